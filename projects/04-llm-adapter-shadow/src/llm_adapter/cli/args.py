@@ -52,6 +52,12 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser.add_argument("--providers", required=True, type=_parse_csv)
     parser.add_argument("--max-concurrency", dest="max_concurrency", type=int)
     parser.add_argument("--rpm", type=int)
+    parser.add_argument("--rate-limit-burst", dest="rate_limit_burst", type=int, default=1)
+    parser.add_argument(
+        "--rate-limit-state",
+        dest="rate_limit_state",
+        help="File holding the rate limit bucket shared by every process pointing at it",
+    )
     parser.add_argument("--aggregate", choices=("majority_vote", "max_score", "weighted_vote"))
     parser.add_argument("--quorum", type=int)
     parser.add_argument("--tie-breaker", choices=("min_latency", "min_cost", "stable_order"), dest="tie_breaker")
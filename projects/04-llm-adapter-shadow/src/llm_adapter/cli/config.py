@@ -68,6 +68,8 @@ def build_runner_config(args: argparse.Namespace) -> RunnerConfig:
     return RunnerConfig(
         mode=RunnerMode(args.mode.replace("-", "_")),
         rpm=args.rpm,
+        rate_limit_burst=args.rate_limit_burst,
+        rate_limit_state_path=args.rate_limit_state,
         consensus=_build_consensus_config(args),
         metrics_path=metrics_path,
         max_concurrency=max_concurrency,
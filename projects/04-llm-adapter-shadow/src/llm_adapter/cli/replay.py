@@ -0,0 +1,74 @@
+"""``replay`` command: re-issue captured traffic against candidate providers.
+
+Run with ``python -m llm_adapter.cli.replay --traffic capture.jsonl
+--candidates openai:gpt-4o-mini --metrics replay-metrics.jsonl``.
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Mapping, Sequence
+import json
+import sys
+
+from ..providers.factory import create_provider_from_spec, ProviderFactory
+from ..shadow_diff import ShadowDiffWorker
+from ..traffic_capture import DEFAULT_REPLAY_CONCURRENCY, read_traffic, replay_traffic
+
+
+def _parse_csv(value: str) -> list[str]:
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    if not items:
+        raise argparse.ArgumentTypeError("at least one value is required")
+    return items
+
+
+def parse_replay_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="llm-adapter-shadow replay")
+    parser.add_argument("--traffic", required=True, help="traffic_capture JSONL written by TrafficCapture")
+    parser.add_argument("--candidates", required=True, type=_parse_csv, help="candidate provider specs (CSV)")
+    parser.add_argument("--metrics", required=True, help="JSONL file receiving shadow_diff records")
+    parser.add_argument("--rpm", type=int, help="candidate calls per minute across all candidates")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_REPLAY_CONCURRENCY)
+    parser.add_argument("--limit", type=int, help="replay at most this many captured requests")
+    parser.add_argument("--detailed-diff", action="store_true", dest="detailed_diff", help="attach ShadowDiffWorker fields")
+    return parser.parse_args(argv)
+
+
+def main(
+    argv: Sequence[str] | None = None,
+    *,
+    factories: Mapping[str, ProviderFactory] | None = None,
+) -> int:
+    args = parse_replay_args(argv)
+    diff_worker = ShadowDiffWorker() if args.detailed_diff else None
+    try:
+        candidates = [create_provider_from_spec(spec, factories=factories) for spec in args.candidates]
+        stats = replay_traffic(
+            read_traffic(args.traffic, limit=args.limit),
+            candidates,
+            args.metrics,
+            rpm=args.rpm,
+            concurrency=args.concurrency,
+            diff_worker=diff_worker,
+        )
+    except Exception as exc:  # noqa: BLE001
+        print(f"Replay failed: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if diff_worker is not None:
+            diff_worker.shutdown()
+    print(
+        json.dumps(
+            {
+                "requests": stats.requests,
+                "calls": stats.calls,
+                "failures": stats.failures,
+                "elapsed_s": round(stats.elapsed_s, 3),
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI
+    raise SystemExit(main())
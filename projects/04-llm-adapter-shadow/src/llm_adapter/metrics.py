@@ -8,7 +8,13 @@ import time
 from types import MappingProxyType
 from typing import Any, Protocol
 
-from .observability import CompositeLogger, JsonlLogger
+from .observability import (
+    CompositeLogger,
+    EventLogger,
+    jsonl_logging_buffered,
+    JsonlLogger,
+    open_jsonl_logger,
+)
 
 PathLike = str | Path
 
@@ -63,6 +69,16 @@ class PrometheusMetricsExporter:
             "End-to-end latency for completed runs (ms).",
             ("status",),
         )
+        self._shadow_shed_total = Counter(
+            f"{metric_prefix}_shadow_shed_total",
+            "Shadow calls dropped because the shadow queue was saturated.",
+            ("executor",),
+        )
+        self._shadow_queue_depth = Histogram(
+            f"{metric_prefix}_shadow_queue_depth",
+            "Shadow queue depth observed at each submission.",
+            ("executor",),
+        )
 
     def handle_event(self, event_type: str, record: Mapping[str, Any]) -> None:
         if event_type == "provider_call":
@@ -98,6 +114,14 @@ class PrometheusMetricsExporter:
             if isinstance(latency_ms, (int, float)) and latency_ms >= 0:  # noqa: UP038
                 self._run_latency_ms.labels(status=status).observe(float(latency_ms))
 
+        elif event_type == "shadow_queue":
+            executor = str(record.get("executor") or "default")
+            if record.get("shed"):
+                self._shadow_shed_total.labels(executor=executor).inc()
+            depth = record.get("queue_depth")
+            if isinstance(depth, int) and depth >= 0:
+                self._shadow_queue_depth.labels(executor=executor).observe(float(depth))
+
     def _normalize_status(self, status: str) -> str:
         lowered = status.strip().lower()
         if lowered in {"errored", "failed", "failure"}:
@@ -130,7 +154,9 @@ def reset_metrics_exporters() -> None:
     _EXPORTER_FANOUT.clear()
 
 
-def _get_jsonl_logger(path: Path) -> JsonlLogger:
+def _get_jsonl_logger(path: Path) -> EventLogger:
+    if jsonl_logging_buffered():
+        return open_jsonl_logger(path)
     with _JSONL_LOGGERS_LOCK:
         logger = _JSONL_LOGGERS.get(path)
         if logger is None:
@@ -139,6 +165,12 @@ def _get_jsonl_logger(path: Path) -> JsonlLogger:
     return logger
 
 
+def emit_metrics_event(event_type: str, record: Mapping[str, Any]) -> None:
+    """Forward ``record`` to registered exporters without writing JSONL."""
+
+    _EXPORTER_FANOUT.emit(event_type, MappingProxyType(dict(record)))
+
+
 def log_event(event_type: str, path: PathLike, **fields: Any) -> None:
     """Append a structured metrics record to ``path``.
 
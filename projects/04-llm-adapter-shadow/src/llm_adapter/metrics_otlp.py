@@ -1,7 +1,13 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Iterable, Mapping, Sequence
+import gzip
+import json
+from threading import Event, Lock, Thread
+import time
 from typing import Any
+import urllib.error
+import urllib.request
 
 ScopeAttrs = list[dict[str, Any]]
 
@@ -68,7 +74,7 @@ class OtlpJsonExporter:
         self._resource = {"attributes": _encode_attrs(attrs)}
 
     def handle_event(self, event_type: str, record: Mapping[str, Any]) -> None:
-        if event_type not in {"provider_call", "run_metric"}:
+        if event_type not in {"provider_call", "run_metric", "shadow_queue"}:
             return
         timestamp = _timestamp_ns(record.get("ts"))
         attr_values = {k: v for k, v in record.items() if k not in {"ts", "event"}}
@@ -111,6 +117,7 @@ class OtlpJsonExporter:
         numeric_fields = {
             "provider_call": ("latency_ms", "tokens_in", "tokens_out"),
             "run_metric": ("latency_ms", "tokens_in", "tokens_out", "cost_usd"),
+            "shadow_queue": ("queue_depth", "shed_total"),
         }
         fields = numeric_fields.get(event_type)
         if fields is None:
@@ -122,3 +129,367 @@ class OtlpJsonExporter:
             if isinstance(value, (int, float)) and not isinstance(value, bool):  # noqa: UP038
                 metrics.append(_gauge(prefix + field, timestamp, float(value), attrs))
         return metrics
+
+
+_BATCH_EVENT_FIELDS: dict[str, tuple[str, ...]] = {
+    "provider_call": ("latency_ms", "tokens_in", "tokens_out"),
+    "run_metric": ("latency_ms", "tokens_in", "tokens_out", "cost_usd"),
+    "shadow_queue": ("queue_depth",),
+    "shadow_diff": ("primary_latency_ms", "shadow_latency_ms", "latency_gap_ms"),
+}
+DEFAULT_METRIC_ATTRIBUTE_KEYS = ("provider", "status", "shadow_used", "mode", "executor")
+
+
+class _Series:
+    __slots__ = ("count", "total", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: _Series) -> None:
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+class BatchingOtlpExporter:
+    """Accumulate events and emit one OTLP JSON envelope per batch.
+
+    Log records are buffered as-is. Numeric fields are aggregated per metric
+    name and per attribute set (only ``metric_attribute_keys`` take part, so
+    request-level identifiers do not explode cardinality) into a delta
+    ``sum`` for event counts and a ``summary`` (count, sum, min, max) for
+    each field. A batch is emitted on :meth:`flush` and every
+    ``flush_interval_s`` once :meth:`start` has been called; reaching
+    ``max_batch_logs`` records wakes the flush thread early (or flushes
+    inline when it has not been started). Resource attributes are encoded
+    once.
+
+    If ``emit`` raises, the batch is put back in front of newer data and
+    retried on the next flush, so delivery is at-least-once. At most
+    ``max_buffered_logs`` log records are kept; older ones are dropped.
+    ``failed_batches`` and ``dropped_logs`` count both cases.
+    """
+
+    _SCOPE = OtlpJsonExporter._SCOPE
+
+    def __init__(
+        self,
+        emit: Callable[[dict[str, Any]], None],
+        *,
+        service_name: str = "llm-adapter",
+        resource_attributes: Mapping[str, Any] | None = None,
+        flush_interval_s: float = 5.0,
+        max_batch_logs: int = 1000,
+        max_buffered_logs: int | None = None,
+        metric_attribute_keys: Sequence[str] = DEFAULT_METRIC_ATTRIBUTE_KEYS,
+        event_types: Iterable[str] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        attrs: dict[str, Any] = {"service.name": service_name}
+        if resource_attributes:
+            attrs.update(resource_attributes)
+        self._emit = emit
+        self._resource = {"attributes": _encode_attrs(attrs)}
+        self._flush_interval_s = flush_interval_s
+        self._max_batch_logs = max_batch_logs
+        self._max_buffered_logs = (
+            max_buffered_logs if max_buffered_logs is not None else max_batch_logs * 10
+        )
+        self._metric_attribute_keys = tuple(metric_attribute_keys)
+        self._event_types = frozenset(event_types if event_types is not None else _BATCH_EVENT_FIELDS)
+        self._clock = clock
+        self._lock = Lock()
+        self._emit_lock = Lock()
+        self._logs: list[dict[str, Any]] = []
+        self._series: dict[tuple[str, tuple[tuple[str, Any], ...]], _Series] = {}
+        self._window_start_ns = self._now_ns()
+        self._failed_batches = 0
+        self._dropped_logs = 0
+        self._stop = Event()
+        self._wake = Event()
+        self._thread: Thread | None = None
+
+    @property
+    def failed_batches(self) -> int:
+        with self._lock:
+            return self._failed_batches
+
+    @property
+    def dropped_logs(self) -> int:
+        with self._lock:
+            return self._dropped_logs
+
+    def handle_event(self, event_type: str, record: Mapping[str, Any]) -> None:
+        if event_type not in self._event_types:
+            return
+        timestamp = _timestamp_ns(record.get("ts"))
+        attr_values = {k: v for k, v in record.items() if k not in {"ts", "event"}}
+        normalized_status = _normalized_status(record)
+        if normalized_status is not None:
+            attr_values["status"] = normalized_status
+        log_record = {
+            "timeUnixNano": timestamp,
+            "observedTimeUnixNano": timestamp,
+            "severityText": event_type,
+            "body": {"stringValue": event_type},
+            "attributes": _encode_attrs(attr_values),
+        }
+        series_attrs = tuple(
+            (key, attr_values[key])
+            for key in self._metric_attribute_keys
+            if attr_values.get(key) is not None
+        )
+        prefix = f"llm_adapter.{event_type}."
+        with self._lock:
+            self._logs.append(log_record)
+            self._series_for(prefix + "count", series_attrs).add(1.0)
+            for field in _BATCH_EVENT_FIELDS.get(event_type, ()):
+                value = record.get(field)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):  # noqa: UP038
+                    self._series_for(prefix + field, series_attrs).add(float(value))
+            full = len(self._logs) >= self._max_batch_logs
+        if full:
+            if self._thread is not None:
+                self._wake.set()
+            else:
+                self.flush()
+
+    def flush(self) -> bool:
+        """Emit buffered data as one envelope. Returns ``False`` if empty."""
+
+        with self._emit_lock:
+            with self._lock:
+                logs, self._logs = self._logs, []
+                series, self._series = self._series, {}
+                start_ns = self._window_start_ns
+                end_ns = self._window_start_ns = self._now_ns()
+            if not logs and not series:
+                return False
+            payload: dict[str, Any] = {}
+            if logs:
+                payload["resourceLogs"] = [
+                    {
+                        "resource": self._resource,
+                        "scopeLogs": [{"scope": self._SCOPE, "logRecords": logs}],
+                    }
+                ]
+            if series:
+                payload["resourceMetrics"] = [
+                    {
+                        "resource": self._resource,
+                        "scopeMetrics": [
+                            {
+                                "scope": self._SCOPE,
+                                "metrics": self._build_metrics(series, start_ns, end_ns),
+                            }
+                        ],
+                    }
+                ]
+            try:
+                self._emit(payload)
+            except Exception:
+                self._requeue(logs, series, start_ns)
+                raise
+            return True
+
+    def _requeue(
+        self,
+        logs: list[dict[str, Any]],
+        series: dict[tuple[str, tuple[tuple[str, Any], ...]], _Series],
+        start_ns: int,
+    ) -> None:
+        with self._lock:
+            self._failed_batches += 1
+            merged = logs + self._logs
+            overflow = len(merged) - self._max_buffered_logs
+            if overflow > 0:
+                self._dropped_logs += overflow
+                merged = merged[overflow:]
+            self._logs = merged
+            for key, values in series.items():
+                current = self._series.get(key)
+                if current is None:
+                    self._series[key] = values
+                else:
+                    current.merge(values)
+            self._window_start_ns = start_ns
+
+    def start(self) -> BatchingOtlpExporter:
+        """Start the periodic flush thread."""
+
+        if self._thread is None:
+            self._stop.clear()
+            self._wake.clear()
+            self._thread = Thread(target=self._run, name="otlp-batch-flush", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop the periodic flush thread and emit what is still buffered."""
+
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def __enter__(self) -> BatchingOtlpExporter:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self._flush_interval_s)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.flush()
+            except Exception:  # pragma: no cover - the batch was re-queued for the next flush
+                continue
+
+    def _series_for(self, name: str, attrs: tuple[tuple[str, Any], ...]) -> _Series:
+        key = (name, attrs)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def _now_ns(self) -> int:
+        return int(self._clock() * 1_000_000_000)
+
+    @staticmethod
+    def _build_metrics(
+        series: Mapping[tuple[str, tuple[tuple[str, Any], ...]], _Series],
+        start_ns: int,
+        end_ns: int,
+    ) -> list[dict[str, Any]]:
+        start, end = str(start_ns), str(end_ns)
+        points: dict[str, list[dict[str, Any]]] = {}
+        for (name, attrs), values in series.items():
+            point: dict[str, Any] = {
+                "startTimeUnixNano": start,
+                "timeUnixNano": end,
+                "attributes": _encode_attrs(dict(attrs)),
+            }
+            if name.endswith(".count"):
+                point["asDouble"] = values.total
+            else:
+                point.update(
+                    {
+                        "count": str(values.count),
+                        "sum": values.total,
+                        "quantileValues": [
+                            {"quantile": 0.0, "value": values.minimum},
+                            {"quantile": 1.0, "value": values.maximum},
+                        ],
+                    }
+                )
+            points.setdefault(name, []).append(point)
+        metrics: list[dict[str, Any]] = []
+        for name, data_points in points.items():
+            if name.endswith(".count"):
+                metrics.append(
+                    {
+                        "name": name,
+                        "sum": {
+                            "dataPoints": data_points,
+                            "aggregationTemporality": _AGGREGATION_TEMPORALITY_DELTA,
+                            "isMonotonic": True,
+                        },
+                    }
+                )
+            else:
+                metrics.append({"name": name, "summary": {"dataPoints": data_points}})
+        return metrics
+
+
+_AGGREGATION_TEMPORALITY_DELTA = 1
+_RETRYABLE_STATUS = frozenset({429, 502, 503, 504})
+
+
+class OtlpHttpJsonTransport:
+    """POST OTLP JSON envelopes to an OTLP/HTTP endpoint.
+
+    Logs and metrics are sent to ``{endpoint}/v1/logs`` and
+    ``{endpoint}/v1/metrics``, gzip-compressed by default. Connection errors
+    and 429/502/503/504 responses are retried with exponential backoff,
+    honouring ``Retry-After`` when present.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        timeout_s: float = 10.0,
+        compress: bool = True,
+        max_retries: int = 3,
+        backoff_s: float = 0.5,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._endpoint = endpoint.rstrip("/")
+        self._headers = {"Content-Type": "application/json", **dict(headers or {})}
+        if compress:
+            self._headers["Content-Encoding"] = "gzip"
+        self._timeout_s = timeout_s
+        self._compress = compress
+        self._max_retries = max_retries
+        self._backoff_s = backoff_s
+        self._sleep = sleep
+
+    def __call__(self, payload: Mapping[str, Any]) -> None:
+        if "resourceLogs" in payload:
+            self._post("/v1/logs", {"resourceLogs": payload["resourceLogs"]})
+        if "resourceMetrics" in payload:
+            self._post("/v1/metrics", {"resourceMetrics": payload["resourceMetrics"]})
+
+    def _post(self, path: str, body: Mapping[str, Any]) -> None:
+        data = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        if self._compress:
+            data = gzip.compress(data)
+        attempt = 0
+        while True:
+            request = urllib.request.Request(
+                self._endpoint + path, data=data, headers=self._headers, method="POST"
+            )
+            retry_after: float | None = None
+            try:
+                with urllib.request.urlopen(request, timeout=self._timeout_s) as response:
+                    response.read()
+                return
+            except urllib.error.HTTPError as exc:
+                if exc.code not in _RETRYABLE_STATUS or attempt >= self._max_retries:
+                    raise
+                retry_after = _parse_retry_after(exc.headers.get("Retry-After"))
+            except urllib.error.URLError:
+                if attempt >= self._max_retries:
+                    raise
+            delay = retry_after if retry_after is not None else self._backoff_s * (2**attempt)
+            attempt += 1
+            self._sleep(delay)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
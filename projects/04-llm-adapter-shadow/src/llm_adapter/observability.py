@@ -1,12 +1,18 @@
 """Shared observability primitives for the shadow adapter."""
 from __future__ import annotations
 
+import atexit
+from collections import deque
 from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
 import json
+import os
 from pathlib import Path
 import sys
-from threading import Lock
-from typing import Any, Protocol, TextIO
+from threading import Condition, Lock, Thread
+import time
+from typing import Any, Literal, Protocol, TextIO
+from weakref import WeakSet
 
 PathLike = str | Path
 
@@ -24,21 +30,315 @@ class JsonlLogger:
     def __init__(self, path: PathLike) -> None:
         self._path = Path(path)
         self._lock = Lock()
+        self._parent_ready = False
 
     def emit(self, event_type: str, record: Mapping[str, Any]) -> None:
         payload = dict(record)
         payload.setdefault("event", event_type)
 
         target = self._path
-        parent = target.parent
-        if parent != Path(""):
-            parent.mkdir(parents=True, exist_ok=True)
+        if not self._parent_ready:
+            parent = target.parent
+            if parent != Path(""):
+                parent.mkdir(parents=True, exist_ok=True)
+            self._parent_ready = True
 
         with self._lock:
             with target.open("a", encoding="utf-8") as handle:
                 handle.write(json.dumps(payload, ensure_ascii=False) + "\n")
 
 
+OverflowPolicy = Literal["block", "drop"]
+
+
+@dataclass(frozen=True, slots=True)
+class JsonlLoggerStats:
+    """Counters reported by :class:`BufferedJsonlLogger`."""
+
+    queued: int
+    written: int
+    failed: int
+    dropped: int
+    batches: int
+    queue_depth: int
+    last_lag_ms: float
+    max_lag_ms: float
+
+
+class BufferedJsonlLogger:
+    """Queue events and append them to a JSONL file from a writer thread.
+
+    ``emit`` only copies the record onto a bounded queue. A daemon writer
+    thread keeps a single handle open, serializes queued events and writes
+    them in batches of up to ``batch_size`` lines, flushing at least every
+    ``flush_interval_s``. When the queue is full ``overflow="block"`` makes
+    ``emit`` wait for the writer (backpressure) while ``overflow="drop"``
+    discards the event and counts it, as do events emitted after
+    :meth:`close`. Pending events are written by :meth:`close`, which also
+    runs at interpreter exit.
+
+    Each event is serialized on its own; values JSON cannot encode are
+    written via ``str()``, and events that still fail (or whose batch could
+    not be written) are counted as ``failed`` instead of poisoning the batch.
+
+    Lag is the time between ``emit`` and the batch containing the event
+    reaching the file. It is available from :meth:`stats` and forwarded to
+    registered metrics exporters as an ``event_logger`` event per batch.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        *,
+        max_queue: int = 10_000,
+        batch_size: int = 512,
+        flush_interval_s: float = 0.2,
+        overflow: OverflowPolicy = "block",
+    ) -> None:
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue and batch_size must be positive")
+        if overflow not in ("block", "drop"):
+            raise ValueError(f"unknown overflow policy: {overflow!r}")
+        self._path = Path(path)
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._flush_interval_s = flush_interval_s
+        self._overflow = overflow
+        self._queue: deque[tuple[float, dict[str, Any]]] = deque()
+        self._cond = Condition()
+        self._queued = 0
+        self._written = 0
+        self._failed = 0
+        self._dropped = 0
+        self._batches = 0
+        self._last_lag_ms = 0.0
+        self._max_lag_ms = 0.0
+        self._flush_waiters = 0
+        self._closed = False
+        self._handle: TextIO | None = None
+        self._writer = Thread(
+            target=self._run, name=f"jsonl-writer-{self._path.name}", daemon=True
+        )
+        self._writer.start()
+        _BUFFERED_LOGGERS.add(self)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def emit(self, event_type: str, record: Mapping[str, Any]) -> None:
+        payload = dict(record)
+        payload.setdefault("event", event_type)
+        with self._cond:
+            while len(self._queue) >= self._max_queue and not self._closed:
+                if self._overflow == "drop":
+                    self._dropped += 1
+                    return
+                self._cond.wait()
+            if self._closed:
+                self._dropped += 1
+                return
+            self._queue.append((time.monotonic(), payload))
+            self._queued += 1
+            depth = len(self._queue)
+            if depth == 1 or depth >= self._batch_size:
+                self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every event emitted so far has been written.
+
+        Returns ``False`` if ``timeout`` elapsed first.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self._queued
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._written + self._failed < target and self._writer.is_alive():
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._flush_waiters -= 1
+            return self._written + self._failed >= target
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        _BUFFERED_LOGGERS.discard(self)
+
+    def stats(self) -> JsonlLoggerStats:
+        with self._cond:
+            return JsonlLoggerStats(
+                queued=self._queued,
+                written=self._written,
+                failed=self._failed,
+                dropped=self._dropped,
+                batches=self._batches,
+                queue_depth=len(self._queue),
+                last_lag_ms=self._last_lag_ms,
+                max_lag_ms=self._max_lag_ms,
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                while (
+                    self._queue
+                    and len(self._queue) < self._batch_size
+                    and not self._closed
+                    and not self._flush_waiters
+                ):
+                    wait_s = self._flush_interval_s - (time.monotonic() - self._queue[0][0])
+                    if wait_s <= 0:
+                        break
+                    self._cond.wait(wait_s)
+                size = min(len(self._queue), self._batch_size)
+                batch = [self._queue.popleft() for _ in range(size)]
+                finished = self._closed and not self._queue
+                self._cond.notify_all()
+            if batch:
+                self._write_batch(batch)
+            if finished:
+                if self._handle is not None:
+                    self._handle.close()
+                    self._handle = None
+                return
+
+    def _write_batch(self, batch: list[tuple[float, dict[str, Any]]]) -> None:
+        lines: list[str] = []
+        for _, payload in batch:
+            line = _serialize_line(payload)
+            if line is not None:
+                lines.append(line)
+        unserializable = len(batch) - len(lines)
+        try:
+            if lines:
+                handle = self._open()
+                handle.write("".join(lines))
+                handle.flush()
+        except Exception:  # pragma: no cover - disk errors must not kill the writer
+            with self._cond:
+                self._failed += len(batch)
+                self._cond.notify_all()
+            return
+        lag_ms = (time.monotonic() - batch[0][0]) * 1000.0
+        with self._cond:
+            self._written += len(lines)
+            self._failed += unserializable
+            self._batches += 1
+            self._last_lag_ms = lag_ms
+            self._max_lag_ms = max(self._max_lag_ms, lag_ms)
+            queue_depth = len(self._queue)
+            dropped = self._dropped
+            self._cond.notify_all()
+        from .metrics import emit_metrics_event  # metrics imports this module
+
+        emit_metrics_event(
+            "event_logger",
+            {
+                "path": str(self._path),
+                "batch_size": len(batch),
+                "lag_ms": lag_ms,
+                "queue_depth": queue_depth,
+                "dropped_total": dropped,
+            },
+        )
+
+    def _open(self) -> TextIO:
+        if self._handle is None:
+            parent = self._path.parent
+            if parent != Path(""):
+                parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self._path.open("a", encoding="utf-8")
+        return self._handle
+
+
+def _serialize_line(payload: Mapping[str, Any]) -> str | None:
+    try:
+        return json.dumps(payload, ensure_ascii=False) + "\n"
+    except (TypeError, ValueError):
+        pass
+    try:
+        return json.dumps(payload, ensure_ascii=False, default=str) + "\n"
+    except (TypeError, ValueError):
+        return None
+
+
+_BUFFERED_LOGGERS: WeakSet[BufferedJsonlLogger] = WeakSet()
+_SHARED_LOGGERS: dict[Path, BufferedJsonlLogger] = {}
+_SHARED_LOGGERS_LOCK = Lock()
+_BUFFERED_ENV = "LLM_ADAPTER_JSONL_BUFFERED"
+_buffered_default: bool | None = None
+
+
+def configure_jsonl_logging(buffered: bool) -> None:
+    """Choose whether :func:`open_jsonl_logger` returns buffered loggers.
+
+    Defaults to the ``LLM_ADAPTER_JSONL_BUFFERED`` environment variable.
+    Switching back to unbuffered closes (and flushes) the shared loggers.
+    """
+
+    global _buffered_default
+    _buffered_default = buffered
+    if not buffered:
+        close_jsonl_loggers()
+
+
+def jsonl_logging_buffered() -> bool:
+    """Whether :func:`open_jsonl_logger` currently returns buffered loggers."""
+
+    if _buffered_default is not None:
+        return _buffered_default
+    return os.environ.get(_BUFFERED_ENV, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def open_jsonl_logger(path: PathLike) -> EventLogger:
+    """Return the JSONL logger for ``path``.
+
+    In buffered mode one :class:`BufferedJsonlLogger` is shared per file so
+    every writer goes through the same queue and handle.
+    """
+
+    if not jsonl_logging_buffered():
+        return JsonlLogger(path)
+    key = Path(path).resolve()
+    with _SHARED_LOGGERS_LOCK:
+        logger = _SHARED_LOGGERS.get(key)
+        if logger is None:
+            logger = BufferedJsonlLogger(key)
+            _SHARED_LOGGERS[key] = logger
+    return logger
+
+
+def flush_jsonl_loggers(timeout: float | None = None) -> None:
+    """Flush every live :class:`BufferedJsonlLogger`."""
+
+    for logger in list(_BUFFERED_LOGGERS):
+        logger.flush(timeout)
+
+
+def close_jsonl_loggers() -> None:
+    """Flush and close every live :class:`BufferedJsonlLogger`."""
+
+    with _SHARED_LOGGERS_LOCK:
+        _SHARED_LOGGERS.clear()
+    for logger in list(_BUFFERED_LOGGERS):
+        logger.close()
+
+
+atexit.register(close_jsonl_loggers)
+
+
 class StdLogger:
     """Emit structured events to a text stream as JSON."""
 
@@ -0,0 +1,129 @@
+"""In-process OTLP/HTTP JSON collector stand-in for tests and benchmarks."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from threading import Lock, Thread
+from typing import Any
+
+_PATHS = {"/v1/logs": "resourceLogs", "/v1/metrics": "resourceMetrics"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _CollectorServer
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        collector = self.server.collector
+        status = collector._next_status()
+        if status != 200:
+            self.send_response(status)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        if self.path not in _PATHS:
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = gzip.decompress(body) if self.headers.get("Content-Encoding") == "gzip" else body
+        collector._record(self.path, json.loads(payload), len(body))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+class _CollectorServer(ThreadingHTTPServer):
+    daemon_threads = True
+    collector: OtlpCollectorStub
+
+
+class OtlpCollectorStub:
+    """Accept OTLP JSON on ``/v1/logs`` and ``/v1/metrics`` on localhost.
+
+    Received envelopes are kept in memory. :meth:`fail_next` makes the next
+    requests answer with an error status to exercise exporter retries.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = _CollectorServer((host, port), _Handler)
+        self._server.collector = self
+        self._lock = Lock()
+        self._requests: list[tuple[str, dict[str, Any]]] = []
+        self._bytes_received = 0
+        self._failures: list[int] = []
+        self._thread: Thread | None = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode("ascii")
+        return f"http://{host}:{port}"
+
+    @property
+    def bytes_received(self) -> int:
+        with self._lock:
+            return self._bytes_received
+
+    def start(self) -> OtlpCollectorStub:
+        if self._thread is None:
+            self._thread = Thread(target=self._server.serve_forever, name="otlp-collector", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> OtlpCollectorStub:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def fail_next(self, count: int = 1, status: int = 503) -> None:
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def requests(self) -> list[tuple[str, dict[str, Any]]]:
+        with self._lock:
+            return list(self._requests)
+
+    def log_records(self) -> Iterator[dict[str, Any]]:
+        for path, payload in self.requests():
+            if path != "/v1/logs":
+                continue
+            for resource in payload["resourceLogs"]:
+                for scope in resource["scopeLogs"]:
+                    yield from scope["logRecords"]
+
+    def metrics(self) -> Iterator[dict[str, Any]]:
+        for path, payload in self.requests():
+            if path != "/v1/metrics":
+                continue
+            for resource in payload["resourceMetrics"]:
+                for scope in resource["scopeMetrics"]:
+                    yield from scope["metrics"]
+
+    def _next_status(self) -> int:
+        with self._lock:
+            return self._failures.pop(0) if self._failures else 200
+
+    def _record(self, path: str, payload: dict[str, Any], size: int) -> None:
+        with self._lock:
+            self._requests.append((path, payload))
+            self._bytes_received += size
+
+
+__all__ = ["OtlpCollectorStub"]
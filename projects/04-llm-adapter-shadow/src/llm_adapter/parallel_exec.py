@@ -1,7 +1,7 @@
 """Parallel execution helpers shared across runner implementations."""
 from __future__ import annotations
 
-from collections.abc import Callable, Iterator, Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from concurrent.futures import (
     as_completed,
     FIRST_COMPLETED,
@@ -10,6 +10,8 @@ from concurrent.futures import (
     wait,
 )
 from dataclasses import dataclass
+import threading
+import time
 from typing import Any, Generic, TypeVar
 
 from . import parallel_async as _parallel_async
@@ -64,6 +66,53 @@ class ParallelAllResult(Generic[T, S]):
         raise AttributeError(msg)
 
 
+class WorkerCompletion:
+    """Track which worker slots started and wake waiters when they finish.
+
+    Workers call :meth:`mark_started` / :meth:`mark_finished` around their
+    body; :meth:`wait_for` blocks on a condition variable until every started
+    slot of interest has finished, so callers never need to poll.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._started: set[int] = set()
+        self._finished: set[int] = set()
+
+    def mark_started(self, index: int) -> None:
+        with self._cond:
+            self._started.add(index)
+
+    def mark_finished(self, index: int) -> None:
+        with self._cond:
+            self._finished.add(index)
+            self._cond.notify_all()
+
+    @property
+    def started(self) -> frozenset[int]:
+        with self._cond:
+            return frozenset(self._started)
+
+    def wait_for(self, indices: Iterable[int], timeout: float | None = None) -> list[int]:
+        """Wait until the started slots in ``indices`` finish.
+
+        Slots that never started are ignored. Returns the started slots that
+        are still running when ``timeout`` expires.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            pending = [index for index in indices if index in self._started]
+            while True:
+                pending = [index for index in pending if index not in self._finished]
+                if not pending:
+                    return pending
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return pending
+                self._cond.wait(remaining)
+
+
 def _normalize_concurrency(total: int, limit: int | None) -> int:
     if limit is None or limit <= 0:
         return max(total, 1)
@@ -160,6 +209,7 @@ __all__ = [
     "ParallelExecutionError",
     "RetryDirective",
     "SyncWorker",
+    "WorkerCompletion",
     "asyncio",
     "run_parallel_all_async",
     "run_parallel_all_sync",
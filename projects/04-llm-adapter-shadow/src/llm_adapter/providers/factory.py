@@ -6,6 +6,7 @@ import os
 
 from ..provider_spi import ProviderSPI
 from .gemini import GeminiProvider
+from .loadgen import LoadGenProvider
 from .mock import MockProvider
 from .ollama import OllamaProvider
 from .openrouter import OpenRouterProvider
@@ -53,6 +54,7 @@ def create_provider_from_spec(
         "gemini": lambda model: GeminiProvider(model=model),
         "ollama": lambda model: OllamaProvider(model=model),
         "mock": lambda model: MockProvider(model),
+        "loadgen": lambda model: LoadGenProvider(model, seed=0),
         "openrouter": lambda model: OpenRouterProvider(model=model),
     }
 
@@ -0,0 +1,282 @@
+"""Mock provider with configurable latency, error and token-length distributions."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from dataclasses import dataclass, field
+import math
+import random
+import threading
+import time
+from typing import Protocol
+
+from ..errors import AuthError, RateLimitError, RetriableError, TimeoutError
+from ..provider_spi import ProviderRequest, ProviderResponse, TokenUsage
+from ..utils import content_hash
+from .mock import ErrorSpec, MockProvider
+
+__all__ = [
+    "Constant",
+    "Distribution",
+    "LoadGenProvider",
+    "LoadProfile",
+    "LogNormal",
+    "Pareto",
+    "Uniform",
+]
+
+
+class Distribution(Protocol):
+    def sample(self, rng: random.Random) -> float: ...
+
+
+@dataclass(frozen=True, slots=True)
+class Constant:
+    value: float
+
+    def sample(self, rng: random.Random) -> float:
+        return self.value
+
+
+@dataclass(frozen=True, slots=True)
+class Uniform:
+    low: float
+    high: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+
+@dataclass(frozen=True, slots=True)
+class LogNormal:
+    """Log-normal distribution parameterised by its median and log-space sigma."""
+
+    median: float
+    sigma: float = 0.5
+    cap: float | None = None
+
+    def sample(self, rng: random.Random) -> float:
+        value = rng.lognormvariate(math.log(self.median), self.sigma)
+        return value if self.cap is None else min(value, self.cap)
+
+
+@dataclass(frozen=True, slots=True)
+class Pareto:
+    """Pareto (type I) distribution with minimum ``scale`` and tail index ``alpha``."""
+
+    scale: float
+    alpha: float = 1.5
+    cap: float | None = None
+
+    def sample(self, rng: random.Random) -> float:
+        value = self.scale * rng.paretovariate(self.alpha)
+        return value if self.cap is None else min(value, self.cap)
+
+
+_ERROR_CLASSES: dict[str, ErrorSpec] = {
+    "timeout": (TimeoutError, "simulated timeout"),
+    "rate_limit": (RateLimitError, "simulated rate limit"),
+    "retriable": (RetriableError, "simulated retriable error"),
+    "auth": (AuthError, "simulated auth error"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class LoadProfile:
+    """Behaviour of a :class:`LoadGenProvider`.
+
+    ``error_rates`` maps an error class (``timeout``, ``rate_limit``,
+    ``retriable``, ``auth``) to its per-call probability. A rate-limit error
+    starts a burst: the next ``rate_limit_burst - 1`` calls are rejected too.
+    Latency is ``latency_ms`` for non-streaming calls; with ``stream_chunk_tokens``
+    set it becomes time-to-first-token plus ``inter_chunk_ms`` per further chunk.
+    ``time_scale`` multiplies every real sleep (``0`` reports the sampled
+    latency without sleeping, for offline throughput runs).
+    """
+
+    latency_ms: Distribution = field(default_factory=lambda: LogNormal(200.0, 0.6))
+    completion_tokens: Distribution = field(default_factory=lambda: LogNormal(120.0, 0.7))
+    error_rates: Mapping[str, float] = field(default_factory=dict)
+    rate_limit_burst: int = 1
+    stream_chunk_tokens: int | None = None
+    inter_chunk_ms: Distribution = field(default_factory=lambda: Constant(15.0))
+    time_scale: float = 1.0
+    max_completion_tokens: int = 4096
+
+    def __post_init__(self) -> None:
+        unknown = set(self.error_rates) - set(_ERROR_CLASSES)
+        if unknown:
+            raise ValueError(f"unknown error classes: {sorted(unknown)}")
+        if sum(self.error_rates.values()) > 1.0:
+            raise ValueError("error rates must sum to at most 1")
+        if self.rate_limit_burst < 1:
+            raise ValueError("rate_limit_burst must be >= 1")
+        if self.stream_chunk_tokens is not None and self.stream_chunk_tokens < 1:
+            raise ValueError("stream_chunk_tokens must be >= 1")
+        if self.time_scale < 0:
+            raise ValueError("time_scale must be non-negative")
+
+
+@dataclass(frozen=True, slots=True)
+class _Plan:
+    error: ErrorSpec | None
+    latency_ms: float
+    completion_tokens: int
+    chunk_delays_ms: tuple[float, ...]
+
+
+class LoadGenProvider(MockProvider):
+    """MockProvider whose latency, failures and output length follow a :class:`LoadProfile`.
+
+    With ``seed`` set, every sample for a call is drawn from a generator
+    keyed on the seed, the prompt and how many times that prompt has been
+    seen. The same traffic therefore gets the same outcomes regardless of
+    thread scheduling. Occurrence counts are kept for the ``max_tracked_prompts``
+    most recently seen prompts; an evicted prompt starts counting from zero again.
+    Rate-limit bursts are shared state and follow call order.
+    The mock error markers (``[TIMEOUT]`` etc.) still apply.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        profile: LoadProfile | None = None,
+        *,
+        seed: int | None = None,
+        max_tracked_prompts: int = 65536,
+        sleep: Callable[[float], None] = time.sleep,
+        async_sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        if max_tracked_prompts < 1:
+            raise ValueError("max_tracked_prompts must be >= 1")
+        super().__init__(name, base_latency_ms=0)
+        self.profile = profile or LoadProfile()
+        self._seed = seed
+        self._rng = random.Random(seed)
+        self._sleep = sleep
+        self._async_sleep = async_sleep
+        self._lock = threading.Lock()
+        self._occurrences: OrderedDict[str, int] = OrderedDict()
+        self._max_tracked_prompts = max_tracked_prompts
+        self._burst_remaining = 0
+
+    def capabilities(self) -> set[str]:
+        capabilities = super().capabilities()
+        if self.profile.stream_chunk_tokens is not None:
+            capabilities = capabilities | {"stream"}
+        return capabilities
+
+    def _request_text(self, request: ProviderRequest) -> str:
+        return request.prompt_text or self._merge_message_content(request.chat_messages)
+
+    def _call_rng(self, text: str) -> random.Random:
+        if self._seed is None:
+            with self._lock:
+                return random.Random(self._rng.getrandbits(64))
+        key = content_hash("loadgen", text)
+        with self._lock:
+            occurrence = self._occurrences.pop(key, 0)
+            self._occurrences[key] = occurrence + 1
+            if len(self._occurrences) > self._max_tracked_prompts:
+                self._occurrences.popitem(last=False)
+        return random.Random(f"{self._seed}:{key}:{occurrence}")
+
+    def _plan(self, text: str) -> _Plan:
+        profile = self.profile
+        rng = self._call_rng(text)
+        error: ErrorSpec | None = None
+        roll = rng.random()
+        with self._lock:
+            if self._burst_remaining > 0:
+                self._burst_remaining -= 1
+                error = _ERROR_CLASSES["rate_limit"]
+            else:
+                threshold = 0.0
+                for error_class, rate in profile.error_rates.items():
+                    threshold += rate
+                    if roll < threshold:
+                        error = _ERROR_CLASSES[error_class]
+                        if error_class == "rate_limit":
+                            self._burst_remaining = profile.rate_limit_burst - 1
+                        break
+        latency_ms = max(profile.latency_ms.sample(rng), 0.0)
+        tokens = int(round(profile.completion_tokens.sample(rng)))
+        tokens = min(max(tokens, 1), profile.max_completion_tokens)
+        chunk_delays: tuple[float, ...] = ()
+        if profile.stream_chunk_tokens is not None and error is None:
+            chunks = math.ceil(tokens / profile.stream_chunk_tokens)
+            chunk_delays = (latency_ms,) + tuple(
+                max(profile.inter_chunk_ms.sample(rng), 0.0) for _ in range(chunks - 1)
+            )
+            latency_ms = sum(chunk_delays)
+        return _Plan(error, latency_ms, tokens, chunk_delays)
+
+    def _response(self, request: ProviderRequest, text: str, plan: _Plan) -> ProviderResponse:
+        words = text.split() or ["ok"]
+        output = " ".join(words[index % len(words)] for index in range(plan.completion_tokens))
+        raw: dict[str, object] = {"echo": text, "provider": self.name()}
+        if plan.chunk_delays_ms:
+            raw["chunks"] = len(plan.chunk_delays_ms)
+            raw["ttft_ms"] = int(plan.chunk_delays_ms[0])
+        return ProviderResponse(
+            text=output,
+            latency_ms=int(plan.latency_ms),
+            token_usage=TokenUsage(
+                prompt=max(1, len(text) // 4), completion=plan.completion_tokens
+            ),
+            model=request.model,
+            finish_reason="stop",
+            raw=raw,
+        )
+
+    def _delays_s(self, plan: _Plan) -> tuple[float, ...]:
+        scale = self.profile.time_scale / 1000.0
+        if scale == 0:
+            return ()
+        return tuple(delay * scale for delay in plan.chunk_delays_ms or (plan.latency_ms,))
+
+    def _raise(self, plan: _Plan) -> None:
+        if plan.error is not None:
+            exc_cls, message = plan.error
+            raise exc_cls(message)
+
+    def invoke(self, request: ProviderRequest) -> ProviderResponse:
+        text = self._request_text(request)
+        self._maybe_raise_error(text)
+        plan = self._plan(text)
+        for delay in self._delays_s(plan):
+            self._sleep(delay)
+        self._raise(plan)
+        return self._response(request, text, plan)
+
+    async def invoke_async(self, request: ProviderRequest) -> ProviderResponse:
+        text = self._request_text(request)
+        self._maybe_raise_error(text)
+        plan = self._plan(text)
+        for delay in self._delays_s(plan):
+            await self._async_sleep(delay)
+        self._raise(plan)
+        return self._response(request, text, plan)
+
+    def stream(self, request: ProviderRequest) -> Iterator[str]:
+        """Yield the response text in ``stream_chunk_tokens`` pieces, paced like the profile."""
+
+        chunk_tokens = self.profile.stream_chunk_tokens
+        if chunk_tokens is None:
+            raise ValueError("profile has no stream_chunk_tokens configured")
+        text = self._request_text(request)
+        self._maybe_raise_error(text)
+        plan = self._plan(text)
+        delays = self._delays_s(plan)
+        if plan.error is not None:
+            for delay in delays:
+                self._sleep(delay)
+            self._raise(plan)
+        words = self._response(request, text, plan).text.split(" ")
+        for index in range(0, len(words), chunk_tokens):
+            chunk_index = index // chunk_tokens
+            if chunk_index < len(delays):
+                self._sleep(delays[chunk_index])
+            prefix = "" if index == 0 else " "
+            yield prefix + " ".join(words[index : index + chunk_tokens])
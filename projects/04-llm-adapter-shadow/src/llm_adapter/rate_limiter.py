@@ -3,64 +3,194 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Awaitable, Callable
+import json
+import os
+from pathlib import Path
 import threading
 import time
+from typing import Protocol
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_RATE_LIMIT_KEY = "default"
+
+
+class RateLimitBackend(Protocol):
+    """Token-bucket state store shared by one or more :class:`RateLimiter`.
+
+    ``reserve`` takes one token from bucket ``key`` and returns how long the
+    caller must wait before retrying (``0.0`` when the token was granted).
+    Implementations must apply the refill and the take atomically; a
+    networked store (e.g. a Redis script) only needs to provide this method.
+    """
+
+    def reserve(
+        self, key: str, *, rate_per_second: float, capacity: float, now: float
+    ) -> float: ...
+
+
+def _take(
+    tokens: float,
+    updated_at: float,
+    *,
+    rate_per_second: float,
+    capacity: float,
+    now: float,
+) -> tuple[float, float, float]:
+    if updated_at > now:
+        # A timestamp from a clock that has since restarted (monotonic time
+        # persisted across a reboot) would otherwise block refills forever.
+        updated_at = now
+    elapsed = now - updated_at
+    if elapsed > 0.0:
+        tokens = min(capacity, tokens + elapsed * rate_per_second)
+        updated_at = now
+    if tokens >= 1.0:
+        return tokens - 1.0, updated_at, 0.0
+    # Keep the partial token so a caller that wakes early still makes progress.
+    return tokens, updated_at, (1.0 - tokens) / rate_per_second
+
+
+class InMemoryRateLimitBackend:
+    """Buckets kept in process memory; shared by limiters using the same instance."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def reserve(
+        self, key: str, *, rate_per_second: float, capacity: float, now: float
+    ) -> float:
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens, updated_at, wait = _take(
+                tokens,
+                updated_at,
+                rate_per_second=rate_per_second,
+                capacity=capacity,
+                now=now,
+            )
+            self._buckets[key] = (tokens, updated_at)
+        return wait
+
+
+class FileRateLimitBackend:
+    """Buckets stored in a JSON file guarded by ``flock`` for processes on one host.
+
+    Every reservation opens the file, takes an exclusive lock, updates the
+    bucket and releases it, so forked workers never share a lock. Timestamps
+    come from the limiter clock, which must be comparable across processes
+    (``time.monotonic`` is system-wide on Linux and macOS). Timestamps ahead
+    of the current clock, e.g. left over from before a reboot, are treated as
+    "now" so the bucket resumes refilling.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        if fcntl is None:
+            raise RuntimeError("FileRateLimitBackend requires fcntl (POSIX only)")
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def reserve(
+        self, key: str, *, rate_per_second: float, capacity: float, now: float
+    ) -> float:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            buckets = self._read(fd)
+            tokens, updated_at = buckets.get(key, (capacity, now))
+            tokens, updated_at, wait = _take(
+                tokens,
+                updated_at,
+                rate_per_second=rate_per_second,
+                capacity=capacity,
+                now=now,
+            )
+            buckets[key] = (tokens, updated_at)
+            data = json.dumps(buckets, separators=(",", ":")).encode("utf-8")
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        return wait
+
+    @staticmethod
+    def _read(fd: int) -> dict[str, tuple[float, float]]:
+        chunks: list[bytes] = []
+        while chunk := os.read(fd, 65536):
+            chunks.append(chunk)
+        if not chunks:
+            return {}
+        try:
+            raw = json.loads(b"".join(chunks))
+        except ValueError:
+            return {}
+        buckets: dict[str, tuple[float, float]] = {}
+        if isinstance(raw, dict):
+            for name, value in raw.items():
+                if isinstance(value, list) and len(value) == 2:
+                    buckets[str(name)] = (float(value[0]), float(value[1]))
+        return buckets
 
 
 class RateLimiter:
-    """Simple monotonic-rate limiter supporting sync/async acquisition."""
+    """Token-bucket rate limiter supporting sync/async acquisition.
+
+    ``burst`` sets the bucket capacity (how many calls may go out back to
+    back after an idle period). Limiters built with the same ``backend`` and
+    ``key`` share one bucket, which is how several runners or processes stay
+    under a single ``rpm`` budget.
+    """
 
     def __init__(
         self,
         rpm: int,
         *,
+        burst: int = 1,
+        backend: RateLimitBackend | None = None,
+        key: str = DEFAULT_RATE_LIMIT_KEY,
         clock: Callable[[], float] | None = None,
         sleep: Callable[[float], None] | None = None,
         async_sleep: Callable[[float], Awaitable[None]] | None = None,
     ) -> None:
         if rpm <= 0:
             raise ValueError("rpm must be greater than zero")
+        if burst < 1:
+            raise ValueError("burst must be at least one")
         self._rate_per_second = float(rpm) / 60.0
+        self._capacity = float(burst)
+        self._backend: RateLimitBackend = backend or InMemoryRateLimitBackend()
+        self._key = key
         self._clock = clock or time.monotonic
         self._sleep = sleep or time.sleep
         self._async_sleep = async_sleep or asyncio.sleep
-        self._capacity = 1.0
-        self._tokens = self._capacity
-        self._updated_at = self._clock()
-        self._lock = threading.Lock()
-        self._async_lock = asyncio.Lock()
 
-    def _refill(self, now: float) -> None:
-        elapsed = now - self._updated_at
-        if elapsed > 0.0:
-            self._tokens = min(
-                self._capacity, self._tokens + elapsed * self._rate_per_second
-            )
-            self._updated_at = now
+    @property
+    def backend(self) -> RateLimitBackend:
+        return self._backend
 
     def _reserve(self, now: float) -> float:
-        self._refill(now)
-        if self._tokens >= 1.0:
-            self._tokens -= 1.0
-            return 0.0
-        deficit = 1.0 - self._tokens
-        wait = deficit / self._rate_per_second
-        self._tokens = 0.0
-        self._updated_at = now
-        return wait
+        return self._backend.reserve(
+            self._key,
+            rate_per_second=self._rate_per_second,
+            capacity=self._capacity,
+            now=now,
+        )
 
     def acquire(self) -> None:
         while True:
-            with self._lock:
-                wait = self._reserve(self._clock())
+            wait = self._reserve(self._clock())
             if wait <= 0.0:
                 return
             self._sleep(wait)
 
     async def acquire_async(self) -> None:
         while True:
-            async with self._async_lock:
-                wait = self._reserve(self._clock())
+            wait = self._reserve(self._clock())
             if wait <= 0.0:
                 return
             await self._async_sleep(wait)
@@ -69,14 +199,37 @@ class RateLimiter:
 def resolve_rate_limiter(
     rpm: int | None,
     *,
+    burst: int = 1,
+    backend: RateLimitBackend | None = None,
+    state_path: str | os.PathLike[str] | None = None,
+    key: str = DEFAULT_RATE_LIMIT_KEY,
     clock: Callable[[], float] | None = None,
     sleep: Callable[[float], None] | None = None,
     async_sleep: Callable[[float], Awaitable[None]] | None = None,
 ) -> RateLimiter | None:
     if rpm is None:
         return None
-    return RateLimiter(rpm, clock=clock, sleep=sleep, async_sleep=async_sleep)
-
+    if backend is None and state_path is not None:
+        backend = FileRateLimitBackend(state_path)
+    return RateLimiter(
+        rpm,
+        burst=burst,
+        backend=backend,
+        key=key,
+        clock=clock,
+        sleep=sleep,
+        async_sleep=async_sleep,
+    )
 
-__all__ = ["RateLimiter", "resolve_rate_limiter", "time", "asyncio", "threading"]
 
+__all__ = [
+    "DEFAULT_RATE_LIMIT_KEY",
+    "FileRateLimitBackend",
+    "InMemoryRateLimitBackend",
+    "RateLimitBackend",
+    "RateLimiter",
+    "resolve_rate_limiter",
+    "time",
+    "asyncio",
+    "threading",
+]
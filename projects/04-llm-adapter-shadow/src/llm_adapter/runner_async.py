@@ -60,8 +60,18 @@ class AsyncRunner:
         ]
         self._logger = logger
         self._config = config or RunnerConfig()
-        self._rate_limiter: RateLimiter | None = resolve_rate_limiter(self._config.rpm)
-        self._invoker = AsyncProviderInvoker(rate_limiter=self._rate_limiter)
+        self._rate_limiter: RateLimiter | None = resolve_rate_limiter(
+            self._config.rpm,
+            burst=self._config.rate_limit_burst,
+            backend=self._config.rate_limit_backend,
+            state_path=self._config.rate_limit_state_path,
+        )
+        self._invoker = AsyncProviderInvoker(
+            rate_limiter=self._rate_limiter,
+            shadow_sampler=self._config.shadow_sampler,
+            shadow_diff_worker=self._config.shadow_diff_worker,
+            traffic_capture=self._config.traffic_capture,
+        )
 
     async def run_async(
         self,
@@ -9,7 +9,8 @@ from ..errors import FatalError, ProviderSkip, RateLimitError, RetryableError, S
 from ..observability import EventLogger
 from ..provider_spi import AsyncProviderSPI, ProviderRequest, ProviderResponse, ProviderSPI
 from ..runner_shared import log_provider_call, log_provider_skipped, log_run_metric, RateLimiter
-from ..shadow import run_with_shadow_async, ShadowMetrics
+from ..shadow import run_with_shadow_async, ShadowDiffWorker, ShadowMetrics, ShadowSampler
+from ..traffic_capture import TrafficCapture
 from ..utils import elapsed_ms
 from .shadow_logging import build_shadow_log_metadata
 
@@ -17,8 +18,18 @@ from .shadow_logging import build_shadow_log_metadata
 class AsyncProviderInvoker:
     """Encapsulates provider invocation with logging and rate limiting."""
 
-    def __init__(self, *, rate_limiter: RateLimiter | None) -> None:
+    def __init__(
+        self,
+        *,
+        rate_limiter: RateLimiter | None,
+        shadow_sampler: ShadowSampler | None = None,
+        shadow_diff_worker: ShadowDiffWorker | None = None,
+        traffic_capture: TrafficCapture | None = None,
+    ) -> None:
         self._rate_limiter = rate_limiter
+        self._shadow_sampler = shadow_sampler
+        self._shadow_diff_worker = shadow_diff_worker
+        self._traffic_capture = traffic_capture
 
     async def invoke(
         self,
@@ -60,6 +71,8 @@ class AsyncProviderInvoker:
                     metrics_path=metrics_path,
                     logger=event_logger,
                     capture_metrics=True,
+                    sampler=self._shadow_sampler,
+                    diff_worker=self._shadow_diff_worker,
                 )
                 response, shadow_metrics = cast(
                     tuple[ProviderResponse, ShadowMetrics | None],
@@ -225,6 +238,10 @@ class AsyncProviderInvoker:
                 allow_private_model=True,
             )
             raise
+        if self._traffic_capture is not None:
+            self._traffic_capture.record(
+                provider, request, response, request_fingerprint=request_fingerprint
+            )
         token_usage = response.token_usage
         if shadow_log_metadata:
             enriched_metadata = dict(metadata)
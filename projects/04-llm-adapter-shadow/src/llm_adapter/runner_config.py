@@ -4,9 +4,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field, FrozenInstanceError
 from enum import Enum
+from pathlib import Path
 from typing import cast, TYPE_CHECKING
 
-from .shadow import DEFAULT_METRICS_PATH, MetricsPath
+from .rate_limiter import RateLimitBackend
+from .shadow import (
+    DEFAULT_METRICS_PATH,
+    MetricsPath,
+    ShadowDiffWorker,
+    ShadowExecutor,
+    ShadowSampler,
+)
+from .traffic_capture import TrafficCapture
 
 if TYPE_CHECKING:
     from .provider_spi import ProviderSPI
@@ -124,6 +133,14 @@ class RunnerConfig:
     consensus: ConsensusConfig | None = None
     shadow_provider: ProviderSPI | None = None
     metrics_path: MetricsPath = DEFAULT_METRICS_PATH
+    shadow_executor: ShadowExecutor | None = None
+    shadow_detach: bool = False
+    shadow_sampler: ShadowSampler | None = None
+    shadow_diff_worker: ShadowDiffWorker | None = None
+    traffic_capture: TrafficCapture | None = None
+    rate_limit_burst: int = 1
+    rate_limit_backend: RateLimitBackend | None = None
+    rate_limit_state_path: str | Path | None = None
 
     def __post_init__(self) -> None:
         if isinstance(self.mode, RunnerMode):
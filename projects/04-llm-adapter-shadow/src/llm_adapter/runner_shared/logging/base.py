@@ -4,7 +4,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from ...observability import EventLogger, JsonlLogger
+from ...observability import EventLogger, open_jsonl_logger
 from ...utils import content_hash
 
 if TYPE_CHECKING:
@@ -23,7 +23,7 @@ def resolve_event_logger(
         return None, None
     if logger is not None:
         return logger, metrics_path_str
-    return JsonlLogger(metrics_path_str), metrics_path_str
+    return open_jsonl_logger(metrics_path_str), metrics_path_str
 
 
 def _provider_name(provider: ProviderSPI | AsyncProviderSPI | None) -> str | None:
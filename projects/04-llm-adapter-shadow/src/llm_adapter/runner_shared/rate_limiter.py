@@ -3,6 +3,9 @@ from __future__ import annotations
 
 from .. import rate_limiter as _rate_limiter
 
+FileRateLimitBackend = _rate_limiter.FileRateLimitBackend
+InMemoryRateLimitBackend = _rate_limiter.InMemoryRateLimitBackend
+RateLimitBackend = _rate_limiter.RateLimitBackend
 RateLimiter = _rate_limiter.RateLimiter
 resolve_rate_limiter = _rate_limiter.resolve_rate_limiter
 asyncio = _rate_limiter.asyncio
@@ -10,6 +13,9 @@ threading = _rate_limiter.threading
 time = _rate_limiter.time
 
 __all__ = [
+    "FileRateLimitBackend",
+    "InMemoryRateLimitBackend",
+    "RateLimitBackend",
     "RateLimiter",
     "resolve_rate_limiter",
     "asyncio",
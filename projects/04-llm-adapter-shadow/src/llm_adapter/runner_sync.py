@@ -1,7 +1,8 @@
 """Synchronous runner implementation."""
 from __future__ import annotations
 
-from collections.abc import Collection, Mapping, Sequence
+from collections.abc import Mapping, Sequence
+from functools import partial
 import time
 from typing import cast
 
@@ -11,6 +12,7 @@ from .parallel_exec import (
     ParallelAllResult,
     run_parallel_all_sync,
     run_parallel_any_sync,
+    WorkerCompletion,
 )
 from .provider_spi import ProviderRequest, ProviderResponse, ProviderSPI
 from .runner_config import RunnerConfig, RunnerMode
@@ -26,6 +28,7 @@ from .runner_shared import (
 )
 from .runner_sync_invocation import (
     _DEFAULT_RUN_WITH_SHADOW,
+    _RunWithShadowCallable,
     CancelledResultsBuilder,
     ParallelResultLogger,
     ProviderInvocationResult,
@@ -36,7 +39,6 @@ from .shadow import DEFAULT_METRICS_PATH
 from .utils import content_hash, elapsed_ms
 
 _CANCELLED_RESULT_WAIT_S = 0.05
-_CANCELLED_RESULT_POLL_S = 0.001
 
 
 class Runner:
@@ -54,16 +56,39 @@ class Runner:
         self.providers: list[ProviderSPI] = list(providers)
         self._logger = logger
         self._config = config or RunnerConfig()
-        self._rate_limiter: RateLimiter | None = resolve_rate_limiter(self._config.rpm)
+        self._rate_limiter: RateLimiter | None = resolve_rate_limiter(
+            self._config.rpm,
+            burst=self._config.rate_limit_burst,
+            backend=self._config.rate_limit_backend,
+            state_path=self._config.rate_limit_state_path,
+        )
         self._time_fn = time.time
         self._elapsed_ms = elapsed_ms
+        run_with_shadow = _DEFAULT_RUN_WITH_SHADOW
+        if (
+            self._config.shadow_executor is not None
+            or self._config.shadow_detach
+            or self._config.shadow_sampler is not None
+            or self._config.shadow_diff_worker is not None
+        ):
+            run_with_shadow = cast(
+                _RunWithShadowCallable,
+                partial(
+                    _DEFAULT_RUN_WITH_SHADOW,
+                    executor=self._config.shadow_executor,
+                    detach=self._config.shadow_detach,
+                    sampler=self._config.shadow_sampler,
+                    diff_worker=self._config.shadow_diff_worker,
+                ),
+            )
         self._provider_invoker = ProviderInvoker(
             rate_limiter=self._rate_limiter,
-            run_with_shadow=_DEFAULT_RUN_WITH_SHADOW,
+            run_with_shadow=run_with_shadow,
             log_provider_call=log_provider_call,
             log_provider_skipped=log_provider_skipped,
             time_fn=self._time_fn,
             elapsed_ms=self._elapsed_ms,
+            traffic_capture=self._config.traffic_capture,
         )
         self._parallel_logger = ParallelResultLogger(
             log_provider_call=log_provider_call,
@@ -107,27 +132,19 @@ class Runner:
         cancelled_indices: Sequence[int],
         total_providers: int,
         run_started: float,
-        started_indices: Collection[int] | None = None,
+        completion: WorkerCompletion | None = None,
     ) -> None:
         if not cancelled_indices:
             return
-        started = set(started_indices or ())
-        pending = [
-            index
-            for index in cancelled_indices
-            if 0 <= index < len(results)
-            and index in started
-            and results[index] is None
-        ]
-        if pending:
-            deadline = self._time_fn() + _CANCELLED_RESULT_WAIT_S
-            while pending and self._time_fn() < deadline:
-                if all(results[index] is not None for index in pending):
-                    break
-                time.sleep(_CANCELLED_RESULT_POLL_S)
-                pending = [
-                    index for index in pending if results[index] is None
-                ]
+        if completion is not None:
+            completion.wait_for(
+                (
+                    index
+                    for index in cancelled_indices
+                    if 0 <= index < len(results) and results[index] is None
+                ),
+                timeout=_CANCELLED_RESULT_WAIT_S,
+            )
         builder = CancelledResultsBuilder(
             run_started=run_started,
             elapsed_ms=self._elapsed_ms,
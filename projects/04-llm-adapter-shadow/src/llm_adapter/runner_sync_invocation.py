@@ -16,7 +16,15 @@ from .runner_shared import (
     MetricsPath,
     RateLimiter,
 )
-from .shadow import DEFAULT_METRICS_PATH, run_with_shadow, ShadowMetrics
+from .shadow import (
+    DEFAULT_METRICS_PATH,
+    run_with_shadow,
+    ShadowDiffWorker,
+    ShadowExecutor,
+    ShadowMetrics,
+    ShadowSampler,
+)
+from .traffic_capture import TrafficCapture
 from .utils import elapsed_ms
 
 if TYPE_CHECKING:
@@ -37,6 +45,10 @@ class _RunWithShadowCallable(Protocol):
         *,
         logger: EventLogger | None = None,
         capture_metrics: Literal[True],
+        executor: ShadowExecutor | None = None,
+        detach: bool = False,
+        sampler: ShadowSampler | None = None,
+        diff_worker: ShadowDiffWorker | None = None,
     ) -> tuple[ProviderResponse, ShadowMetrics | None]: ...
 
     @overload
@@ -49,6 +61,10 @@ class _RunWithShadowCallable(Protocol):
         *,
         logger: EventLogger | None = None,
         capture_metrics: Literal[False] = False,
+        executor: ShadowExecutor | None = None,
+        detach: bool = False,
+        sampler: ShadowSampler | None = None,
+        diff_worker: ShadowDiffWorker | None = None,
     ) -> ProviderResponse: ...
 
     def __call__(
@@ -60,6 +76,10 @@ class _RunWithShadowCallable(Protocol):
         *,
         logger: EventLogger | None = None,
         capture_metrics: bool = False,
+        executor: ShadowExecutor | None = None,
+        detach: bool = False,
+        sampler: ShadowSampler | None = None,
+        diff_worker: ShadowDiffWorker | None = None,
     ) -> ProviderResponse | tuple[ProviderResponse, ShadowMetrics | None]: ...
 
 
@@ -93,8 +113,10 @@ class ProviderInvoker:
         log_provider_skipped: Callable[..., None] = log_provider_skipped,
         time_fn: Callable[[], float] = time.time,
         elapsed_ms: Callable[[float], int] = elapsed_ms,
+        traffic_capture: TrafficCapture | None = None,
     ) -> None:
         self._rate_limiter = rate_limiter
+        self._traffic_capture = traffic_capture
         self._run_with_shadow = run_with_shadow
         self._log_provider_call = log_provider_call
         self._log_provider_skipped = log_provider_skipped
@@ -167,6 +189,10 @@ class ProviderInvoker:
             usage = response.token_usage
             tokens_in = usage.prompt
             tokens_out = usage.completion
+            if self._traffic_capture is not None:
+                self._traffic_capture.record(
+                    provider, request, response, request_fingerprint=request_fingerprint
+                )
             if shadow_metrics is not None:
                 shadow_payload = dict(shadow_metrics.payload)
                 shadow_metadata = {
@@ -6,7 +6,7 @@ from typing import Protocol, TYPE_CHECKING
 
 from .errors import AllFailedError
 from .observability import EventLogger
-from .parallel_exec import ParallelExecutionError
+from .parallel_exec import ParallelExecutionError, WorkerCompletion
 from .provider_spi import ProviderResponse, ProviderSPI
 from .runner_shared import log_run_metric
 from .utils import elapsed_ms
@@ -99,26 +99,29 @@ class ParallelAnyStrategy:
         results: list[ProviderInvocationResult | None] = [None] * total_providers
         max_attempts = runner._config.max_attempts
         providers = _limited_providers(runner.providers, max_attempts)
-        started_indices: set[int] = set()
+        completion = WorkerCompletion()
 
         def make_worker(
             index: int, provider: ProviderSPI
         ) -> Callable[[], ProviderInvocationResult]:
             def worker() -> ProviderInvocationResult:
-                started_indices.add(index - 1)
-                result = runner._invoke_provider_sync(
-                    provider,
-                    context.request,
-                    attempt=index,
-                    total_providers=total_providers,
-                    event_logger=context.event_logger,
-                    request_fingerprint=context.request_fingerprint,
-                    metadata=context.metadata,
-                    shadow=context.shadow,
-                    metrics_path=context.metrics_path,
-                    capture_shadow_metrics=False,
-                )
-                results[index - 1] = result
+                completion.mark_started(index - 1)
+                try:
+                    result = runner._invoke_provider_sync(
+                        provider,
+                        context.request,
+                        attempt=index,
+                        total_providers=total_providers,
+                        event_logger=context.event_logger,
+                        request_fingerprint=context.request_fingerprint,
+                        metadata=context.metadata,
+                        shadow=context.shadow,
+                        metrics_path=context.metrics_path,
+                        capture_shadow_metrics=False,
+                    )
+                    results[index - 1] = result
+                finally:
+                    completion.mark_finished(index - 1)
                 if result.response is None:
                     error = result.error
                     if error is not None:
@@ -187,7 +190,7 @@ class ParallelAnyStrategy:
                     cancelled_indices=cancelled_slots,
                     total_providers=total_providers,
                     run_started=context.run_started,
-                    started_indices=started_indices,
+                    completion=completion,
                 )
             runner._log_parallel_results(
                 results,
@@ -2,28 +2,48 @@
 
 from __future__ import annotations
 
-import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import replace
+from functools import partial
 import time
 from typing import Any, Literal, overload
 
+from .metrics import emit_metrics_event
 from .observability import EventLogger
 from .provider_spi import ProviderRequest, ProviderResponse, ProviderSPI
 from .shadow_async import run_with_shadow_async
+from .shadow_diff import ShadowDiffWorker
+from .shadow_executor import default_shadow_executor, ShadowExecutor
 from .shadow_metrics import _to_path_str, MetricsPath, ShadowMetrics
+from .shadow_sampling import ShadowSampler
 from .shadow_shared import (
     _finalize_shadow_metrics,
     _make_shadow_payload,
     _make_timeout_payload,
+    _observe_primary,
+    _observe_shadow,
+    _sample_shadow,
     DEFAULT_METRICS_PATH,
 )
 
+_SHADOW_TIMEOUT_S = 10.0
+
+
+def _bounded_request(req: ProviderRequest) -> ProviderRequest:
+    if req.timeout_s is not None and req.timeout_s <= _SHADOW_TIMEOUT_S:
+        return req
+    return replace(req, timeout_s=_SHADOW_TIMEOUT_S)
+
 
 def _run_shadow_sync(
     shadow: ProviderSPI,
     req: ProviderRequest,
     *,
     provider_name: str | None,
+    sampler: ShadowSampler | None = None,
 ) -> dict[str, Any]:
+    # Bound the provider's own timeout so a stalled call releases its worker.
+    req = _bounded_request(req)
     ts0 = time.time()
     try:
         response = shadow.invoke(req)
@@ -33,6 +53,7 @@ def _run_shadow_sync(
             error=exc,
             duration_ms=int((time.time() - ts0) * 1000),
         )
+    _observe_shadow(sampler, shadow, response)
     return _make_shadow_payload(
         provider_name=provider_name,
         response=response,
@@ -49,6 +70,10 @@ def run_with_shadow(
     *,
     logger: EventLogger | None = None,
     capture_metrics: Literal[True],
+    executor: ShadowExecutor | None = None,
+    detach: bool = False,
+    sampler: ShadowSampler | None = None,
+    diff_worker: ShadowDiffWorker | None = None,
 ) -> tuple[ProviderResponse, ShadowMetrics | None]: ...
 
 
@@ -61,6 +86,10 @@ def run_with_shadow(
     *,
     logger: EventLogger | None = None,
     capture_metrics: Literal[False] = False,
+    executor: ShadowExecutor | None = None,
+    detach: bool = False,
+    sampler: ShadowSampler | None = None,
+    diff_worker: ShadowDiffWorker | None = None,
 ) -> ProviderResponse: ...
 
 
@@ -72,49 +101,103 @@ def run_with_shadow(
     *,
     logger: EventLogger | None = None,
     capture_metrics: bool = False,
+    executor: ShadowExecutor | None = None,
+    detach: bool = False,
+    sampler: ShadowSampler | None = None,
+    diff_worker: ShadowDiffWorker | None = None,
 ) -> ProviderResponse | tuple[ProviderResponse, ShadowMetrics | None]:
+    """Invoke ``primary`` while mirroring ``req`` to ``shadow``.
+
+    The shadow call runs on ``executor`` (the shared default pool when
+    omitted). If the pool's queue is saturated the shadow call is shed and no
+    ``shadow_diff`` is recorded. With ``detach=True`` the primary response is
+    returned without waiting for the shadow; the ``shadow_diff`` record is
+    emitted once the shadow call completes and no metrics are returned.
+    ``sampler`` decides per request fingerprint whether to mirror at all.
+    ``diff_worker`` adds a detailed text/JSON comparison to ``shadow_diff``;
+    it runs in the background and the record is written once it finishes.
+
+    The shadow call is issued with ``timeout_s`` capped at the shadow timeout.
+    A shadow call still queued when the timeout expires is cancelled. Python
+    cannot interrupt a running call, so a provider that ignores ``timeout_s``
+    keeps its pool worker after the timeout payload is recorded; each such
+    case is reported as a ``shadow_worker_stuck`` metrics event.
+    """
+
     if metrics_path is None:
         logger = None
+    if shadow is not None and not _sample_shadow(sampler, req):
+        shadow = None
 
-    shadow_thread: threading.Thread | None = None
-    shadow_payload: dict[str, Any] | None = None
+    shadow_future: Future[dict[str, Any]] | None = None
     shadow_name: str | None = None
     shadow_started: float | None = None
     metrics_path_str = _to_path_str(metrics_path)
 
-    payload_holder: list[dict[str, Any]] = []
     if shadow is not None:
         shadow_name = shadow.name()
         shadow_started = time.time()
-
-        def _shadow_worker() -> None:
-            payload_holder.append(
-                _run_shadow_sync(shadow, req, provider_name=shadow_name)
+        pool = executor if executor is not None else default_shadow_executor()
+        shadow_future = pool.submit(
+            partial(
+                _run_shadow_sync, shadow, req, provider_name=shadow_name, sampler=sampler
             )
-
-        shadow_thread = threading.Thread(target=_shadow_worker, daemon=True)
-        shadow_thread.start()
+        )
 
     try:
         primary_res = primary.invoke(req)
-    except Exception:
-        if shadow_thread is not None:
-            shadow_thread.join(timeout=0)
+    except Exception as exc:
+        _observe_primary(sampler, exc)
+        if shadow_future is not None:
+            shadow_future.cancel()
         raise
+    _observe_primary(sampler, None)
 
     metrics: ShadowMetrics | None = None
-    if shadow_thread is not None:
-        shadow_thread.join(timeout=10)
-        if shadow_thread.is_alive():
+    if shadow_future is not None and detach:
+        if metrics_path_str:
+            primary_name = primary.name()
+
+            def _emit_when_done(done: Future[dict[str, Any]]) -> None:
+                if done.cancelled() or done.exception() is not None:
+                    return
+                _finalize_shadow_metrics(
+                    metrics_path=metrics_path_str,
+                    capture_metrics=False,
+                    logger=logger,
+                    primary_provider_name=primary_name,
+                    primary_response=primary_res,
+                    request=req,
+                    shadow_payload=dict(done.result()),
+                    shadow_name=shadow_name,
+                    diff_worker=diff_worker,
+                )
+
+            shadow_future.add_done_callback(_emit_when_done)
+    elif shadow_future is not None:
+        shadow_payload: dict[str, Any]
+        try:
+            shadow_payload = dict(shadow_future.result(timeout=_SHADOW_TIMEOUT_S))
+        except FutureTimeoutError:
             duration_ms = (
                 int((time.time() - shadow_started) * 1000)
                 if shadow_started is not None
                 else None
             )
             shadow_payload = _make_timeout_payload(shadow_name, duration_ms)
-        elif payload_holder:
-            shadow_payload = dict(payload_holder[-1])
-        else:
+            # A job still waiting in the queue is dropped instead of running
+            # later against an already recorded timeout; only a job that
+            # actually started can be holding a worker.
+            if not shadow_future.cancel():
+                emit_metrics_event(
+                    "shadow_worker_stuck",
+                    {
+                        "provider": shadow_name,
+                        "timeout_s": _SHADOW_TIMEOUT_S,
+                        "duration_ms": duration_ms,
+                    },
+                )
+        except Exception:  # pragma: no cover - _run_shadow_sync captures errors
             shadow_payload = _make_shadow_payload(provider_name=shadow_name)
 
         metrics = _finalize_shadow_metrics(
@@ -126,6 +209,7 @@ def run_with_shadow(
             request=req,
             shadow_payload=shadow_payload,
             shadow_name=shadow_name,
+            diff_worker=diff_worker,
         )
 
     if capture_metrics:
@@ -138,5 +222,8 @@ __all__ = [
     "run_with_shadow_async",
     "DEFAULT_METRICS_PATH",
     "MetricsPath",
+    "ShadowDiffWorker",
+    "ShadowExecutor",
     "ShadowMetrics",
+    "ShadowSampler",
 ]
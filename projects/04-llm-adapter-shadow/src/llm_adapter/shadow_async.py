@@ -15,11 +15,16 @@ from .provider_spi import (
     ProviderResponse,
     ProviderSPI,
 )
+from .shadow_diff import ShadowDiffWorker
 from .shadow_metrics import _to_path_str, MetricsPath, ShadowMetrics
+from .shadow_sampling import ShadowSampler
 from .shadow_shared import (
     _finalize_shadow_metrics,
     _make_shadow_payload,
     _make_timeout_payload,
+    _observe_primary,
+    _observe_shadow,
+    _sample_shadow,
     DEFAULT_METRICS_PATH,
 )
 
@@ -29,6 +34,7 @@ async def _run_shadow_async(
     req: ProviderRequest,
     *,
     provider_name: str | None,
+    sampler: ShadowSampler | None = None,
 ) -> dict[str, Any]:
     ts0 = time.time()
     try:
@@ -39,6 +45,7 @@ async def _run_shadow_async(
             error=exc,
             duration_ms=int((time.time() - ts0) * 1000),
         )
+    _observe_shadow(sampler, shadow_async, response)
     return _make_shadow_payload(
         provider_name=provider_name,
         response=response,
@@ -54,7 +61,11 @@ async def run_with_shadow_async(
     *,
     logger: EventLogger | None = None,
     capture_metrics: bool = False,
+    sampler: ShadowSampler | None = None,
+    diff_worker: ShadowDiffWorker | None = None,
 ) -> ProviderResponse | tuple[ProviderResponse, ShadowMetrics | None]:
+    if shadow is not None and not _sample_shadow(sampler, req):
+        shadow = None
     primary_async = ensure_async_provider(primary)
     shadow_async = ensure_async_provider(shadow) if shadow is not None else None
 
@@ -76,18 +87,21 @@ async def run_with_shadow_async(
                 shadow_async,
                 req,
                 provider_name=shadow_name,
+                sampler=sampler,
             )
 
         shadow_task = asyncio.create_task(_shadow_worker())
 
     try:
         primary_res = await primary_async.invoke_async(req)
-    except Exception:
+    except Exception as exc:
+        _observe_primary(sampler, exc)
         if shadow_task is not None:
             shadow_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await shadow_task
         raise
+    _observe_primary(sampler, None)
 
     metrics: ShadowMetrics | None = None
     if shadow_task is not None:
@@ -118,6 +132,7 @@ async def run_with_shadow_async(
             request=req,
             shadow_payload=shadow_payload,
             shadow_name=shadow_name,
+            diff_worker=diff_worker,
         )
 
     if capture_metrics:
@@ -0,0 +1,258 @@
+"""Detailed shadow vs. primary output comparison run off the request path."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future
+from difflib import SequenceMatcher
+import json
+import threading
+import time
+from typing import Any
+import unicodedata
+
+from adapter.core.metrics.diff import compute_diff_rate
+
+from .shadow_executor import ShadowExecutor
+
+DEFAULT_DIFF_MAX_TOKENS = 400
+DEFAULT_DIFF_CPU_BUDGET = 0.25
+DEFAULT_DIFF_WINDOW_S = 10.0
+DEFAULT_JSON_DIFF_PATHS = 20
+
+_COST_DECAY = 0.9
+
+_MISSING = object()
+
+
+def normalize_text(text: str) -> str:
+    """Fold case, Unicode compatibility forms and whitespace runs."""
+
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def _load_json(text: str) -> object:
+    stripped = text.strip()
+    if not stripped or stripped[0] not in "{[":
+        return _MISSING
+    try:
+        return json.loads(stripped)
+    except ValueError:
+        return _MISSING
+
+
+def _flatten(value: object, path: str, out: dict[str, object]) -> None:
+    if isinstance(value, Mapping):
+        if not value:
+            out[path or "$"] = {}
+        for key, item in value.items():
+            _flatten(item, f"{path}.{key}" if path else f"$.{key}", out)
+    elif isinstance(value, list):
+        if not value:
+            out[path or "$"] = []
+        for index, item in enumerate(value):
+            _flatten(item, f"{path or '$'}[{index}]", out)
+    else:
+        out[path or "$"] = value
+
+
+def json_structural_diff(
+    primary: object, shadow: object, *, max_paths: int = DEFAULT_JSON_DIFF_PATHS
+) -> dict[str, Any]:
+    """Compare two decoded JSON documents leaf by leaf.
+
+    Paths are JSONPath-like (``$.items[0].name``). Each list is capped at
+    ``max_paths`` entries; the ``*_count`` fields hold the full totals.
+    """
+
+    left: dict[str, object] = {}
+    right: dict[str, object] = {}
+    _flatten(primary, "", left)
+    _flatten(shadow, "", right)
+    added = sorted(right.keys() - left.keys())
+    removed = sorted(left.keys() - right.keys())
+    changed = sorted(path for path in left.keys() & right.keys() if left[path] != right[path])
+    return {
+        "equal": not (added or removed or changed),
+        "added_count": len(added),
+        "removed_count": len(removed),
+        "changed_count": len(changed),
+        "added": added[:max_paths],
+        "removed": removed[:max_paths],
+        "changed": changed[:max_paths],
+    }
+
+
+def analyze_shadow_diff(
+    primary_text: str,
+    shadow_text: str,
+    *,
+    max_tokens: int = DEFAULT_DIFF_MAX_TOKENS,
+    max_json_paths: int = DEFAULT_JSON_DIFF_PATHS,
+) -> dict[str, Any]:
+    """Return ``shadow_diff`` fields describing how far ``shadow_text`` is from ``primary_text``.
+
+    ``normalized_diff_rate`` is the token edit distance rate (the same metric
+    as the compare reports) after :func:`normalize_text`, and ``similarity``
+    the linear-time :meth:`difflib.SequenceMatcher.quick_ratio` (bag-of-tokens
+    overlap) over the same tokens. Both sides are cut to ``max_tokens`` tokens
+    because the edit distance is quadratic pure Python; at the default cap one
+    comparison costs tens of milliseconds of CPU.
+    """
+
+    primary_tokens = normalize_text(primary_text).split()
+    shadow_tokens = normalize_text(shadow_text).split()
+    truncated = len(primary_tokens) > max_tokens or len(shadow_tokens) > max_tokens
+    primary_tokens = primary_tokens[:max_tokens]
+    shadow_tokens = shadow_tokens[:max_tokens]
+    result: dict[str, Any] = {
+        "normalized_match": primary_tokens == shadow_tokens and not truncated,
+        "normalized_diff_rate": round(
+            compute_diff_rate(" ".join(primary_tokens), " ".join(shadow_tokens)), 6
+        ),
+        "similarity": round(
+            SequenceMatcher(None, primary_tokens, shadow_tokens, autojunk=False).quick_ratio(),
+            6,
+        ),
+        "diff_truncated": truncated,
+    }
+    primary_json = _load_json(primary_text)
+    shadow_json = _load_json(shadow_text)
+    if primary_json is not _MISSING and shadow_json is not _MISSING:
+        result["json_diff"] = json_structural_diff(
+            primary_json, shadow_json, max_paths=max_json_paths
+        )
+    return result
+
+
+class ShadowDiffWorker:
+    """Compute :func:`analyze_shadow_diff` on background threads within a CPU budget.
+
+    ``cpu_budget`` is the share of one core the analysis may use, averaged
+    over ``window_s`` seconds. Each comparison's cost is projected from the
+    CPU time per token pair measured so far; when the projection would not
+    fit in what is left of the window's budget, the comparison resolves
+    immediately to ``{"diff_analysis": "skipped_budget"}`` until older
+    samples age out. With nothing spent in the window one comparison is
+    always allowed, so a budget below a single comparison does not starve.
+    Submissions beyond ``max_queue`` are shed and :meth:`submit` returns
+    ``None``.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 1,
+        max_queue: int = 256,
+        cpu_budget: float = DEFAULT_DIFF_CPU_BUDGET,
+        window_s: float = DEFAULT_DIFF_WINDOW_S,
+        max_tokens: int = DEFAULT_DIFF_MAX_TOKENS,
+        max_json_paths: int = DEFAULT_JSON_DIFF_PATHS,
+        clock: Callable[[], float] = time.monotonic,
+        cpu_clock: Callable[[], float] = time.thread_time,
+    ) -> None:
+        if cpu_budget <= 0:
+            raise ValueError("cpu_budget must be positive")
+        if window_s <= 0:
+            raise ValueError("window_s must be positive")
+        self._executor = ShadowExecutor(
+            max_workers, max_queue, name="llm-adapter-shadow-diff"
+        )
+        self._budget_s = cpu_budget * window_s
+        self._window_s = window_s
+        self._max_tokens = max_tokens
+        self._max_json_paths = max_json_paths
+        self._clock = clock
+        self._cpu_clock = cpu_clock
+        self._lock = threading.Lock()
+        self._spent: deque[tuple[float, float]] = deque()
+        self._spent_total = 0.0
+        # CPU seconds reserved by analyses still running
+        self._pending = 0.0
+        # decayed totals of measured CPU seconds and token pairs, for projection
+        self._cpu_seen = 0.0
+        self._pairs_seen = 0.0
+        self._skipped = 0
+
+    @property
+    def skipped(self) -> int:
+        with self._lock:
+            return self._skipped
+
+    def cpu_spent(self) -> float:
+        """CPU seconds used by analyses that finished within the current window."""
+
+        with self._lock:
+            self._expire(self._clock())
+            return self._spent_total
+
+    def submit(self, primary_text: str, shadow_text: str) -> Future[dict[str, Any]] | None:
+        return self._executor.submit(lambda: self._analyze(primary_text, shadow_text))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait)
+
+    def _analyze(self, primary_text: str, shadow_text: str) -> dict[str, Any]:
+        pairs = self._token_pairs(primary_text, shadow_text)
+        with self._lock:
+            self._expire(self._clock())
+            committed = self._spent_total + self._pending
+            projected = (
+                self._cpu_seen / self._pairs_seen * pairs if self._pairs_seen else 0.0
+            )
+            if committed > 0.0 and committed + projected > self._budget_s:
+                self._skipped += 1
+                return {"diff_analysis": "skipped_budget"}
+            self._pending += projected
+        started = self._cpu_clock()
+        try:
+            result = analyze_shadow_diff(
+                primary_text,
+                shadow_text,
+                max_tokens=self._max_tokens,
+                max_json_paths=self._max_json_paths,
+            )
+        finally:
+            cpu_s = self._cpu_clock() - started
+            with self._lock:
+                self._pending = max(self._pending - projected, 0.0)
+                self._spent.append((self._clock(), cpu_s))
+                self._spent_total += cpu_s
+                self._cpu_seen = self._cpu_seen * _COST_DECAY + cpu_s
+                self._pairs_seen = self._pairs_seen * _COST_DECAY + pairs
+        result["diff_analysis"] = "ok"
+        result["diff_cpu_ms"] = round(cpu_s * 1000.0, 3)
+        return result
+
+    def _token_pairs(self, primary_text: str, shadow_text: str) -> int:
+        primary = min(len(primary_text.split()), self._max_tokens)
+        shadow = min(len(shadow_text.split()), self._max_tokens)
+        return max(primary * shadow, 1)
+
+    def _expire(self, now: float) -> None:
+        horizon = now - self._window_s
+        spent = self._spent
+        while spent and spent[0][0] <= horizon:
+            self._spent_total -= spent.popleft()[1]
+        if not spent:
+            self._spent_total = 0.0
+
+
+def diff_fields(future: Future[dict[str, Any]]) -> dict[str, Any]:
+    """Fields to merge into ``shadow_diff`` once ``future`` has resolved."""
+
+    if future.cancelled() or future.exception() is not None:
+        return {"diff_analysis": "error"}
+    return dict(future.result())
+
+
+__all__ = [
+    "DEFAULT_DIFF_CPU_BUDGET",
+    "DEFAULT_DIFF_MAX_TOKENS",
+    "ShadowDiffWorker",
+    "analyze_shadow_diff",
+    "diff_fields",
+    "json_structural_diff",
+    "normalize_text",
+]
@@ -0,0 +1,200 @@
+"""Bounded worker pool for shadow provider calls."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+import random
+import threading
+from typing import Any, Literal, TypeVar
+
+from .metrics import emit_metrics_event
+
+T = TypeVar("T")
+
+ShedPolicy = Literal["drop", "sample"]
+
+DEFAULT_SHADOW_WORKERS = 4
+DEFAULT_SHADOW_QUEUE_SIZE = 64
+
+
+@dataclass(frozen=True, slots=True)
+class ShadowExecutorStats:
+    """Point-in-time counters for a :class:`ShadowExecutor`."""
+
+    workers: int
+    max_queue: int
+    queue_depth: int
+    in_flight: int
+    submitted: int
+    completed: int
+    shed: int
+
+
+class ShadowExecutor:
+    """Run shadow calls on a fixed set of daemon threads with a bounded queue.
+
+    ``submit`` never blocks the caller. When the queue is full the job is
+    shed and ``None`` is returned. With ``shed_policy="sample"`` jobs are
+    additionally admitted with a probability that falls linearly from 1 to 0
+    once the queue is more than half full, so shadow coverage degrades
+    gradually instead of flipping between all and nothing.
+
+    Every admission decision is reported to the registered metrics exporters
+    as a ``shadow_queue`` event.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_SHADOW_WORKERS,
+        max_queue: int = DEFAULT_SHADOW_QUEUE_SIZE,
+        *,
+        shed_policy: ShedPolicy = "drop",
+        name: str = "llm-adapter-shadow",
+        rng: random.Random | None = None,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if max_queue < 1:
+            raise ValueError("max_queue must be >= 1")
+        if shed_policy not in ("drop", "sample"):
+            raise ValueError(f"unknown shed_policy: {shed_policy!r}")
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        self._shed_policy = shed_policy
+        self._name = name
+        self._rng = rng or random.Random()
+        self._queue: deque[tuple[Future[Any], Callable[[], Any]]] = deque()
+        self._cond = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._idle = 0
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._shed = 0
+        self._shutdown = False
+
+    def submit(self, fn: Callable[[], T]) -> Future[T] | None:
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("ShadowExecutor is shut down")
+            depth = len(self._queue)
+            admitted = self._admit(depth)
+            future: Future[T] | None = None
+            if admitted:
+                future = Future()
+                self._queue.append((future, fn))
+                self._submitted += 1
+                depth += 1
+                if self._idle:
+                    self._cond.notify()
+                elif len(self._threads) < self._max_workers:
+                    self._spawn_worker()
+            else:
+                self._shed += 1
+            shed_total = self._shed
+        emit_metrics_event(
+            "shadow_queue",
+            {
+                "executor": self._name,
+                "shed": not admitted,
+                "queue_depth": depth,
+                "max_queue": self._max_queue,
+                "shed_total": shed_total,
+            },
+        )
+        return future
+
+    def stats(self) -> ShadowExecutorStats:
+        with self._cond:
+            return ShadowExecutorStats(
+                workers=len(self._threads),
+                max_queue=self._max_queue,
+                queue_depth=len(self._queue),
+                in_flight=self._in_flight,
+                submitted=self._submitted,
+                completed=self._completed,
+                shed=self._shed,
+            )
+
+    def shutdown(self, wait: bool = True, *, cancel_pending: bool = False) -> None:
+        with self._cond:
+            self._shutdown = True
+            if cancel_pending:
+                while self._queue:
+                    future, _ = self._queue.popleft()
+                    future.cancel()
+            self._cond.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _admit(self, depth: int) -> bool:
+        if depth >= self._max_queue:
+            return False
+        if self._shed_policy == "sample":
+            threshold = self._max_queue / 2
+            if depth > threshold:
+                headroom = (self._max_queue - depth) / (self._max_queue - threshold)
+                return self._rng.random() < headroom
+        return True
+
+    def _spawn_worker(self) -> None:
+        thread = threading.Thread(
+            target=self._worker,
+            name=f"{self._name}-{len(self._threads)}",
+            daemon=True,
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._shutdown:
+                    self._idle += 1
+                    self._cond.wait()
+                    self._idle -= 1
+                if not self._queue:
+                    return
+                future, fn = self._queue.popleft()
+                self._in_flight += 1
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        result = fn()
+                    except BaseException as exc:  # noqa: BLE001 - surfaced via future
+                        future.set_exception(exc)
+                    else:
+                        future.set_result(result)
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._completed += 1
+
+
+_DEFAULT_EXECUTOR: ShadowExecutor | None = None
+_DEFAULT_EXECUTOR_LOCK = threading.Lock()
+
+
+def default_shadow_executor() -> ShadowExecutor:
+    """Return the process-wide executor used when none is passed explicitly."""
+
+    global _DEFAULT_EXECUTOR
+    with _DEFAULT_EXECUTOR_LOCK:
+        if _DEFAULT_EXECUTOR is None:
+            _DEFAULT_EXECUTOR = ShadowExecutor()
+        return _DEFAULT_EXECUTOR
+
+
+__all__ = [
+    "DEFAULT_SHADOW_QUEUE_SIZE",
+    "DEFAULT_SHADOW_WORKERS",
+    "ShadowExecutor",
+    "ShadowExecutorStats",
+    "ShedPolicy",
+    "default_shadow_executor",
+]
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
+from concurrent.futures import Future
 from dataclasses import dataclass
 from pathlib import Path
 import time
 from typing import Any
 
-from .observability import EventLogger, JsonlLogger
+from .observability import EventLogger, open_jsonl_logger
 from .provider_spi import ProviderRequest, ProviderResponse
+from .shadow_diff import diff_fields
+from .shadow_sampling import request_fingerprint
 from .utils import content_hash
 
 MetricsPath = str | Path | None
@@ -15,8 +18,16 @@ MetricsPath = str | Path | None
 
 @dataclass(slots=True)
 class ShadowMetrics:
+    """A ``shadow_diff`` record waiting to be emitted.
+
+    When ``pending`` holds a detailed diff still being computed, :meth:`emit`
+    returns immediately and the record is written with those fields merged in
+    once the analysis resolves.
+    """
+
     payload: dict[str, Any]
     logger: EventLogger | None
+    pending: Future[dict[str, Any]] | None = None
 
     def extend(self, extra: Mapping[str, Any] | None = None) -> None:
         if extra:
@@ -25,17 +36,32 @@ class ShadowMetrics:
     def emit(self, extra: Mapping[str, Any] | None = None) -> None:
         if extra:
             self.extend(extra)
-        if self.logger is None:
+        logger = self.logger
+        if logger is None:
             return
         payload = dict(self.payload)
         payload.setdefault("ts", int(time.time() * 1000))
-        self.logger.emit("shadow_diff", payload)
+        if self.pending is None:
+            logger.emit("shadow_diff", payload)
+            return
+
+        def _emit_with_diff(done: Future[dict[str, Any]]) -> None:
+            payload.update(diff_fields(done))
+            logger.emit("shadow_diff", payload)
+
+        self.pending.add_done_callback(_emit_with_diff)
 
 
 def _to_path_str(path: MetricsPath) -> str | None:
     return None if path is None else str(Path(path))
 
 
+def _request_fingerprint(request: ProviderRequest) -> str:
+    return request_fingerprint(
+        request.prompt_text, options=request.options, max_tokens=request.max_tokens
+    )
+
+
 def _resolve_shadow_outcome(payload: Mapping[str, Any]) -> str | None:
     outcome = payload.get("outcome")
     if isinstance(outcome, str):
@@ -65,7 +91,7 @@ def _build_shadow_record(
         "outcome": "error",
     }
     request_inputs = (request.prompt_text, request.options, request.max_tokens)
-    request_fingerprint = content_hash("runner", *request_inputs)
+    request_fingerprint = _request_fingerprint(request)
     shadow_provider = payload.get("provider", shadow_name)
     shadow_outcome = _resolve_shadow_outcome(payload)
     diff_kind = "unknown"
@@ -122,12 +148,15 @@ def _emit_shadow_metrics(
     logger: EventLogger | None,
     metrics_path: str | None,
     capture_metrics: bool,
+    pending: Future[dict[str, Any]] | None = None,
 ) -> ShadowMetrics | None:
-    event_logger = logger or (JsonlLogger(metrics_path) if metrics_path is not None else None)
+    event_logger = logger or (
+        open_jsonl_logger(metrics_path) if metrics_path is not None else None
+    )
     if capture_metrics:
-        return ShadowMetrics(dict(record), event_logger)
+        return ShadowMetrics(dict(record), event_logger, pending)
     if event_logger is not None:
-        ShadowMetrics(dict(record), event_logger).emit()
+        ShadowMetrics(dict(record), event_logger, pending).emit()
     return None
 
 
@@ -136,6 +165,7 @@ __all__ = [
     "ShadowMetrics",
     "_build_shadow_record",
     "_emit_shadow_metrics",
+    "_request_fingerprint",
     "_resolve_shadow_outcome",
     "_to_path_str",
 ]
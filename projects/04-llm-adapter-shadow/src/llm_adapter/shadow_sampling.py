@@ -0,0 +1,17 @@
+"""Shadow traffic sampling (shared with the core adapter)."""
+
+from __future__ import annotations
+
+from adapter.core.shadow_sampling import (
+    AdaptiveShadowSampler,
+    request_fingerprint,
+    sampling_point,
+    ShadowSampler,
+)
+
+__all__ = [
+    "AdaptiveShadowSampler",
+    "ShadowSampler",
+    "request_fingerprint",
+    "sampling_point",
+]
@@ -2,13 +2,41 @@ from __future__ import annotations
 
 from typing import Any
 
+from .errors import RateLimitError
 from .observability import EventLogger
 from .provider_spi import ProviderRequest, ProviderResponse
-from .shadow_metrics import _build_shadow_record, _emit_shadow_metrics, ShadowMetrics
+from .runner_shared.costs import estimate_cost
+from .shadow_diff import ShadowDiffWorker
+from .shadow_metrics import (
+    _build_shadow_record,
+    _emit_shadow_metrics,
+    _request_fingerprint,
+    ShadowMetrics,
+)
+from .shadow_sampling import ShadowSampler
 
 DEFAULT_METRICS_PATH = "artifacts/runs-metrics.jsonl"
 
 
+def _sample_shadow(
+    sampler: ShadowSampler | None, request: ProviderRequest
+) -> bool:
+    return sampler is None or sampler.should_shadow(_request_fingerprint(request))
+
+
+def _observe_primary(sampler: ShadowSampler | None, error: Exception | None) -> None:
+    if sampler is not None:
+        sampler.observe_primary(rate_limited=isinstance(error, RateLimitError))
+
+
+def _observe_shadow(
+    sampler: ShadowSampler | None, shadow: object, response: ProviderResponse
+) -> None:
+    if sampler is not None:
+        usage = response.token_usage
+        sampler.observe_shadow(estimate_cost(shadow, usage.prompt, usage.completion))
+
+
 def _make_shadow_payload(
     *,
     provider_name: str | None,
@@ -22,6 +50,7 @@ def _make_shadow_payload(
             {
                 "ok": True,
                 "latency_ms": response.latency_ms,
+                "text": response.text,
                 "text_len": len(response.text),
                 "token_usage_total": response.token_usage.total,
                 "outcome": "success",
@@ -61,6 +90,7 @@ def _finalize_shadow_metrics(
     request: ProviderRequest,
     shadow_payload: dict[str, Any] | None,
     shadow_name: str | None,
+    diff_worker: ShadowDiffWorker | None = None,
 ) -> ShadowMetrics | None:
     if not metrics_path:
         return None
@@ -71,11 +101,18 @@ def _finalize_shadow_metrics(
         shadow_payload=shadow_payload,
         shadow_name=shadow_name,
     )
+    pending = None
+    shadow_text = shadow_payload.get("text") if shadow_payload else None
+    if diff_worker is not None and isinstance(shadow_text, str):
+        pending = diff_worker.submit(primary_response.text, shadow_text)
+        if pending is None:
+            record["diff_analysis"] = "shed"
     return _emit_shadow_metrics(
         record,
         logger=logger,
         metrics_path=metrics_path,
         capture_metrics=capture_metrics,
+        pending=pending,
     )
 
 
@@ -84,4 +121,7 @@ __all__ = [
     "_make_shadow_payload",
     "_make_timeout_payload",
     "_finalize_shadow_metrics",
+    "_observe_primary",
+    "_observe_shadow",
+    "_sample_shadow",
 ]
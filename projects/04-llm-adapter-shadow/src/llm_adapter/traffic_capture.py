@@ -0,0 +1,272 @@
+"""Capture primary traffic and replay it against candidate providers offline."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+from .metrics import emit_metrics_event
+from .observability import EventLogger, open_jsonl_logger
+from .provider_spi import (
+    AsyncProviderSPI,
+    ProviderRequest,
+    ProviderResponse,
+    ProviderSPI,
+    TokenUsage,
+)
+from .rate_limiter import RateLimiter
+from .shadow import _run_shadow_sync
+from .shadow_diff import ShadowDiffWorker
+from .shadow_metrics import _to_path_str, MetricsPath
+from .shadow_shared import _finalize_shadow_metrics
+from .utils import content_hash
+
+TRAFFIC_EVENT = "traffic_capture"
+REPLAY_ERROR_EVENT = "replay_error"
+DEFAULT_REPLAY_CONCURRENCY = 4
+
+
+def _jsonable(value: Any) -> Any:
+    return json.loads(json.dumps(value, ensure_ascii=False, default=str))
+
+
+class TrafficCapture:
+    """Append one ``traffic_capture`` line per successful primary provider call.
+
+    Each line holds the request fingerprint, the full :class:`ProviderRequest`
+    and a summary of the primary response (latency, token usage and, unless
+    ``store_text`` is false, the text needed to diff a replay against it).
+    The file is written through :func:`open_jsonl_logger`, so it follows the
+    buffered logging mode like the metrics files.
+    """
+
+    def __init__(self, path: str | Path, *, store_text: bool = True) -> None:
+        self.path = Path(path)
+        self._store_text = store_text
+        self._logger: EventLogger = open_jsonl_logger(self.path)
+
+    def record(
+        self,
+        provider: ProviderSPI | AsyncProviderSPI,
+        request: ProviderRequest,
+        response: ProviderResponse,
+        *,
+        request_fingerprint: str,
+    ) -> None:
+        usage = response.token_usage
+        primary: dict[str, Any] = {
+            "latency_ms": response.latency_ms,
+            "model": response.model,
+            "finish_reason": response.finish_reason,
+            "text_len": len(response.text),
+            "text_hash": content_hash("text", response.text),
+            "token_usage": {"prompt": usage.prompt, "completion": usage.completion},
+        }
+        if self._store_text:
+            primary["text"] = response.text
+        self._logger.emit(
+            TRAFFIC_EVENT,
+            {
+                "ts": int(time.time() * 1000),
+                "request_fingerprint": request_fingerprint,
+                "provider": provider.name(),
+                "request": {
+                    "model": request.model,
+                    "prompt": request.prompt,
+                    "messages": _jsonable(list(request.messages or [])),
+                    "max_tokens": request.max_tokens,
+                    "temperature": request.temperature,
+                    "top_p": request.top_p,
+                    "stop": list(request.stop) if request.stop else None,
+                    "timeout_s": request.timeout_s,
+                    "metadata": _jsonable(dict(request.metadata or {})),
+                    "options": _jsonable(dict(request.options or {})),
+                },
+                "primary": primary,
+            },
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CapturedRequest:
+    """One captured primary call, rebuilt for replay."""
+
+    ts: int | None
+    request_fingerprint: str
+    provider: str
+    request: ProviderRequest
+    response: ProviderResponse
+
+
+def _captured_from_record(record: Mapping[str, Any]) -> CapturedRequest:
+    request_data = dict(record["request"])
+    stop = request_data.get("stop")
+    request = ProviderRequest(
+        model=request_data["model"],
+        prompt=request_data.get("prompt") or "",
+        messages=request_data.get("messages") or None,
+        max_tokens=request_data.get("max_tokens"),
+        temperature=request_data.get("temperature"),
+        top_p=request_data.get("top_p"),
+        stop=tuple(stop) if stop else None,
+        timeout_s=request_data.get("timeout_s"),
+        metadata=request_data.get("metadata") or None,
+        options=request_data.get("options") or None,
+    )
+    primary = dict(record["primary"])
+    usage = primary.get("token_usage") or {}
+    response = ProviderResponse(
+        text=primary.get("text") or "",
+        latency_ms=int(primary.get("latency_ms") or 0),
+        token_usage=TokenUsage(
+            prompt=int(usage.get("prompt") or 0),
+            completion=int(usage.get("completion") or 0),
+        ),
+        model=primary.get("model"),
+        finish_reason=primary.get("finish_reason"),
+    )
+    return CapturedRequest(
+        ts=record.get("ts"),
+        request_fingerprint=str(record["request_fingerprint"]),
+        provider=str(record["provider"]),
+        request=request,
+        response=response,
+    )
+
+
+def read_traffic(path: str | Path, *, limit: int | None = None) -> Iterator[CapturedRequest]:
+    """Yield captured requests from ``path`` in file order.
+
+    Lines that are not ``traffic_capture`` events or fail to parse (for
+    example a torn last line) are skipped.
+    """
+
+    yielded = 0
+    with Path(path).open(encoding="utf-8") as handle:
+        for line in handle:
+            if limit is not None and yielded >= limit:
+                return
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, Mapping) or record.get("event") != TRAFFIC_EVENT:
+                    continue
+                captured = _captured_from_record(record)
+            except (KeyError, TypeError, ValueError):
+                continue
+            yielded += 1
+            yield captured
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayStats:
+    """Totals for one :func:`replay_traffic` run."""
+
+    requests: int
+    calls: int
+    failures: int
+    elapsed_s: float
+
+
+def replay_traffic(
+    traffic: Iterable[CapturedRequest],
+    candidates: Sequence[ProviderSPI],
+    metrics_path: MetricsPath,
+    *,
+    rpm: int | None = None,
+    concurrency: int = DEFAULT_REPLAY_CONCURRENCY,
+    logger: EventLogger | None = None,
+    diff_worker: ShadowDiffWorker | None = None,
+) -> ReplayStats:
+    """Re-issue captured requests to ``candidates`` and record ``shadow_diff`` events.
+
+    Each candidate call is treated as the shadow of the captured primary
+    response, so the records match what live shadowing would have written.
+    ``rpm`` caps candidate calls per minute across all candidates and
+    ``concurrency`` bounds the calls in flight. A call that raises (for
+    example while recording its diff) counts as a failure and is reported as
+    a ``replay_error`` event to ``logger`` and the metrics exporters.
+    """
+
+    if not candidates:
+        raise ValueError("at least one candidate provider is required")
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    metrics_path_str = _to_path_str(metrics_path)
+    limiter = RateLimiter(rpm, burst=concurrency) if rpm is not None else None
+    slots = threading.BoundedSemaphore(concurrency)
+    lock = threading.Lock()
+    counts = {"requests": 0, "calls": 0, "failures": 0}
+    started = time.perf_counter()
+
+    def _replay_one(captured: CapturedRequest, candidate: ProviderSPI) -> None:
+        shadow_name: str | None = None
+        try:
+            shadow_name = candidate.name()
+            payload = _run_shadow_sync(candidate, captured.request, provider_name=shadow_name)
+            _finalize_shadow_metrics(
+                metrics_path=metrics_path_str,
+                capture_metrics=False,
+                logger=logger,
+                primary_provider_name=captured.provider,
+                primary_response=captured.response,
+                request=captured.request,
+                shadow_payload=payload,
+                shadow_name=shadow_name,
+                diff_worker=diff_worker,
+            )
+            with lock:
+                counts["calls"] += 1
+                if payload.get("ok") is not True:
+                    counts["failures"] += 1
+        except Exception as exc:
+            with lock:
+                counts["calls"] += 1
+                counts["failures"] += 1
+            record = {
+                "provider": shadow_name,
+                "primary_provider": captured.provider,
+                "error": type(exc).__name__,
+                "message": str(exc),
+            }
+            if logger is not None:
+                logger.emit(REPLAY_ERROR_EVENT, record)
+            emit_metrics_event(REPLAY_ERROR_EVENT, record)
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llm-adapter-replay") as pool:
+        for captured in traffic:
+            with lock:
+                counts["requests"] += 1
+            for candidate in candidates:
+                if limiter is not None:
+                    limiter.acquire()
+                slots.acquire()
+                pool.submit(_replay_one, captured, candidate)
+    return ReplayStats(
+        requests=counts["requests"],
+        calls=counts["calls"],
+        failures=counts["failures"],
+        elapsed_s=time.perf_counter() - started,
+    )
+
+
+__all__ = [
+    "CapturedRequest",
+    "DEFAULT_REPLAY_CONCURRENCY",
+    "REPLAY_ERROR_EVENT",
+    "ReplayStats",
+    "TRAFFIC_EVENT",
+    "TrafficCapture",
+    "read_traffic",
+    "replay_traffic",
+]
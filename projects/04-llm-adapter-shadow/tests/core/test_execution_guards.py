@@ -16,7 +16,8 @@ GUARDS_PATH = ADAPTER_PATH / "adapter" / "core" / "execution" / "guards.py"
 
 
 def _import_guards_without_jsonschema(monkeypatch: pytest.MonkeyPatch) -> ModuleType:
-    module_name = "_guards_missing_jsonschema"
+    module_name = "adapter.core.execution._guards_missing_jsonschema"
+    monkeypatch.syspath_prepend(str(ADAPTER_PATH))
     sys.modules.pop(module_name, None)
     sys.modules.pop("jsonschema", None)
 
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from llm_adapter.errors import RateLimitError, TimeoutError
+from llm_adapter.provider_spi import ProviderRequest
+from llm_adapter.providers.factory import create_provider_from_spec
+from llm_adapter.providers.loadgen import (
+    Constant,
+    LoadGenProvider,
+    LoadProfile,
+    LogNormal,
+    Pareto,
+    Uniform,
+)
+
+
+def _outcomes(provider: LoadGenProvider, prompts: list[str]) -> list[tuple[str, int, int]]:
+    outcomes: list[tuple[str, int, int]] = []
+    for prompt in prompts:
+        try:
+            response = provider.invoke(ProviderRequest(model="m", prompt=prompt))
+        except (RateLimitError, TimeoutError) as exc:
+            outcomes.append((type(exc).__name__, 0, 0))
+        else:
+            outcomes.append(("ok", response.latency_ms, response.token_usage.completion))
+    return outcomes
+
+
+def test_seeded_provider_is_deterministic_and_follows_distributions() -> None:
+    profile = LoadProfile(
+        latency_ms=Pareto(50.0, alpha=2.0, cap=5000.0),
+        completion_tokens=LogNormal(64.0, 0.5),
+        error_rates={"timeout": 0.1},
+        time_scale=0.0,
+    )
+    prompts = [f"prompt {index % 50}" for index in range(2000)]
+
+    first = _outcomes(LoadGenProvider("lg", profile, seed=7), prompts)
+    second = _outcomes(LoadGenProvider("lg", profile, seed=7), prompts)
+    other = _outcomes(LoadGenProvider("lg", profile, seed=8), prompts)
+
+    assert first == second
+    assert first != other
+    ok = [outcome for outcome in first if outcome[0] == "ok"]
+    timeouts = len(first) - len(ok)
+    assert 120 < timeouts < 280
+    assert min(latency for _, latency, _ in ok) >= 50
+    assert max(latency for _, latency, _ in ok) <= 5000
+    tokens = sorted(completion for _, _, completion in ok)
+    assert 50 < tokens[len(tokens) // 2] < 80
+
+    spec_provider = create_provider_from_spec("loadgen:demo")
+    assert isinstance(spec_provider, LoadGenProvider)
+
+
+def test_seeded_occurrence_tracking_is_bounded() -> None:
+    profile = LoadProfile(latency_ms=Uniform(1.0, 1000.0), time_scale=0.0)
+    provider = LoadGenProvider("lg", profile, seed=3, max_tracked_prompts=2)
+    unbounded = LoadGenProvider("lg", profile, seed=3)
+
+    assert _outcomes(provider, ["a", "b", "a"]) == _outcomes(unbounded, ["a", "b", "a"])
+    first_a = _outcomes(LoadGenProvider("lg", profile, seed=3), ["a"])
+    assert _outcomes(provider, [f"prompt {index}" for index in range(100)] + ["a"])[-1:] == first_a
+    assert len(provider._occurrences) == 2
+
+    with pytest.raises(ValueError):
+        LoadGenProvider("lg", max_tracked_prompts=0)
+
+
+def test_rate_limit_errors_arrive_in_bursts() -> None:
+    profile = LoadProfile(
+        latency_ms=Constant(1.0),
+        error_rates={"rate_limit": 0.02},
+        rate_limit_burst=5,
+        time_scale=0.0,
+    )
+    provider = LoadGenProvider("lg", profile, seed=1)
+
+    outcomes = [outcome[0] for outcome in _outcomes(provider, ["same"] * 1000)]
+
+    runs: list[int] = []
+    current = 0
+    for outcome in outcomes:
+        if outcome == "RateLimitError":
+            current += 1
+        elif current:
+            runs.append(current)
+            current = 0
+    assert runs
+    assert all(run >= 5 and run % 5 == 0 for run in runs)
+
+    with pytest.raises(ValueError):
+        LoadProfile(error_rates={"quota": 0.1})
+
+
+def test_streaming_paces_chunks_by_profile() -> None:
+    sleeps: list[float] = []
+    profile = LoadProfile(
+        latency_ms=Constant(200.0),
+        completion_tokens=Constant(10.0),
+        stream_chunk_tokens=4,
+        inter_chunk_ms=Constant(20.0),
+    )
+    provider = LoadGenProvider("lg", profile, seed=3, sleep=sleeps.append)
+    request = ProviderRequest(model="m", prompt="alpha beta gamma")
+
+    chunks = list(provider.stream(request))
+
+    assert len(chunks) == 3
+    assert "".join(chunks).split() == ["alpha", "beta", "gamma"] * 3 + ["alpha"]
+    assert sleeps == pytest.approx([0.2, 0.02, 0.02])
+
+    async_sleeps: list[float] = []
+
+    async def _async_sleep(seconds: float) -> None:
+        async_sleeps.append(seconds)
+
+    async_provider = LoadGenProvider("lg", profile, seed=3, async_sleep=_async_sleep)
+    response = asyncio.run(async_provider.invoke_async(request))
+    assert response.latency_ms == 240
+    assert response.raw == {
+        "echo": "alpha beta gamma",
+        "provider": "lg",
+        "chunks": 3,
+        "ttft_ms": 200,
+    }
+    assert async_sleeps == pytest.approx([0.2, 0.02, 0.02])
+    assert "stream" in async_provider.capabilities()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+import json
+from pathlib import Path
+import threading
+
+import pytest
+
+from llm_adapter.metrics import log_event
+from llm_adapter.observability import (
+    BufferedJsonlLogger,
+    close_jsonl_loggers,
+    configure_jsonl_logging,
+    flush_jsonl_loggers,
+    open_jsonl_logger,
+)
+
+
+@pytest.fixture
+def buffered_logging() -> Iterator[None]:
+    configure_jsonl_logging(True)
+    try:
+        yield
+    finally:
+        configure_jsonl_logging(False)
+
+
+def test_buffered_logger_batches_concurrent_writers(tmp_path: Path) -> None:
+    target = tmp_path / "nested" / "events.jsonl"
+    logger = BufferedJsonlLogger(target, batch_size=64, flush_interval_s=0.05)
+    barrier = threading.Barrier(4)
+
+    def worker(thread_id: int) -> None:
+        barrier.wait()
+        for index in range(250):
+            logger.emit("test", {"thread": thread_id, "index": index})
+
+    threads = [threading.Thread(target=worker, args=(idx,)) for idx in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert logger.flush(timeout=5)
+    stats = logger.stats()
+    logger.close()
+
+    records = [json.loads(line) for line in target.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 1000
+    for thread_id in range(4):
+        indices = [item["index"] for item in records if item["thread"] == thread_id]
+        assert indices == list(range(250))
+    assert stats.written == 1000
+    assert stats.batches < 1000
+    assert stats.max_lag_ms >= stats.last_lag_ms >= 0.0
+
+
+def test_buffered_logger_drop_policy_counts_overflow(tmp_path: Path) -> None:
+    logger = BufferedJsonlLogger(
+        tmp_path / "events.jsonl", max_queue=1, batch_size=10, flush_interval_s=60, overflow="drop"
+    )
+    for index in range(5):
+        logger.emit("test", {"index": index})
+    logger.close()
+    logger.emit("late", {"index": 99})
+
+    stats = logger.stats()
+    written = (tmp_path / "events.jsonl").read_text(encoding="utf-8").splitlines()
+    assert stats.written == len(written) >= 1
+    assert stats.dropped == 5 - len(written) + 1
+
+
+def test_log_event_shares_one_buffered_logger_per_path(tmp_path: Path, buffered_logging: None) -> None:
+    target = tmp_path / "events.jsonl"
+    assert open_jsonl_logger(target) is open_jsonl_logger(str(target))
+
+    for index in range(10):
+        log_event("test", target, index=index)
+    flush_jsonl_loggers(timeout=5)
+
+    lines = target.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["index"] for line in lines] == list(range(10))
+    close_jsonl_loggers()
+
+
+def test_buffered_logger_isolates_unserializable_events(tmp_path: Path) -> None:
+    target = tmp_path / "events.jsonl"
+    logger = BufferedJsonlLogger(target, batch_size=10, flush_interval_s=60)
+    circular: dict[str, object] = {}
+    circular["self"] = circular
+
+    logger.emit("test", {"index": 0})
+    logger.emit("test", {"index": 1, "path": tmp_path})
+    logger.emit("test", {"index": 2, "loop": circular})
+    logger.emit("test", {"index": 3})
+    assert logger.flush(timeout=5)
+    stats = logger.stats()
+    logger.close()
+
+    records = [json.loads(line) for line in target.read_text(encoding="utf-8").splitlines()]
+    assert [record["index"] for record in records] == [0, 1, 3]
+    assert records[1]["path"] == str(tmp_path)
+    assert (stats.written, stats.failed) == (3, 1)
@@ -275,3 +275,32 @@ def test_cli_prepare_execution_uses_defaults(tmp_path: Path) -> None:
     assert runner._config.max_concurrency == DEFAULT_MAX_CONCURRENCY
     assert runner._config.metrics_path == DEFAULT_METRICS_PATH
     assert metrics == DEFAULT_METRICS_PATH
+
+
+def test_build_runner_config_with_shared_rate_limit(tmp_path: Path) -> None:
+    prompt_path = tmp_path / "prompt.txt"
+    prompt_path.write_text("payload", encoding="utf-8")
+    state_path = tmp_path / "bucket.json"
+
+    args = cli.parse_args(
+        [
+            "--mode",
+            "sequential",
+            "--providers",
+            "mock:primary",
+            "--input",
+            str(prompt_path),
+            "--rpm",
+            "60",
+            "--rate-limit-burst",
+            "4",
+            "--rate-limit-state",
+            str(state_path),
+        ]
+    )
+
+    config = cli.build_runner_config(args)
+
+    assert config.rpm == 60
+    assert config.rate_limit_burst == 4
+    assert config.rate_limit_state_path == str(state_path)
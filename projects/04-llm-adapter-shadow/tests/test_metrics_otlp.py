@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import gzip
+import json
+import threading
 from typing import Any
+from urllib.request import Request, urlopen
 
 import pytest
 
-from llm_adapter.metrics_otlp import OtlpJsonExporter
+from llm_adapter.metrics_otlp import BatchingOtlpExporter, OtlpHttpJsonTransport, OtlpJsonExporter
+from llm_adapter.otlp_collector import OtlpCollectorStub
 
 
 def _collect(event: str, record: dict[str, Any]) -> dict[str, Any]:
@@ -106,3 +111,92 @@ def test_status_values_are_normalized_for_failed_status(
     metric = _metric(payload, f"llm_adapter.{event_type}.count")
     metric_attrs = metric["gauge"]["dataPoints"][0]["attributes"]
     assert _attr(metric_attrs, "status")["stringValue"] == "error"
+
+
+def test_batching_exporter_aggregates_per_attribute_set() -> None:
+    sink: list[dict[str, Any]] = []
+    exporter = BatchingOtlpExporter(sink.append, max_batch_logs=100, clock=lambda: 1.0)
+    for latency in (10, 30, 20):
+        exporter.handle_event(
+            "provider_call",
+            {"ts": 1_700_000_000_000, "provider": "primary", "status": "ok", "latency_ms": latency, "request_hash": str(latency)},
+        )
+    exporter.handle_event("provider_call", {"provider": "fallback", "status": "failed", "latency_ms": 5})
+    exporter.handle_event("unrelated", {"provider": "primary"})
+
+    assert sink == []
+    assert exporter.flush() is True
+    assert exporter.flush() is False
+
+    (payload,) = sink
+    logs = payload["resourceLogs"][0]["scopeLogs"][0]["logRecords"]
+    assert len(logs) == 4
+    assert _attr(payload["resourceLogs"][0]["resource"]["attributes"], "service.name")["stringValue"] == "llm-adapter"
+    count = _metric(payload, "llm_adapter.provider_call.count")["sum"]
+    assert count["isMonotonic"] is True
+    counts = {_attr(point["attributes"], "provider")["stringValue"]: point["asDouble"] for point in count["dataPoints"]}
+    assert counts == {"primary": 3.0, "fallback": 1.0}
+    latency = _metric(payload, "llm_adapter.provider_call.latency_ms")["summary"]["dataPoints"]
+    primary = next(point for point in latency if _attr(point["attributes"], "provider")["stringValue"] == "primary")
+    assert (primary["count"], primary["sum"]) == ("3", 60.0)
+    assert [item["value"] for item in primary["quantileValues"]] == [10.0, 30.0]
+    assert all(item["key"] != "request_hash" for item in primary["attributes"])
+
+
+def test_batching_exporter_posts_gzip_to_collector_with_retries() -> None:
+    with OtlpCollectorStub() as collector:
+        transport = OtlpHttpJsonTransport(collector.endpoint, sleep=lambda _: None)
+        exporter = BatchingOtlpExporter(transport, max_batch_logs=2)
+        collector.fail_next(1, status=503)
+        exporter.handle_event("run_metric", {"provider": "primary", "status": "ok", "cost_usd": 0.25})
+        exporter.handle_event("run_metric", {"provider": "primary", "status": "ok", "cost_usd": 0.75})
+
+        assert [path for path, _ in collector.requests()] == ["/v1/logs", "/v1/metrics"]
+        assert len(list(collector.log_records())) == 2
+        cost = next(metric for metric in collector.metrics() if metric["name"] == "llm_adapter.run_metric.cost_usd")
+        assert cost["summary"]["dataPoints"][0]["sum"] == pytest.approx(1.0)
+
+
+def test_collector_counts_bytes_as_received_on_the_wire() -> None:
+    payload = json.dumps({"resourceLogs": [{"scopeLogs": []}] * 50}).encode()
+    body = gzip.compress(payload)
+    with OtlpCollectorStub() as collector:
+        request = Request(
+            f"{collector.endpoint}/v1/logs",
+            data=body,
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+        with urlopen(request, timeout=5) as response:
+            assert response.status == 200
+
+        assert collector.bytes_received == len(body) < len(payload)
+        assert [path for path, _ in collector.requests()] == ["/v1/logs"]
+
+
+def test_batching_exporter_requeues_failed_batches_and_wakes_flush_thread() -> None:
+    sink: list[dict[str, Any]] = []
+    failures = [RuntimeError("collector down")]
+
+    def emit(payload: dict[str, Any]) -> None:
+        if failures:
+            raise failures.pop()
+        sink.append(payload)
+
+    exporter = BatchingOtlpExporter(emit, max_batch_logs=2, max_buffered_logs=1)
+    exporter.handle_event("run_metric", {"provider": "primary", "status": "ok", "cost_usd": 0.25})
+    with pytest.raises(RuntimeError):
+        exporter.handle_event("run_metric", {"provider": "primary", "status": "ok", "cost_usd": 0.75})
+    assert exporter.failed_batches == 1
+    assert exporter.dropped_logs == 1
+    exporter.handle_event("run_metric", {"provider": "primary", "status": "ok", "cost_usd": 1.0})
+
+    (payload,) = sink
+    assert len(payload["resourceLogs"][0]["scopeLogs"][0]["logRecords"]) == 2
+    cost = _metric(payload, "llm_adapter.run_metric.cost_usd")["summary"]["dataPoints"][0]
+    assert (cost["count"], cost["sum"]) == ("3", pytest.approx(2.0))
+
+    delivered = threading.Event()
+    threaded = BatchingOtlpExporter(lambda _: delivered.set(), max_batch_logs=1, flush_interval_s=60)
+    with threaded:
+        threaded.handle_event("run_metric", {"provider": "primary", "status": "ok"})
+        assert delivered.wait(timeout=5)
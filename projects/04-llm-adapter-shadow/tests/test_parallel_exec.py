@@ -1,12 +1,18 @@
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
 import sys
+import threading
+import time
 import types
 from typing import cast, TYPE_CHECKING
 
 import pytest
 
-from llm_adapter.parallel_exec import run_parallel_all_async, run_parallel_any_async
+from llm_adapter.parallel_exec import (
+    run_parallel_all_async,
+    run_parallel_any_async,
+    WorkerCompletion,
+)
 
 ADAPTER_ROOT = Path(__file__).resolve().parents[2] / "04-llm-adapter"
 if (adapter_root_str := str(ADAPTER_ROOT)) not in sys.path:
@@ -99,3 +105,31 @@ def test_all_failed_error_exposes_failures_list() -> None:
 
     assert isinstance(error.failures, list)
     assert error.failures == []
+
+
+def test_worker_completion_wakes_waiter_when_started_slots_finish() -> None:
+    completion = WorkerCompletion()
+    completion.mark_started(0)
+    completion.mark_started(2)
+    release = threading.Event()
+
+    def _finish() -> None:
+        release.wait()
+        completion.mark_finished(0)
+        time.sleep(0.02)
+        completion.mark_finished(2)
+
+    thread = threading.Thread(target=_finish)
+    thread.start()
+    release.set()
+    started = time.monotonic()
+    pending = completion.wait_for([0, 1, 2], timeout=5.0)
+    elapsed = time.monotonic() - started
+    thread.join()
+
+    assert pending == []
+    assert elapsed < 1.0
+    assert completion.started == frozenset({0, 2})
+
+    completion.mark_started(3)
+    assert completion.wait_for([3], timeout=0.01) == [3]
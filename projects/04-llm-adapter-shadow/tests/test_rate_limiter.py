@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import time
+
+import pytest
+
+from llm_adapter.providers.mock import MockProvider
+from llm_adapter.rate_limiter import (
+    FileRateLimitBackend,
+    InMemoryRateLimitBackend,
+    RateLimiter,
+)
+from llm_adapter.runner import AsyncRunner, Runner
+from llm_adapter.runner_config import RunnerConfig
+
+
+def _grab_tokens(path: str, attempts: int) -> int:
+    backend = FileRateLimitBackend(path)
+    return sum(
+        1
+        for _ in range(attempts)
+        if backend.reserve("api-key", rate_per_second=1e-6, capacity=6.0, now=time.monotonic()) == 0.0
+    )
+
+
+def test_burst_allows_back_to_back_calls_then_waits() -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def _sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(60, burst=3, clock=lambda: now[0], sleep=_sleep)
+    for _ in range(3):
+        limiter.acquire()
+    assert sleeps == []
+
+    limiter.acquire()
+    assert sleeps == [pytest.approx(1.0)]
+
+    with pytest.raises(ValueError):
+        RateLimiter(60, burst=0)
+
+
+def test_limiters_sharing_a_backend_share_one_bucket() -> None:
+    backend = InMemoryRateLimitBackend()
+    now = [0.0]
+    sleeps: list[float] = []
+    first = RateLimiter(60, backend=backend, clock=lambda: now[0], sleep=sleeps.append)
+    second = RateLimiter(60, backend=backend, clock=lambda: now[0], sleep=lambda s: now.__setitem__(0, now[0] + s))
+
+    first.acquire()
+    second.acquire()
+
+    assert now[0] == pytest.approx(1.0)
+    assert sleeps == []
+
+
+def test_file_backend_caps_total_across_processes(tmp_path: Path) -> None:
+    path = str(tmp_path / "ratelimit.json")
+
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        granted = sum(pool.map(_grab_tokens, [path] * 3, [4] * 3))
+
+    assert granted == 6
+
+
+def test_file_backend_recovers_from_timestamps_ahead_of_the_clock(tmp_path: Path) -> None:
+    path = tmp_path / "ratelimit.json"
+    # Written by a previous boot whose monotonic clock was far ahead.
+    path.write_text('{"api-key":[0.0,1000000.0]}', encoding="utf-8")
+    backend = FileRateLimitBackend(path)
+
+    assert backend.reserve("api-key", rate_per_second=1.0, capacity=1.0, now=5.0) == pytest.approx(1.0)
+    assert backend.reserve("api-key", rate_per_second=1.0, capacity=1.0, now=6.0) == 0.0
+
+
+def test_runners_build_limiter_from_config(tmp_path: Path) -> None:
+    backend = InMemoryRateLimitBackend()
+    config = RunnerConfig(rpm=120, rate_limit_burst=5, rate_limit_backend=backend)
+    runner = Runner([MockProvider("primary", base_latency_ms=1)], config=config)
+    async_runner = AsyncRunner([MockProvider("primary", base_latency_ms=1)], config=config)
+
+    assert runner._rate_limiter is not None
+    assert runner._rate_limiter.backend is backend
+    assert async_runner._rate_limiter is not None
+    assert async_runner._rate_limiter.backend is backend
+
+    state_path = tmp_path / "shared" / "bucket.json"
+    file_runner = Runner(
+        [MockProvider("primary", base_latency_ms=1)],
+        config=RunnerConfig(rpm=120, rate_limit_state_path=state_path),
+    )
+    assert file_runner._rate_limiter is not None
+    assert isinstance(file_runner._rate_limiter.backend, FileRateLimitBackend)
+    assert file_runner._rate_limiter.backend.path == state_path
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from llm_adapter.provider_spi import ProviderRequest
+from llm_adapter.providers.mock import MockProvider
+from llm_adapter.runner import Runner
+from llm_adapter.runner_config import RunnerConfig
+from llm_adapter.shadow_diff import analyze_shadow_diff, ShadowDiffWorker
+
+
+def test_analyze_shadow_diff_normalizes_text_and_diffs_json() -> None:
+    cosmetic = analyze_shadow_diff("Hello   World\n", "hello world")
+    assert cosmetic["normalized_match"] is True
+    assert cosmetic["normalized_diff_rate"] == 0.0
+    assert cosmetic["similarity"] == 1.0
+    assert "json_diff" not in cosmetic
+
+    different = analyze_shadow_diff("the quick brown fox", "a slow green turtle")
+    assert different["normalized_match"] is False
+    assert different["normalized_diff_rate"] == 1.0
+    assert different["similarity"] == 0.0
+
+    structured = analyze_shadow_diff(
+        json.dumps({"answer": 1, "items": [{"id": 1}], "extra": True}),
+        json.dumps({"answer": 2, "items": [{"id": 1}, {"id": 2}]}),
+    )
+    assert structured["json_diff"] == {
+        "equal": False,
+        "added_count": 1,
+        "removed_count": 1,
+        "changed_count": 1,
+        "added": ["$.items[1].id"],
+        "removed": ["$.extra"],
+        "changed": ["$.answer"],
+    }
+
+
+def test_diff_worker_skips_analysis_once_cpu_budget_is_spent() -> None:
+    now = [0.0]
+    worker = ShadowDiffWorker(cpu_budget=1e-9, window_s=1.0, clock=lambda: now[0])
+    try:
+        first = worker.submit("alpha beta", "alpha gamma")
+        assert first is not None
+        assert first.result(timeout=5)["diff_analysis"] == "ok"
+
+        second = worker.submit("alpha beta", "alpha gamma")
+        assert second is not None
+        assert second.result(timeout=5) == {"diff_analysis": "skipped_budget"}
+
+        now[0] += 2.0
+        third = worker.submit("alpha beta", "alpha gamma")
+        assert third is not None
+        assert third.result(timeout=5)["diff_analysis"] == "ok"
+        assert worker.skipped == 1
+    finally:
+        worker.shutdown()
+
+
+def test_diff_worker_skips_analysis_that_would_overshoot_the_budget() -> None:
+    cpu = [0.0]
+
+    def cpu_clock() -> float:
+        # consecutive readings are 0.5 CPU seconds apart, so each analysis costs 0.5
+        cpu[0] += 0.5
+        return cpu[0]
+
+    worker = ShadowDiffWorker(
+        cpu_budget=0.12, window_s=10.0, clock=lambda: 0.0, cpu_clock=cpu_clock
+    )
+    try:
+        outcomes = []
+        for _ in range(3):
+            future = worker.submit("alpha beta", "alpha gamma")
+            assert future is not None
+            outcomes.append(future.result(timeout=5)["diff_analysis"])
+    finally:
+        worker.shutdown()
+
+    # 0.5 + 0.5 fits the 1.2 s budget; a third 0.5 s analysis would overshoot it
+    assert outcomes == ["ok", "ok", "skipped_budget"]
+    assert worker.cpu_spent() == pytest.approx(1.0)
+
+
+def test_runner_attaches_detailed_diff_to_shadow_event(tmp_path: Path) -> None:
+    worker = ShadowDiffWorker()
+    runner = Runner(
+        [MockProvider("primary", base_latency_ms=1, error_markers=set())],
+        config=RunnerConfig(shadow_diff_worker=worker),
+    )
+    metrics_path = tmp_path / "metrics.jsonl"
+
+    runner.run(
+        ProviderRequest(prompt="hello there", model="m"),
+        shadow=MockProvider("shadow", base_latency_ms=1, error_markers=set()),
+        shadow_metrics_path=metrics_path,
+    )
+    worker.shutdown()
+
+    events = [json.loads(line) for line in metrics_path.read_text().splitlines() if line.strip()]
+    shadow_diff = next(event for event in events if event["event"] == "shadow_diff")
+    assert shadow_diff["diff_kind"] == "mismatch"
+    assert shadow_diff["diff_analysis"] == "ok"
+    assert shadow_diff["normalized_diff_rate"] == pytest.approx(1 / 3, abs=1e-6)
+    assert 0.0 < shadow_diff["similarity"] < 1.0
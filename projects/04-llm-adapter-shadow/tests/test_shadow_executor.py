@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from llm_adapter import shadow as shadow_module
+from llm_adapter.errors import RateLimitError
+from llm_adapter.metrics import register_metrics_exporter, reset_metrics_exporters
+from llm_adapter.provider_spi import ProviderRequest, ProviderResponse, TokenUsage
+from llm_adapter.shadow import run_with_shadow
+from llm_adapter.shadow_executor import ShadowExecutor
+from llm_adapter.shadow_sampling import AdaptiveShadowSampler, ShadowSampler
+
+
+class _CapturingLogger:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, dict[str, Any]]] = []
+        self.received = threading.Event()
+
+    def emit(self, event_type: str, record: Mapping[str, Any]) -> None:
+        self.events.append((event_type, dict(record)))
+        self.received.set()
+
+
+class _RecordingExporter:
+    def __init__(self) -> None:
+        self.records: list[dict[str, Any]] = []
+
+    def handle_event(self, event_type: str, record: Mapping[str, Any]) -> None:
+        if event_type == "shadow_queue":
+            self.records.append(dict(record))
+
+
+class _Provider:
+    def __init__(self, name: str, gate: threading.Event | None = None) -> None:
+        self._name = name
+        self._gate = gate
+
+    def name(self) -> str:
+        return self._name
+
+    def capabilities(self) -> set[str]:
+        return set()
+
+    def invoke(self, request: ProviderRequest) -> ProviderResponse:
+        if self._gate is not None:
+            self._gate.wait(timeout=5)
+        return ProviderResponse(
+            text=f"{self._name}:{request.prompt}",
+            latency_ms=1,
+            token_usage=TokenUsage(prompt=1, completion=1),
+        )
+
+
+def test_executor_sheds_when_queue_is_full_and_reports_counters() -> None:
+    exporter = _RecordingExporter()
+    register_metrics_exporter(exporter)
+    gate = threading.Event()
+    executor = ShadowExecutor(max_workers=1, max_queue=2, name="test")
+    try:
+        futures = [executor.submit(gate.wait) for _ in range(5)]
+        accepted = [future for future in futures if future is not None]
+        stats = executor.stats()
+        gate.set()
+        for future in accepted:
+            future.result(timeout=5)
+    finally:
+        executor.shutdown()
+        reset_metrics_exporters()
+
+    # 1 running + 2 queued; the rest are shed. The first job may still be
+    # queued when later submissions arrive, so allow for one extra shed.
+    assert 2 <= len(accepted) <= 3
+    assert stats.shed == 5 - len(accepted)
+    assert stats.workers == 1
+    assert [record["shed"] for record in exporter.records].count(True) == stats.shed
+    assert exporter.records[-1]["shed_total"] == stats.shed
+    assert max(record["queue_depth"] for record in exporter.records) == 2
+
+
+def test_detached_shadow_returns_before_shadow_completes(tmp_path: Any) -> None:
+    gate = threading.Event()
+    logger = _CapturingLogger()
+    executor = ShadowExecutor(max_workers=1, max_queue=4)
+    request = ProviderRequest(prompt="hello", model="primary-model")
+
+    started = time.perf_counter()
+    response, metrics = run_with_shadow(
+        _Provider("primary"),
+        _Provider("shadow", gate),
+        request,
+        tmp_path / "metrics.jsonl",
+        logger=logger,
+        capture_metrics=True,
+        executor=executor,
+        detach=True,
+    )
+    elapsed = time.perf_counter() - started
+
+    assert response.text == "primary:hello"
+    assert metrics is None
+    assert elapsed < 1.0
+    assert logger.events == []
+
+    gate.set()
+    assert logger.received.wait(timeout=5)
+    executor.shutdown()
+    event_type, record = logger.events[0]
+    assert event_type == "shadow_diff"
+    assert record["shadow_provider"] == "shadow"
+    assert record["shadow_ok"] is True
+
+
+def test_shed_shadow_skips_diff_record(tmp_path: Any) -> None:
+    gate = threading.Event()
+    executor = ShadowExecutor(max_workers=1, max_queue=1)
+    executor.submit(gate.wait)
+    deadline = time.monotonic() + 5
+    while executor.stats().in_flight == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    executor.submit(gate.wait)
+    logger = _CapturingLogger()
+
+    response, metrics = run_with_shadow(
+        _Provider("primary"),
+        _Provider("shadow"),
+        ProviderRequest(prompt="hello", model="primary-model"),
+        tmp_path / "metrics.jsonl",
+        logger=logger,
+        capture_metrics=True,
+        executor=executor,
+    )
+    gate.set()
+    executor.shutdown()
+
+    assert response.text == "primary:hello"
+    assert metrics is None
+    assert executor.stats().shed == 1
+    assert logger.events == []
+
+
+def test_sampler_skips_unsampled_requests_and_backs_off_on_rate_limit(tmp_path: Any) -> None:
+    class _RateLimitedProvider(_Provider):
+        def invoke(self, request: ProviderRequest) -> ProviderResponse:
+            raise RateLimitError("slow down")
+
+    logger = _CapturingLogger()
+    sampler = AdaptiveShadowSampler(deterministic=True)
+    request = ProviderRequest(prompt="hello", model="primary-model")
+
+    with pytest.raises(RateLimitError):
+        run_with_shadow(
+            _RateLimitedProvider("primary"),
+            _Provider("shadow"),
+            request,
+            tmp_path / "metrics.jsonl",
+            logger=logger,
+            sampler=sampler,
+        )
+    assert sampler.effective_rate() == pytest.approx(0.5)
+
+    _, skipped = run_with_shadow(
+        _Provider("primary"),
+        _Provider("shadow"),
+        request,
+        tmp_path / "metrics.jsonl",
+        logger=logger,
+        capture_metrics=True,
+        sampler=ShadowSampler(0.0),
+    )
+    _, sampled = run_with_shadow(
+        _Provider("primary"),
+        _Provider("shadow"),
+        request,
+        tmp_path / "metrics.jsonl",
+        logger=logger,
+        capture_metrics=True,
+        sampler=ShadowSampler(1.0, deterministic=True),
+    )
+
+    assert skipped is None
+    assert sampled is not None
+    assert sampled.payload["shadow_ok"] is True
+
+
+def test_shadow_timeout_is_passed_to_provider_and_reports_stuck_worker(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class _StuckExporter:
+        def __init__(self) -> None:
+            self.records: list[dict[str, Any]] = []
+
+        def handle_event(self, event_type: str, record: Mapping[str, Any]) -> None:
+            if event_type == "shadow_worker_stuck":
+                self.records.append(dict(record))
+
+    seen_timeouts: list[float | None] = []
+    gate = threading.Event()
+
+    class _SlowShadow(_Provider):
+        def invoke(self, request: ProviderRequest) -> ProviderResponse:
+            seen_timeouts.append(request.timeout_s)
+            return super().invoke(request)
+
+    monkeypatch.setattr(shadow_module, "_SHADOW_TIMEOUT_S", 0.05)
+    exporter = _StuckExporter()
+    register_metrics_exporter(exporter)
+    executor = ShadowExecutor(max_workers=1, name="stuck")
+    try:
+        _, metrics = run_with_shadow(
+            _Provider("primary"),
+            _SlowShadow("shadow", gate),
+            ProviderRequest(prompt="hello", model="m", timeout_s=30),
+            tmp_path / "metrics.jsonl",
+            capture_metrics=True,
+            executor=executor,
+        )
+    finally:
+        gate.set()
+        executor.shutdown()
+        reset_metrics_exporters()
+
+    assert metrics is not None
+    assert metrics.payload["shadow_outcome"] == "timeout"
+    assert seen_timeouts == [0.05]
+    assert [record["provider"] for record in exporter.records] == ["shadow"]
+
+
+def test_shadow_timeout_cancels_queued_call_without_reporting_stuck_worker(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    stuck: list[str] = []
+
+    class _StuckExporter:
+        def handle_event(self, event_type: str, record: Mapping[str, Any]) -> None:
+            if event_type == "shadow_worker_stuck":
+                stuck.append(str(record["provider"]))
+
+    invoked: list[str] = []
+
+    class _RecordingShadow(_Provider):
+        def invoke(self, request: ProviderRequest) -> ProviderResponse:
+            invoked.append(request.prompt)
+            return super().invoke(request)
+
+    monkeypatch.setattr(shadow_module, "_SHADOW_TIMEOUT_S", 0.05)
+    register_metrics_exporter(_StuckExporter())
+    gate = threading.Event()
+    executor = ShadowExecutor(max_workers=1, name="queued")
+    blocker = executor.submit(lambda: gate.wait(timeout=5))
+    try:
+        _, metrics = run_with_shadow(
+            _Provider("primary"),
+            _RecordingShadow("shadow"),
+            ProviderRequest(prompt="hello", model="m"),
+            tmp_path / "metrics.jsonl",
+            capture_metrics=True,
+            executor=executor,
+        )
+    finally:
+        gate.set()
+        executor.shutdown()
+        reset_metrics_exporters()
+
+    assert blocker is not None
+    assert metrics is not None
+    assert metrics.payload["shadow_outcome"] == "timeout"
+    assert invoked == []
+    assert stuck == []
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from llm_adapter.cli import replay as replay_cli
+from llm_adapter.provider_spi import ProviderRequest
+from llm_adapter.providers.mock import MockProvider
+from llm_adapter.runner import Runner
+from llm_adapter.runner_config import RunnerConfig, RunnerMode
+from llm_adapter.traffic_capture import (
+    read_traffic,
+    REPLAY_ERROR_EVENT,
+    replay_traffic,
+    TrafficCapture,
+)
+
+
+def _events(path: Path, event: str) -> list[dict[str, object]]:
+    return [
+        record
+        for record in (json.loads(line) for line in path.read_text().splitlines() if line.strip())
+        if record["event"] == event
+    ]
+
+
+def _capture(tmp_path: Path, prompts: list[str]) -> Path:
+    traffic_path = tmp_path / "traffic.jsonl"
+    runner = Runner(
+        [MockProvider("primary", base_latency_ms=1, error_markers=set())],
+        config=RunnerConfig(mode=RunnerMode.SEQUENTIAL, traffic_capture=TrafficCapture(traffic_path)),
+    )
+    for prompt in prompts:
+        runner.run(
+            ProviderRequest(prompt=prompt, model="primary-model", options={"seed": 7}, stop=("END",)),
+            shadow_metrics_path=tmp_path / "live.jsonl",
+        )
+    return traffic_path
+
+
+def test_capture_round_trips_requests_and_primary_summary(tmp_path: Path) -> None:
+    traffic_path = _capture(tmp_path, ["first prompt", "second prompt"])
+    traffic_path.open("a", encoding="utf-8").write('{"event": "traffic_capture", "request"')
+
+    captured = list(read_traffic(traffic_path))
+
+    assert [item.request.prompt for item in captured] == ["first prompt", "second prompt"]
+    first = captured[0]
+    assert first.provider == "primary"
+    assert first.request.options == {"seed": 7}
+    assert first.request.stop == ("END",)
+    assert first.response.text == "echo(primary): first prompt"
+    assert first.response.token_usage.completion == 16
+    assert len(list(read_traffic(traffic_path, limit=1))) == 1
+
+
+def test_replay_emits_shadow_diff_per_candidate(tmp_path: Path) -> None:
+    traffic_path = _capture(tmp_path, ["alpha", "beta", "gamma [TIMEOUT]"])
+    metrics_path = tmp_path / "replay.jsonl"
+
+    stats = replay_traffic(
+        read_traffic(traffic_path),
+        [
+            MockProvider("candidate-a", base_latency_ms=1),
+            MockProvider("candidate-b", base_latency_ms=1, error_markers=set()),
+        ],
+        metrics_path,
+        rpm=6000,
+        concurrency=2,
+    )
+
+    assert (stats.requests, stats.calls, stats.failures) == (3, 6, 1)
+    records = _events(metrics_path, "shadow_diff")
+    assert len(records) == 6
+    assert {record["shadow_provider"] for record in records} == {"candidate-a", "candidate-b"}
+    assert {record["primary_provider"] for record in records} == {"primary"}
+    timeout = next(
+        record
+        for record in records
+        if record["shadow_provider"] == "candidate-a" and record["shadow_outcome"] != "success"
+    )
+    assert timeout["diff_kind"] == "shadow_error"
+
+    with pytest.raises(ValueError):
+        replay_traffic([], [], metrics_path)
+
+
+class _BrokenCandidate(MockProvider):
+    def name(self) -> str:
+        raise RuntimeError("candidate unavailable")
+
+
+def test_replay_counts_worker_exceptions_as_failures(tmp_path: Path) -> None:
+    traffic_path = _capture(tmp_path, ["alpha", "beta"])
+    events: list[tuple[str, dict[str, object]]] = []
+
+    class _Recorder:
+        def emit(self, event_type: str, record: dict[str, object]) -> None:
+            events.append((event_type, record))
+
+    stats = replay_traffic(
+        read_traffic(traffic_path),
+        [MockProvider("candidate-a", base_latency_ms=1), _BrokenCandidate("broken", base_latency_ms=1)],
+        tmp_path / "replay.jsonl",
+        logger=_Recorder(),
+    )
+
+    assert (stats.requests, stats.calls, stats.failures) == (2, 4, 2)
+    errors = [record for event_type, record in events if event_type == REPLAY_ERROR_EVENT]
+    assert len(errors) == 2
+    assert {record["error"] for record in errors} == {"RuntimeError"}
+    assert {record["primary_provider"] for record in errors} == {"primary"}
+
+
+def test_replay_cli_reports_totals(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    traffic_path = _capture(tmp_path, ["one", "two"])
+    metrics_path = tmp_path / "replay.jsonl"
+
+    exit_code = replay_cli.main(
+        [
+            "--traffic",
+            str(traffic_path),
+            "--candidates",
+            "mock:candidate",
+            "--metrics",
+            str(metrics_path),
+            "--limit",
+            "1",
+            "--detailed-diff",
+        ]
+    )
+
+    assert exit_code == 0
+    assert json.loads(capsys.readouterr().out)["calls"] == 1
+    (record,) = _events(metrics_path, "shadow_diff")
+    assert record["diff_analysis"] == "ok"
@@ -0,0 +1,107 @@
+"""Benchmark waiting for cancelled parallel_any workers: polling vs condition variable.
+
+The runner used to poll the shared result slots every millisecond until the
+cancelled-but-started workers published their results. This compares that
+loop with :class:`llm_adapter.parallel_exec.WorkerCompletion`, reporting the
+waiter's CPU time and the delay between a worker finishing and the waiter
+noticing it.
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable, Sequence
+import json
+from pathlib import Path
+from statistics import mean, median
+import threading
+import time
+
+from llm_adapter.parallel_exec import WorkerCompletion
+
+_LEGACY_POLL_S = 0.001
+_WAIT_S = 0.05
+
+
+def _legacy_wait(results: list[object | None], pending: list[int]) -> None:
+    deadline = time.time() + _WAIT_S
+    while pending and time.time() < deadline:
+        if all(results[index] is not None for index in pending):
+            break
+        time.sleep(_LEGACY_POLL_S)
+        pending = [index for index in pending if results[index] is None]
+
+
+def _run_once(mode: str, workers: int, work_s: float) -> tuple[float, float]:
+    results: list[object | None] = [None] * workers
+    completion = WorkerCompletion()
+    finished_at: list[float] = []
+    lock = threading.Lock()
+    indices = list(range(workers))
+    for index in indices:
+        completion.mark_started(index)
+
+    def _worker(index: int) -> None:
+        time.sleep(work_s)
+        results[index] = index
+        with lock:
+            finished_at.append(time.perf_counter())
+        completion.mark_finished(index)
+
+    threads = [threading.Thread(target=_worker, args=(index,)) for index in indices]
+    for thread in threads:
+        thread.start()
+    cpu_started = time.thread_time()
+    if mode == "poll":
+        _legacy_wait(results, list(indices))
+    else:
+        completion.wait_for(indices, timeout=_WAIT_S)
+    woke = time.perf_counter()
+    cpu = time.thread_time() - cpu_started
+    for thread in threads:
+        thread.join()
+    return cpu, max(woke - max(finished_at), 0.0)
+
+
+def run_benchmark(*, runs: int, workers: int, work_s: float) -> list[dict[str, object]]:
+    rows: list[dict[str, object]] = []
+    modes: dict[str, Callable[[], tuple[float, float]]] = {
+        mode: (lambda mode=mode: _run_once(mode, workers, work_s)) for mode in ("poll", "condition")
+    }
+    for mode, run in modes.items():
+        samples = [run() for _ in range(runs)]
+        cpu = [sample[0] * 1000.0 for sample in samples]
+        wake = [sample[1] * 1000.0 for sample in samples]
+        rows.append(
+            {
+                "mode": mode,
+                "runs": runs,
+                "waiter_cpu_ms_mean": mean(cpu),
+                "wake_latency_ms_mean": mean(wake),
+                "wake_latency_ms_median": median(wake),
+                "wake_latency_ms_max": max(wake),
+            }
+        )
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200, help="number of simulated parallel_any runs")
+    parser.add_argument("--workers", type=int, default=3, help="cancelled workers still running per run")
+    parser.add_argument("--work-ms", type=float, default=20.0, help="time each worker keeps running after cancellation")
+    parser.add_argument("--out", default=None, help="write the JSON result here instead of stdout")
+    args = parser.parse_args(argv)
+
+    rows = run_benchmark(runs=args.runs, workers=args.workers, work_s=args.work_ms / 1000.0)
+    payload = json.dumps({"benchmark": "cancelled_results_wait", "rows": rows}, indent=2)
+    if args.out:
+        out_path = Path(args.out).expanduser()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI
+    raise SystemExit(main())
@@ -11,6 +11,11 @@ from .aggregation import (  # noqa: F401
     MaxScoreStrategy,
     MaxScoreTieBreaker,
 )
+from .budget_ledger import (  # noqa: F401
+    BudgetLedger,
+    InMemoryBudgetLedger,
+    SQLiteBudgetLedger,
+)
 from .budgets import BudgetManager  # noqa: F401
 from .config import (  # noqa: F401
     BudgetBook,
@@ -37,6 +42,7 @@ from .metrics.models import (  # noqa: F401
 )
 from .providers import ProviderFactory  # noqa: F401
 from .runners import CompareRunner  # noqa: F401
+from .shadow_sampling import AdaptiveShadowSampler, ShadowSampler  # noqa: F401
 
 __all__ = [
     "AggregationCandidate",
@@ -46,6 +52,9 @@ __all__ = [
     "FirstTieBreaker",
     "JudgeStrategy",
     "BudgetManager",
+    "BudgetLedger",
+    "InMemoryBudgetLedger",
+    "SQLiteBudgetLedger",
     "BudgetBook",
     "BudgetRule",
     "RetryConfig",
@@ -72,4 +81,6 @@ __all__ = [
     "MaxScoreTieBreaker",
     "ProviderFactory",
     "CompareRunner",
+    "ShadowSampler",
+    "AdaptiveShadowSampler",
 ]
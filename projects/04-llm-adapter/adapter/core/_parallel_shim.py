@@ -10,6 +10,7 @@ from concurrent.futures import (
     ThreadPoolExecutor,
     wait,
 )
+from threading import Event
 from typing import TypeVar
 
 from .errors import ParallelExecutionError
@@ -24,21 +25,36 @@ def _normalize_concurrency(total: int, limit: int | None) -> int:
 
 
 def run_parallel_all_sync(
-    workers: Sequence[Callable[[], T]], *, max_concurrency: int | None = None
+    workers: Sequence[Callable[[], T]],
+    *,
+    max_concurrency: int | None = None,
+    stop_event: Event | None = None,
 ) -> list[T]:
+    """全ワーカーを実行する。``stop_event`` が立つと未開始分を取り消し、実行中の分は待たずに返す。"""
+
     if not workers:
         raise ValueError("workers must not be empty")
     max_workers = _normalize_concurrency(len(workers), max_concurrency)
     results: list[T] = [None] * len(workers)  # type: ignore[list-item]
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    stopped = False
+    try:
         future_map = {executor.submit(worker): index for index, worker in enumerate(workers)}
         try:
             for future in as_completed(future_map):
+                if stop_event is not None and stop_event.is_set():
+                    # 停止後に完了したワーカーの例外は伝播させない
+                    stopped = True
+                    if future.exception() is None:
+                        results[future_map[future]] = future.result()
+                    break
                 results[future_map[future]] = future.result()
         except BaseException:  # noqa: BLE001
             for pending in future_map:
                 pending.cancel()
             raise
+    finally:
+        executor.shutdown(wait=not stopped, cancel_futures=stopped)
     return results
 
 
@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from .config import ProviderConfig
 from .execution.shadow_runner import ShadowRunner, ShadowRunnerResult
 from .provider_spi import ProviderSPI
+from .shadow_sampling import request_fingerprint, ShadowSampler
 
 
 @dataclass(slots=True)
@@ -18,10 +19,17 @@ class ShadowSession:
 
 
 def start_shadow_session(
-    shadow_provider: ProviderSPI | None, provider_config: ProviderConfig, prompt: str
+    shadow_provider: ProviderSPI | None,
+    provider_config: ProviderConfig,
+    prompt: str,
+    sampler: ShadowSampler | None = None,
 ) -> ShadowSession | None:
     if shadow_provider is None:
         return None
+    if sampler is not None and not sampler.should_shadow(
+        request_fingerprint(prompt.strip(), max_tokens=provider_config.max_tokens)
+    ):
+        return None
     runner = ShadowRunner(shadow_provider)
     runner.start(provider_config, prompt)
     return ShadowSession(runner=runner, fallback_provider_id=runner.provider_id)
@@ -1,7 +1,7 @@
 """組み込み集約ストラテジモジュール群。"""
 from __future__ import annotations
 
-from .majority_vote import MajorityVoteStrategy
+from .majority_vote import MajorityVoteStrategy, MajorityVoteTally
 from .max_score import MaxScoreStrategy
 from .registry import (
     resolve_builtin_strategy,
@@ -16,6 +16,7 @@ __all__ = [
     "FirstTieBreaker",
     "MaxScoreTieBreaker",
     "MajorityVoteStrategy",
+    "MajorityVoteTally",
     "MaxScoreStrategy",
     "WeightedVoteStrategy",
     "StrategyFactory",
@@ -2,28 +2,36 @@
 from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
-import json
+import hashlib
 import re
 from typing import Any, TYPE_CHECKING
 
+from ...json_documents import decode_json
 from .. import AggregationCandidate, AggregationResult, TieBreaker
 from .tie_breakers import FirstTieBreaker
 
-__all__ = ["MajorityVoteStrategy"]
+__all__ = ["MajorityVoteStrategy", "MajorityVoteTally"]
 
 _WHITESPACE_RE = re.compile(r"\s+")
 
 
 if TYPE_CHECKING:
     from .. import AggregationStrategy
+    from ..similarity import SimilarityBucketer
 
 
 class MajorityVoteStrategy:
     name = "majority_vote"
 
-    def __init__(self, *, schema: Mapping[str, Any] | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        schema: Mapping[str, Any] | None = None,
+        similarity: SimilarityBucketer | None = None,
+    ) -> None:
         self._schema = schema
         self._required_keys = self._extract_required_keys(schema)
+        self._similarity = similarity
 
     def _extract_required_keys(self, schema: Mapping[str, Any] | None) -> frozenset[str]:
         if not isinstance(schema, Mapping):
@@ -41,34 +49,38 @@ class MajorityVoteStrategy:
         normalized = _WHITESPACE_RE.sub(" ", normalized)
         return normalized.lower()
 
-    def _json_bucket_key(self, value: str) -> str | None:
-        if not self._schema:
-            return None
-        try:
-            payload = json.loads(value)
-        except json.JSONDecodeError:
-            return None
-        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-        return f"json:{canonical}"
+    def _candidate_text(self, candidate: AggregationCandidate) -> str:
+        raw = candidate.text if candidate.text is not None else candidate.response.text
+        return raw or ""
+
+    def _candidate_key(self, candidate: AggregationCandidate) -> tuple[str, bool]:
+        """候補ごとに一度だけ JSON を解析し、(バケットキー, 完全性) を返す。"""
+
+        raw = self._candidate_text(candidate)
+        if self._schema:
+            document = decode_json(raw)
+            if document.ok:
+                payload = document.value
+                canonical = document.canonical
+                complete = (
+                    bool(self._required_keys)
+                    and isinstance(payload, dict)
+                    and all(key in payload for key in self._required_keys)
+                )
+                return f"json:{_digest(canonical)}", complete
+        return f"text:{_digest(self._normalize_text(raw))}", False
 
     def _bucket_key(self, candidate: AggregationCandidate) -> str:
-        raw = candidate.text if candidate.text is not None else candidate.response.text
-        json_key = self._json_bucket_key(raw)
-        if json_key is not None:
-            return json_key
-        return self._normalize_text(raw)
+        return self._candidate_key(candidate)[0]
 
     def _bucket_is_complete(self, key: str, candidate: AggregationCandidate) -> bool:
-        if not self._required_keys or not key.startswith("json:"):
-            return False
-        raw = (candidate.text if candidate.text is not None else candidate.response.text) or ""
-        try:
-            payload = json.loads(raw)
-        except json.JSONDecodeError:
-            return False
-        if not isinstance(payload, dict):
-            return False
-        return all(required_key in payload for required_key in self._required_keys)
+        candidate_key, complete = self._candidate_key(candidate)
+        return complete and candidate_key == key
+
+    def tally(self, *, quorum: int, expected: int) -> MajorityVoteTally:
+        """候補を 1 件ずつ投入できる逐次集計器を返す。"""
+
+        return MajorityVoteTally(self, quorum=quorum, expected=expected)
 
     def aggregate(
         self, candidates: Sequence[AggregationCandidate], *, tiebreaker: TieBreaker | None = None
@@ -76,20 +88,149 @@ class MajorityVoteStrategy:
         if not candidates:
             raise ValueError("majority_vote: candidates must be non-empty")
 
-        buckets: dict[str, list[AggregationCandidate]] = {}
-        completeness: dict[str, bool] = {}
-        for candidate in candidates:
-            key = self._bucket_key(candidate)
-            buckets.setdefault(key, []).append(candidate)
-            if key not in completeness:
-                completeness[key] = self._bucket_is_complete(key, candidate)
+        tally = self.tally(quorum=0, expected=len(candidates))
+        vectors = tally.embed(candidates)
+        for candidate, vector in zip(candidates, vectors, strict=True):
+            tally.add(candidate, vector=vector)
+        return tally.result(tiebreaker=tiebreaker)
+
+    @staticmethod
+    def from_string(kind: str, **kwargs: Any) -> AggregationStrategy:
+        from .registry import resolve_builtin_strategy
+
+        return resolve_builtin_strategy(kind, **kwargs)
+
+
+class MajorityVoteTally:
+    """多数決の逐次集計器。
+
+    候補 (または失敗による棄権) を到着順に ``add`` し、残り票数から
+    勝者と quorum 到達の可否が既に確定しているかを判定する。
+    """
+
+    def __init__(
+        self, strategy: MajorityVoteStrategy, *, quorum: int, expected: int
+    ) -> None:
+        self._strategy = strategy
+        self._quorum = quorum
+        self._remaining = expected
+        self._buckets: dict[str, list[AggregationCandidate]] = {}
+        self._completeness: dict[str, bool] = {}
+        self._candidates: list[AggregationCandidate] = []
+        similarity = strategy._similarity  # noqa: SLF001
+        self._similarity = similarity
+        self._index = similarity.index() if similarity is not None else None
+        self._merged = 0
+        # 埋め込みに 1 度失敗したら、この集計では類似度バケットを使わない
+        self._embedding_failed = False
+
+    @property
+    def remaining(self) -> int:
+        return self._remaining
+
+    def embed(
+        self, candidates: Sequence[AggregationCandidate | None]
+    ) -> list[list[float] | None]:
+        """類似度バケット用の埋め込みを 1 回の呼び出しでまとめて求める。
+
+        集計状態を参照しないため、呼び出し側のロック外で実行してよい。
+        類似度が無効な場合、埋め込みに失敗した場合、テキスト以外の候補は
+        ``None`` を返す。
+        """
+
+        vectors: list[list[float] | None] = [None] * len(candidates)
+        if self._similarity is None or self._embedding_failed:
+            return vectors
+        positions: list[int] = []
+        texts: list[str] = []
+        for position, candidate in enumerate(candidates):
+            if candidate is None:
+                continue
+            key, _ = self._strategy._candidate_key(candidate)  # noqa: SLF001
+            if key.startswith("text:"):
+                positions.append(position)
+                texts.append(self._vector_text(candidate))
+        embedded = self._similarity.vectors(texts)
+        if embedded is None:
+            self._embedding_failed = True
+            return vectors
+        for position, vector in zip(positions, embedded, strict=True):
+            vectors[position] = vector
+        return vectors
+
+    def add(
+        self,
+        candidate: AggregationCandidate | None,
+        *,
+        vector: list[float] | None = None,
+    ) -> None:
+        """候補を 1 件投入する。``None`` は有効な候補を返さなかった応答を表す。
+
+        ``vector`` には ``embed`` で事前計算した埋め込みを渡せる。
+        """
+
+        self._remaining = max(self._remaining - 1, 0)
+        if candidate is None:
+            return
+        key, complete = self._strategy._candidate_key(candidate)
+        if key not in self._buckets and key.startswith("text:"):
+            key = self._similar_key(key, candidate, vector)
+        self._buckets.setdefault(key, []).append(candidate)
+        self._completeness.setdefault(key, complete)
+        self._candidates.append(candidate)
+
+    def _vector_text(self, candidate: AggregationCandidate) -> str:
+        strategy = self._strategy
+        return strategy._normalize_text(strategy._candidate_text(candidate))  # noqa: SLF001
+
+    def _similar_key(
+        self, key: str, candidate: AggregationCandidate, vector: list[float] | None
+    ) -> str:
+        if self._similarity is None or self._index is None or self._embedding_failed:
+            return key
+        if vector is None:
+            vector = self._similarity.vector(self._vector_text(candidate))
+            if vector is None:
+                self._embedding_failed = True
+                return key
+        match = self._index.find(vector)
+        if match is not None:
+            self._merged += 1
+            return match
+        self._index.add(key, vector)
+        return key
+
+    def _leading_counts(self) -> tuple[int, int]:
+        counts = sorted((len(bucket) for bucket in self._buckets.values()), reverse=True)
+        leader = counts[0] if counts else 0
+        runner_up = counts[1] if len(counts) > 1 else 0
+        return leader, runner_up
+
+    def is_decided(self) -> bool:
+        """勝者が確定し、かつ quorum に到達済みなら True。"""
+
+        leader, runner_up = self._leading_counts()
+        if leader < self._quorum:
+            return False
+        # 残り全票が次点に流れても逆転・同数にならない
+        return leader > runner_up + self._remaining
+
+    def quorum_unreachable(self) -> bool:
+        """残り票をすべて最大バケットへ加えても quorum に届かなければ True。"""
+
+        leader, _ = self._leading_counts()
+        return leader + self._remaining < self._quorum
+
+    def result(self, *, tiebreaker: TieBreaker | None = None) -> AggregationResult:
+        if not self._candidates:
+            raise ValueError("majority_vote: candidates must be non-empty")
 
         max_bucket: list[AggregationCandidate] = []
         max_count = -1
         max_complete = False
-        for key, bucket in buckets.items():
+        for key, bucket in self._buckets.items():
             count = len(bucket)
-            bucket_complete = completeness.get(key, False)
+            bucket_complete = self._completeness.get(key, False)
             if count > max_count:
                 max_bucket = bucket
                 max_count = count
@@ -102,18 +243,19 @@ class MajorityVoteStrategy:
         chosen = max_bucket[0] if len(max_bucket) == 1 else breaker.break_tie(max_bucket)
         reason = f"majority_vote({max_count})"
         tie_used = None if len(max_bucket) == 1 else breaker.name
+        metadata: dict[str, Any] = {"bucket_size": max_count}
+        if self._merged:
+            metadata["similarity_merged"] = self._merged
 
         return AggregationResult(
             chosen=chosen,
-            candidates=list(candidates),
-            strategy=self.name,
+            candidates=list(self._candidates),
+            strategy=self._strategy.name,
             reason=reason,
             tie_breaker_used=tie_used,
-            metadata={"bucket_size": max_count},
+            metadata=metadata,
         )
 
-    @staticmethod
-    def from_string(kind: str, **kwargs: Any) -> AggregationStrategy:
-        from .registry import resolve_builtin_strategy
 
-        return resolve_builtin_strategy(kind, **kwargs)
+def _digest(value: str) -> str:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=16).hexdigest()
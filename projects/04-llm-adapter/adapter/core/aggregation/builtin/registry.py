@@ -2,13 +2,16 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Mapping
-from typing import Any, cast
+from typing import Any, cast, TYPE_CHECKING
 
 from .. import AggregationStrategy
 from .majority_vote import MajorityVoteStrategy
 from .max_score import MaxScoreStrategy
 from .weighted_vote import WeightedVoteStrategy
 
+if TYPE_CHECKING:
+    from ..similarity import SimilarityBucketer
+
 __all__ = [
     "StrategyFactory",
     "resolve_builtin_strategy",
@@ -21,7 +24,8 @@ StrategyFactory = Callable[..., AggregationStrategy]
 
 def _build_majority(**kwargs: Any) -> AggregationStrategy:
     schema = cast(Mapping[str, Any] | None, kwargs.get("schema"))
-    return MajorityVoteStrategy(schema=schema)
+    similarity = cast("SimilarityBucketer | None", kwargs.get("similarity"))
+    return MajorityVoteStrategy(schema=schema, similarity=similarity)
 
 
 def _build_max_score(**_kwargs: Any) -> AggregationStrategy:
@@ -31,7 +35,8 @@ def _build_max_score(**_kwargs: Any) -> AggregationStrategy:
 def _build_weighted(**kwargs: Any) -> AggregationStrategy:
     weights = cast(Mapping[str, float] | None, kwargs.get("provider_weights"))
     schema = cast(Mapping[str, Any] | None, kwargs.get("schema"))
-    return WeightedVoteStrategy(weights=weights, schema=schema)
+    learned = cast(Callable[[str], float | None] | None, kwargs.get("learned_weights"))
+    return WeightedVoteStrategy(weights=weights, schema=schema, learned_weights=learned)
 
 
 def _build_judge(**kwargs: Any) -> AggregationStrategy:
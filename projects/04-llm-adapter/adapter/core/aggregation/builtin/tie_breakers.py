@@ -1,7 +1,7 @@
 """組み込みタイブレーカー。"""
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 
 from .. import AggregationCandidate
 
@@ -18,14 +18,35 @@ class FirstTieBreaker:
 
 
 class MaxScoreTieBreaker:
+    """スコア最大の候補を選ぶ。
+
+    ``provider_scores`` を渡すと、スコア未設定の候補にプロバイダの事前スコア
+    (学習重みなど) を用いる。
+    """
+
     name = "max_score"
 
+    def __init__(
+        self, *, provider_scores: Callable[[str], float | None] | None = None
+    ) -> None:
+        self._provider_scores = provider_scores
+
+    def _score(self, candidate: AggregationCandidate) -> float | None:
+        if candidate.score is not None or self._provider_scores is None:
+            return candidate.score
+        return self._provider_scores(candidate.provider)
+
     def break_tie(self, candidates: Sequence[AggregationCandidate]) -> AggregationCandidate:
         if not candidates:
             raise ValueError("TieBreaker: candidates must be non-empty")
-        if any(c.score is not None for c in candidates):
+        scores = {id(c): self._score(c) for c in candidates}
+        if any(score is not None for score in scores.values()):
             return max(
                 candidates,
-                key=lambda c: (c.score is not None, float(c.score or float("-inf")), -c.index),
+                key=lambda c: (
+                    scores[id(c)] is not None,
+                    float(scores[id(c)] or float("-inf")),
+                    -c.index,
+                ),
             )
         return FirstTieBreaker().break_tie(candidates)
@@ -1,7 +1,7 @@
 """重み付き投票ストラテジ。"""
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
+from collections.abc import Callable, Mapping, Sequence
 from typing import Any, TYPE_CHECKING
 
 from .. import AggregationCandidate, AggregationResult, TieBreaker
@@ -23,12 +23,16 @@ class WeightedVoteStrategy:
         *,
         weights: Mapping[str, float] | None = None,
         schema: Mapping[str, Any] | None = None,
+        learned_weights: Callable[[str], float | None] | None = None,
     ) -> None:
         self._weights = dict(weights or {})
+        self._learned_weights = learned_weights
         self._majority = MajorityVoteStrategy(schema=schema)
 
     def _resolve_weight(self, provider: str) -> float:
         weight = self._weights.get(provider)
+        if weight is None and self._learned_weights is not None:
+            weight = self._learned_weights(provider)
         if weight is None:
             return 1.0
         return float(weight)
@@ -41,14 +45,14 @@ class WeightedVoteStrategy:
 
         buckets: dict[str, dict[str, Any]] = {}
         for candidate in candidates:
-            key = self._majority._bucket_key(candidate)  # noqa: SLF001
+            key, complete = self._majority._candidate_key(candidate)  # noqa: SLF001
             if key not in buckets:
                 buckets[key] = {
                     "candidates": [],
                     "weight": 0.0,
                     "text": (candidate.text if candidate.text is not None else candidate.response.text)
                     or "",
-                    "complete": self._majority._bucket_is_complete(key, candidate),  # noqa: SLF001
+                    "complete": complete,
                 }
             entry = buckets[key]
             entry["candidates"].append(candidate)
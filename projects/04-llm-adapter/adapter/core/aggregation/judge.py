@@ -12,6 +12,7 @@ from ..aggregation import (
     FirstTieBreaker,
     TieBreaker,
 )
+from .judge_cache import JudgeVerdictCache
 
 if TYPE_CHECKING:
     from ..aggregation import AggregationStrategy
@@ -69,6 +70,7 @@ class JudgeStrategy:
     LLM ジャッジにより最良を選ぶ。
     - provider_factory.create(model=...) で判定用プロバイダを作成
     - 候補を列挙したプロンプトを与え、選択インデックスを抽出
+    - verdict_cache があれば同一候補列への判定を再利用
     """
 
     name = "judge"
@@ -80,11 +82,14 @@ class JudgeStrategy:
         provider_factory: JudgeProviderFactory,
         prompt_template: str | None = None,
         request_factory: RequestFactory | None = None,
+        verdict_cache: JudgeVerdictCache | None = None,
     ) -> None:
         self._model = model
         self._provider_factory = provider_factory
         self._prompt_template = prompt_template or DEFAULT_JUDGE_TEMPLATE
         self._request_factory = request_factory or _default_request_factory
+        self._verdict_cache = verdict_cache
+        self._judge: JudgeProvider | None = None
 
     def aggregate(
         self, candidates: Sequence[AggregationCandidate], *, tiebreaker: TieBreaker | None = None
@@ -92,15 +97,29 @@ class JudgeStrategy:
         if not candidates:
             raise ValueError("judge: candidates must be non-empty")
 
+        texts: list[str] = []
         rows: list[str] = []
         for index, candidate in enumerate(candidates, start=1):
             raw = candidate.text if candidate.text is not None else candidate.response.text
             text = raw.strip()
+            texts.append(text)
             rows.append(f"{index}. {text}")
 
+        cache_key: str | None = None
+        if self._verdict_cache is not None:
+            # 提示順で判定が変わり得るため、候補の並びもキーに含める
+            cache_key = JudgeVerdictCache.key(self._model, self._prompt_template, texts)
+            cached = self._verdict_cache.get(cache_key)
+            if cached is not None:
+                cached_index = cached.get("index")
+                if isinstance(cached_index, int) and 0 <= cached_index < len(candidates):
+                    return self._selected(
+                        candidates, cached_index, str(cached.get("raw", "")), cached=True
+                    )
+
         prompt = self._prompt_template.format(candidates="\n".join(rows))
 
-        judge = self._provider_factory.create(model=self._model)
+        judge = self._get_judge()
         request = self._request_factory(
             model=self._model,
             prompt=prompt,
@@ -122,15 +141,33 @@ class JudgeStrategy:
                 metadata={"judge_raw": response.text},
             )
 
-        index = index_or_none
-        chosen = candidates[index]
+        if self._verdict_cache is not None and cache_key is not None:
+            self._verdict_cache.put(cache_key, {"index": index_or_none, "raw": response.text})
+        return self._selected(candidates, index_or_none, response.text, cached=False)
+
+    def _get_judge(self) -> JudgeProvider:
+        if self._judge is None:
+            self._judge = self._provider_factory.create(model=self._model)
+        return self._judge
+
+    def _selected(
+        self,
+        candidates: Sequence[AggregationCandidate],
+        index: int,
+        raw: str,
+        *,
+        cached: bool,
+    ) -> AggregationResult:
+        metadata: dict[str, Any] = {"judge_raw": raw}
+        if cached:
+            metadata["judge_cached"] = True
         return AggregationResult(
-            chosen=chosen,
+            chosen=candidates[index],
             candidates=list(candidates),
             strategy=self.name,
             reason=f"judge selected {index + 1}",
             tie_breaker_used=None,
-            metadata={"judge_raw": response.text},
+            metadata=metadata,
         )
 
     @staticmethod
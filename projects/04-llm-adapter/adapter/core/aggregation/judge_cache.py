@@ -0,0 +1,82 @@
+"""LLM ジャッジ判定のキャッシュ。"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+import hashlib
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+__all__ = ["JudgeVerdictCache", "text_digest"]
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class JudgeVerdictCache:
+    """(ジャッジモデル, テンプレート, 候補ハッシュ列) をキーに判定結果を保持する。
+
+    ``path`` を指定すると JSONL へ追記し、次回起動時に読み戻す。
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._lock = Lock()
+        if path is not None and path.exists():
+            self._load(path)
+
+    @staticmethod
+    def key(
+        model: str,
+        template: str,
+        texts: Iterable[str],
+        *,
+        ordered: bool = True,
+    ) -> str:
+        """判定キーを返す。``ordered=False`` なら候補順を問わず同一キーになる。"""
+
+        digests = [text_digest(text) for text in texts]
+        if not ordered:
+            digests.sort()
+        payload = json.dumps(
+            [model, text_digest(template), digests], separators=(",", ":")
+        )
+        return text_digest(payload)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+        return dict(entry) if entry is not None else None
+
+    def put(self, key: str, value: Mapping[str, Any]) -> None:
+        entry = dict(value)
+        with self._lock:
+            if self._entries.get(key) == entry:
+                return
+            self._entries[key] = entry
+            if self._path is None:
+                return
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.open("a", encoding="utf-8") as fp:
+                fp.write(json.dumps({"key": key, "value": entry}, ensure_ascii=False))
+                fp.write("\n")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self, path: Path) -> None:
+        with path.open("r", encoding="utf-8") as fp:
+            for line in fp:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                key = record.get("key")
+                value = record.get("value")
+                if isinstance(key, str) and isinstance(value, dict):
+                    self._entries[key] = value
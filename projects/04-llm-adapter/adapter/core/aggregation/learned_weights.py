@@ -0,0 +1,280 @@
+"""履歴メトリクスから学習したプロバイダ重みテーブル。
+
+``runs-metrics.jsonl`` の ``eval.exact_match`` を (provider, prompt_id) 単位で
+集計し、固定長スロットのオープンアドレス法ハッシュ表としてファイルへ保存する。
+集約時はファイルを mmap して 1 回のハッシュ計算と数スロットの読み出しで
+重みを引くため、ランごとに履歴を再集計することはない。
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+import hashlib
+import json
+import mmap
+import os
+from pathlib import Path
+import struct
+import tempfile
+from threading import Lock
+
+try:  # pragma: no cover - プラットフォーム依存
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+__all__ = [
+    "DEFAULT_MIN_SAMPLES",
+    "ProviderScoreLookup",
+    "ProviderScoreTable",
+    "main",
+    "update_learned_weights",
+]
+
+DEFAULT_MIN_SAMPLES = 3
+
+ProviderScoreLookup = Callable[[str], float | None]
+
+_MAGIC = b"LLMAWT02"
+# magic, capacity, metrics offset, entries, metrics inode
+_HEADER = struct.Struct("<8sQQQQ")
+_SLOT = struct.Struct("<QII")  # key hash, correct, total
+_ANY_CATEGORY = "*"
+
+_Counts = dict[int, list[int]]
+
+
+def _slot_key(provider: str, category: str) -> int:
+    digest = hashlib.blake2b(
+        f"{provider}\x00{category}".encode(), digest_size=8
+    ).digest()
+    # 0 は空きスロットを表すため使わない
+    return int.from_bytes(digest, "little") or 1
+
+
+def _capacity_for(entries: int) -> int:
+    capacity = 16
+    while capacity < entries * 2:
+        capacity *= 2
+    return capacity
+
+
+class ProviderScoreTable:
+    """mmap した重みテーブルを O(1) で引く読み取り専用ビュー。"""
+
+    def __init__(self, path: Path, *, min_samples: int = DEFAULT_MIN_SAMPLES) -> None:
+        self._path = path
+        self._min_samples = max(min_samples, 1)
+        self._file = path.open("rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"learned weight table is empty: {path}") from None
+        magic, capacity, offset, entries, _inode = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or capacity & (capacity - 1):
+            self.close()
+            raise ValueError(f"invalid learned weight table: {path}")
+        self._capacity = capacity
+        self.metrics_offset = offset
+        self.entries = entries
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def counts(self, provider: str, category: str | None = None) -> tuple[int, int]:
+        """(正解数, 評価数) を返す。未登録なら (0, 0)。"""
+
+        key = _slot_key(provider, category or _ANY_CATEGORY)
+        mask = self._capacity - 1
+        position = key & mask
+        for _ in range(self._capacity):
+            slot_key, correct, total = _SLOT.unpack_from(
+                self._map, _HEADER.size + position * _SLOT.size
+            )
+            if slot_key == key:
+                return correct, total
+            if slot_key == 0:
+                break
+            position = (position + 1) & mask
+        return 0, 0
+
+    def weight(self, provider: str, category: str | None = None) -> float | None:
+        """Laplace 平滑化した正答率。サンプル不足のカテゴリは全体値へ退避する。"""
+
+        if category is not None:
+            correct, total = self.counts(provider, category)
+            if total >= self._min_samples:
+                return (correct + 1) / (total + 2)
+        correct, total = self.counts(provider)
+        if total == 0:
+            return None
+        return (correct + 1) / (total + 2)
+
+    def scores_for(self, category: str | None) -> ProviderScoreLookup:
+        """カテゴリを固定した provider -> 重みの参照関数を返す。"""
+
+        def lookup(provider: str) -> float | None:
+            return self.weight(provider, category)
+
+        return lookup
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None  # type: ignore[assignment]
+        self._file.close()
+
+
+def _read_counts(path: Path) -> tuple[_Counts, int, int]:
+    counts: _Counts = {}
+    with path.open("rb") as fp:
+        data = fp.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"invalid learned weight table: {path}")
+    magic, capacity, offset, _entries, inode = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC:
+        raise ValueError(f"invalid learned weight table: {path}")
+    for position in range(capacity):
+        key, correct, total = _SLOT.unpack_from(data, _HEADER.size + position * _SLOT.size)
+        if key:
+            counts[key] = [correct, total]
+    return counts, offset, inode
+
+
+def _write_counts(path: Path, counts: _Counts, offset: int, inode: int) -> None:
+    capacity = _capacity_for(len(counts))
+    buffer = bytearray(_HEADER.size + capacity * _SLOT.size)
+    _HEADER.pack_into(buffer, 0, _MAGIC, capacity, offset, len(counts), inode)
+    mask = capacity - 1
+    for key, (correct, total) in counts.items():
+        position = key & mask
+        while _SLOT.unpack_from(buffer, _HEADER.size + position * _SLOT.size)[0]:
+            position = (position + 1) & mask
+        _SLOT.pack_into(buffer, _HEADER.size + position * _SLOT.size, key, correct, total)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 一時ファイル名を書き手ごとに分け、並行更新が同じファイルを書き潰さないようにする
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+    ) as fp:
+        fp.write(buffer)
+    try:
+        # mmap 済みの読者は旧 inode を参照し続けるため、置き換えは原子的で安全
+        os.replace(fp.name, path)
+    except BaseException:
+        Path(fp.name).unlink(missing_ok=True)
+        raise
+
+
+def _iter_new_records(metrics_path: Path, offset: int) -> Iterable[tuple[dict[str, object], int]]:
+    with metrics_path.open("rb") as fp:
+        fp.seek(offset)
+        for raw in fp:
+            if not raw.endswith(b"\n"):
+                # 書き込み途中の行は次回の更新で読む
+                return
+            offset += len(raw)
+            line = raw.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                yield {}, offset
+                continue
+            yield (record if isinstance(record, dict) else {}), offset
+
+
+_update_lock = Lock()
+
+
+@contextmanager
+def _table_lock(table_path: Path) -> Iterator[None]:
+    """テーブルの読み込みから置き換えまでをスレッド間・プロセス間で直列化する。"""
+
+    with _update_lock:
+        if fcntl is None:
+            yield
+            return
+        table_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = table_path.with_name(table_path.name + ".lock")
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+
+def update_learned_weights(table_path: Path, metrics_path: Path) -> int:
+    """未反映のメトリクス行だけを読んでテーブルを更新し、反映した評価数を返す。
+
+    メトリクスファイルが縮んだか inode が変わっていれば (ローテーション等)
+    先頭から再構築する。旧形式のテーブルも再構築する。同じテーブルを複数
+    プロセスが更新しても、POSIX ではロックファイルで直列化される。
+    """
+
+    with _table_lock(table_path):
+        counts: _Counts = {}
+        offset = 0
+        stored_inode = 0
+        exists = table_path.exists()
+        if exists:
+            try:
+                counts, offset, stored_inode = _read_counts(table_path)
+            except ValueError:
+                exists = False
+        if metrics_path.exists():
+            stat = metrics_path.stat()
+            size, inode = stat.st_size, stat.st_ino
+        else:
+            size, inode = 0, 0
+        rebuilt = size < offset or (offset > 0 and stored_inode != inode)
+        if rebuilt:
+            counts, offset = {}, 0
+        if size == offset and exists and not rebuilt:
+            return 0
+        added = 0
+        consumed = offset
+        if size > offset:
+            for record, end in _iter_new_records(metrics_path, offset):
+                consumed = end
+                evaluation = record.get("eval")
+                if not isinstance(evaluation, dict):
+                    continue
+                matched = evaluation.get("exact_match")
+                if not isinstance(matched, bool):
+                    continue
+                provider = str(record.get("provider") or "")
+                if not provider:
+                    continue
+                categories = [_ANY_CATEGORY]
+                prompt_id = record.get("prompt_id")
+                if prompt_id:
+                    categories.append(str(prompt_id))
+                for category in categories:
+                    entry = counts.setdefault(_slot_key(provider, category), [0, 0])
+                    entry[0] += int(matched)
+                    entry[1] += 1
+                added += 1
+        # 評価行が 0 件でもオフセットは進め、同じ行を読み直さない
+        _write_counts(table_path, counts, consumed, inode)
+        return added
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="履歴メトリクスから学習重みテーブルを更新する")
+    parser.add_argument("--metrics", required=True, help="runs-metrics.jsonl のパス")
+    parser.add_argument("--out", required=True, help="重みテーブルの出力先")
+    args = parser.parse_args(argv)
+    added = update_learned_weights(
+        Path(args.out).expanduser(), Path(args.metrics).expanduser()
+    )
+    print(f"{added} 件の評価結果を反映しました")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI
+    raise SystemExit(main())
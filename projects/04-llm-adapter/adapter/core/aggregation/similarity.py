@@ -0,0 +1,223 @@
+"""意味的に同等な候補をまとめる類似度バケット化。"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import lru_cache
+import logging
+import math
+import os
+import re
+from typing import Any, Protocol, runtime_checkable
+import zlib
+
+try:
+    import numpy as _np
+except ModuleNotFoundError:  # pragma: no cover - NumPy 未導入時は純 Python で計算
+    _np = None
+
+__all__ = [
+    "DEFAULT_SIMILARITY_THRESHOLD",
+    "HashedNgramEmbedder",
+    "OllamaEmbedder",
+    "SimilarityBucketer",
+    "SimilarityIndex",
+    "TextEmbedder",
+    "build_consensus_similarity",
+    "build_similarity_bucketer",
+]
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.9
+
+LOGGER = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@runtime_checkable
+class TextEmbedder(Protocol):
+    """テキスト列をベクトル列へ変換する。"""
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        ...
+
+
+def _l2_normalize(vector: Sequence[float]) -> list[float]:
+    norm = math.sqrt(sum(value * value for value in vector))
+    if norm == 0.0:
+        return [0.0 for _ in vector]
+    return [value / norm for value in vector]
+
+
+class HashedNgramEmbedder:
+    """文字 n-gram を特徴ハッシュした L2 正規化ベクトル (外部依存なし)。"""
+
+    def __init__(self, *, dim: int = 512, ngram: int = 3) -> None:
+        if dim <= 0 or ngram <= 0:
+            raise ValueError("dim and ngram must be positive")
+        self._dim = dim
+        self._ngram = ngram
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> list[float]:
+        normalized = _WHITESPACE_RE.sub(" ", text.strip().lower())
+        padded = f" {normalized} "
+        vector = [0.0] * self._dim
+        span = max(len(padded) - self._ngram + 1, 1)
+        for start in range(span):
+            gram = padded[start : start + self._ngram]
+            vector[zlib.crc32(gram.encode("utf-8")) % self._dim] += 1.0
+        return _l2_normalize(vector)
+
+
+class OllamaEmbedder:
+    """ローカル Ollama の /api/embed を利用する埋め込み。"""
+
+    def __init__(
+        self,
+        model: str,
+        *,
+        client: Any | None = None,
+        host: str | None = None,
+        timeout: float = 30.0,
+    ) -> None:
+        if client is None:
+            from ..providers._requests_compat import create_session
+            from ..providers.ollama_client import OllamaClient
+            from ..providers.ollama_connection import DEFAULT_HOST
+
+            resolved_host = (
+                host
+                or os.getenv("OLLAMA_BASE_URL")
+                or os.getenv("OLLAMA_HOST")
+                or DEFAULT_HOST
+            )
+            client = OllamaClient(
+                host=resolved_host,
+                session=create_session(),
+                timeout=timeout,
+                pull_timeout=timeout,
+            )
+        self._client = client
+        self._model = model
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        response = self._client.embed({"model": self._model, "input": list(texts)})
+        try:
+            payload = response.json()
+        finally:
+            response.close()
+        embeddings = payload.get("embeddings") if isinstance(payload, dict) else None
+        if not isinstance(embeddings, list) or len(embeddings) != len(texts):
+            raise ValueError("invalid embeddings payload from Ollama")
+        return [_l2_normalize([float(value) for value in row]) for row in embeddings]
+
+
+class SimilarityIndex:
+    """代表ベクトルと閾値以上のコサイン類似度を持つバケットを探す。"""
+
+    def __init__(self, threshold: float) -> None:
+        self._threshold = threshold
+        self._keys: list[str] = []
+        self._rows: list[list[float]] = []
+        self._matrix: Any = None
+
+    def find(self, vector: Sequence[float]) -> str | None:
+        if not self._keys:
+            return None
+        if _np is not None:
+            if self._matrix is None:
+                self._matrix = _np.asarray(self._rows, dtype=_np.float32)
+            scores = self._matrix @ _np.asarray(vector, dtype=_np.float32)
+            best = int(scores.argmax())
+            best_score = float(scores[best])
+        else:
+            best, best_score = 0, -1.0
+            for position, row in enumerate(self._rows):
+                score = sum(left * right for left, right in zip(row, vector, strict=True))
+                if score > best_score:
+                    best, best_score = position, score
+        if best_score >= self._threshold:
+            return self._keys[best]
+        return None
+
+    def add(self, key: str, vector: Sequence[float]) -> None:
+        self._keys.append(key)
+        self._rows.append(list(vector))
+        self._matrix = None
+
+
+class SimilarityBucketer:
+    """埋め込みと閾値から候補ごとの類似度インデックスを構築する。
+
+    埋め込みに失敗した場合 (Ollama 停止中など) は ``None`` を返し、呼び出し側は
+    そのバッチを完全一致・正規化テキストのバケットで集計する。警告は 1 回だけ出す。
+    """
+
+    def __init__(
+        self,
+        embedder: TextEmbedder,
+        *,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    ) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("similarity threshold must be in (0, 1]")
+        self._embedder = embedder
+        self._threshold = threshold
+        self._warned = False
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    def index(self) -> SimilarityIndex:
+        return SimilarityIndex(self._threshold)
+
+    def vector(self, text: str) -> list[float] | None:
+        vectors = self.vectors([text])
+        return vectors[0] if vectors is not None else None
+
+    def vectors(self, texts: Sequence[str]) -> list[list[float]] | None:
+        """重複を除いた 1 回の ``embed`` 呼び出しでまとめて埋め込む。
+
+        埋め込みに失敗した場合は ``None`` を返す。
+        """
+
+        unique = list(dict.fromkeys(texts))
+        if not unique:
+            return []
+        try:
+            embedded = dict(zip(unique, self._embedder.embed(unique), strict=True))
+        except Exception as exc:  # noqa: BLE001 - 埋め込みの失敗で集約全体を落とさない
+            if not self._warned:
+                self._warned = True
+                LOGGER.warning(
+                    "埋め込みに失敗したため類似度バケットを使わずに集計します: %s", exc
+                )
+            return None
+        return [embedded[text] for text in texts]
+
+
+@lru_cache(maxsize=8)
+def build_similarity_bucketer(threshold: float, embedder: str | None = None) -> SimilarityBucketer:
+    """``embedder`` は ``ngram`` (既定) または ``ollama:<model>``。"""
+
+    spec = (embedder or "ngram").strip()
+    if spec == "ngram":
+        return SimilarityBucketer(HashedNgramEmbedder(), threshold=threshold)
+    if spec.startswith("ollama:") and spec[len("ollama:") :].strip():
+        model = spec[len("ollama:") :].strip()
+        return SimilarityBucketer(OllamaEmbedder(model), threshold=threshold)
+    raise ValueError(f"unknown similarity embedder: {embedder}")
+
+
+def build_consensus_similarity(config: object) -> SimilarityBucketer | None:
+    """RunnerConfig の similarity_* 設定から共有バケッタを返す。"""
+
+    threshold = getattr(config, "similarity_threshold", None)
+    if threshold is None:
+        return None
+    return build_similarity_bucketer(
+        float(threshold), getattr(config, "similarity_embedder", None)
+    )
@@ -1,7 +1,7 @@
 """組み込み集約ストラテジの互換レイヤー。"""
 from __future__ import annotations
 
-from .builtin.majority_vote import MajorityVoteStrategy
+from .builtin.majority_vote import MajorityVoteStrategy, MajorityVoteTally
 from .builtin.max_score import MaxScoreStrategy
 from .builtin.registry import resolve_builtin_strategy
 from .builtin.tie_breakers import FirstTieBreaker, MaxScoreTieBreaker
@@ -11,6 +11,7 @@ __all__ = [
     "FirstTieBreaker",
     "MaxScoreTieBreaker",
     "MajorityVoteStrategy",
+    "MajorityVoteTally",
     "MaxScoreStrategy",
     "WeightedVoteStrategy",
     "resolve_builtin_strategy",
@@ -32,6 +32,9 @@ class AggregationController:
             judge_factory_builder=judge_factory_builder,
         )
 
+    def refresh_learned_weights(self, table_path: Path | None, metrics_path: Path) -> None:
+        self._selector.refresh_learned_weights(table_path, metrics_path)
+
     def apply(
         self,
         *,
@@ -107,6 +110,14 @@ class AggregationController:
         meta["aggregate_hash"] = hash_text(aggregate_output)
         if selection.votes is not None:
             meta["aggregate_votes"] = selection.votes
+        if selection.judge is not None:
+            # ジャッジ呼び出しの所要時間はプロバイダ遅延と分けて記録する
+            meta["judge_scoring"] = {
+                "latency_ms": selection.judge.latency_ms,
+                "calls": selection.judge.calls,
+                "batched": selection.judge.batched,
+                "cache_hits": selection.judge.cache_hits,
+            }
         if resolved_mode == "consensus":
             quorum_value = config.quorum if config.quorum is not None else 2
             meta["aggregate_quorum"] = quorum_value
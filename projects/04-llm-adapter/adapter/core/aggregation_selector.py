@@ -10,10 +10,20 @@ from typing import Any, TYPE_CHECKING
 
 from . import aggregation as aggregation_module
 from .aggregation import AggregationResult, AggregationStrategy, TieBreaker
+from .aggregation.builtin.registry import STRATEGY_ALIASES
+from .aggregation.judge_cache import JudgeVerdictCache
+from .aggregation.learned_weights import (
+    ProviderScoreLookup,
+    ProviderScoreTable,
+    update_learned_weights,
+)
+from .aggregation.similarity import build_consensus_similarity
 from .aggregation_selector_components import (
     CandidateBuilder,
     JudgeProviderFactory,
+    JudgeProviderPool,
     JudgeScorer,
+    JudgeScoring,
     SchemaCache,
     TieBreakerFactory,
 )
@@ -29,6 +39,7 @@ class AggregationDecision:
     decision: AggregationResult
     lookup: Mapping[int, SingleRunResult]
     votes: float | int | None
+    judge: JudgeScoring | None = None
 
 
 class AggregationSelector:
@@ -45,7 +56,12 @@ class AggregationSelector:
         self._candidate_builder = candidate_builder or CandidateBuilder()
         self._tie_breaker_factory = tie_breaker_factory or TieBreakerFactory()
         self._schema_cache = schema_cache or SchemaCache()
-        self._judge_scorer = judge_scorer or JudgeScorer(judge_factory_builder)
+        self._judge_pool = JudgeProviderPool(judge_factory_builder)
+        self._judge_scorer = judge_scorer or JudgeScorer(
+            judge_factory_builder, judge_pool=self._judge_pool
+        )
+        self._verdict_caches: dict[Path, JudgeVerdictCache] = {}
+        self._score_tables: dict[Path, ProviderScoreTable] = {}
 
     def select(
         self,
@@ -62,21 +78,30 @@ class AggregationSelector:
         if not candidates:
             return None
         mode_value = mode.value if isinstance(mode, Enum) else mode
+        provider_scores = self._provider_scores(config, lookup)
         strategy = self._resolve_aggregation_strategy(
             mode,
             config,
             default_judge_config=default_judge_config,
+            provider_scores=provider_scores,
         )
         if strategy is None:
             return None
         score_metadata: dict[str, float] | None = None
+        judge_scoring: JudgeScoring | None = None
         if strategy.name == "max_score":
-            score_metadata = self._judge_scorer.score(
+            judge_scoring = self._judge_scorer.measure(
                 candidates,
                 config=config,
                 default_judge_config=default_judge_config,
+                verdict_cache=self._verdict_cache(config),
             )
-        tiebreaker = self._tie_breaker_factory.create(config, lookup)
+            score_metadata = judge_scoring.scores
+        tiebreaker = (
+            self._tie_breaker_factory.create(config, lookup, provider_scores=provider_scores)
+            if provider_scores is not None
+            else self._tie_breaker_factory.create(config, lookup)
+        )
         decision = strategy.aggregate(candidates, tiebreaker=tiebreaker)
         aggregate_kind = (config.aggregate or "").strip().lower().replace("-", "_")
         alias_to_preferred = {
@@ -138,7 +163,9 @@ class AggregationSelector:
                     )
             if votes is not None and not is_weighted:
                 votes = int(votes)
-        return AggregationDecision(decision=decision, lookup=lookup, votes=votes)
+        return AggregationDecision(
+            decision=decision, lookup=lookup, votes=votes, judge=judge_scoring
+        )
 
     @staticmethod
     def _resolve_tie_breaker(
@@ -154,6 +181,7 @@ class AggregationSelector:
         config: RunnerConfig,
         *,
         default_judge_config: ProviderConfig | None,
+        provider_scores: ProviderScoreLookup | None = None,
     ) -> AggregationStrategy | None:
         del mode
         aggregate_raw = config.aggregate
@@ -173,11 +201,12 @@ class AggregationSelector:
                     attr_name,
                     getattr(aggregation_module, attr_name),
                 )
-            factory = self._judge_factory_builder(judge_config)
+            factory = self._judge_pool.factory(judge_config)
             return AggregationStrategy.from_string(
                 aggregate,
                 model=judge_config.model,
                 provider_factory=factory,
+                verdict_cache=self._verdict_cache(config),
             )
         schema_data = self._schema_cache.load(getattr(config, "schema", None))
         provider_weights = getattr(config, "provider_weights", None)
@@ -185,15 +214,65 @@ class AggregationSelector:
         normalized = aggregate.lower().replace("-", "_") if aggregate else ""
         if normalized in {"weighted_vote", "weighted"}:
             extra["provider_weights"] = provider_weights
+            if provider_scores is not None:
+                extra["learned_weights"] = provider_scores
+        similarity = build_consensus_similarity(config)
+        if similarity is not None and normalized in STRATEGY_ALIASES["majority_vote"]:
+            extra["similarity"] = similarity
         return AggregationStrategy.from_string(aggregate, **extra)
 
     def _load_schema(self, schema_path: Path | None) -> Mapping[str, Any] | None:
         return self._schema_cache.load(schema_path)
 
+    def refresh_learned_weights(self, table_path: Path | None, metrics_path: Path) -> None:
+        """ラン開始時に学習重みテーブルへ未反映のメトリクスを取り込む。
+
+        ラン中の ``select`` はマップ済みテーブルを読むだけで、更新は行わない。
+        """
+
+        if table_path is None:
+            return
+        if metrics_path.exists():
+            # 前回以降に追記されたメトリクスだけを差分反映する
+            update_learned_weights(table_path, metrics_path)
+        table = self._score_tables.pop(table_path, None)
+        if table is not None:
+            table.close()
+
+    def _provider_scores(
+        self,
+        config: RunnerConfig,
+        lookup: Mapping[int, SingleRunResult],
+    ) -> ProviderScoreLookup | None:
+        table_path = getattr(config, "learned_weights", None)
+        if table_path is None:
+            return None
+        table = self._score_tables.get(table_path)
+        if table is None:
+            if not table_path.exists():
+                return None
+            table = ProviderScoreTable(table_path)
+            self._score_tables[table_path] = table
+        category = next(
+            (result.metrics.prompt_id for result in lookup.values()), None
+        )
+        return table.scores_for(category)
+
+    def _verdict_cache(self, config: RunnerConfig) -> JudgeVerdictCache | None:
+        path = getattr(config, "judge_cache", None)
+        if path is None:
+            # 未指定時は従来どおり毎回ジャッジへ問い合わせる
+            return None
+        cache = self._verdict_caches.get(path)
+        if cache is None:
+            cache = JudgeVerdictCache(path)
+            self._verdict_caches[path] = cache
+        return cache
+
+
 
 __all__ = [
     "AggregationDecision",
     "AggregationSelector",
     "JudgeProviderFactory",
 ]
-
@@ -3,11 +3,22 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import json
+import math
 from pathlib import Path
+from threading import Lock
+import time
 from typing import Any, cast, Protocol, TYPE_CHECKING
 
-from .aggregation import AggregationCandidate, FirstTieBreaker, TieBreaker
+from .aggregation import (
+    AggregationCandidate,
+    FirstTieBreaker,
+    MaxScoreTieBreaker,
+    TieBreaker,
+)
+from .aggregation.judge_cache import JudgeVerdictCache, text_digest
 from .providers import ProviderResponse as JudgeProviderResponse
 from .runner_execution import SingleRunResult
 
@@ -48,14 +59,90 @@ class CandidateBuilder:
         return candidates
 
 
+DEFAULT_BATCH_SCORE_TEMPLATE = (
+    """You are a strict evaluator.
+Score every candidate below for overall quality on a scale from 0.0 to 1.0.
+
+Candidates:
+{candidates}
+
+Rules:
+- Output only a JSON array with exactly {count} numbers, one per candidate, in order.
+- Do not add explanations.
+""".strip()
+)
+
+
+@dataclass(slots=True)
+class JudgeScoring:
+    """ジャッジ採点の結果と所要時間."""
+
+    scores: dict[str, float]
+    latency_ms: int
+    calls: int
+    batched: bool
+    cache_hits: int = 0
+
+
+class _ReusingJudgeFactory:
+    def __init__(self, factory: JudgeProviderFactory) -> None:
+        self._factory = factory
+        self._instances: dict[str, object] = {}
+        self._lock = Lock()
+
+    def create(self, *, model: str) -> object:
+        with self._lock:
+            instance = self._instances.get(model)
+            if instance is None:
+                instance = self._factory.create(model=model)
+                self._instances[model] = instance
+            return instance
+
+
+class JudgeProviderPool:
+    """ジャッジ設定ごとにファクトリとプロバイダ実体を再利用する."""
+
+    def __init__(
+        self,
+        judge_factory_builder: Callable[[ProviderConfig], JudgeProviderFactory] | None,
+    ) -> None:
+        self._judge_factory_builder = judge_factory_builder
+        self._factories: dict[tuple[str, str, str, str | None], _ReusingJudgeFactory] = {}
+        self._lock = Lock()
+
+    @property
+    def available(self) -> bool:
+        return self._judge_factory_builder is not None
+
+    def factory(self, judge_config: ProviderConfig) -> JudgeProviderFactory:
+        if self._judge_factory_builder is None:
+            raise ValueError("judge_factory_builder must be provided for judge aggregation")
+        key = (
+            judge_config.provider,
+            judge_config.model,
+            str(judge_config.path),
+            judge_config.endpoint,
+        )
+        with self._lock:
+            factory = self._factories.get(key)
+            if factory is None:
+                factory = _ReusingJudgeFactory(self._judge_factory_builder(judge_config))
+                self._factories[key] = factory
+            return factory
+
+
 class JudgeScorer:
     """LLM ジャッジを介して候補へスコアを付与する."""
 
     def __init__(
         self,
         judge_factory_builder: Callable[[ProviderConfig], JudgeProviderFactory] | None,
+        *,
+        batch_template: str | None = None,
+        judge_pool: JudgeProviderPool | None = None,
     ) -> None:
-        self._judge_factory_builder = judge_factory_builder
+        self._judge_pool = judge_pool or JudgeProviderPool(judge_factory_builder)
+        self._batch_template = batch_template or DEFAULT_BATCH_SCORE_TEMPLATE
 
     def score(
         self,
@@ -64,30 +151,194 @@ class JudgeScorer:
         config: RunnerConfig,
         default_judge_config: ProviderConfig | None,
     ) -> dict[str, float]:
+        return self.measure(
+            candidates, config=config, default_judge_config=default_judge_config
+        ).scores
+
+    def measure(
+        self,
+        candidates: Sequence[AggregationCandidate],
+        *,
+        config: RunnerConfig,
+        default_judge_config: ProviderConfig | None,
+        verdict_cache: JudgeVerdictCache | None = None,
+    ) -> JudgeScoring:
         judge_config = config.judge_provider or default_judge_config
         if judge_config is None:
             raise ValueError("max_score aggregation requires judge provider configuration")
-        if self._judge_factory_builder is None:
+        if not self._judge_pool.available:
             raise ValueError("judge_factory_builder must be provided for max_score aggregation")
-        factory = self._judge_factory_builder(judge_config)
-        judge = factory.create(model=judge_config.model)
+        judge = self._judge_pool.factory(judge_config).create(model=judge_config.model)
         invoke = getattr(judge, "invoke", None)
         if not callable(invoke):
             raise ValueError("judge instance must expose invoke(request)")
-        scores: dict[str, float] = {}
         mode_value = _resolve_mode_value(getattr(config, "mode", ""))
-        for candidate in candidates:
-            request = {
+        texts = [
+            (candidate.text if candidate.text is not None else candidate.response.text) or ""
+            for candidate in candidates
+        ]
+        started = time.perf_counter()
+        calls = 0
+        cache_hits = 0
+        values: list[float | None] | None = None
+        if getattr(config, "judge_batch", False) and len(candidates) > 1:
+            # 候補の並び順が変わっても同じ判定を引けるよう、順序非依存のキーで
+            # 候補テキストのダイジェストごとにスコアを保持する
+            batch_key = JudgeVerdictCache.key(
+                judge_config.model, self._batch_template, texts, ordered=False
+            )
+            cached = verdict_cache.get(batch_key) if verdict_cache is not None else None
+            batched_scores = self._cached_batch_scores(cached, texts)
+            if batched_scores is not None:
+                cache_hits += 1
+            else:
+                calls += 1
+                try:
+                    batch_response = invoke(self._build_batch_request(candidates, mode_value))
+                except Exception:  # noqa: BLE001 - 一括採点の失敗は個別採点で補う
+                    batch_response = None
+                batched_scores = (
+                    self._extract_batch_scores(batch_response, expected=len(candidates))
+                    if batch_response is not None
+                    else None
+                )
+                if batched_scores is not None and verdict_cache is not None:
+                    verdict_cache.put(
+                        batch_key,
+                        {
+                            "scores": {
+                                text_digest(text): score
+                                for text, score in zip(texts, batched_scores, strict=True)
+                            }
+                        },
+                    )
+            if batched_scores is not None:
+                values = list(batched_scores)
+        batched = values is not None
+        if values is None:
+            # 単体採点は候補順に依存しないため、候補テキスト単位でキャッシュする
+            score_template = f"quality_score:{mode_value}"
+            keys = [
+                JudgeVerdictCache.key(judge_config.model, score_template, [text])
+                for text in texts
+            ]
+            values = [None] * len(candidates)
+            pending: list[int] = []
+            for position, key in enumerate(keys):
+                entry = verdict_cache.get(key) if verdict_cache is not None else None
+                score = entry.get("score") if entry is not None else None
+                if isinstance(score, (int, float)) and not isinstance(score, bool):  # noqa: UP038
+                    values[position] = float(score)
+                    cache_hits += 1
+                else:
+                    pending.append(position)
+            fresh = self._score_each(
+                invoke,
+                [candidates[position] for position in pending],
+                mode_value,
+                max_workers=getattr(config, "max_concurrency", None),
+            )
+            calls += len(pending)
+            for position, score in zip(pending, fresh, strict=True):
+                values[position] = score
+                if score is not None and verdict_cache is not None:
+                    verdict_cache.put(keys[position], {"score": score})
+        latency_ms = int((time.perf_counter() - started) * 1000)
+        scores: dict[str, float] = {}
+        for candidate, score in zip(candidates, values, strict=True):
+            candidate.score = score
+            if score is not None:
+                scores[candidate.provider] = score
+        return JudgeScoring(
+            scores=scores,
+            latency_ms=latency_ms,
+            calls=calls,
+            batched=batched,
+            cache_hits=cache_hits,
+        )
+
+    def _score_each(
+        self,
+        invoke: Callable[[Mapping[str, object]], object],
+        candidates: Sequence[AggregationCandidate],
+        mode_value: str,
+        *,
+        max_workers: int | None,
+    ) -> list[float | None]:
+        requests = [
+            {
                 "mode": mode_value,
                 "provider": candidate.provider,
                 "index": candidate.index,
                 "text": candidate.text if candidate.text is not None else candidate.response.text,
             }
-            response = invoke(request)
-            score = self._extract_quality_score(response)
-            candidate.score = score
-            if score is not None:
-                scores[candidate.provider] = score
+            for candidate in candidates
+        ]
+        if not requests:
+            return []
+        workers = min(max_workers or 1, len(requests))
+        if workers <= 1:
+            return [self._extract_quality_score(invoke(request)) for request in requests]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            responses = list(executor.map(invoke, requests))
+        return [self._extract_quality_score(response) for response in responses]
+
+    def _build_batch_request(
+        self, candidates: Sequence[AggregationCandidate], mode_value: str
+    ) -> dict[str, object]:
+        entries: list[dict[str, object]] = []
+        rows: list[str] = []
+        for position, candidate in enumerate(candidates, start=1):
+            text = candidate.text if candidate.text is not None else candidate.response.text
+            entries.append(
+                {"provider": candidate.provider, "index": candidate.index, "text": text}
+            )
+            rows.append(f"{position}. {(text or '').strip()}")
+        prompt = self._batch_template.format(
+            candidates="\n".join(rows), count=len(candidates)
+        )
+        return {"mode": mode_value, "prompt": prompt, "candidates": entries}
+
+    @staticmethod
+    def _extract_batch_scores(response: object, *, expected: int) -> list[float] | None:
+        payload: object = None
+        raw = getattr(response, "raw", None)
+        if isinstance(raw, Mapping):
+            payload = raw.get("quality_scores")
+        if payload is None:
+            text = getattr(response, "text", None)
+            if not isinstance(text, str):
+                return None
+            try:
+                payload = json.loads(text.strip())
+            except json.JSONDecodeError:
+                return None
+        if isinstance(payload, Mapping):
+            payload = payload.get("scores")
+        return JudgeScorer._validate_scores(payload, expected=expected)
+
+    @classmethod
+    def _cached_batch_scores(
+        cls, entry: Mapping[str, Any] | None, texts: Sequence[str]
+    ) -> list[float] | None:
+        by_digest = entry.get("scores") if entry is not None else None
+        if not isinstance(by_digest, Mapping):
+            return None
+        return cls._validate_scores(
+            [by_digest.get(text_digest(text)) for text in texts], expected=len(texts)
+        )
+
+    @staticmethod
+    def _validate_scores(payload: object, *, expected: int) -> list[float] | None:
+        if not isinstance(payload, list) or len(payload) != expected:
+            return None
+        scores: list[float] = []
+        for value in payload:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):  # noqa: UP038
+                return None
+            if not math.isfinite(value):
+                return None
+            scores.append(float(value))
         return scores
 
     @staticmethod
@@ -156,8 +407,12 @@ class TieBreakerFactory:
         self,
         config: RunnerConfig,
         lookup: Mapping[int, SingleRunResult],
+        *,
+        provider_scores: Callable[[str], float | None] | None = None,
     ) -> TieBreaker | None:
         tie_name = (config.tie_breaker or "").strip().lower().replace("-", "_")
+        if tie_name == "max_score":
+            return MaxScoreTieBreaker(provider_scores=provider_scores)
         alias = {
             "latency": "latency",
             "min_latency": "latency",
@@ -225,7 +480,10 @@ class SchemaCache:
 
 __all__ = [
     "CandidateBuilder",
+    "DEFAULT_BATCH_SCORE_TEMPLATE",
+    "JudgeProviderPool",
     "JudgeScorer",
+    "JudgeScoring",
     "TieBreakerFactory",
     "SchemaCache",
     "JudgeProviderFactory",
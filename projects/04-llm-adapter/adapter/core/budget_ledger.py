@@ -0,0 +1,278 @@
+"""日次予算の消化を記録する台帳。
+
+``BudgetManager`` は台帳へ消化額を記録する。既定の
+``InMemoryBudgetLedger`` はプロセス内でだけ共有されるが、
+``SQLiteBudgetLedger`` は WAL モードの SQLite ファイルに記録するため、
+同じファイルを指す複数プロセス (シャードや CI ランナー) で日次予算を
+共有できる。
+
+呼び出し前に見積もり額を ``reserve`` で予約し、実費が確定したら
+``commit`` で予約を実費へ置き換える。予約と消化済み額の合計で上限を
+判定するので、並列に走る呼び出しが同時に最後の予算枠を使い切ることはない。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import sqlite3
+from threading import local, Lock
+import time
+from typing import Protocol
+
+__all__ = [
+    "BudgetLedger",
+    "BudgetReservation",
+    "InMemoryBudgetLedger",
+    "SQLiteBudgetLedger",
+    "open_budget_ledger",
+]
+
+# 浮動小数の加算誤差で上限ちょうどの予約が弾かれないための許容幅
+_EPSILON = 1e-9
+
+
+@dataclass(frozen=True, slots=True)
+class BudgetReservation:
+    """予約結果。``granted`` が偽なら予約は記録されていない。"""
+
+    day: str
+    provider: str
+    amount_usd: float
+    granted: bool
+    committed_usd: float
+    token: int | None = None
+
+
+class BudgetLedger(Protocol):
+    """予算台帳のバックエンド。各操作は単独でアトミックであること。"""
+
+    def reserve(
+        self, day: str, provider: str, amount_usd: float, limit_usd: float | None
+    ) -> BudgetReservation: ...
+
+    def commit(self, reservation: BudgetReservation, actual_usd: float) -> float: ...
+
+    def release(self, reservation: BudgetReservation) -> None: ...
+
+    def record(self, day: str, provider: str, amount_usd: float) -> float: ...
+
+    def spent(self, day: str, provider: str) -> float: ...
+
+
+def _within_limit(total: float, limit_usd: float | None) -> bool:
+    return limit_usd is None or total <= limit_usd + _EPSILON
+
+
+class InMemoryBudgetLedger:
+    """プロセス内の辞書で管理する台帳 (再起動で消える)。"""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._spent: dict[tuple[str, str], float] = {}
+        self._reservations: dict[int, tuple[str, str, float]] = {}
+        self._next_token = 1
+
+    def reserve(
+        self, day: str, provider: str, amount_usd: float, limit_usd: float | None
+    ) -> BudgetReservation:
+        key = (day, provider)
+        with self._lock:
+            spent = self._spent.get(key, 0.0)
+            reserved = sum(
+                amount
+                for reserved_day, reserved_provider, amount in self._reservations.values()
+                if (reserved_day, reserved_provider) == key
+            )
+            committed = spent + reserved
+            if not _within_limit(committed + amount_usd, limit_usd):
+                return BudgetReservation(day, provider, amount_usd, False, committed)
+            token = self._next_token
+            self._next_token += 1
+            self._reservations[token] = (day, provider, amount_usd)
+        return BudgetReservation(day, provider, amount_usd, True, committed, token)
+
+    def commit(self, reservation: BudgetReservation, actual_usd: float) -> float:
+        with self._lock:
+            if reservation.token is not None:
+                self._reservations.pop(reservation.token, None)
+            return self._add(reservation.day, reservation.provider, actual_usd)
+
+    def release(self, reservation: BudgetReservation) -> None:
+        if reservation.token is None:
+            return
+        with self._lock:
+            self._reservations.pop(reservation.token, None)
+
+    def record(self, day: str, provider: str, amount_usd: float) -> float:
+        with self._lock:
+            return self._add(day, provider, amount_usd)
+
+    def spent(self, day: str, provider: str) -> float:
+        with self._lock:
+            return self._spent.get((day, provider), 0.0)
+
+    def _add(self, day: str, provider: str, amount_usd: float) -> float:
+        key = (day, provider)
+        total = self._spent.get(key, 0.0) + amount_usd
+        self._spent[key] = total
+        return total
+
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS budget_spend (
+        day TEXT NOT NULL,
+        provider TEXT NOT NULL,
+        spent_usd REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, provider)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS budget_reservations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        day TEXT NOT NULL,
+        provider TEXT NOT NULL,
+        amount_usd REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS budget_reservations_key ON budget_reservations (day, provider)",
+)
+
+
+class SQLiteBudgetLedger:
+    """WAL モードの SQLite ファイルで管理する複数プロセス共有の台帳。
+
+    書き込みは ``BEGIN IMMEDIATE`` の短いトランザクションで行い、接続は
+    スレッドごとに張る。クラッシュで確定されなかった予約は
+    ``reservation_ttl_s`` 経過後に次の予約時に破棄される。
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        reservation_ttl_s: float = 900.0,
+        timeout_s: float = 30.0,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._reservation_ttl_s = reservation_ttl_s
+        self._timeout_s = timeout_s
+        self._local = local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = Lock()
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as cursor:
+            for statement in _SCHEMA:
+                cursor.execute(statement)
+
+    def reserve(
+        self, day: str, provider: str, amount_usd: float, limit_usd: float | None
+    ) -> BudgetReservation:
+        now = time.time()
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM budget_reservations WHERE expires_at < ?", (now,))
+            committed = self._spent(cursor, day, provider) + float(
+                cursor.execute(
+                    "SELECT COALESCE(SUM(amount_usd), 0) FROM budget_reservations"
+                    " WHERE day = ? AND provider = ?",
+                    (day, provider),
+                ).fetchone()[0]
+            )
+            if not _within_limit(committed + amount_usd, limit_usd):
+                return BudgetReservation(day, provider, amount_usd, False, committed)
+            cursor.execute(
+                "INSERT INTO budget_reservations (day, provider, amount_usd, expires_at)"
+                " VALUES (?, ?, ?, ?)",
+                (day, provider, amount_usd, now + self._reservation_ttl_s),
+            )
+            token = cursor.lastrowid
+        return BudgetReservation(day, provider, amount_usd, True, committed, token)
+
+    def commit(self, reservation: BudgetReservation, actual_usd: float) -> float:
+        with self._transaction() as cursor:
+            if reservation.token is not None:
+                cursor.execute(
+                    "DELETE FROM budget_reservations WHERE id = ?", (reservation.token,)
+                )
+            return self._add(cursor, reservation.day, reservation.provider, actual_usd)
+
+    def release(self, reservation: BudgetReservation) -> None:
+        if reservation.token is None:
+            return
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM budget_reservations WHERE id = ?", (reservation.token,))
+
+    def record(self, day: str, provider: str, amount_usd: float) -> float:
+        with self._transaction() as cursor:
+            return self._add(cursor, day, provider, amount_usd)
+
+    def spent(self, day: str, provider: str) -> float:
+        return self._spent(self._connection().cursor(), day, provider)
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self._timeout_s,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def _transaction(self) -> _Transaction:
+        return _Transaction(self._connection())
+
+    @staticmethod
+    def _spent(cursor: sqlite3.Cursor, day: str, provider: str) -> float:
+        row = cursor.execute(
+            "SELECT spent_usd FROM budget_spend WHERE day = ? AND provider = ?",
+            (day, provider),
+        ).fetchone()
+        return 0.0 if row is None else float(row[0])
+
+    @classmethod
+    def _add(cls, cursor: sqlite3.Cursor, day: str, provider: str, amount_usd: float) -> float:
+        cursor.execute(
+            "INSERT INTO budget_spend (day, provider, spent_usd) VALUES (?, ?, ?)"
+            " ON CONFLICT (day, provider) DO UPDATE SET spent_usd = spent_usd + excluded.spent_usd",
+            (day, provider, amount_usd),
+        )
+        return cls._spent(cursor, day, provider)
+
+
+class _Transaction:
+    """``BEGIN IMMEDIATE`` で書き込みロックを先に取るトランザクション。"""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+
+    def __enter__(self) -> sqlite3.Cursor:
+        cursor = self._connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        return cursor
+
+    def __exit__(self, exc_type: object, *_exc: object) -> None:
+        self._connection.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+
+
+def open_budget_ledger(path: Path | str | None) -> BudgetLedger:
+    """パス指定があれば SQLite 台帳を、なければプロセス内台帳を返す。"""
+
+    if path is None:
+        return InMemoryBudgetLedger()
+    return SQLiteBudgetLedger(Path(path).expanduser())
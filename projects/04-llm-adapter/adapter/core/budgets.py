@@ -1,26 +1,22 @@
 """予算制御ロジック。"""
 from __future__ import annotations
 
-from dataclasses import dataclass
 from datetime import date
 
+from .budget_ledger import BudgetLedger, BudgetReservation, InMemoryBudgetLedger
 from .config import BudgetBook, BudgetRule
 
 
-@dataclass
-class BudgetState:
-    """予算消化の状態。"""
-
-    spent_today_usd: float = 0.0
-
-
 class BudgetManager:
-    """予算ルールを評価・更新する。"""
+    """予算ルールを評価し、消化額を台帳へ記録する。"""
 
-    def __init__(self, book: BudgetBook) -> None:
+    def __init__(self, book: BudgetBook, ledger: BudgetLedger | None = None) -> None:
         self.book = book
-        self._states: dict[str, BudgetState] = {}
-        self._today = date.today()
+        self.ledger: BudgetLedger = ledger if ledger is not None else InMemoryBudgetLedger()
+
+    @staticmethod
+    def _day() -> str:
+        return date.today().isoformat()
 
     def _rule_for(self, provider_name: str) -> BudgetRule:
         return self.book.overrides.get(provider_name, self.book.default)
@@ -53,19 +49,36 @@ class BudgetManager:
     def notify_cost(self, provider_name: str, cost_usd: float) -> bool:
         """コスト消化を記録し、継続可否を返す。"""
 
+        spent = self.ledger.record(self._day(), provider_name, cost_usd)
+        return self._within_daily_budget(provider_name, spent)
+
+    def reserve(
+        self, provider_name: str, estimated_usd: float, *, enforce: bool = True
+    ) -> BudgetReservation:
+        """見積もり額を予約する。日次予算を超える場合は ``granted=False`` を返す。"""
+
         rule = self._rule_for(provider_name)
-        today = date.today()
-        if today != self._today:
-            self._states.clear()
-            self._today = today
-        state = self._states.setdefault(provider_name, BudgetState())
-        state.spent_today_usd += cost_usd
-        if not rule.stop_on_budget_exceed:
-            return True
-        return state.spent_today_usd <= rule.daily_budget_usd
+        limit = rule.daily_budget_usd if enforce and rule.stop_on_budget_exceed else None
+        return self.ledger.reserve(self._day(), provider_name, estimated_usd, limit)
+
+    def settle(self, reservation: BudgetReservation, cost_usd: float) -> bool:
+        """予約を実費で確定し、継続可否を返す。"""
+
+        spent = self.ledger.commit(reservation, cost_usd)
+        return self._within_daily_budget(reservation.provider, spent)
+
+    def release(self, reservation: BudgetReservation) -> None:
+        """呼び出しを行わなかった予約を取り消す。"""
+
+        self.ledger.release(reservation)
 
     def spent_today(self, provider_name: str) -> float:
         """本日消費した金額を返す。"""
 
-        state = self._states.get(provider_name)
-        return 0.0 if state is None else state.spent_today_usd
+        return self.ledger.spent(self._day(), provider_name)
+
+    def _within_daily_budget(self, provider_name: str, spent_usd: float) -> bool:
+        rule = self._rule_for(provider_name)
+        if not rule.stop_on_budget_exceed:
+            return True
+        return spent_usd <= rule.daily_budget_usd
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-import json
 import logging
 from pathlib import Path
 from statistics import median, pstdev
@@ -12,6 +11,8 @@ from .config import ProviderConfig
 from .datasets import GoldenTask
 from .metrics.diff import compute_diff_rate
 from .metrics.models import RunMetrics
+from .metrics.result_store import ResultStore
+from .metrics.serialization import write_run_metrics
 from .providers import BaseProvider
 
 if TYPE_CHECKING:  # pragma: no cover - 型補完用
@@ -101,8 +102,9 @@ class TaskFinalizer:
         task: GoldenTask,
         providers: Sequence[tuple[ProviderConfig, BaseProvider]],
         histories: Sequence[Sequence[SingleRunResult]],
-        results: list[RunMetrics],
+        results: list[RunMetrics] | ResultStore,
     ) -> None:
+        finalized: list[RunMetrics] = []
         for index, (provider_config, _) in enumerate(providers):
             attempts = list(histories[index])
             if not attempts:
@@ -110,9 +112,9 @@ class TaskFinalizer:
             metrics_list = [attempt.metrics for attempt in attempts]
             outputs = [attempt.raw_output for attempt in attempts]
             self._apply_determinism_gate(provider_config, task, metrics_list, outputs)
-            for attempt in attempts:
-                results.append(attempt.metrics)
-                self._append_metric(attempt.metrics)
+            finalized.extend(metrics_list)
+        results.extend(finalized)
+        self._append_metrics(finalized)
 
     def _apply_determinism_gate(
         self,
@@ -123,7 +125,9 @@ class TaskFinalizer:
     ) -> None:
         self._determinism_gate.apply(provider_config, task, metrics_list, outputs)
 
-    def _append_metric(self, metrics: RunMetrics) -> None:
-        with self._metrics_path.open("a", encoding="utf-8") as fp:
-            json.dump(metrics.to_json_dict(), fp, ensure_ascii=False)
-            fp.write("\n")
+    def _append_metrics(self, metrics: Sequence[RunMetrics]) -> None:
+        if not metrics:
+            return
+        # タスク単位で 1 回だけ開き、エンコード済みの行をまとめて書き込む
+        with self._metrics_path.open("ab") as fp:
+            write_run_metrics(fp, metrics)
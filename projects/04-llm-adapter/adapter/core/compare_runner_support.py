@@ -6,9 +6,12 @@ from dataclasses import replace
 import logging
 from typing import Any
 
+from .budget_ledger import BudgetReservation
 from .budgets import BudgetManager
 from .compare_runner_support.metrics_builder import RunMetricsBuilder
 from .config import ProviderConfig
+from .cost_projection import CostEstimator
+from .metrics.costs import estimate_cost
 from .metrics.models import BudgetSnapshot
 from .provider_spi import ProviderRequest, TokenUsage
 from .providers import (
@@ -45,6 +48,28 @@ class BudgetEvaluator:
         self._budget_manager = budget_manager
         self.allow_overrun = allow_overrun
         self._logger = logger or LOGGER
+        self.estimator: CostEstimator | None = None
+
+    def reserve(
+        self,
+        provider_config: ProviderConfig,
+        prompt: str,
+        prompt_id: str | None = None,
+    ) -> BudgetReservation:
+        """呼び出し前に見積もり額を予約する。
+
+        見積もり器がなければ出力が ``max_tokens`` に達すると仮定した上限で見積もる。
+        """
+
+        if self.estimator is not None:
+            estimated = self.estimator.project(provider_config, prompt, prompt_id).cost_usd
+        else:
+            estimated = estimate_cost(
+                provider_config, len(prompt.split()), provider_config.max_tokens
+            )
+        return self._budget_manager.reserve(
+            provider_config.provider, estimated, enforce=not self.allow_overrun
+        )
 
     def evaluate(
         self,
@@ -53,11 +78,18 @@ class BudgetEvaluator:
         status: str,
         failure_kind: str | None,
         error_message: str | None,
+        reservation: BudgetReservation | None = None,
     ) -> tuple[BudgetSnapshot, str | None, str, str | None, str | None]:
         provider_name = provider_config.provider
         run_budget_limit = self._budget_manager.run_budget(provider_name)
         run_budget_hit = run_budget_limit > 0 and cost_usd > run_budget_limit
-        daily_stop_required = not self._budget_manager.notify_cost(provider_name, cost_usd)
+        if reservation is None:
+            daily_stop_required = not self._budget_manager.notify_cost(provider_name, cost_usd)
+        elif reservation.granted:
+            daily_stop_required = not self._budget_manager.settle(reservation, cost_usd)
+        else:
+            # 予約を拒否された呼び出しは実行していないため消化額は増えない
+            daily_stop_required = True
         budget_snapshot = BudgetSnapshot(
             run_budget_usd=run_budget_limit,
             hit_stop=run_budget_hit or daily_stop_required,
@@ -70,12 +102,19 @@ class BudgetEvaluator:
             )
         daily_reason: str | None = None
         if daily_stop_required:
-            spent = self._budget_manager.spent_today(provider_name)
             daily_limit = self._budget_manager.daily_budget(provider_name)
-            daily_reason = (
-                f"provider={provider_name} daily budget {daily_limit:.4f} USD exceeded "
-                f"(spent={spent:.4f} USD)"
-            )
+            if reservation is not None and not reservation.granted:
+                daily_reason = (
+                    f"provider={provider_name} daily budget {daily_limit:.4f} USD would be exceeded "
+                    f"(committed={reservation.committed_usd:.4f} USD, "
+                    f"estimate={reservation.amount_usd:.4f} USD)"
+                )
+            else:
+                spent = self._budget_manager.spent_today(provider_name)
+                daily_reason = (
+                    f"provider={provider_name} daily budget {daily_limit:.4f} USD exceeded "
+                    f"(spent={spent:.4f} USD)"
+                )
         stop_reason: str | None = None
         if not self.allow_overrun:
             if daily_reason:
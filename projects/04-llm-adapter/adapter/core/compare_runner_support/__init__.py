@@ -5,6 +5,7 @@ from importlib import util
 from pathlib import Path
 import sys
 
+from .evaluation_pool import evaluate_expectation, EvaluationPool
 from .metrics_builder import RunMetricsBuilder
 
 _LEGACY_PATH = Path(__file__).resolve().parent.parent / "compare_runner_support.py"
@@ -24,8 +25,10 @@ _JudgeInvoker = _LEGACY_MODULE._JudgeInvoker
 _JudgeProviderFactoryAdapter = _LEGACY_MODULE._JudgeProviderFactoryAdapter
 
 __all__ = [
+    "EvaluationPool",
     "RunMetricsBuilder",
     "BudgetEvaluator",
     "_JudgeInvoker",
     "_JudgeProviderFactoryAdapter",
+    "evaluate_expectation",
 ]
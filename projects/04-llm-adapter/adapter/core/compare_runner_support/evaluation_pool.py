@@ -0,0 +1,190 @@
+"""期待値評価をプロセスプールで実行する評価ステージ。"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Condition, Thread
+
+from ..expectations import compile_expectation, CompiledExpectation
+from ..metrics.models import EvalMetrics
+
+__all__ = [
+    "DEFAULT_EVAL_CHUNK_SIZE",
+    "DEFAULT_INLINE_BELOW",
+    "EvaluationPool",
+    "evaluate_expectation",
+]
+
+DEFAULT_EVAL_CHUNK_SIZE = 16
+DEFAULT_INLINE_BELOW = 2048
+
+_EvalOutcome = tuple[EvalMetrics, str | None]
+_Pending = tuple[CompiledExpectation, str, "Future[_EvalOutcome]"]
+
+
+def evaluate_expectation(
+    expected: CompiledExpectation | Mapping[str, object],
+    output_text: str | None,
+) -> _EvalOutcome:
+    """出力を期待値と照合する。未コンパイルの定義はその場でコンパイルする。"""
+
+    if not isinstance(expected, CompiledExpectation):
+        expected = compile_expectation(expected)
+    return expected.evaluate(output_text)
+
+
+def _evaluate_chunk(
+    items: Sequence[tuple[CompiledExpectation, str]],
+) -> list[_EvalOutcome]:
+    return [expected.evaluate(text) for expected, text in items]
+
+
+def _deliver_inline(batch: Sequence[_Pending]) -> None:
+    # チャンク単位の失敗 (ワーカー異常終了や pickle 失敗) を 1 件ずつの同期評価で救済する
+    for expected, text, target in batch:
+        try:
+            outcome = expected.evaluate(text)
+        except BaseException as exc:  # noqa: BLE001 - 呼び出し側の Future へ委ねる
+            target.set_exception(exc)
+        else:
+            target.set_result(outcome)
+
+
+class EvaluationPool:
+    """(期待値, 出力) の組を束ねてワーカープロセスへ送る。
+
+    呼び出しスレッドは結果を待つ間 GIL を手放すため、他スレッドの
+    HTTP 待ちと評価処理が重なる。``inline_below`` 文字未満の出力は
+    プロセス間転送のほうが高くつくため呼び出しスレッドで評価する。
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        *,
+        chunk_size: int = DEFAULT_EVAL_CHUNK_SIZE,
+        inline_below: int = DEFAULT_INLINE_BELOW,
+        linger_s: float = 0.002,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._chunk_size = chunk_size
+        self._inline_below = max(inline_below, 0)
+        self._linger_s = linger_s
+        self._pending: list[_Pending] = []
+        self._condition = Condition()
+        self._dispatcher: Thread | None = None
+        self._closed = False
+        self._broken = False
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    def submit(
+        self, expected: CompiledExpectation | Mapping[str, object], output_text: str
+    ) -> Future[_EvalOutcome]:
+        if not isinstance(expected, CompiledExpectation):
+            expected = compile_expectation(expected)
+        future: Future[_EvalOutcome] = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("EvaluationPool is closed")
+            self._pending.append((expected, output_text, future))
+            if self._dispatcher is None:
+                self._dispatcher = Thread(
+                    target=self._dispatch_loop, name="evaluation-pool", daemon=True
+                )
+                self._dispatcher.start()
+            self._condition.notify()
+        return future
+
+    def evaluate(
+        self, expected: CompiledExpectation | Mapping[str, object], output_text: str | None
+    ) -> _EvalOutcome:
+        if output_text is None or self._broken or len(output_text) < self._inline_below:
+            return evaluate_expectation(expected, output_text)
+        try:
+            return self.submit(expected, output_text).result()
+        except BrokenProcessPool:
+            # ワーカーを起動できない環境では同期評価へ退避する
+            self._broken = True
+            return evaluate_expectation(expected, output_text)
+
+    def evaluate_many(
+        self, pairs: Iterable[tuple[CompiledExpectation | Mapping[str, object], str]]
+    ) -> list[_EvalOutcome]:
+        """まとまった組をチャンク単位で一括評価する (オフライン評価向け)。"""
+
+        items = [
+            (
+                expected
+                if isinstance(expected, CompiledExpectation)
+                else compile_expectation(expected),
+                text,
+            )
+            for expected, text in pairs
+        ]
+        chunks = [
+            items[start : start + self._chunk_size]
+            for start in range(0, len(items), self._chunk_size)
+        ]
+        futures = [self._executor.submit(_evaluate_chunk, chunk) for chunk in chunks]
+        results: list[_EvalOutcome] = []
+        for chunk, future in zip(chunks, futures, strict=True):
+            try:
+                results.extend(future.result())
+            except Exception:  # noqa: BLE001 - 失敗したチャンクだけ同期評価する
+                results.extend(_evaluate_chunk(chunk))
+        return results
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            dispatcher = self._dispatcher
+        if dispatcher is not None:
+            dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> EvaluationPool:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                if len(self._pending) < self._chunk_size and not self._closed:
+                    # 同時に届く評価要求を 1 チャンクへまとめるため少し待つ
+                    self._condition.wait(self._linger_s)
+                batch = self._pending[: self._chunk_size]
+                del self._pending[: self._chunk_size]
+            self._ship(batch)
+
+    def _ship(self, batch: list[_Pending]) -> None:
+        items = [(expected, text) for expected, text, _ in batch]
+        try:
+            future = self._executor.submit(_evaluate_chunk, items)
+        except (BrokenProcessPool, RuntimeError):
+            self._broken = True
+            _deliver_inline(batch)
+            return
+
+        def _deliver(done: Future[list[_EvalOutcome]]) -> None:
+            if done.exception() is not None:
+                if isinstance(done.exception(), BrokenProcessPool):
+                    self._broken = True
+                _deliver_inline(batch)
+                return
+            for (_, _, target), outcome in zip(batch, done.result(), strict=True):
+                target.set_result(outcome)
+
+        future.add_done_callback(_deliver)
@@ -4,12 +4,11 @@ from __future__ import annotations
 from collections.abc import Mapping
 from enum import Enum
 import os
-import re
 import uuid
 
 from ..config import ProviderConfig
 from ..datasets import GoldenTask
-from ..metrics.diff import compute_diff_rate
+from ..metrics.minhash import minhash_signature
 from ..metrics.models import (
     BudgetSnapshot,
     EvalMetrics,
@@ -18,11 +17,26 @@ from ..metrics.models import (
     RunMetrics,
 )
 from ..providers import ProviderResponse
+from .evaluation_pool import EvaluationPool
 
 
 class RunMetricsBuilder:
     """ランメトリクス生成ロジック。"""
 
+    def __init__(
+        self, *, eval_pool: EvaluationPool | None = None, output_minhash: bool = False
+    ) -> None:
+        self._eval_pool = eval_pool
+        self.output_minhash = output_minhash
+
+    @property
+    def eval_pool(self) -> EvaluationPool | None:
+        return self._eval_pool
+
+    @eval_pool.setter
+    def eval_pool(self, pool: EvaluationPool | None) -> None:
+        self._eval_pool = pool
+
     def build(
         self,
         provider_config: ProviderConfig,
@@ -67,6 +81,11 @@ class RunMetricsBuilder:
             error_message=error_message,
             output_text=output_text_record,
             output_hash=output_hash,
+            output_minhash=(
+                minhash_signature(output_text)
+                if self.output_minhash and output_text
+                else None
+            ),
             eval=eval_metrics,
             budget=budget_snapshot,
             ci_meta=self._ci_metadata(),
@@ -102,37 +121,10 @@ class RunMetricsBuilder:
         task: GoldenTask,
         output_text: str | None,
     ) -> tuple[EvalMetrics, str | None]:
-        expected_type = str(task.expected.get("type", "regex"))
-        expected_value = task.expected.get("value")
-        eval_metrics = EvalMetrics()
-        failure_kind: str | None = None
-        if output_text is None:
-            return eval_metrics, failure_kind
-        if expected_type == "regex" and isinstance(expected_value, str):
-            match = re.search(expected_value, output_text)
-            eval_metrics.exact_match = bool(match)
-            eval_metrics.diff_rate = 0.0 if match else 1.0
-        elif expected_type == "literal" and isinstance(expected_value, str):
-            eval_metrics.exact_match = output_text.strip() == expected_value.strip()
-            eval_metrics.diff_rate = (
-                0.0
-                if eval_metrics.exact_match
-                else compute_diff_rate(output_text, expected_value)
-            )
-        elif expected_type == "json_equal" and expected_value is not None:
-            try:
-                import json as _json
-
-                actual = _json.loads(output_text)
-                eval_metrics.exact_match = actual == expected_value
-                eval_metrics.diff_rate = 0.0 if eval_metrics.exact_match else 1.0
-            except Exception:
-                eval_metrics.exact_match = False
-                eval_metrics.diff_rate = 1.0
-                failure_kind = "parsing"
-        else:
-            eval_metrics.diff_rate = 1.0
-        return eval_metrics, failure_kind
+        expectation = task.expectation
+        if self._eval_pool is not None:
+            return self._eval_pool.evaluate(expectation, output_text)
+        return expectation.evaluate(output_text)
 
     @staticmethod
     def _compute_output_hash(output_text: str | None) -> str | None:
@@ -0,0 +1,196 @@
+"""呼び出し前のトークン数・コスト見積もり。
+
+実費は呼び出し後に返るトークン数からしか分からない。ここでは
+プロバイダ / モデルごとに「1 トークンあたりの文字数」と出力トークン数の
+平均を履歴メトリクスから学習し、送信前のプロンプトから入力・出力
+トークン数とコストを見積もる。履歴がない場合は文字数 / 4 と
+``max_tokens`` (上限) で見積もる。
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+import json
+import math
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from .metrics.costs import estimate_cost
+
+if TYPE_CHECKING:  # pragma: no cover - 型補完用
+    from .config import ProviderConfig
+    from .metrics.models import RunMetrics
+
+__all__ = [
+    "DEFAULT_CHARS_PER_TOKEN",
+    "CostEstimator",
+    "CostProjection",
+]
+
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+_SUCCESS_STATUSES = {"ok", "success"}
+
+
+@dataclass(frozen=True, slots=True)
+class CostProjection:
+    """1 回の呼び出しに対する見積もり。"""
+
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float
+
+
+@dataclass(slots=True)
+class _TokenStats:
+    chars: int = 0
+    tokens: int = 0
+    output_tokens: int = 0
+    calls: int = 0
+
+    def chars_per_token(self) -> float | None:
+        if self.tokens <= 0 or self.chars <= 0:
+            return None
+        return self.chars / self.tokens
+
+    def mean_output_tokens(self) -> float | None:
+        return self.output_tokens / self.calls if self.calls else None
+
+
+class CostEstimator:
+    """プロバイダ / モデル単位の文字数比モデルで呼び出し前コストを見積もる。
+
+    ``prompt_chars`` は prompt_id → 描画済みプロンプトの文字数。履歴行の
+    入力トークン数と対応付けて文字数比を学習するのに使う。
+    """
+
+    def __init__(
+        self,
+        prompt_chars: Mapping[str, int] | None = None,
+        *,
+        chars_per_token: float = DEFAULT_CHARS_PER_TOKEN,
+    ) -> None:
+        if chars_per_token <= 0:
+            raise ValueError("chars_per_token must be positive")
+        self._prompt_chars = dict(prompt_chars or {})
+        self._default_chars_per_token = chars_per_token
+        self._models: dict[tuple[str, str], _TokenStats] = {}
+        self._prompts: dict[tuple[str, str, str], _TokenStats] = {}
+        self._lock = Lock()
+
+    def observe(self, metric: Mapping[str, object]) -> bool:
+        """メトリクス 1 行 (JSONL の dict) を学習へ取り込む。成功行のみ使う。"""
+
+        return self._observe(
+            metric.get("status"),
+            metric.get("provider"),
+            metric.get("model"),
+            metric.get("prompt_id"),
+            metric.get("input_tokens"),
+            metric.get("output_tokens"),
+            metric.get("output_text"),
+        )
+
+    def observe_metrics(self, metrics: RunMetrics) -> bool:
+        """実行中に確定した ``RunMetrics`` を学習へ取り込む。"""
+
+        return self._observe(
+            metrics.status,
+            metrics.provider,
+            metrics.model,
+            metrics.prompt_id,
+            metrics.input_tokens,
+            metrics.output_tokens,
+            metrics.output_text,
+        )
+
+    def _observe(
+        self,
+        status: object,
+        provider: object,
+        model: object,
+        prompt_id_value: object,
+        input_tokens: object,
+        output_tokens: object,
+        output_text: object,
+    ) -> bool:
+        if str(status or "").lower() not in _SUCCESS_STATUSES:
+            return False
+        if not isinstance(input_tokens, int) or not isinstance(output_tokens, int):
+            return False
+        key = (str(provider), str(model))
+        prompt_id = str(prompt_id_value)
+        chars = 0
+        tokens = 0
+        prompt_chars = self._prompt_chars.get(prompt_id)
+        if prompt_chars and input_tokens > 0:
+            chars += prompt_chars
+            tokens += input_tokens
+        if isinstance(output_text, str) and output_text and output_tokens > 0:
+            chars += len(output_text)
+            tokens += output_tokens
+        with self._lock:
+            for stats in (
+                self._models.setdefault(key, _TokenStats()),
+                self._prompts.setdefault((*key, prompt_id), _TokenStats()),
+            ):
+                stats.chars += chars
+                stats.tokens += tokens
+                stats.output_tokens += output_tokens
+                stats.calls += 1
+        return True
+
+    def calibrate(self, metrics: Iterable[Mapping[str, object]]) -> int:
+        """履歴メトリクスをまとめて取り込み、使った行数を返す。"""
+
+        return sum(1 for metric in metrics if self.observe(metric))
+
+    def calibrate_from_file(self, metrics_path: Path) -> int:
+        """JSONL の履歴メトリクスから学習する。壊れた行は読み飛ばす。"""
+
+        if not metrics_path.exists():
+            return 0
+        used = 0
+        with metrics_path.open("r", encoding="utf-8") as fp:
+            for line in fp:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    metric = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(metric, Mapping) and self.observe(metric):
+                    used += 1
+        return used
+
+    def chars_per_token(self, provider: str, model: str) -> float:
+        with self._lock:
+            stats = self._models.get((provider, model))
+            ratio = stats.chars_per_token() if stats is not None else None
+        return ratio if ratio is not None else self._default_chars_per_token
+
+    def project(
+        self,
+        provider_config: ProviderConfig,
+        prompt: str,
+        prompt_id: str | None = None,
+    ) -> CostProjection:
+        provider = provider_config.provider
+        model = provider_config.model
+        input_tokens = math.ceil(len(prompt) / self.chars_per_token(provider, model))
+        max_tokens = max(int(provider_config.max_tokens), 0)
+        with self._lock:
+            mean_output: float | None = None
+            if prompt_id is not None:
+                stats = self._prompts.get((provider, model, prompt_id))
+                mean_output = stats.mean_output_tokens() if stats is not None else None
+            if mean_output is None:
+                stats = self._models.get((provider, model))
+                mean_output = stats.mean_output_tokens() if stats is not None else None
+        output_tokens = max_tokens if mean_output is None else math.ceil(mean_output)
+        if max_tokens:
+            output_tokens = min(output_tokens, max_tokens)
+        cost = estimate_cost(provider_config, input_tokens, output_tokens)
+        return CostProjection(input_tokens, output_tokens, cost)
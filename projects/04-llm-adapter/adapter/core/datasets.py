@@ -3,9 +3,14 @@ from __future__ import annotations
 
 from collections.abc import Iterator, Mapping, MutableMapping
 from dataclasses import dataclass
+from functools import cached_property
 import json
 from pathlib import Path
 import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - 型補完用
+    from .expectations import CompiledExpectation
 
 _PROMPT_PATTERN = re.compile(r"{{\s*(?P<key>[a-zA-Z0-9_\.]+)\s*}}")
 
@@ -30,6 +35,14 @@ class GoldenTask:
 
         return _PROMPT_PATTERN.sub(replace, self.prompt_template)
 
+    @cached_property
+    def expectation(self) -> CompiledExpectation:
+        """``expected`` をコンパイルした評価器 (タスクごとに 1 度だけ生成)。"""
+
+        from .expectations import compile_expectation
+
+        return compile_expectation(self.expected)
+
 
 def _lookup_nested(payload: Mapping[str, object], dotted_key: str) -> object | None:
     parts = dotted_key.split(".")
@@ -9,6 +9,7 @@ from ..config import ProviderConfig
 from ..datasets import GoldenTask
 from ..errors import AllFailedError
 from ..metrics.models import RunMetrics
+from ..metrics.result_store import ResultStore
 from ..providers import BaseProvider, ProviderFactory
 from ..runner_execution import RunnerExecution, SingleRunResult
 
@@ -32,7 +33,8 @@ def run_tasks(
     record_failed_batch: Callable[..., None],
     log_attempt_failures: Callable[[str, Sequence[object]], None],
     parallel_execution_error: type[Exception],
-) -> list[RunMetrics]:
+    results: list[RunMetrics] | ResultStore | None = None,
+) -> list[RunMetrics] | ResultStore:
     providers: list[tuple[ProviderConfig, BaseProvider]] = [
         (provider_config, ProviderFactory.create(provider_config))
         for provider_config in provider_configs
@@ -43,7 +45,8 @@ def run_tasks(
             provider_config.provider,
             provider_config.model,
         )
-    results: list[RunMetrics] = []
+    if results is None:
+        results = []
     if not providers:
         return results
 
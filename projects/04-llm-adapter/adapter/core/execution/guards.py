@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import json
 from pathlib import Path
 from threading import Lock
@@ -9,6 +11,8 @@ from time import perf_counter, sleep
 from types import SimpleNamespace
 from typing import Any, cast, Protocol, TYPE_CHECKING
 
+from ..json_documents import decode_json
+
 if TYPE_CHECKING:
     from jsonschema.exceptions import ValidationError as _ValidationError
 else:
@@ -86,6 +90,11 @@ else:
 validators: _ValidatorsModule = _validators_impl
 jsonschema_exceptions: _ExceptionsModule = _exceptions_impl
 
+try:
+    import fastjsonschema as _fastjsonschema
+except ModuleNotFoundError:  # pragma: no cover - 任意依存
+    _fastjsonschema = None
+
 
 class _TokenBucket:
     def __init__(self, rpm: int | None) -> None:
@@ -113,23 +122,78 @@ class _TokenBucket:
             sleep(max(1.0 / max(self.capacity, 1), 0.01))
 
 
+@dataclass(frozen=True)
+class _CompiledSchema:
+    schema: dict[str, Any] | None
+    validator: _ValidatorProtocol | None
+    fast_validate: Callable[[Any], Any] | None
+
+
+_compiled_schemas: dict[Path, tuple[tuple[int, int], _CompiledSchema]] = {}
+_compiled_lock = Lock()
+
+
+def _compile_schema(schema_path: Path) -> _CompiledSchema:
+    with schema_path.open("r", encoding="utf-8") as fp:
+        loaded = json.load(fp)
+    if not isinstance(loaded, dict):
+        return _CompiledSchema(None, None, None)
+    validator_cls = validators.validator_for(loaded)
+    validator_cls.check_schema(loaded)
+    fast_validate: Callable[[Any], Any] | None = None
+    if _fastjsonschema is not None:
+        try:
+            # 共有されるデコード済み値を書き換えないよう default の補完は無効化する
+            fast_validate = _fastjsonschema.compile(loaded, use_default=False)
+        except Exception:  # pragma: no cover - 未対応キーワードは jsonschema のみで検証
+            fast_validate = None
+    return _CompiledSchema(loaded, validator_cls(loaded), fast_validate)
+
+
+def _load_compiled_schema(schema_path: Path | None) -> _CompiledSchema | None:
+    """スキーマをパスと mtime をキーにプロセス全体でキャッシュする。"""
+
+    if not schema_path:
+        return None
+    try:
+        stat = schema_path.stat()
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _compiled_lock:
+        cached = _compiled_schemas.get(schema_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    compiled = _compile_schema(schema_path)
+    with _compiled_lock:
+        _compiled_schemas[schema_path] = (stamp, compiled)
+    return compiled
+
+
 class _SchemaValidator:
     def __init__(self, schema_path: Path | None) -> None:
         self.schema: dict[str, Any] | None = None
         self._validator: _ValidatorProtocol | None = None
-        if schema_path and schema_path.exists():
-            with schema_path.open("r", encoding="utf-8") as fp:
-                loaded = json.load(fp)
-            if isinstance(loaded, dict):
-                self.schema = loaded
-                validator_cls = validators.validator_for(loaded)
-                validator_cls.check_schema(loaded)
-                self._validator = validator_cls(loaded)
+        self._fast_validate: Callable[[Any], Any] | None = None
+        compiled = _load_compiled_schema(schema_path)
+        if compiled is not None:
+            self.schema = compiled.schema
+            self._validator = compiled.validator
+            self._fast_validate = compiled.fast_validate
 
     def validate(self, payload: str) -> None:
         if self._validator is None or not payload.strip():
             return
-        data = json.loads(payload)
+        document = decode_json(payload)
+        document.raise_for_error()
+        data = document.value
+        if self._fast_validate is not None:
+            try:
+                self._fast_validate(data)
+                return
+            except Exception:
+                # 生成コードは合否判定のみに使い、エラーメッセージは jsonschema で組み立てる
+                pass
         try:
             self._validator.validate(data)
         except jsonschema_exceptions.ValidationError as exc:
@@ -0,0 +1,222 @@
+"""ゴールデンタスク期待値のコンパイル済み表現と評価。"""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+import hashlib
+import json
+import math
+import re
+from typing import Any
+
+from .json_documents import decode_json
+from .metrics.diff import levenshtein_distance, tokenize
+from .metrics.models import EvalMetrics
+
+__all__ = [
+    "CompiledExpectation",
+    "EXPECTATION_TYPES",
+    "compile_expectation",
+    "json_subset",
+]
+
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+_EvalOutcome = tuple[EvalMetrics, str | None]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledExpectation:
+    """タスクごとに 1 度だけ前処理した期待値。
+
+    ``value`` は種別ごとの評価済み形 (コンパイル済み正規表現、正規化済み
+    リテラルとトークン列、正準 JSON など) を保持する。``digest`` は正準化
+    した期待値のハッシュ。
+    """
+
+    kind: str
+    value: Any
+    digest: str
+
+    def evaluate(self, output_text: str | None) -> _EvalOutcome:
+        if output_text is None:
+            return EvalMetrics(), None
+        return _EVALUATORS[self.kind](self.value, output_text)
+
+
+def _canonical_json(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def _parse_json(output_text: str) -> tuple[bool, object]:
+    document = decode_json(output_text)
+    return document.ok, document.value
+
+
+def json_subset(expected: object, actual: object) -> bool:
+    """``expected`` のキーと値がすべて ``actual`` に含まれるかを再帰的に判定する。"""
+
+    if isinstance(expected, Mapping):
+        if not isinstance(actual, Mapping):
+            return False
+        return all(
+            key in actual and json_subset(value, actual[key])
+            for key, value in expected.items()
+        )
+    if isinstance(expected, list):
+        if not isinstance(actual, list) or len(expected) > len(actual):
+            return False
+        # actual 側の余剰要素は部分一致として許容するため短い側で打ち切る
+        return all(
+            json_subset(item, other) for item, other in zip(expected, actual, strict=False)
+        )
+    return expected == actual
+
+
+def _compile_regex(raw: Mapping[str, object]) -> object | None:
+    value = raw.get("value")
+    if not isinstance(value, str):
+        return None
+    return re.compile(value)
+
+
+def _compile_literal(raw: Mapping[str, object]) -> object | None:
+    value = raw.get("value")
+    if not isinstance(value, str):
+        return None
+    return value.strip(), tuple(tokenize(value))
+
+
+def _compile_json(raw: Mapping[str, object]) -> object | None:
+    value = raw.get("value")
+    if value is None:
+        return None
+    return value, _canonical_json(value)
+
+
+def _compile_contains_all(raw: Mapping[str, object]) -> object | None:
+    value = raw.get("value")
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not value:
+        return None
+    needles = [str(item) for item in value]
+    if raw.get("case_sensitive", True) is False:
+        return tuple(needle.lower() for needle in needles), True
+    return tuple(needles), False
+
+
+def _compile_numeric(raw: Mapping[str, object]) -> object | None:
+    value = raw.get("value")
+    if isinstance(value, bool) or not isinstance(value, int | float | str):
+        return None
+    try:
+        target = float(value)
+        tolerance = float(raw.get("tolerance", 0.0))  # type: ignore[arg-type]
+        relative = float(raw.get("relative", 0.0))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+    return target, max(tolerance, 0.0), max(relative, 0.0)
+
+
+def _evaluate_unsupported(_value: object, _output_text: str) -> _EvalOutcome:
+    return EvalMetrics(diff_rate=1.0), None
+
+
+def _evaluate_regex(pattern: re.Pattern[str], output_text: str) -> _EvalOutcome:
+    matched = pattern.search(output_text) is not None
+    return EvalMetrics(exact_match=matched, diff_rate=0.0 if matched else 1.0), None
+
+
+def _evaluate_literal(value: tuple[str, tuple[str, ...]], output_text: str) -> _EvalOutcome:
+    literal, expected_tokens = value
+    if output_text.strip() == literal:
+        return EvalMetrics(exact_match=True, diff_rate=0.0), None
+    actual_tokens = tokenize(output_text)
+    if not actual_tokens and not expected_tokens:
+        return EvalMetrics(exact_match=False, diff_rate=0.0), None
+    distance = levenshtein_distance(actual_tokens, expected_tokens)
+    diff_rate = distance / max(len(actual_tokens), len(expected_tokens))
+    return EvalMetrics(exact_match=False, diff_rate=diff_rate), None
+
+
+def _evaluate_json_equal(value: tuple[object, str], output_text: str) -> _EvalOutcome:
+    expected, canonical = value
+    if output_text.strip() == canonical:
+        return EvalMetrics(exact_match=True, diff_rate=0.0), None
+    ok, actual = _parse_json(output_text)
+    if not ok:
+        return EvalMetrics(exact_match=False, diff_rate=1.0), "parsing"
+    matched = actual == expected
+    return EvalMetrics(exact_match=matched, diff_rate=0.0 if matched else 1.0), None
+
+
+def _evaluate_json_subset(value: tuple[object, str], output_text: str) -> _EvalOutcome:
+    expected, _canonical = value
+    ok, actual = _parse_json(output_text)
+    if not ok:
+        return EvalMetrics(exact_match=False, diff_rate=1.0), "parsing"
+    matched = json_subset(expected, actual)
+    return EvalMetrics(exact_match=matched, diff_rate=0.0 if matched else 1.0), None
+
+
+def _evaluate_contains_all(value: tuple[tuple[str, ...], bool], output_text: str) -> _EvalOutcome:
+    needles, fold_case = value
+    haystack = output_text.lower() if fold_case else output_text
+    missing = sum(1 for needle in needles if needle not in haystack)
+    return EvalMetrics(exact_match=missing == 0, diff_rate=missing / len(needles)), None
+
+
+def _evaluate_numeric(value: tuple[float, float, float], output_text: str) -> _EvalOutcome:
+    target, tolerance, relative = value
+    found = _NUMBER_RE.search(output_text)
+    if found is None:
+        return EvalMetrics(exact_match=False, diff_rate=1.0), "parsing"
+    actual = float(found.group(0))
+    error = abs(actual - target)
+    allowed = max(tolerance, relative * abs(target))
+    matched = error <= allowed
+    scale = max(abs(target), allowed, 1e-12)
+    diff_rate = 0.0 if matched else min(error / scale, 1.0)
+    if math.isnan(diff_rate):
+        diff_rate = 1.0
+    return EvalMetrics(exact_match=matched, diff_rate=diff_rate), None
+
+
+_Compiler = Callable[[Mapping[str, object]], object | None]
+_Evaluator = Callable[[Any, str], _EvalOutcome]
+
+_COMPILERS: dict[str, _Compiler] = {
+    "regex": _compile_regex,
+    "literal": _compile_literal,
+    "json_equal": _compile_json,
+    "json_subset": _compile_json,
+    "contains_all": _compile_contains_all,
+    "numeric_tolerance": _compile_numeric,
+}
+
+_EVALUATORS: dict[str, _Evaluator] = {
+    "regex": _evaluate_regex,
+    "literal": _evaluate_literal,
+    "json_equal": _evaluate_json_equal,
+    "json_subset": _evaluate_json_subset,
+    "contains_all": _evaluate_contains_all,
+    "numeric_tolerance": _evaluate_numeric,
+    "unsupported": _evaluate_unsupported,
+}
+
+EXPECTATION_TYPES = frozenset(_COMPILERS)
+
+
+def compile_expectation(expected: Mapping[str, object]) -> CompiledExpectation:
+    """期待値定義をコンパイルする。未知の種別や不正な値は常に不一致として扱う。"""
+
+    kind = str(expected.get("type", "regex"))
+    compiler = _COMPILERS.get(kind)
+    value = compiler(expected) if compiler is not None else None
+    digest = hashlib.sha256(
+        _canonical_json({str(key): item for key, item in expected.items()}).encode("utf-8")
+    ).hexdigest()
+    if value is None:
+        return CompiledExpectation(kind="unsupported", value=None, digest=digest)
+    return CompiledExpectation(kind=kind, value=value, digest=digest)
@@ -0,0 +1,124 @@
+"""プロバイダ出力の JSON を 1 度だけ解析して共有するキャッシュ。
+
+スキーマ検証・多数決のバケット化・``json_equal`` 評価は同じ出力文字列を
+順に受け取る。解析結果を文字列キーで保持し、後段は再解析せずに
+デコード済みの値を参照する。
+
+制約:
+
+- 値は呼び出し間で共有されるため、dict / list は変更不可の部分型
+  (``FrozenDict`` / ``FrozenList``) で返す。変更が必要なら ``thaw`` で複製する。
+- キャッシュはプロセス内の直近 ``_MAX_DOCUMENTS`` 件のみで、評価プールの
+  ワーカープロセスとは共有しない。
+- 同じ文字列を複数スレッドが同時に初めて解析した場合は重複して解析し得る
+  (結果はどちらも等価で、後勝ちでキャッシュされる)。
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import json
+from threading import Lock
+from typing import Any, NoReturn
+
+__all__ = ["FrozenDict", "FrozenList", "JsonDocument", "decode_json", "thaw"]
+
+_MAX_DOCUMENTS = 256
+
+
+def _immutable(self: object, *_args: object, **_kwargs: object) -> NoReturn:
+    raise TypeError(f"{type(self).__name__} is shared by the JSON cache and is read-only")
+
+
+class FrozenDict(dict[str, Any]):
+    """変更操作を拒否する dict。``isinstance(value, dict)`` や比較はそのまま使える。"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self) -> tuple[type[FrozenDict], tuple[dict[str, Any]]]:
+        return FrozenDict, (dict(self),)
+
+
+class FrozenList(list[Any]):
+    """変更操作を拒否する list。"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = clear = extend = insert = pop = remove = reverse = sort = _immutable
+
+    def __reduce__(self) -> tuple[type[FrozenList], tuple[list[Any]]]:
+        return FrozenList, (list(self),)
+
+
+def _freeze(value: object) -> object:
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(_freeze(item) for item in value)
+    return value
+
+
+def thaw(value: object) -> object:
+    """共有値を変更可能な dict / list へ深く複製する。"""
+
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+class JsonDocument:
+    """解析済み JSON 文書。解析に失敗した場合は ``error`` を保持する。"""
+
+    __slots__ = ("_canonical", "error", "value")
+
+    def __init__(self, value: object, error: json.JSONDecodeError | None) -> None:
+        self.value = value
+        self.error = error
+        self._canonical: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def canonical(self) -> str:
+        """キー順を正規化したコンパクトな JSON 文字列。"""
+
+        if self._canonical is None:
+            self._canonical = json.dumps(
+                self.value, sort_keys=True, separators=(",", ":")
+            )
+        return self._canonical
+
+    def raise_for_error(self) -> None:
+        if self.error is not None:
+            error = self.error
+            raise json.JSONDecodeError(error.msg, error.doc, error.pos)
+
+
+_documents: OrderedDict[str, JsonDocument] = OrderedDict()
+_lock = Lock()
+
+
+def decode_json(text: str) -> JsonDocument:
+    """``text`` を解析する。直近に解析済みの同一文字列はキャッシュを返す。"""
+
+    with _lock:
+        document = _documents.get(text)
+        if document is not None:
+            _documents.move_to_end(text)
+            return document
+    try:
+        document = JsonDocument(_freeze(json.loads(text)), None)
+    except json.JSONDecodeError as exc:
+        document = JsonDocument(None, exc)
+    with _lock:
+        _documents[text] = document
+        if len(_documents) > _MAX_DOCUMENTS:
+            _documents.popitem(last=False)
+    return document
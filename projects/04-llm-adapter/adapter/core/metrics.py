@@ -5,6 +5,9 @@
 # - [ ] adapter.core.metrics.update を直接 import している
 # - [ ] adapter.core.metrics.costs を直接 import している
 # - [ ] adapter.core.metrics.diff を直接 import している
+# - [ ] adapter.core.metrics.minhash を直接 import している
+# - [ ] adapter.core.metrics.serialization を直接 import している
+# - [ ] adapter.core.metrics.result_store を直接 import している
 
 from __future__ import annotations
 
@@ -30,11 +33,17 @@ _models = _load_submodule("models")
 _update = _load_submodule("update")
 _costs = _load_submodule("costs")
 _diff = _load_submodule("diff")
+_minhash = _load_submodule("minhash")
+_serialization = _load_submodule("serialization")
+_result_store = _load_submodule("result_store")
 
 sys.modules[f"{__name__}.models"] = _models
 sys.modules[f"{__name__}.update"] = _update
 sys.modules[f"{__name__}.costs"] = _costs
 sys.modules[f"{__name__}.diff"] = _diff
+sys.modules[f"{__name__}.minhash"] = _minhash
+sys.modules[f"{__name__}.serialization"] = _serialization
+sys.modules[f"{__name__}.result_store"] = _result_store
 
 RunMetric = _models.RunMetric
 RunMetrics = _models.RunMetrics
@@ -55,6 +64,15 @@ levenshtein_distance = _diff.levenshtein_distance
 compute_diff_rate = _diff.compute_diff_rate
 summarize_diff_rates = _diff.summarize_diff_rates
 
+minhash_signature = _minhash.minhash_signature
+estimate_jaccard = _minhash.estimate_jaccard
+
+run_metrics_to_dict = _serialization.run_metrics_to_dict
+encode_run_metrics = _serialization.encode_run_metrics
+write_run_metrics = _serialization.write_run_metrics
+
+ResultStore = _result_store.ResultStore
+
 __all__ = [
     "RunMetric",
     "RunMetrics",
@@ -71,5 +89,11 @@ __all__ = [
     "levenshtein_distance",
     "compute_diff_rate",
     "summarize_diff_rates",
+    "minhash_signature",
+    "estimate_jaccard",
+    "run_metrics_to_dict",
+    "encode_run_metrics",
+    "write_run_metrics",
+    "ResultStore",
 ]
 
@@ -0,0 +1,74 @@
+"""出力テキストの MinHash シグネチャ。"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+import hashlib
+import re
+
+__all__ = [
+    "MINHASH_PERMUTATIONS",
+    "MINHASH_SHINGLE_SIZE",
+    "estimate_jaccard",
+    "minhash_signature",
+]
+
+MINHASH_PERMUTATIONS = 64
+MINHASH_SHINGLE_SIZE = 5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _permutations(count: int) -> list[tuple[int, int]]:
+    # シグネチャ間の比較可能性のため、係数はシードから決定的に導出する
+    params: list[tuple[int, int]] = []
+    for index in range(count):
+        digest = hashlib.blake2b(f"minhash:{index}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "big") % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "big") % _MERSENNE_PRIME
+        params.append((a, b))
+    return params
+
+
+_DEFAULT_PERMUTATIONS = _permutations(MINHASH_PERMUTATIONS)
+
+
+def _shingle_hashes(text: str, size: int) -> set[int]:
+    normalized = _WHITESPACE_RE.sub(" ", text.strip().lower())
+    if len(normalized) <= size:
+        grams = [normalized]
+    else:
+        grams = [normalized[index : index + size] for index in range(len(normalized) - size + 1)]
+    return {
+        int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big")
+        for gram in grams
+    }
+
+
+def minhash_signature(
+    text: str,
+    *,
+    num_perm: int = MINHASH_PERMUTATIONS,
+    shingle_size: int = MINHASH_SHINGLE_SIZE,
+) -> list[int]:
+    """文字 shingle 集合の MinHash シグネチャを返す。"""
+
+    permutations = (
+        _DEFAULT_PERMUTATIONS if num_perm == MINHASH_PERMUTATIONS else _permutations(num_perm)
+    )
+    hashes = _shingle_hashes(text, shingle_size)
+    return [
+        min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in hashes)
+        for a, b in permutations
+    ]
+
+
+def estimate_jaccard(left: Sequence[int], right: Sequence[int]) -> float:
+    """2 つのシグネチャから Jaccard 類似度を推定する。"""
+
+    if not left or len(left) != len(right):
+        return 0.0
+    matches = sum(1 for a, b in zip(left, right, strict=True) if a == b)
+    return matches / len(left)
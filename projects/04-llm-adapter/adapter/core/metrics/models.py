@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from datetime import datetime, UTC
 import hashlib
 from typing import Any, Literal, TYPE_CHECKING
@@ -50,7 +50,7 @@ class RunMetric(BaseModel):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EvalMetrics:
     """評価結果。"""
 
@@ -59,7 +59,7 @@ class EvalMetrics:
     len_tokens: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BudgetSnapshot:
     """予算情報。"""
 
@@ -67,7 +67,7 @@ class BudgetSnapshot:
     hit_stop: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class RunMetrics:
     """JSONL へ書き出す 1 行のメトリクス。"""
 
@@ -91,6 +91,7 @@ class RunMetrics:
     error_message: str | None
     output_text: str | None
     output_hash: str | None
+    output_minhash: list[int] | None = None
     error_type: str | None = None
     providers: list[str] = field(default_factory=list)
     token_usage: dict[str, int] = field(default_factory=dict)
@@ -106,18 +107,16 @@ class RunMetrics:
     budget: BudgetSnapshot = field(default_factory=lambda: BudgetSnapshot(0.0, False))
     ci_meta: Mapping[str, Any] = field(default_factory=dict)
     cost_estimate: float | None = None
+    projected_cost_usd: float | None = None
 
     def __post_init__(self) -> None:
         if self.cost_estimate is None:
             self.cost_estimate = self.cost_usd
 
     def to_json_dict(self) -> dict[str, Any]:
-        payload: dict[str, Any] = asdict(self)
-        payload["cost_estimate"] = (
-            self.cost_estimate if self.cost_estimate is not None else self.cost_usd
-        )
-        payload["eval"] = {k: v for k, v in payload["eval"].items() if v is not None}
-        return payload
+        from .serialization import run_metrics_to_dict
+
+        return run_metrics_to_dict(self)
 
 
 def now_ts() -> str:
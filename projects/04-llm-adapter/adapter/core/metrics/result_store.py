@@ -0,0 +1,249 @@
+"""長時間実行向けのコンパクトな RunMetrics ストア。
+
+試行数が多いと ``RunMetrics`` のリストは同じプロバイダ名・モデル名や
+巨大な出力テキストを重複して抱え込む。``ResultStore`` は
+
+- 低カーディナリティの文字列を文字列表へインターンして添字だけを保持し、
+- 数値フィールドを ``array`` の列として保持し、
+- 出力テキストを内容ハッシュで重複排除したうえで blob ファイルへ退避し、
+- 残りのフィールドをエンコード済み JSON バイト列として保持する。
+
+``Sequence[RunMetrics]`` として振る舞い、要素へのアクセス時にだけ
+``RunMetrics`` を組み立てる。返るオブジェクトは毎回新しく作られるため、
+変更してもストアには反映されない。
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import fields
+import hashlib
+import json
+from pathlib import Path
+import tempfile
+from threading import Lock
+from typing import Any, IO, overload
+
+from .models import BudgetSnapshot, EvalMetrics, RunMetrics
+from .serialization import _encode, _to_dict_view
+
+__all__ = ["ResultStore"]
+
+_INTERNED = (
+    "provider",
+    "model",
+    "mode",
+    "prompt_id",
+    "prompt_name",
+    "status",
+    "failure_kind",
+    "error_type",
+    "outcome",
+    "shadow_provider_id",
+    "shadow_status",
+    "shadow_outcome",
+)
+_INTEGERS = (
+    "seed",
+    "max_tokens",
+    "input_tokens",
+    "output_tokens",
+    "latency_ms",
+    "attempts",
+    "retries",
+)
+_FLOATS = ("temperature", "top_p", "cost_usd")
+_COLUMNAR = frozenset((*_INTERNED, *_INTEGERS, *_FLOATS, "output_text"))
+_RESIDUAL = tuple(item.name for item in fields(RunMetrics) if item.name not in _COLUMNAR)
+
+_NO_BLOB = -1
+
+
+class ResultStore(Sequence[RunMetrics]):
+    """RunMetrics を列指向で保持する追記専用ストア。
+
+    ``blob_path`` を省略すると一時ファイルへ出力テキストを退避し、
+    ``close()`` かガベージコレクション時に削除する。
+    """
+
+    def __init__(self, blob_path: Path | None = None) -> None:
+        self._lock = Lock()
+        self._strings: list[str | None] = [None]
+        self._string_ids: dict[str | None, int] = {None: 0}
+        self._interned: dict[str, array[int]] = {name: array("I") for name in _INTERNED}
+        self._integers: dict[str, array[int]] = {name: array("q") for name in _INTEGERS}
+        self._floats: dict[str, array[float]] = {name: array("d") for name in _FLOATS}
+        self._output_blobs = array("q")
+        self._residual: list[bytes] = []
+        # 列へ収まらない値 (None の数値など) は行ごとの上書きとして保持する
+        self._overrides: dict[int, dict[str, Any]] = {}
+        self._blob_ids: dict[bytes, int] = {}
+        self._blob_offsets = array("q")
+        self._blob_lengths = array("q")
+        self._blob_end = 0
+        self._blob_path = blob_path
+        self._blob: IO[bytes] | None
+        if blob_path is None:
+            self._blob = tempfile.TemporaryFile()  # noqa: SIM115 - ストアの寿命で閉じる
+        else:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            self._blob = blob_path.open("w+b")
+
+    @property
+    def blob_path(self) -> Path | None:
+        return self._blob_path
+
+    @property
+    def blob_count(self) -> int:
+        """重複排除後に退避した出力テキストの件数。"""
+
+        return len(self._blob_offsets)
+
+    def __len__(self) -> int:
+        return len(self._residual)
+
+    @overload
+    def __getitem__(self, index: int) -> RunMetrics: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[RunMetrics]: ...
+
+    def __getitem__(self, index: int | slice) -> RunMetrics | list[RunMetrics]:
+        if isinstance(index, slice):
+            return [self._materialize(position) for position in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("ResultStore index out of range")
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[RunMetrics]:
+        for index in range(len(self)):
+            yield self._materialize(index)
+
+    def append(self, metrics: RunMetrics) -> None:
+        payload = _to_dict_view(metrics)
+        with self._lock:
+            row = len(self._residual)
+            overrides: dict[str, Any] = {}
+            for name, column in self._interned.items():
+                value = payload[name]
+                if value is not None and not isinstance(value, str):
+                    overrides[name] = value
+                    value = None
+                column.append(self._intern(value))
+            for name, column in self._integers.items():
+                self._append_number(column, name, payload[name], 0, overrides)
+            for name, float_column in self._floats.items():
+                self._append_number(float_column, name, payload[name], 0.0, overrides)
+            output_text = payload["output_text"]
+            self._output_blobs.append(
+                _NO_BLOB if output_text is None else self._spill(output_text)
+            )
+            self._residual.append(_encode([payload[name] for name in _RESIDUAL]))
+            if overrides:
+                self._overrides[row] = overrides
+
+    def extend(self, records: Iterable[RunMetrics]) -> None:
+        for metrics in records:
+            self.append(metrics)
+
+    def column(self, name: str) -> Sequence[int] | Sequence[float]:
+        """数値フィールドの列をそのまま返す。集計用で、変更しないこと。"""
+
+        if name in self._integers:
+            return self._integers[name]
+        if name in self._floats:
+            return self._floats[name]
+        raise KeyError(name)
+
+    def output_text(self, index: int) -> str | None:
+        """``index`` 行目の出力テキストだけを読み出す。"""
+
+        if index < 0:
+            index += len(self)
+        blob_id = self._output_blobs[index]
+        return None if blob_id == _NO_BLOB else self._read_blob(blob_id)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._blob is not None:
+                self._blob.close()
+                self._blob = None
+
+    def __enter__(self) -> ResultStore:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def _intern(self, value: str | None) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    @staticmethod
+    def _append_number(
+        column: array[Any],
+        name: str,
+        value: object,
+        placeholder: float,
+        overrides: dict[str, Any],
+    ) -> None:
+        try:
+            column.append(value)
+        except (TypeError, OverflowError):
+            column.append(placeholder)
+            overrides[name] = value
+
+    def _spill(self, text: str) -> int:
+        data = text.encode("utf-8")
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        blob_id = self._blob_ids.get(digest)
+        if blob_id is not None:
+            return blob_id
+        blob = self._require_blob()
+        blob.seek(self._blob_end)
+        blob.write(data)
+        blob_id = len(self._blob_offsets)
+        self._blob_offsets.append(self._blob_end)
+        self._blob_lengths.append(len(data))
+        self._blob_ids[digest] = blob_id
+        self._blob_end += len(data)
+        return blob_id
+
+    def _read_blob(self, blob_id: int) -> str:
+        with self._lock:
+            blob = self._require_blob()
+            blob.seek(self._blob_offsets[blob_id])
+            data = blob.read(self._blob_lengths[blob_id])
+        return data.decode("utf-8")
+
+    def _require_blob(self) -> IO[bytes]:
+        if self._blob is None:
+            raise ValueError("ResultStore is closed")
+        return self._blob
+
+    def _materialize(self, index: int) -> RunMetrics:
+        values: dict[str, Any] = dict(
+            zip(_RESIDUAL, json.loads(self._residual[index]), strict=True)
+        )
+        values["eval"] = EvalMetrics(**values["eval"])
+        values["budget"] = BudgetSnapshot(**values["budget"])
+        strings = self._strings
+        for name, column in self._interned.items():
+            values[name] = strings[column[index]]
+        for name, column in self._integers.items():
+            values[name] = column[index]
+        for name, float_column in self._floats.items():
+            values[name] = float_column[index]
+        values["output_text"] = self.output_text(index)
+        overrides = self._overrides.get(index)
+        if overrides:
+            values.update(overrides)
+        return RunMetrics(**values)
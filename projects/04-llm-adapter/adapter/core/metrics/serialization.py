@@ -0,0 +1,150 @@
+"""RunMetrics の高速シリアライザ。
+
+``dataclasses.asdict`` は入れ子のデータクラスを再帰的に deepcopy するため、
+試行ごとに JSONL へ追記する経路では支配的なコストになる。ここではフィールド
+一覧からフィールドを直接読む変換関数を 1 度だけ生成し、エンコードは
+orjson / msgspec が導入されていればそれを、なければ標準 ``json`` を使う。
+どのバックエンドでも出力は同一 (区切りに空白を入れないコンパクト形式、
+非 ASCII はそのまま、NaN / Infinity は ``null``) になるよう揃えている。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import fields
+import importlib
+import json
+import math
+import os
+from types import ModuleType
+from typing import Any, IO
+
+from .models import BudgetSnapshot, EvalMetrics, RunMetrics
+
+
+def _optional_module(name: str) -> ModuleType | None:
+    try:
+        return importlib.import_module(name)
+    except ModuleNotFoundError:  # pragma: no cover - 任意依存
+        return None
+
+
+_orjson = _optional_module("orjson")
+_msgspec = _optional_module("msgspec")
+
+__all__ = [
+    "JSON_BACKENDS",
+    "encode_run_metrics",
+    "run_metrics_to_dict",
+    "write_run_metrics",
+]
+
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+
+_NESTED = {
+    "eval": EvalMetrics,
+    "budget": BudgetSnapshot,
+}
+# 呼び出し側へ返す dict では可変コンテナをシャローコピーして元オブジェクトと切り離す
+_CONTAINER_COPIES = {
+    "output_minhash": "None if m.output_minhash is None else list(m.output_minhash)",
+    "providers": "list(m.providers)",
+    "token_usage": "dict(m.token_usage)",
+}
+
+
+def _generate_to_dict(*, copy_containers: bool) -> Callable[[RunMetrics], dict[str, Any]]:
+    eval_pairs = ", ".join(f"({sub.name!r}, e.{sub.name})" for sub in fields(EvalMetrics))
+    lines = ["def to_dict(m):", "    e = m.eval", "    return {"]
+    for item in fields(RunMetrics):
+        name = item.name
+        if name == "eval":
+            expression = f"{{k: v for k, v in ({eval_pairs},) if v is not None}}"
+        elif name in _NESTED:
+            parts = ", ".join(
+                f"{sub.name!r}: m.{name}.{sub.name}" for sub in fields(_NESTED[name])
+            )
+            expression = f"{{{parts}}}"
+        elif name == "cost_estimate":
+            expression = "m.cost_usd if m.cost_estimate is None else m.cost_estimate"
+        elif name == "ci_meta":
+            expression = "dict(m.ci_meta)"
+        elif copy_containers and name in _CONTAINER_COPIES:
+            expression = _CONTAINER_COPIES[name]
+        else:
+            expression = f"m.{name}"
+        lines.append(f"        {name!r}: {expression},")
+    lines.append("    }")
+    namespace: dict[str, Any] = {}
+    exec(compile("\n".join(lines), f"<run_metrics_to_dict copy={copy_containers}>", "exec"), namespace)
+    return namespace["to_dict"]
+
+
+_to_dict_copy = _generate_to_dict(copy_containers=True)
+_to_dict_view = _generate_to_dict(copy_containers=False)
+
+
+def run_metrics_to_dict(metrics: RunMetrics) -> dict[str, Any]:
+    """``RunMetrics.to_json_dict`` と同じ形の dict を asdict を使わずに返す。"""
+
+    return _to_dict_copy(metrics)
+
+
+def _json_encoder() -> tuple[str, Callable[[object], bytes]]:
+    preferred = os.getenv("LLM_ADAPTER_JSON_BACKEND", "").strip().lower()
+    order = [preferred] if preferred in JSON_BACKENDS else list(JSON_BACKENDS)
+    for backend in order:
+        if backend == "orjson" and _orjson is not None:
+            return backend, lambda payload: _orjson.dumps(payload, option=_orjson.OPT_NON_STR_KEYS)
+        if backend == "msgspec" and _msgspec is not None:
+            return backend, _msgspec.json.Encoder().encode
+        if backend == "json":
+            break
+    return "json", _encode_stdlib
+
+
+_STDLIB_ENCODER = json.JSONEncoder(
+    ensure_ascii=False, allow_nan=False, separators=(",", ":")
+)
+
+
+def _finite_or_none(value: object) -> object:
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite_or_none(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_finite_or_none(item) for item in value]
+    return value
+
+
+def _encode_stdlib(payload: object) -> bytes:
+    try:
+        text = _STDLIB_ENCODER.encode(payload)
+    except ValueError:
+        # orjson / msgspec と同じく非有限値は null として書き出す
+        text = _STDLIB_ENCODER.encode(_finite_or_none(payload))
+    return text.encode("utf-8")
+
+
+_BACKEND, _encode = _json_encoder()
+
+
+def encode_run_metrics(metrics: RunMetrics) -> bytes:
+    """1 行分の JSON を UTF-8 バイト列で返す (改行なし)。"""
+
+    return _encode(_to_dict_view(metrics))
+
+
+def write_run_metrics(fp: IO[bytes], records: Iterable[RunMetrics]) -> int:
+    """レコードを JSONL としてまとめて書き込み、件数を返す。"""
+
+    buffer = bytearray()
+    count = 0
+    for metrics in records:
+        buffer += _encode(_to_dict_view(metrics))
+        buffer += b"\n"
+        count += 1
+    if buffer:
+        fp.write(buffer)
+    return count
@@ -4,23 +4,39 @@ from __future__ import annotations
 
 from collections.abc import Callable, Sequence
 from concurrent.futures import CancelledError
+from threading import Event, Lock
 from typing import TYPE_CHECKING
 
+from ...aggregation import AggregationCandidate
 from ...config import ProviderConfig
 from ...datasets import GoldenTask
-from ...providers import BaseProvider
+from ...providers import BaseProvider, ProviderResponse
 from .base import _ParallelCoordinatorBase
 
 if TYPE_CHECKING:  # pragma: no cover - 型補完用
+    from ...aggregation.builtin.majority_vote import MajorityVoteTally
     from ...runner_api import RunnerConfig
     from ...runner_execution import SingleRunResult
     from ...runner_execution_parallel import ParallelAttemptExecutor
     from .base import _BuildCancelledResult
 
+_ConsensusTallyFactory = Callable[["RunnerConfig", int], "MajorityVoteTally | None"]
+
 # --- ParallelAll 固有ロジック ---
 
 
 class _ParallelAllCoordinator(_ParallelCoordinatorBase):
+    """全プロバイダを実行し、合意が確定または不成立になった時点で打ち切る。
+
+    打ち切り時に取り消せるのは未開始の呼び出しだけで、実行中の呼び出しは
+    バックグラウンドで完了まで走る (予算は ``_run_single`` 内で計上される)。
+    そうした行は ``ci_meta["early_stop_in_flight"]`` で識別でき、タスク確定前に
+    応答が返れば、そのコスト・トークン・レイテンシを同じ行へ加算する。
+    """
+
+    EARLY_STOP_MESSAGE = "consensus decided before completion"
+    UNREACHABLE_MESSAGE = "consensus quorum unreachable before completion"
+
     def __init__(
         self,
         executor: ParallelAttemptExecutor,
@@ -30,6 +46,7 @@ class _ParallelAllCoordinator(_ParallelCoordinatorBase):
         config: RunnerConfig,
         *,
         cancel_builder: _BuildCancelledResult,
+        tally_factory: _ConsensusTallyFactory | None = None,
     ) -> None:
         super().__init__(
             executor,
@@ -39,23 +56,44 @@ class _ParallelAllCoordinator(_ParallelCoordinatorBase):
             config,
             cancel_builder=cancel_builder,
         )
+        self._tally = (
+            tally_factory(config, len(providers)) if tally_factory is not None else None
+        )
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._stop_message = self.EARLY_STOP_MESSAGE
+        self._started: set[int] = set()
+        self._closed = False
 
     def execute(self) -> tuple[list[tuple[int, SingleRunResult]], str | None]:
         workers = [
             self._build_worker(index, provider_config, provider)
             for index, (provider_config, provider) in enumerate(self._providers)
         ]
+        if self._tally is None:
+            self._executor._run_parallel_all_sync(
+                workers, max_concurrency=self._max_workers
+            )
+            return self._build_batch(), self._stop_reason
         self._executor._run_parallel_all_sync(
-            workers, max_concurrency=self._max_workers
+            workers, max_concurrency=self._max_workers, stop_event=self._stop_event
         )
-        return self._build_batch(), self._stop_reason
+        with self._lock:
+            self._closed = True
+            if self._stop_event.is_set():
+                for index, result in enumerate(self._results):
+                    if result is None:
+                        self._mark_early_stopped(index)
+            return self._build_batch(), self._stop_reason
 
     def _build_worker(
         self, index: int, provider_config: ProviderConfig, provider: BaseProvider
     ) -> Callable[[], int]:
         def worker() -> int:
-            if self._cancel_event.is_set():
+            if self._cancel_event.is_set() or self._stop_event.is_set():
                 raise CancelledError()
+            with self._lock:
+                self._started.add(index)
             try:
                 result = self._executor._run_single(
                     provider_config,
@@ -64,14 +102,80 @@ class _ParallelAllCoordinator(_ParallelCoordinatorBase):
                     self._attempt_index,
                     self._mode_value,
                 )
-                self._results[index] = result
-                self._update_stop_reason(result)
+                if self._tally is None:
+                    self._results[index] = result
+                    self._update_stop_reason(result)
+                    return index
+                candidate = _to_candidate(index, result)
+                # 埋め込みは外部呼び出しになり得るためロック取得前に済ませる
+                vector = self._tally.embed([candidate])[0]
+                with self._lock:
+                    if self._closed:
+                        # 合意確定後に返ってきた応答は集約対象にせず、実費だけ残す
+                        self._absorb_late_result(index, result)
+                        return index
+                    self._results[index] = result
+                    self._update_stop_reason(result)
+                    self._tally.add(candidate, vector=vector)
+                    if self._tally.is_decided():
+                        self._stop_event.set()
+                    elif self._tally.quorum_unreachable():
+                        self._stop_message = self.UNREACHABLE_MESSAGE
+                        self._stop_event.set()
                 return index
             except CancelledError:
-                self._mark_cancelled(index)
+                if self._tally is None:
+                    self._mark_cancelled(index)
+                    raise
+                with self._lock:
+                    # 確定後は execute 側が結果を確定済みなので書き換えない
+                    if not self._closed:
+                        self._mark_cancelled(index)
                 raise
 
         return worker
 
+    def _mark_early_stopped(self, index: int) -> None:
+        provider_config, _ = self._providers[index]
+        result = self._build_cancelled_result(
+            provider_config,
+            self._task,
+            self._attempt_index,
+            self._config,
+            self._stop_message,
+        )
+        if index in self._started:
+            result.metrics.ci_meta = {**result.metrics.ci_meta, "early_stop_in_flight": True}
+        self._results[index] = result
+
+    def _absorb_late_result(self, index: int, late: SingleRunResult) -> None:
+        placeholder = self._results[index]
+        if placeholder is None:
+            return
+        metrics = placeholder.metrics
+        metrics.cost_usd += late.metrics.cost_usd
+        metrics.input_tokens += late.metrics.input_tokens
+        metrics.output_tokens += late.metrics.output_tokens
+        metrics.latency_ms = max(metrics.latency_ms, late.metrics.latency_ms)
+        metrics.ci_meta = {**metrics.ci_meta, "early_stop_late_status": late.metrics.status}
+
+
+def _to_candidate(index: int, result: SingleRunResult) -> AggregationCandidate | None:
+    # CandidateBuilder と同じ基準で投票対象を判定する
+    if result.metrics.status != "ok" or not result.raw_output.strip():
+        return None
+    response = ProviderResponse(
+        text=result.raw_output,
+        latency_ms=result.metrics.latency_ms,
+        input_tokens=result.metrics.input_tokens,
+        output_tokens=result.metrics.output_tokens,
+    )
+    return AggregationCandidate(
+        index=index,
+        provider=result.metrics.provider,
+        response=response,
+        text=result.raw_output,
+    )
+
 
 __all__ = ["_ParallelAllCoordinator"]
@@ -118,6 +118,13 @@ class OllamaClient:
         )
         return _StreamingResponseWrapper(response, "/api/pull")
 
+    def embed(
+        self, payload: Mapping[str, object], *, timeout: float | None = None
+    ) -> ResponseProtocol:
+        return self._ensure_success(
+            "/api/embed", self._post("/api/embed", payload, timeout=timeout)
+        )
+
     def chat(
         self,
         payload: Mapping[str, object],
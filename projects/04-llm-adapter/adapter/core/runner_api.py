@@ -23,6 +23,7 @@ from .runner_config_builder import (
     RunnerMode,
 )
 from .runners import CompareRunner
+from .shadow_sampling import ShadowSampler
 
 
 def default_budgets_path() -> Path:
@@ -54,6 +55,19 @@ def run_compare(
     runner_config: RunnerConfig | None = None,
     backoff: BackoffPolicy | None = None,
     shadow_provider: ProviderSPI | None = None,
+    shadow_sampler: ShadowSampler | None = None,
+    consensus_early_stop: bool = False,
+    judge_batch: bool = False,
+    judge_cache: Path | str | None = None,
+    similarity_threshold: float | None = None,
+    similarity_embedder: str | None = None,
+    learned_weights: Path | str | None = None,
+    eval_workers: int | None = None,
+    eval_chunk_size: int | None = None,
+    compact_results: bool = False,
+    budget_ledger: Path | str | None = None,
+    predictive_budget: bool = False,
+    output_minhash: bool = False,
 ) -> int:
     logging.basicConfig(level=getattr(logging, log_level.upper(), logging.INFO))
 
@@ -73,7 +87,20 @@ def run_compare(
         rpm=rpm,
         backoff=backoff,
         shadow_provider=shadow_provider,
+        shadow_sampler=shadow_sampler,
         metrics_path=metrics_path,
+        consensus_early_stop=consensus_early_stop,
+        judge_batch=judge_batch,
+        judge_cache=judge_cache,
+        similarity_threshold=similarity_threshold,
+        similarity_embedder=similarity_embedder,
+        learned_weights=learned_weights,
+        eval_workers=eval_workers,
+        eval_chunk_size=eval_chunk_size,
+        compact_results=compact_results,
+        budget_ledger=budget_ledger,
+        predictive_budget=predictive_budget,
+        output_minhash=output_minhash,
     )
 
     if RunnerConfig is not type(config) and is_dataclass(config):
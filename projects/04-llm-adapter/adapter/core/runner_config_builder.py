@@ -6,6 +6,7 @@ from pathlib import Path
 
 from .config import ProviderConfig
 from .provider_spi import ProviderSPI
+from .shadow_sampling import ShadowSampler
 
 
 class RunnerMode(str, Enum):
@@ -60,7 +61,20 @@ class RunnerConfig:
     rpm: int | None = None
     backoff: BackoffPolicy = field(default_factory=BackoffPolicy)
     shadow_provider: ProviderSPI | None = None
+    shadow_sampler: ShadowSampler | None = None
     metrics_path: Path | None = None
+    consensus_early_stop: bool = False
+    judge_batch: bool = False
+    judge_cache: Path | None = None
+    similarity_threshold: float | None = None
+    similarity_embedder: str | None = None
+    learned_weights: Path | None = None
+    eval_workers: int | None = None
+    eval_chunk_size: int | None = None
+    compact_results: bool = False
+    budget_ledger: Path | None = None
+    predictive_budget: bool = False
+    output_minhash: bool = False
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "mode", RunnerConfigBuilder._normalize_mode(self.mode))
@@ -70,6 +84,21 @@ class RunnerConfig:
         object.__setattr__(
             self, "judge", RunnerConfigBuilder._resolve_optional_path(self.judge)
         )
+        object.__setattr__(
+            self,
+            "judge_cache",
+            RunnerConfigBuilder._resolve_optional_path(self.judge_cache),
+        )
+        object.__setattr__(
+            self,
+            "learned_weights",
+            RunnerConfigBuilder._resolve_optional_path(self.learned_weights),
+        )
+        object.__setattr__(
+            self,
+            "budget_ledger",
+            RunnerConfigBuilder._resolve_optional_path(self.budget_ledger),
+        )
         object.__setattr__(
             self,
             "metrics_path",
@@ -97,20 +126,42 @@ class RunnerConfigBuilder:
         backoff: BackoffPolicy | None,
         shadow_provider: ProviderSPI | None,
         metrics_path: Path | str,
+        shadow_sampler: ShadowSampler | None = None,
+        consensus_early_stop: bool = False,
+        judge_batch: bool = False,
+        judge_cache: Path | str | None = None,
+        similarity_threshold: float | None = None,
+        similarity_embedder: str | None = None,
+        learned_weights: Path | str | None = None,
+        eval_workers: int | None = None,
+        eval_chunk_size: int | None = None,
+        compact_results: bool = False,
+        budget_ledger: Path | str | None = None,
+        predictive_budget: bool = False,
+        output_minhash: bool = False,
     ) -> RunnerConfig:
         sanitized_mode = self._normalize_mode(mode)
         sanitized_schema = self._resolve_optional_path(schema)
         sanitized_judge = self._resolve_optional_path(judge)
+        sanitized_judge_cache = self._resolve_optional_path(judge_cache)
+        sanitized_learned_weights = self._resolve_optional_path(learned_weights)
+        sanitized_budget_ledger = self._resolve_optional_path(budget_ledger)
+        if similarity_threshold is not None and not 0.0 < similarity_threshold <= 1.0:
+            raise ValueError("similarity_threshold must be in (0, 1]")
         sanitized_quorum = self._sanitize_positive_int(quorum)
         sanitized_max_concurrency = self._sanitize_positive_int(max_concurrency)
         sanitized_rpm = self._sanitize_positive_int(rpm)
+        sanitized_eval_workers = self._sanitize_positive_int(eval_workers)
+        sanitized_eval_chunk_size = self._sanitize_positive_int(eval_chunk_size)
         sanitized_metrics = self._resolve_optional_path(metrics_path)
         if sanitized_metrics is None:  # pragma: no cover - defensive
             raise ValueError("metrics_path must be provided")
 
         is_weighted = self._is_weighted_aggregate(aggregate)
-        if is_weighted and provider_weights is None:
-            raise ValueError("aggregate=weighted_vote requires provider_weights")
+        if is_weighted and provider_weights is None and sanitized_learned_weights is None:
+            raise ValueError(
+                "aggregate=weighted_vote requires provider_weights or learned_weights"
+            )
         sanitized_weights = provider_weights if is_weighted else None
 
         if self._base is None:
@@ -127,7 +178,20 @@ class RunnerConfigBuilder:
                 rpm=sanitized_rpm,
                 backoff=backoff or BackoffPolicy(),
                 shadow_provider=shadow_provider,
+                shadow_sampler=shadow_sampler,
                 metrics_path=sanitized_metrics,
+                consensus_early_stop=consensus_early_stop,
+                judge_batch=judge_batch,
+                judge_cache=sanitized_judge_cache,
+                similarity_threshold=similarity_threshold,
+                similarity_embedder=similarity_embedder,
+                learned_weights=sanitized_learned_weights,
+                eval_workers=sanitized_eval_workers,
+                eval_chunk_size=sanitized_eval_chunk_size,
+                compact_results=compact_results,
+                budget_ledger=sanitized_budget_ledger,
+                predictive_budget=predictive_budget,
+                output_minhash=output_minhash,
             )
 
         config = self._base
@@ -153,8 +217,39 @@ class RunnerConfigBuilder:
             judge_provider=judge_provider_value,
             backoff=backoff_value,
             shadow_provider=shadow_value,
+            shadow_sampler=(
+                shadow_sampler if shadow_sampler is not None else config.shadow_sampler
+            ),
             provider_weights=provider_weights_value,
             metrics_path=sanitized_metrics,
+            consensus_early_stop=config.consensus_early_stop or consensus_early_stop,
+            judge_batch=config.judge_batch or judge_batch,
+            judge_cache=(
+                sanitized_judge_cache
+                if sanitized_judge_cache is not None
+                else config.judge_cache
+            ),
+            similarity_threshold=(
+                similarity_threshold
+                if similarity_threshold is not None
+                else config.similarity_threshold
+            ),
+            similarity_embedder=similarity_embedder or config.similarity_embedder,
+            learned_weights=(
+                sanitized_learned_weights
+                if sanitized_learned_weights is not None
+                else config.learned_weights
+            ),
+            eval_workers=sanitized_eval_workers or config.eval_workers,
+            eval_chunk_size=sanitized_eval_chunk_size or config.eval_chunk_size,
+            compact_results=config.compact_results or compact_results,
+            budget_ledger=(
+                sanitized_budget_ledger
+                if sanitized_budget_ledger is not None
+                else config.budget_ledger
+            ),
+            predictive_budget=config.predictive_budget or predictive_budget,
+            output_minhash=config.output_minhash or output_minhash,
         )
 
     @staticmethod
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable, Sequence
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import Protocol, TYPE_CHECKING
 
 from ._parallel_shim import (
     ParallelExecutionError,
@@ -12,6 +12,10 @@ from ._parallel_shim import (
     run_parallel_any_sync,
 )
 from ._provider_execution import _ProviderCallResult, ProviderCallExecutor
+from .aggregation.builtin.majority_vote import MajorityVoteStrategy, MajorityVoteTally
+from .aggregation.builtin.registry import STRATEGY_ALIASES
+from .aggregation.similarity import build_consensus_similarity
+from .budget_ledger import BudgetReservation
 from .config import ProviderConfig
 from .datasets import GoldenTask
 from .execution.guards import _SchemaValidator, _TokenBucket
@@ -32,14 +36,30 @@ from .runner_execution_metrics import (
     SingleRunResult,
 )
 from .runner_execution_shadow import close_shadow_session, open_shadow_session
+from .shadow_sampling import ShadowSampler
 
 if TYPE_CHECKING:  # pragma: no cover - 型補完用
     from .runner_api import BackoffPolicy, RunnerConfig
 
-_EvaluateBudget = Callable[
-    [ProviderConfig, float, str, str | None, str | None],
-    tuple[BudgetSnapshot, str | None, str, str | None, str | None],
-]
+_BudgetOutcome = tuple[BudgetSnapshot, str | None, str, str | None, str | None]
+
+
+class _EvaluateBudget(Protocol):
+    """予約付きで評価する場合は ``reservation`` をキーワード引数で渡す。"""
+
+    def __call__(
+        self,
+        provider_config: ProviderConfig,
+        cost_usd: float,
+        status: str,
+        failure_kind: str | None,
+        error_message: str | None,
+        /,
+        *,
+        reservation: BudgetReservation | None = None,
+    ) -> _BudgetOutcome: ...
+
+
 _BuildMetrics = Callable[
     [
         ProviderConfig,
@@ -57,6 +77,7 @@ _BuildMetrics = Callable[
     tuple[RunMetrics, str],
 ]
 _NormalizeConcurrency = Callable[[int, int | None], int]
+_ReserveBudget = Callable[[ProviderConfig, str, str], BudgetReservation]
 
 
 class RunnerExecution:
@@ -72,6 +93,8 @@ class RunnerExecution:
         shadow_provider: ProviderSPI | None,
         metrics_path: Path | None,
         provider_weights: dict[str, float] | None,
+        reserve_budget: _ReserveBudget | None = None,
+        shadow_sampler: ShadowSampler | None = None,
     ) -> None:
         self._token_bucket = token_bucket
         self._schema_validator = schema_validator
@@ -82,6 +105,8 @@ class RunnerExecution:
         self._shadow_provider = shadow_provider
         self._metrics_path = metrics_path
         self._provider_weights = provider_weights
+        self._reserve_budget = reserve_budget
+        self._shadow_sampler = shadow_sampler
         self._sequential_executor = SequentialAttemptExecutor(self._run_single)
         self._parallel_executor = ParallelAttemptExecutor(
             self._run_single,
@@ -89,6 +114,7 @@ class RunnerExecution:
             run_parallel_all_sync=run_parallel_all_sync,
             run_parallel_any_sync=run_parallel_any_sync,
             parallel_execution_error=ParallelExecutionError,
+            consensus_tally_factory=self._build_consensus_tally,
         )
         self._provider_executor = ProviderCallExecutor(backoff)
         self._active_provider_ids: tuple[str, ...] = ()
@@ -135,6 +161,26 @@ class RunnerExecution:
             config,
         )
 
+    def _build_consensus_tally(
+        self, config: RunnerConfig, expected: int
+    ) -> MajorityVoteTally | None:
+        """consensus + 多数決で早期終了が有効な場合のみ逐次集計器を返す。"""
+
+        if not getattr(config, "consensus_early_stop", False):
+            return None
+        mode = getattr(config.mode, "value", config.mode)
+        if mode != "consensus":
+            return None
+        aggregate = (config.aggregate or "").strip().lower() or "majority"
+        if aggregate not in STRATEGY_ALIASES["majority_vote"]:
+            return None
+        schema = self._schema_validator.schema if self._schema_validator else None
+        quorum = config.quorum if config.quorum is not None else 2
+        strategy = MajorityVoteStrategy(
+            schema=schema, similarity=build_consensus_similarity(config)
+        )
+        return strategy.tally(quorum=quorum, expected=expected)
+
     def _run_single(
         self,
         provider_config: ProviderConfig,
@@ -144,14 +190,49 @@ class RunnerExecution:
         mode: str,
     ) -> SingleRunResult:
         prompt = task.render_prompt()
-        shadow_session = open_shadow_session(self._shadow_provider, provider_config, prompt)
-        provider_result = execute_provider_with_retries(
-            self._provider_executor,
-            provider_config,
-            provider,
-            prompt,
-            token_bucket=self._token_bucket,
+        reservation = (
+            self._reserve_budget(provider_config, prompt, task.task_id)
+            if self._reserve_budget is not None
+            else None
         )
+        if reservation is not None and not reservation.granted:
+            return build_single_run_result(
+                provider_config=provider_config,
+                task=task,
+                attempt_index=attempt_index,
+                mode=mode,
+                provider_result=_budget_denied_result(),
+                evaluate_budget=self._evaluate_budget,
+                build_metrics=self._build_metrics,
+                schema_validator=None,
+                shadow_result=None,
+                fallback_shadow_id=None,
+                active_provider_ids=self._active_provider_ids,
+                current_attempt_index=self._current_attempt_index,
+                reservation=reservation,
+            )
+        shadow_session = open_shadow_session(
+            self._shadow_provider, provider_config, prompt, self._shadow_sampler
+        )
+        try:
+            provider_result = execute_provider_with_retries(
+                self._provider_executor,
+                provider_config,
+                provider,
+                prompt,
+                token_bucket=self._token_bucket,
+            )
+        except BaseException:
+            if reservation is not None:
+                # 評価まで到達しない場合も予約を残さないよう実費 0 で確定する
+                self._evaluate_budget(
+                    provider_config, 0.0, "error", None, None, reservation=reservation
+                )
+            raise
+        if self._shadow_sampler is not None:
+            self._shadow_sampler.observe_primary(
+                rate_limited=provider_result.failure_kind == "rate_limit"
+            )
         shadow_result, fallback_shadow_id = close_shadow_session(shadow_session)
         return build_single_run_result(
             provider_config=provider_config,
@@ -166,8 +247,21 @@ class RunnerExecution:
             fallback_shadow_id=fallback_shadow_id,
             active_provider_ids=self._active_provider_ids,
             current_attempt_index=self._current_attempt_index,
+            reservation=reservation,
         )
 
+
+def _budget_denied_result() -> _ProviderCallResult:
+    return _ProviderCallResult(
+        response=ProviderResponse(output_text="", input_tokens=0, output_tokens=0, latency_ms=0),
+        status="error",
+        failure_kind="guard_violation",
+        error_message=None,
+        latency_ms=0,
+        retries=0,
+    )
+
+
 __all__ = [
     "RunnerExecution",
     "SequentialAttemptExecutor",
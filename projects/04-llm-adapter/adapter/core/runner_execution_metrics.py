@@ -13,6 +13,7 @@ if TYPE_CHECKING:  # pragma: no cover - 型補完用
     from collections.abc import Sequence
 
     from ._provider_execution import _ProviderCallResult
+    from .budget_ledger import BudgetReservation
     from .config import ProviderConfig
     from .datasets import GoldenTask
     from .execution.guards import _SchemaValidator
@@ -68,6 +69,7 @@ def build_single_run_result(
     fallback_shadow_id: str | None,
     active_provider_ids: Sequence[str],
     current_attempt_index: int,
+    reservation: BudgetReservation | None = None,
 ) -> SingleRunResult:
     """Finalize metrics for a single provider run."""
 
@@ -76,13 +78,20 @@ def build_single_run_result(
     failure_kind = provider_result.failure_kind
     error_message = provider_result.error_message
     cost_usd = estimate_cost(provider_config, response.input_tokens, response.output_tokens)
-    budget_snapshot, stop_reason, status, failure_kind, error_message = evaluate_budget(
-        provider_config,
-        cost_usd,
-        status,
-        failure_kind,
-        error_message,
-    )
+    if reservation is None:
+        budget_outcome = evaluate_budget(
+            provider_config, cost_usd, status, failure_kind, error_message
+        )
+    else:
+        budget_outcome = evaluate_budget(
+            provider_config,
+            cost_usd,
+            status,
+            failure_kind,
+            error_message,
+            reservation=reservation,
+        )
+    budget_snapshot, stop_reason, status, failure_kind, error_message = budget_outcome
     status, failure_kind, error_message, schema_error = apply_schema_validation(
         schema_validator,
         response,
@@ -103,6 +112,8 @@ def build_single_run_result(
         budget_snapshot,
         cost_usd,
     )
+    if reservation is not None:
+        run_metrics.projected_cost_usd = reservation.amount_usd
     finalize_run_metrics(
         run_metrics,
         attempt_index=attempt_index,
@@ -22,6 +22,7 @@ from .parallel_state import ParallelAnyState
 from .providers import BaseProvider
 
 if TYPE_CHECKING:  # pragma: no cover - 型補完用
+    from .aggregation.builtin.majority_vote import MajorityVoteTally
     from .runner_api import RunnerConfig
     from .runner_execution import SingleRunResult
 
@@ -43,6 +44,7 @@ else:
         object,
     ]
 _StateFactory = Callable[[Event], ParallelAnyState]
+_ConsensusTallyFactory = Callable[["RunnerConfig", int], "MajorityVoteTally | None"]
 
 
 class _ParallelRunner(Protocol):
@@ -54,6 +56,16 @@ class _ParallelRunner(Protocol):
     ) -> object: ...
 
 
+class _ParallelAllRunner(Protocol):
+    def __call__(
+        self,
+        workers: Sequence[Callable[[], int]],
+        *,
+        max_concurrency: int | None = None,
+        stop_event: Event | None = None,
+    ) -> object: ...
+
+
 class ParallelAttemptExecutor:
     """Executor to handle parallel provider attempts."""
 
@@ -62,11 +74,12 @@ class ParallelAttemptExecutor:
         run_single: _RunSingle,
         normalize_concurrency: Callable[[int, int | None], int],
         *,
-        run_parallel_all_sync: _ParallelRunner,
+        run_parallel_all_sync: _ParallelAllRunner,
         run_parallel_any_sync: _ParallelRunner,
         parallel_execution_error: type[Exception],
         build_cancelled_result: _BuildCancelledResult = build_cancelled_result,
         parallel_any_state_factory: _StateFactory = ParallelAnyState,
+        consensus_tally_factory: _ConsensusTallyFactory | None = None,
     ) -> None:
         self._run_single = run_single
         self._normalize_concurrency = normalize_concurrency
@@ -75,6 +88,7 @@ class ParallelAttemptExecutor:
         self._parallel_execution_error = parallel_execution_error
         self._build_cancelled_result = build_cancelled_result
         self._parallel_any_state_factory = parallel_any_state_factory
+        self._consensus_tally_factory = consensus_tally_factory
 
     def run(
         self,
@@ -109,6 +123,7 @@ class ParallelAttemptExecutor:
                 attempt_index,
                 config,
                 cancel_builder=self._build_cancelled_result,
+                tally_factory=self._consensus_tally_factory,
             )
         return coordinator.execute()
 
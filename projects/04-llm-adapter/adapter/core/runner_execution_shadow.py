@@ -10,14 +10,18 @@ if TYPE_CHECKING:  # pragma: no cover - 型補完用
     from .config import ProviderConfig
     from .execution.shadow_runner import ShadowRunnerResult
     from .provider_spi import ProviderSPI
+    from .shadow_sampling import ShadowSampler
 
 
 def open_shadow_session(
-    shadow_provider: ProviderSPI | None, provider_config: ProviderConfig, prompt: str
+    shadow_provider: ProviderSPI | None,
+    provider_config: ProviderConfig,
+    prompt: str,
+    sampler: ShadowSampler | None = None,
 ) -> ShadowSession | None:
-    """Start a shadow session when a provider is available."""
+    """Start a shadow session when a provider is available and sampled."""
 
-    return start_shadow_session(shadow_provider, provider_config, prompt)
+    return start_shadow_session(shadow_provider, provider_config, prompt, sampler)
 
 
 def close_shadow_session(
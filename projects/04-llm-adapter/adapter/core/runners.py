@@ -9,6 +9,7 @@ from typing import Any, cast, TYPE_CHECKING
 
 from . import errors as core_errors
 from .aggregation_controller import AggregationController
+from .budget_ledger import BudgetReservation, SQLiteBudgetLedger
 from .budgets import BudgetManager
 from .compare_runner_finalizer import TaskFinalizer
 from .compare_runner_support import (
@@ -16,10 +17,16 @@ from .compare_runner_support import (
     BudgetEvaluator,
     RunMetricsBuilder,
 )
+from .compare_runner_support.evaluation_pool import (
+    DEFAULT_EVAL_CHUNK_SIZE,
+    EvaluationPool,
+)
 from .config import ProviderConfig
+from .cost_projection import CostEstimator
 from .datasets import GoldenTask
 from .execution.compare_task_runner import run_tasks
 from .metrics.models import BudgetSnapshot, RunMetrics
+from .metrics.result_store import ResultStore
 from .providers import BaseProvider, ProviderResponse
 from .runner_execution import (
     _SchemaValidator,
@@ -99,7 +106,7 @@ class CompareRunner:
             logger=LOGGER,
         )
 
-    def run(self, repeat: int, config: RunnerConfig) -> list[RunMetrics]:
+    def run(self, repeat: int, config: RunnerConfig) -> list[RunMetrics] | ResultStore:
         repeat = max(repeat, 1)
 
         self.runner_config = config
@@ -122,6 +129,7 @@ class CompareRunner:
             self._judge_provider_config = config.judge_provider
 
         self._budget_evaluator.allow_overrun = self.allow_overrun
+        reserve_budget = self._attach_budget_ledger(config)
         execution = RunnerExecution(
             token_bucket=self._token_bucket,
             schema_validator=self._schema_validator,
@@ -132,20 +140,83 @@ class CompareRunner:
             shadow_provider=self._shadow_provider,
             metrics_path=config.metrics_path,
             provider_weights=self._provider_weights,
+            reserve_budget=reserve_budget,
+            shadow_sampler=config.shadow_sampler,
         )
-        return run_tasks(
-            provider_configs=self.provider_configs,
-            tasks=self.tasks,
-            repeat=repeat,
-            config=config,
-            execution=execution,
-            aggregation_apply=self._apply_aggregation,
-            finalize_task=self._task_finalizer.finalize_task,
-            judge_provider_config=self._judge_provider_config,
-            record_failed_batch=self._record_failed_batch,
-            log_attempt_failures=self._log_attempt_failures_with_mode,
-            parallel_execution_error=ParallelExecutionError,
+        # 学習重みはラン開始時に 1 回だけ更新し、集約中はマップ済みテーブルを読むだけにする
+        self._aggregation.refresh_learned_weights(
+            getattr(config, "learned_weights", None), self.metrics_path
+        )
+        eval_pool = self._create_eval_pool(config)
+        self._metrics_builder.eval_pool = eval_pool
+        self._metrics_builder.output_minhash = bool(getattr(config, "output_minhash", False))
+        try:
+            return run_tasks(
+                provider_configs=self.provider_configs,
+                tasks=self.tasks,
+                repeat=repeat,
+                config=config,
+                execution=execution,
+                aggregation_apply=self._apply_aggregation,
+                finalize_task=self._finalize_task,
+                judge_provider_config=self._judge_provider_config,
+                record_failed_batch=self._record_failed_batch,
+                log_attempt_failures=self._log_attempt_failures_with_mode,
+                parallel_execution_error=ParallelExecutionError,
+                results=ResultStore() if getattr(config, "compact_results", False) else None,
+            )
+        finally:
+            if eval_pool is not None:
+                self._metrics_builder.eval_pool = None
+                eval_pool.close()
+
+    def _attach_budget_ledger(
+        self, config: RunnerConfig
+    ) -> Callable[[ProviderConfig, str, str], BudgetReservation] | None:
+        """共有台帳や予測予算が指定されていれば呼び出し前予約を有効にする。"""
+
+        ledger_path = getattr(config, "budget_ledger", None)
+        predictive = bool(getattr(config, "predictive_budget", False))
+        self._budget_evaluator.estimator = self._build_cost_estimator() if predictive else None
+        if ledger_path is None and not predictive:
+            return None
+        ledger = self.budget_manager.ledger
+        if ledger_path is not None and (
+            not isinstance(ledger, SQLiteBudgetLedger) or ledger.path != ledger_path
+        ):
+            self.budget_manager.ledger = SQLiteBudgetLedger(ledger_path)
+        return self._budget_evaluator.reserve
+
+    def _build_cost_estimator(self) -> CostEstimator:
+        estimator = CostEstimator(
+            {task.task_id: len(task.render_prompt()) for task in self.tasks}
         )
+        used = estimator.calibrate_from_file(self.metrics_path)
+        LOGGER.info("コスト見積もりを履歴 %d 件で較正しました", used)
+        return estimator
+
+    def _finalize_task(
+        self,
+        task: GoldenTask,
+        providers: Sequence[tuple[ProviderConfig, BaseProvider]],
+        histories: Sequence[Sequence[SingleRunResult]],
+        results: list[RunMetrics] | ResultStore,
+    ) -> None:
+        self._task_finalizer.finalize_task(task, providers, histories, results)
+        estimator = self._budget_evaluator.estimator
+        if estimator is not None:
+            # 実行中に確定した実績で見積もりを更新する
+            for history in histories:
+                for result in history:
+                    estimator.observe_metrics(result.metrics)
+
+    @staticmethod
+    def _create_eval_pool(config: RunnerConfig) -> EvaluationPool | None:
+        workers = getattr(config, "eval_workers", None)
+        if not workers:
+            return None
+        chunk_size = getattr(config, "eval_chunk_size", None) or DEFAULT_EVAL_CHUNK_SIZE
+        return EvaluationPool(workers, chunk_size=chunk_size)
 
     def _record_failed_batch(
         self,
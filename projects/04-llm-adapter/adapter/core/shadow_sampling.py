@@ -0,0 +1,188 @@
+"""シャドウ実行のサンプリング。
+
+既定ではシャドウプロバイダが設定されたリクエストを全件ミラーするため、
+費用とレート制限の負荷が倍になる。ここではミラーする割合を決める
+サンプラーを提供する。
+
+- ``ShadowSampler``: 固定比率。``deterministic=True`` ならキー
+  (リクエストのフィンガープリント) のハッシュで判定するため、
+  同じプロンプトは常に同じ判定になる。
+- ``AdaptiveShadowSampler``: 固定比率に加え、直近 60 秒の rpm / コスト
+  予算を超えないよう抑制し、プライマリがレート制限を受けたら比率を
+  半減させて徐々に戻す (AIMD)。
+"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Mapping
+import hashlib
+import random
+from threading import Lock
+import time
+from typing import Any
+
+__all__ = [
+    "AdaptiveShadowSampler",
+    "ShadowSampler",
+    "request_fingerprint",
+    "sampling_point",
+]
+
+_WINDOW_S = 60.0
+_HASH_SCALE = float(1 << 64)
+
+
+def request_fingerprint(
+    prompt: str,
+    *,
+    options: Mapping[str, Any] | None = None,
+    max_tokens: int | None = None,
+) -> str:
+    """サンプリングのキーとなるリクエストのフィンガープリントを返す。
+
+    ``llm_adapter`` の ``content_hash("runner", ...)`` と同じ値になるため、
+    両パッケージで同じリクエストは同じ判定になる。
+    """
+
+    digest = hashlib.sha256()
+    digest.update(b"runner")
+    digest.update(prompt.encode())
+    digest.update(repr(max_tokens).encode())
+    if options:
+        digest.update(repr(sorted(options.items())).encode())
+    return digest.hexdigest()[:16]
+
+
+def sampling_point(key: str) -> float:
+    """``key`` を [0, 1) 上の決定的な点へ写す。"""
+
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / _HASH_SCALE
+
+
+class ShadowSampler:
+    """固定比率でシャドウ実行の可否を決める。
+
+    決定的モードでは比率を下げても採用集合は部分集合になる
+    (比率 0.1 で採用されるキーは 0.2 でも採用される)。
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        *,
+        deterministic: bool = False,
+        rng: random.Random | None = None,
+    ) -> None:
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("rate must be within [0, 1]")
+        self.rate = rate
+        self.deterministic = deterministic
+        self._rng = rng or random.Random()
+        self._lock = Lock()
+
+    def should_shadow(self, key: str) -> bool:
+        return self._point(key) < self.effective_rate()
+
+    def effective_rate(self) -> float:
+        return self.rate
+
+    def observe_primary(self, *, rate_limited: bool) -> None:
+        """プライマリ呼び出しの結果を通知する。固定比率では何もしない。"""
+
+    def observe_shadow(self, cost_usd: float = 0.0) -> None:
+        """完了したシャドウ呼び出しのコストを通知する。固定比率では何もしない。"""
+
+    def _point(self, key: str) -> float:
+        if self.deterministic:
+            return sampling_point(key)
+        with self._lock:
+            return self._rng.random()
+
+
+class AdaptiveShadowSampler(ShadowSampler):
+    """rpm / コスト予算とプライマリのレート制限に応じて比率を調整する。
+
+    ``rpm`` は直近 60 秒に開始できるシャドウ呼び出し数、
+    ``cost_budget_usd_per_min`` は直近 60 秒に完了したシャドウ呼び出しの
+    コスト上限。プライマリがレート制限を受けるたびに比率の係数を
+    ``backoff_factor`` 倍し、成功ごとに ``recovery_step`` ずつ 1 へ戻す。
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        *,
+        rpm: int | None = None,
+        cost_budget_usd_per_min: float | None = None,
+        deterministic: bool = False,
+        backoff_factor: float = 0.5,
+        recovery_step: float = 0.05,
+        min_scale: float = 0.0,
+        rng: random.Random | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(rate, deterministic=deterministic, rng=rng)
+        if rpm is not None and rpm <= 0:
+            raise ValueError("rpm must be positive")
+        if not 0.0 < backoff_factor < 1.0:
+            raise ValueError("backoff_factor must be within (0, 1)")
+        self.rpm = rpm
+        self.cost_budget_usd_per_min = cost_budget_usd_per_min
+        self._backoff_factor = backoff_factor
+        self._recovery_step = recovery_step
+        self._min_scale = min_scale
+        self._clock = clock
+        self._scale = 1.0
+        self._starts: deque[float] = deque()
+        self._costs: deque[tuple[float, float]] = deque()
+        self._cost_total = 0.0
+
+    @property
+    def scale(self) -> float:
+        with self._lock:
+            return self._scale
+
+    def effective_rate(self) -> float:
+        with self._lock:
+            return self.rate * self._scale
+
+    def should_shadow(self, key: str) -> bool:
+        if not super().should_shadow(key):
+            return False
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            if self.rpm is not None and len(self._starts) >= self.rpm:
+                return False
+            budget = self.cost_budget_usd_per_min
+            if budget is not None and self._cost_total >= budget:
+                return False
+            self._starts.append(now)
+        return True
+
+    def observe_primary(self, *, rate_limited: bool) -> None:
+        with self._lock:
+            if rate_limited:
+                self._scale = max(self._min_scale, self._scale * self._backoff_factor)
+            else:
+                self._scale = min(1.0, self._scale + self._recovery_step)
+
+    def observe_shadow(self, cost_usd: float = 0.0) -> None:
+        if cost_usd <= 0:
+            return
+        now = self._clock()
+        with self._lock:
+            self._costs.append((now, cost_usd))
+            self._cost_total += cost_usd
+
+    def _expire(self, now: float) -> None:
+        horizon = now - _WINDOW_S
+        starts = self._starts
+        while starts and starts[0] <= horizon:
+            starts.popleft()
+        costs = self._costs
+        while costs and costs[0][0] <= horizon:
+            self._cost_total -= costs.popleft()[1]
+        if not costs:
+            self._cost_total = 0.0
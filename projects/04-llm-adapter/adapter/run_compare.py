@@ -94,10 +94,29 @@ def _parse_args() -> argparse.Namespace:
         default=None,
         help="合意に必要な最小一致数 (consensus モード向け)",
     )
+    parser.add_argument(
+        "--consensus-early-stop",
+        dest="consensus_early_stop",
+        action="store_true",
+        help="多数決の勝者が確定した時点で残りのプロバイダ呼び出しを打ち切る",
+    )
+    parser.add_argument(
+        "--similarity-threshold",
+        dest="similarity_threshold",
+        type=float,
+        default=None,
+        help="多数決で言い換えを同一票とみなすコサイン類似度の閾値 (例: 0.9)",
+    )
+    parser.add_argument(
+        "--similarity-embedder",
+        dest="similarity_embedder",
+        default=None,
+        help="類似度計算のベクトル化手法 (ngram または ollama:<model>)",
+    )
     parser.add_argument(
         "--tie-breaker",
         dest="tie_breaker",
-        choices=["min_latency", "min_cost", "stable_order"],
+        choices=["min_latency", "min_cost", "stable_order", "max_score"],
         help="合意不能時のタイブレーク手法",
     )
     parser.add_argument(
@@ -110,12 +129,30 @@ def _parse_args() -> argparse.Namespace:
         default=None,
         help="判定プロバイダ設定ファイル (aggregate=judge など)",
     )
+    parser.add_argument(
+        "--judge-batch",
+        dest="judge_batch",
+        action="store_true",
+        help="aggregate=max_score の採点を 1 回のジャッジ呼び出しにまとめる",
+    )
+    parser.add_argument(
+        "--judge-cache",
+        dest="judge_cache",
+        default=None,
+        help="ジャッジ判定を永続化するキャッシュファイル (JSONL)",
+    )
     parser.add_argument(
         "--weights",
         dest="weights",
         default=None,
         help="aggregate=weighted_vote 用の重み (例: openai=1.0,anthropic=0.5)",
     )
+    parser.add_argument(
+        "--learned-weights",
+        dest="learned_weights",
+        default=None,
+        help="履歴メトリクスから学習したプロバイダ重みテーブル (weighted_vote と max_score タイブレークで利用)",
+    )
     parser.add_argument(
         "--max-concurrency",
         dest="max_concurrency",
@@ -129,6 +166,44 @@ def _parse_args() -> argparse.Namespace:
         default=None,
         help="1 分あたりの呼び出し上限",
     )
+    parser.add_argument(
+        "--eval-workers",
+        dest="eval_workers",
+        type=int,
+        default=None,
+        help="期待値評価を実行するワーカープロセス数 (未指定なら呼び出しスレッドで評価)",
+    )
+    parser.add_argument(
+        "--eval-chunk-size",
+        dest="eval_chunk_size",
+        type=int,
+        default=None,
+        help="ワーカープロセスへ 1 回に送る評価件数",
+    )
+    parser.add_argument(
+        "--compact-results",
+        dest="compact_results",
+        action="store_true",
+        help="試行結果を列指向ストアへ保持し、出力テキストを一時ファイルへ退避する (長時間実行向け)",
+    )
+    parser.add_argument(
+        "--budget-ledger",
+        dest="budget_ledger",
+        default=None,
+        help="日次予算を複数プロセスで共有する SQLite 台帳のパス (指定時は呼び出し前に見積もり額を予約)",
+    )
+    parser.add_argument(
+        "--predictive-budget",
+        dest="predictive_budget",
+        action="store_true",
+        help="履歴メトリクスで較正したトークン見積もりから呼び出し前にコストを予測し、日次予算を超える呼び出しを送らない",
+    )
+    parser.add_argument(
+        "--output-minhash",
+        dest="output_minhash",
+        action="store_true",
+        help="出力ドリフト検出 (llm-adapter-output-drift) 用に各試行の MinHash シグネチャを記録する",
+    )
     return parser.parse_args()
 
 
@@ -204,10 +279,11 @@ def main() -> int:
     rpm = args.rpm if args.rpm and args.rpm > 0 else None
     quorum = args.quorum if args.quorum and args.quorum > 0 else None
     provider_weights = _parse_weights_arg(args.weights)
+    learned_weights = getattr(args, "learned_weights", None)
     if aggregate_kind == "weighted_vote":
-        if provider_weights is None:
+        if provider_weights is None and not learned_weights:
             raise SystemExit(
-                "aggregate=weighted_vote/weighted の場合は --weights を指定してください"
+                "aggregate=weighted_vote/weighted の場合は --weights か --learned-weights を指定してください"
             )
     elif provider_weights is not None:
         raise SystemExit("--weights は aggregate=weighted_vote のときのみ利用できます")
@@ -231,6 +307,18 @@ def main() -> int:
         judge=args.judge,
         max_concurrency=max_concurrency,
         rpm=rpm,
+        consensus_early_stop=getattr(args, "consensus_early_stop", False),
+        judge_batch=getattr(args, "judge_batch", False),
+        judge_cache=getattr(args, "judge_cache", None),
+        similarity_threshold=getattr(args, "similarity_threshold", None),
+        similarity_embedder=getattr(args, "similarity_embedder", None),
+        learned_weights=learned_weights,
+        eval_workers=getattr(args, "eval_workers", None),
+        eval_chunk_size=getattr(args, "eval_chunk_size", None),
+        compact_results=getattr(args, "compact_results", False),
+        budget_ledger=getattr(args, "budget_ledger", None),
+        predictive_budget=getattr(args, "predictive_budget", False),
+        output_minhash=getattr(args, "output_minhash", False),
     )
 
 
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from threading import Event
+import time
+from typing import cast
+
+from adapter.core._parallel_shim import run_parallel_all_sync
+from adapter.core.aggregation import MajorityVoteStrategy
+from adapter.core.providers import BaseProvider
+from adapter.core.runner_api import RunnerConfig, RunnerMode
+from adapter.core.runner_execution import SingleRunResult
+from adapter.core.runner_execution_parallel import ParallelAttemptExecutor
+
+from .conftest import _normalize_concurrency, FakeParallelExecutionError
+
+
+def test_consensus_early_stop_skips_remaining_providers(
+    make_provider_config,
+    golden_task,
+    make_run_metrics,
+) -> None:
+    providers = [make_provider_config(name) for name in ("a", "b", "c", "d", "slow")]
+    release = Event()
+    called: list[str] = []
+
+    def run_single(config, _provider, _task, _attempt, _mode):
+        called.append(config.provider)
+        if config.provider == "slow":
+            release.wait(timeout=5)
+        metrics = make_run_metrics(config, status="ok", failure_kind=None, error_message=None)
+        return SingleRunResult(metrics=metrics, raw_output="same", stop_reason=None)
+
+    def tally_factory(config: RunnerConfig, expected: int):
+        return MajorityVoteStrategy().tally(quorum=2, expected=expected)
+
+    executor = ParallelAttemptExecutor(
+        run_single,
+        _normalize_concurrency,
+        run_parallel_all_sync=run_parallel_all_sync,
+        run_parallel_any_sync=run_parallel_all_sync,
+        parallel_execution_error=FakeParallelExecutionError,
+        consensus_tally_factory=tally_factory,
+    )
+    provider_pairs = [(cfg, cast(BaseProvider, object())) for cfg in providers]
+    config = RunnerConfig(mode=RunnerMode.CONSENSUS, max_concurrency=1)
+
+    try:
+        batch, _ = executor.run(provider_pairs, golden_task, attempt_index=0, config=config)
+    finally:
+        release.set()
+
+    results = dict(batch)
+    assert "slow" not in called
+    statuses = [results[index].metrics.status for index in range(len(providers))]
+    assert statuses == ["ok", "ok", "ok", "skip", "skip"]
+    assert results[4].metrics.error_message == "consensus decided before completion"
+
+
+def _executor(run_single, *, quorum: int) -> ParallelAttemptExecutor:
+    def tally_factory(config: RunnerConfig, expected: int):
+        return MajorityVoteStrategy().tally(quorum=quorum, expected=expected)
+
+    return ParallelAttemptExecutor(
+        run_single,
+        _normalize_concurrency,
+        run_parallel_all_sync=run_parallel_all_sync,
+        run_parallel_any_sync=run_parallel_all_sync,
+        parallel_execution_error=FakeParallelExecutionError,
+        consensus_tally_factory=tally_factory,
+    )
+
+
+def test_consensus_stops_once_quorum_is_unreachable(
+    make_provider_config,
+    golden_task,
+    make_run_metrics,
+) -> None:
+    providers = [make_provider_config(name) for name in ("a", "b", "c", "d", "e")]
+    called: list[str] = []
+
+    def run_single(config, _provider, _task, _attempt, _mode):
+        called.append(config.provider)
+        metrics = make_run_metrics(config, status="ok", failure_kind=None, error_message=None)
+        return SingleRunResult(
+            metrics=metrics, raw_output=f"answer {config.provider}", stop_reason=None
+        )
+
+    executor = _executor(run_single, quorum=3)
+    provider_pairs = [(cfg, cast(BaseProvider, object())) for cfg in providers]
+    config = RunnerConfig(mode=RunnerMode.CONSENSUS, max_concurrency=1)
+
+    batch, _ = executor.run(provider_pairs, golden_task, attempt_index=0, config=config)
+
+    results = dict(batch)
+    assert called == ["a", "b", "c", "d"]
+    assert results[4].metrics.status == "skip"
+    assert results[4].metrics.error_message == "consensus quorum unreachable before completion"
+
+
+def test_consensus_early_stop_records_late_in_flight_calls(
+    make_provider_config,
+    golden_task,
+    make_run_metrics,
+) -> None:
+    providers = [make_provider_config(name) for name in ("a", "b", "c", "slow")]
+    release = Event()
+    slow_started = Event()
+    finished = Event()
+
+    def run_single(config, _provider, _task, _attempt, _mode):
+        metrics = make_run_metrics(config, status="ok", failure_kind=None, error_message=None)
+        if config.provider != "slow":
+            slow_started.wait(timeout=5)
+        else:
+            slow_started.set()
+            release.wait(timeout=5)
+            metrics.cost_usd = 0.25
+            metrics.output_tokens = 7
+            finished.set()
+        return SingleRunResult(metrics=metrics, raw_output="same", stop_reason=None)
+
+    executor = _executor(run_single, quorum=2)
+    provider_pairs = [(cfg, cast(BaseProvider, object())) for cfg in providers]
+    config = RunnerConfig(mode=RunnerMode.CONSENSUS, max_concurrency=4)
+
+    try:
+        batch, _ = executor.run(provider_pairs, golden_task, attempt_index=0, config=config)
+    finally:
+        release.set()
+
+    slow = dict(batch)[3].metrics
+    assert slow.status == "skip"
+    assert slow.ci_meta["early_stop_in_flight"] is True
+    assert finished.wait(timeout=5)
+    deadline = time.monotonic() + 5
+    while slow.cost_usd == 0.0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert slow.cost_usd == 0.25
+    assert slow.output_tokens == 7
+    assert slow.ci_meta["early_stop_late_status"] == "ok"
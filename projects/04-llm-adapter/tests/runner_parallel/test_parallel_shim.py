@@ -80,3 +80,25 @@ def test_run_parallel_any_sync_raises_parallel_execution_error_with_failures() -
     assert error.failures is not None
     assert [str(exc) for exc in error.failures] == ["first", "second"]
 
+
+
+def test_run_parallel_all_sync_returns_early_when_stop_event_set() -> None:
+    stop = threading.Event()
+    release = threading.Event()
+
+    def winner() -> int:
+        stop.set()
+        return 0
+
+    def straggler() -> int:
+        release.wait(timeout=5)
+        return 1
+
+    try:
+        results = _parallel_shim.run_parallel_all_sync(
+            [winner, straggler], max_concurrency=2, stop_event=stop
+        )
+    finally:
+        release.set()
+
+    assert results == [0, None]
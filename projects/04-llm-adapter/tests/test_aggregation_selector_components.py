@@ -249,3 +249,142 @@ def test_tie_breaker_falls_back_to_cost_when_latency_equal() -> None:
     assert decision is not None
     assert decision.decision.tie_breaker_used == "min_cost"
     assert decision.decision.chosen.provider == "p2"
+
+
+class _BatchJudge:
+    def __init__(self, text: str) -> None:
+        self._text = text
+        self.requests: list[dict[str, object]] = []
+
+    def invoke(self, request: dict[str, object]) -> SimpleNamespace:
+        self.requests.append(request)
+        if "candidates" in request:
+            return SimpleNamespace(text=self._text, raw={})
+        score = {"Alpha": 0.2, "Beta": 0.7, "Gamma": 0.5}[str(request["text"])]
+        return SimpleNamespace(text=str(score), raw={"quality_score": score})
+
+
+def _score_batch() -> list[tuple[int, SingleRunResult]]:
+    return [
+        (0, SingleRunResult(metrics=_metrics("p1"), raw_output="Alpha")),
+        (1, SingleRunResult(metrics=_metrics("p2"), raw_output="Beta")),
+        (2, SingleRunResult(metrics=_metrics("p3"), raw_output="Gamma")),
+    ]
+
+
+def test_max_score_batches_judge_scoring_into_single_call() -> None:
+    judge = _BatchJudge("[0.1, 0.8, 0.3]")
+    selector = AggregationSelector(judge_factory_builder=lambda config: _StubFactory(judge))
+    config = RunnerConfig(mode=RunnerMode.CONSENSUS, aggregate="max", judge_batch=True)
+
+    decision = selector.select(
+        "consensus", config, _score_batch(), default_judge_config=_judge_config()
+    )
+
+    assert decision is not None
+    assert len(judge.requests) == 1
+    assert "Gamma" in str(judge.requests[0]["prompt"])
+    assert decision.decision.chosen.provider == "p2"
+    assert decision.judge is not None
+    assert decision.judge.batched is True
+    assert decision.judge.calls == 1
+
+
+def test_max_score_batch_falls_back_to_concurrent_calls_on_invalid_reply() -> None:
+    judge = _BatchJudge("[0.1, 0.8]")
+    selector = AggregationSelector(judge_factory_builder=lambda config: _StubFactory(judge))
+    config = RunnerConfig(
+        mode=RunnerMode.CONSENSUS, aggregate="max", judge_batch=True, max_concurrency=3
+    )
+
+    decision = selector.select(
+        "consensus", config, _score_batch(), default_judge_config=_judge_config()
+    )
+
+    assert decision is not None
+    assert len(judge.requests) == 4
+    assert decision.decision.metadata == {"scores": {"p1": 0.2, "p2": 0.7, "p3": 0.5}}
+    assert decision.judge is not None
+    assert decision.judge.batched is False
+    assert decision.judge.calls == 4
+
+
+def test_max_score_batch_falls_back_to_single_calls_when_batch_raises() -> None:
+    class _FailingBatchJudge(_BatchJudge):
+        def invoke(self, request: dict[str, object]) -> SimpleNamespace:
+            if "candidates" in request:
+                self.requests.append(request)
+                raise RuntimeError("judge overloaded")
+            return super().invoke(request)
+
+    judge = _FailingBatchJudge("")
+    selector = AggregationSelector(judge_factory_builder=lambda config: _StubFactory(judge))
+    config = RunnerConfig(mode=RunnerMode.CONSENSUS, aggregate="max", judge_batch=True)
+
+    decision = selector.select(
+        "consensus", config, _score_batch(), default_judge_config=_judge_config()
+    )
+
+    assert decision is not None
+    assert decision.decision.chosen.provider == "p2"
+    assert decision.judge is not None
+    assert decision.judge.batched is False
+    assert decision.judge.calls == 4
+
+
+def test_max_score_reuses_judge_and_cached_scores_across_selections(tmp_path: Path) -> None:
+    judge = _BatchJudge("[]")
+    factory = _StubFactory(judge)
+    builder_calls: list[ProviderConfig] = []
+
+    def builder(config: ProviderConfig) -> _StubFactory:
+        builder_calls.append(config)
+        return factory
+
+    selector = AggregationSelector(judge_factory_builder=builder)
+    config = RunnerConfig(
+        mode=RunnerMode.CONSENSUS, aggregate="max", judge_cache=tmp_path / "judge.jsonl"
+    )
+    judge_config = _judge_config()
+
+    first = selector.select("consensus", config, _score_batch(), default_judge_config=judge_config)
+    second = selector.select("consensus", config, _score_batch(), default_judge_config=judge_config)
+
+    assert first is not None and second is not None
+    assert len(judge.requests) == 3
+    assert len(builder_calls) == 1
+    assert factory.create_calls == ["judge-model"]
+    assert second.judge is not None
+    assert second.judge.calls == 0
+    assert second.judge.cache_hits == 3
+    assert second.decision.metadata == first.decision.metadata
+
+
+def test_max_score_batch_cache_is_order_invariant_and_opt_in(tmp_path: Path) -> None:
+    judge = _BatchJudge("[0.1, 0.8, 0.3]")
+    selector = AggregationSelector(judge_factory_builder=lambda config: _StubFactory(judge))
+    uncached = RunnerConfig(mode=RunnerMode.CONSENSUS, aggregate="max", judge_batch=True)
+
+    selector.select("consensus", uncached, _score_batch(), default_judge_config=_judge_config())
+    selector.select("consensus", uncached, _score_batch(), default_judge_config=_judge_config())
+    assert len(judge.requests) == 2
+
+    cached = RunnerConfig(
+        mode=RunnerMode.CONSENSUS,
+        aggregate="max",
+        judge_batch=True,
+        judge_cache=tmp_path / "judge.jsonl",
+    )
+    first = selector.select("consensus", cached, _score_batch(), default_judge_config=_judge_config())
+    reordered = selector.select(
+        "consensus",
+        cached,
+        list(reversed(_score_batch())),
+        default_judge_config=_judge_config(),
+    )
+
+    assert len(judge.requests) == 3
+    assert first is not None and reordered is not None
+    assert reordered.judge is not None and reordered.judge.cache_hits == 1
+    assert reordered.decision.metadata == first.decision.metadata
+    assert reordered.decision.chosen.provider == "p2"
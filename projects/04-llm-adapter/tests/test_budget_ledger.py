@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from adapter.core.budget_ledger import InMemoryBudgetLedger, SQLiteBudgetLedger
+from adapter.core.budgets import BudgetManager
+from adapter.core.compare_runner_support import BudgetEvaluator
+from adapter.core.config import BudgetBook, BudgetRule
+
+
+def _manager(ledger: object, *, daily: float = 1.0) -> BudgetManager:
+    rule = BudgetRule(run_budget_usd=0.0, daily_budget_usd=daily, stop_on_budget_exceed=True)
+    return BudgetManager(BudgetBook(default=rule, overrides={}), ledger=ledger)  # type: ignore[arg-type]
+
+
+def _reserve_many(path: str, count: int) -> int:
+    ledger = SQLiteBudgetLedger(Path(path))
+    granted = 0
+    for _ in range(count):
+        reservation = ledger.reserve("2024-01-01", "openai", 0.1, 1.0)
+        if reservation.granted:
+            granted += 1
+            ledger.commit(reservation, 0.1)
+    ledger.close()
+    return granted
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_reservations_count_against_daily_budget(tmp_path: Path, backend: str) -> None:
+    if backend == "memory":
+        first = second = InMemoryBudgetLedger()
+    else:
+        first = SQLiteBudgetLedger(tmp_path / "ledger.sqlite")
+        second = SQLiteBudgetLedger(tmp_path / "ledger.sqlite")
+    shard_a, shard_b = _manager(first), _manager(second)
+
+    held = shard_a.reserve("openai", 0.6)
+    denied = shard_b.reserve("openai", 0.6)
+
+    assert held.granted is True
+    assert denied.granted is False
+    assert denied.committed_usd == pytest.approx(0.6)
+
+    assert shard_a.settle(held, 0.25) is True
+    assert shard_b.spent_today("openai") == pytest.approx(0.25)
+    retry = shard_b.reserve("openai", 0.6)
+    assert retry.granted is True
+    shard_b.release(retry)
+    assert shard_a.notify_cost("openai", 0.8) is False
+
+
+def test_sqlite_ledger_is_atomic_across_processes(tmp_path: Path) -> None:
+    path = str(tmp_path / "ledger.sqlite")
+    SQLiteBudgetLedger(Path(path)).close()
+
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        granted = sum(pool.map(_reserve_many, [path] * 3, [8] * 3))
+
+    assert granted == 10
+    assert SQLiteBudgetLedger(Path(path)).spent("2024-01-01", "openai") == pytest.approx(1.0)
+
+
+def test_budget_evaluator_reports_denied_reservation() -> None:
+    manager = _manager(InMemoryBudgetLedger(), daily=0.5)
+    manager.notify_cost("mock", 0.45)
+    evaluator = BudgetEvaluator(budget_manager=manager, allow_overrun=False, logger=logging.getLogger(__name__))
+    provider_config = SimpleNamespace(
+        provider="mock",
+        max_tokens=1000,
+        pricing=SimpleNamespace(
+            input_per_million=None,
+            output_per_million=None,
+            prompt_usd=0.0,
+            completion_usd=0.1,
+        ),
+    )
+
+    reservation = evaluator.reserve(provider_config, "hello world")  # type: ignore[arg-type]
+    snapshot, stop_reason, status, failure_kind, _ = evaluator.evaluate(
+        provider_config,  # type: ignore[arg-type]
+        0.0,
+        "error",
+        "guard_violation",
+        None,
+        reservation=reservation,
+    )
+
+    assert reservation.granted is False
+    assert snapshot.hit_stop is True
+    assert status == "error"
+    assert failure_kind == "guard_violation"
+    assert stop_reason is not None and "would be exceeded" in stop_reason
+    assert manager.spent_today("mock") == pytest.approx(0.45)
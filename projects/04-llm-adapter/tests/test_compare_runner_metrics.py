@@ -7,7 +7,7 @@ from adapter.core.budgets import BudgetBook, BudgetManager, BudgetRule
 from adapter.core.compare_runner_support import BudgetEvaluator, RunMetricsBuilder
 from adapter.core.config import ProviderConfig
 from adapter.core.datasets import GoldenTask
-from adapter.core.metrics import BudgetSnapshot, hash_text
+from adapter.core.metrics import BudgetSnapshot, hash_text, minhash_signature
 from adapter.core.models import (
     PricingConfig,
     QualityGatesConfig,
@@ -100,8 +100,25 @@ def test_run_metrics_builder_merges_eval_failures(
     assert run_metrics.output_text == provider_response.output_text
     assert run_metrics.output_hash == hash_text(provider_response.output_text)
     assert run_metrics.eval.len_tokens == provider_response.output_tokens
+    assert run_metrics.output_minhash is None
     assert output_text == provider_response.output_text
 
+    builder.output_minhash = True
+    signed, _ = builder.build(
+        provider_config=provider_config,
+        task=golden_task,
+        attempt_index=3,
+        mode=mode,
+        response=provider_response,
+        status="ok",
+        failure_kind=None,
+        error_message=None,
+        latency_ms=provider_response.latency_ms,
+        budget_snapshot=snapshot,
+        cost_usd=0.5,
+    )
+    assert signed.output_minhash == minhash_signature(provider_response.output_text)
+
 
 def test_run_metrics_builder_sets_cost_estimate(
     provider_config: ProviderConfig,
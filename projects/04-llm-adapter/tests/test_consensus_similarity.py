@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from types import SimpleNamespace
+
+import pytest
+
+from adapter.core.aggregation import AggregationCandidate, MajorityVoteStrategy
+from adapter.core.aggregation.similarity import (
+    build_similarity_bucketer,
+    HashedNgramEmbedder,
+    OllamaEmbedder,
+    SimilarityBucketer,
+)
+from adapter.core.aggregation_selector import AggregationSelector
+from adapter.core.metrics import RunMetrics
+from adapter.core.provider_spi import ProviderResponse
+from adapter.core.runner_api import RunnerConfig, RunnerMode
+from adapter.core.runner_execution import SingleRunResult
+
+
+def _candidate(index: int, text: str) -> AggregationCandidate:
+    response = ProviderResponse(text=text, latency_ms=0)
+    return AggregationCandidate(index=index, provider=f"p{index}", response=response, text=text)
+
+
+def _metrics(provider: str) -> RunMetrics:
+    return RunMetrics(
+        ts="2024-01-01T00:00:00Z",
+        run_id="run",
+        provider=provider,
+        model=f"{provider}-model",
+        mode="consensus",
+        prompt_id="prompt",
+        prompt_name="Prompt",
+        seed=0,
+        temperature=0.0,
+        top_p=1.0,
+        max_tokens=16,
+        input_tokens=1,
+        output_tokens=1,
+        latency_ms=1,
+        cost_usd=0.0,
+        status="ok",
+        failure_kind=None,
+        error_message=None,
+        output_text=None,
+        output_hash=None,
+    )
+
+
+def test_hashed_ngram_embedder_scores_paraphrases_above_unrelated_text() -> None:
+    embedder = HashedNgramEmbedder()
+    base, close, far = embedder.embed(
+        [
+            "The capital of France is Paris.",
+            "The capital of France is Paris!",
+            "Bananas are rich in potassium.",
+        ]
+    )
+    close_score = sum(a * b for a, b in zip(base, close, strict=True))
+    far_score = sum(a * b for a, b in zip(base, far, strict=True))
+    assert close_score > 0.9
+    assert far_score < 0.5
+
+
+def test_majority_vote_merges_similar_text_buckets() -> None:
+    calls: list[list[str]] = []
+
+    class _CountingEmbedder(HashedNgramEmbedder):
+        def embed(self, texts: Sequence[str]) -> list[list[float]]:
+            calls.append(list(texts))
+            return super().embed(texts)
+
+    bucketer = SimilarityBucketer(_CountingEmbedder(), threshold=0.85)
+    strategy = MajorityVoteStrategy(similarity=bucketer)
+    candidates = [
+        _candidate(0, "The capital of France is Paris."),
+        _candidate(1, "Bananas are rich in potassium."),
+        _candidate(2, "The capital of France is Paris!"),
+    ]
+
+    result = strategy.aggregate(candidates)
+
+    assert result.chosen.index == 0
+    assert result.metadata == {"bucket_size": 2, "similarity_merged": 1}
+    assert len(calls) == 1
+    assert MajorityVoteStrategy().aggregate(candidates).metadata == {"bucket_size": 1}
+
+
+def test_selector_reaches_quorum_with_similarity_threshold() -> None:
+    selector = AggregationSelector()
+    config = RunnerConfig(
+        mode=RunnerMode.CONSENSUS, aggregate="majority", similarity_threshold=0.85
+    )
+    batch = [
+        (0, SingleRunResult(metrics=_metrics("p1"), raw_output="Answer: 42 apples.")),
+        (1, SingleRunResult(metrics=_metrics("p2"), raw_output="Answer: 42 apples")),
+    ]
+
+    decision = selector.select("consensus", config, batch, default_judge_config=None)
+
+    assert decision is not None
+    assert decision.votes == 2
+
+
+def test_ollama_embedder_posts_batch_and_normalizes() -> None:
+    requests: list[dict[str, object]] = []
+
+    class _Client:
+        def embed(self, payload: dict[str, object]) -> SimpleNamespace:
+            requests.append(payload)
+            return SimpleNamespace(
+                json=lambda: {"embeddings": [[3.0, 4.0], [0.0, 2.0]]},
+                close=lambda: None,
+            )
+
+    vectors = OllamaEmbedder("nomic-embed-text", client=_Client()).embed(["a", "b"])
+
+    assert requests == [{"model": "nomic-embed-text", "input": ["a", "b"]}]
+    assert vectors == [[0.6, 0.8], [0.0, 1.0]]
+
+
+def test_majority_vote_falls_back_to_exact_buckets_when_ollama_fails(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    calls: list[object] = []
+
+    class _DownClient:
+        def embed(self, payload: dict[str, object]) -> SimpleNamespace:
+            calls.append(payload)
+            raise ConnectionError("connection refused")
+
+    bucketer = SimilarityBucketer(OllamaEmbedder("nomic-embed-text", client=_DownClient()))
+    strategy = MajorityVoteStrategy(similarity=bucketer)
+    candidates = [
+        _candidate(0, "Paris"),
+        _candidate(1, "Berlin"),
+        _candidate(2, "  paris "),
+    ]
+
+    with caplog.at_level("WARNING"):
+        first = strategy.aggregate(candidates)
+        second = strategy.aggregate(candidates)
+
+    assert first.chosen.index == 0
+    assert first.metadata == {"bucket_size": 2}
+    assert second.metadata == {"bucket_size": 2}
+    # バッチごとに 1 回だけ試し、警告は最初の 1 回のみ
+    assert len(calls) == 2
+    assert len([record for record in caplog.records if record.levelname == "WARNING"]) == 1
+
+
+def test_build_similarity_bucketer_rejects_unknown_embedder() -> None:
+    with pytest.raises(ValueError):
+        build_similarity_bucketer(0.9, "word2vec")
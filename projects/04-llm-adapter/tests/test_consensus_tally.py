@@ -0,0 +1,52 @@
+from adapter.core.aggregation import AggregationCandidate, MajorityVoteStrategy
+from adapter.core.provider_spi import ProviderResponse
+
+
+def _candidate(index: int, text: str) -> AggregationCandidate:
+    response = ProviderResponse(text=text, latency_ms=0)
+    return AggregationCandidate(index=index, provider=f"p{index}", response=response, text=text)
+
+
+def test_tally_decides_once_leader_cannot_be_overtaken() -> None:
+    tally = MajorityVoteStrategy().tally(quorum=2, expected=5)
+    tally.add(_candidate(0, "yes"))
+    assert not tally.is_decided()
+    tally.add(_candidate(1, " YES "))
+    # 残り 3 票が次点に流れれば逆転し得る
+    assert not tally.is_decided()
+    tally.add(_candidate(2, "yes"))
+    assert tally.is_decided()
+    assert tally.remaining == 2
+    result = tally.result()
+    assert result.chosen.index == 0
+    assert result.metadata == {"bucket_size": 3}
+
+
+def test_tally_counts_abstentions_against_remaining_votes() -> None:
+    tally = MajorityVoteStrategy().tally(quorum=2, expected=3)
+    tally.add(_candidate(0, "a"))
+    tally.add(None)
+    assert not tally.is_decided()
+    assert not tally.quorum_unreachable()
+    tally.add(_candidate(2, "b"))
+    assert tally.quorum_unreachable()
+
+
+def test_tally_requires_quorum_before_deciding() -> None:
+    tally = MajorityVoteStrategy().tally(quorum=3, expected=3)
+    tally.add(_candidate(0, "a"))
+    tally.add(_candidate(1, "a"))
+    assert not tally.is_decided()
+
+
+def test_json_buckets_are_hashed_and_canonical() -> None:
+    schema = {"type": "object", "required": ["foo"]}
+    strategy = MajorityVoteStrategy(schema=schema)
+    first = _candidate(0, '{"foo": 1, "bar": 2}')
+    second = _candidate(1, '{"bar":2,"foo":1}')
+    first_key, first_complete = strategy._candidate_key(first)
+    second_key, _ = strategy._candidate_key(second)
+    assert first_key == second_key
+    assert first_key.startswith("json:") and len(first_key) == len("json:") + 32
+    assert first_complete
+    assert strategy.aggregate([first, second]).metadata == {"bucket_size": 2}
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from tools.report.metrics.data import build_cost_projection
+from tools.report.metrics.incremental import ReportAggregate
+
+from adapter.core.cost_projection import CostEstimator
+
+
+def _provider_config(max_tokens: int = 100) -> SimpleNamespace:
+    return SimpleNamespace(
+        provider="openai",
+        model="gpt-test",
+        max_tokens=max_tokens,
+        pricing=SimpleNamespace(
+            input_per_million=1.0,
+            output_per_million=2.0,
+            prompt_usd=0.0,
+            completion_usd=0.0,
+        ),
+    )
+
+
+def test_estimator_learns_ratio_and_output_length(tmp_path: Path) -> None:
+    estimator = CostEstimator({"task-1": 40})
+    uncalibrated = estimator.project(_provider_config(), "x" * 40, "task-1")  # type: ignore[arg-type]
+    assert (uncalibrated.input_tokens, uncalibrated.output_tokens) == (10, 100)
+
+    history = tmp_path / "metrics.jsonl"
+    history.write_text(
+        "\n".join(
+            [
+                '{"status": "ok", "provider": "openai", "model": "gpt-test", "prompt_id": "task-1",'
+                ' "input_tokens": 20, "output_tokens": 10, "output_text": "' + "y" * 20 + '"}',
+                '{"status": "error", "provider": "openai", "model": "gpt-test", "prompt_id": "task-1",'
+                ' "input_tokens": 20, "output_tokens": 0}',
+                "not json",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    assert estimator.calibrate_from_file(history) == 1
+    assert estimator.chars_per_token("openai", "gpt-test") == pytest.approx(2.0)
+
+    projection = estimator.project(_provider_config(), "x" * 40, "task-1")  # type: ignore[arg-type]
+    assert (projection.input_tokens, projection.output_tokens) == (20, 10)
+    assert projection.cost_usd == pytest.approx(20 / 1e6 + 10 * 2 / 1e6)
+    clamped = estimator.project(_provider_config(max_tokens=4), "x" * 40, "task-1")  # type: ignore[arg-type]
+    assert clamped.output_tokens == 4
+
+
+def test_report_cost_projection_matches_incremental_aggregate() -> None:
+    metrics = [
+        {"provider": "openai", "model": "m", "cost_usd": 0.3, "projected_cost_usd": 0.2, "status": "ok"},
+        {"provider": "openai", "model": "m", "cost_usd": 0.1, "projected_cost_usd": 0.2, "status": "ok"},
+        {"provider": "openai", "model": "m", "cost_usd": 5.0, "status": "ok"},
+    ]
+    aggregate = ReportAggregate()
+    for metric in metrics:
+        aggregate.add(metric)
+
+    rows = build_cost_projection(metrics)
+    assert rows == [
+        {
+            "provider": "openai",
+            "model": "m",
+            "attempts": 2,
+            "projected_cost": 0.4,
+            "actual_cost": 0.4,
+            "error_pct": 0.0,
+        }
+    ]
+    assert aggregate.cost_projection() == rows
+    assert ReportAggregate.from_json(aggregate.to_json()).cost_projection() == rows
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from adapter.core.compare_runner_support import RunMetricsBuilder
+from adapter.core.compare_runner_support.evaluation_pool import (
+    evaluate_expectation,
+    EvaluationPool,
+)
+from adapter.core.datasets import GoldenTask
+
+
+def _pairs() -> list[tuple[dict[str, object], str]]:
+    return [
+        ({"type": "regex", "value": r"\d{3}"}, "value 123" * 300),
+        ({"type": "literal", "value": "hello world"}, "hello  world!" * 200),
+        ({"type": "json_equal", "value": {"a": 1}}, '{"a": 1}' + " " * 3000),
+        ({"type": "json_equal", "value": {"a": 1}}, "not json" * 400),
+    ]
+
+
+def test_pool_matches_inline_evaluation() -> None:
+    pairs = _pairs()
+    expected = [evaluate_expectation(spec, text) for spec, text in pairs]
+
+    with EvaluationPool(2, chunk_size=3, inline_below=0) as pool:
+        with ThreadPoolExecutor(max_workers=len(pairs)) as threads:
+            submitted = list(threads.map(lambda pair: pool.evaluate(*pair), pairs))
+        bulk = pool.evaluate_many(pairs)
+
+    assert submitted == expected
+    assert bulk == expected
+    assert expected[3][1] == "parsing"
+
+
+def test_failed_chunks_are_reevaluated_inline() -> None:
+    class _FailingExecutor:
+        def submit(self, fn: object, *args: object) -> Future[object]:
+            future: Future[object] = Future()
+            future.set_exception(MemoryError("worker died"))
+            return future
+
+        def shutdown(self, wait: bool = True) -> None:
+            return None
+
+    pairs = _pairs()
+    expected = [evaluate_expectation(spec, text) for spec, text in pairs]
+    pool = EvaluationPool(1, chunk_size=2, inline_below=0)
+    pool._executor.shutdown()
+    pool._executor = _FailingExecutor()  # type: ignore[assignment]
+    try:
+        assert [pool.evaluate(*pair) for pair in pairs] == expected
+        assert pool.evaluate_many(pairs) == expected
+    finally:
+        pool.close()
+
+
+def test_metrics_builder_delegates_to_pool() -> None:
+    calls: list[str] = []
+
+    class _Pool:
+        def evaluate(self, expected: object, output_text: str | None) -> object:
+            calls.append(output_text or "")
+            return evaluate_expectation(expected, output_text)  # type: ignore[arg-type]
+
+    task = GoldenTask(
+        task_id="t1",
+        name="task",
+        input={},
+        prompt_template="",
+        expected={"type": "literal", "value": "ok"},
+    )
+    builder = RunMetricsBuilder(eval_pool=_Pool())  # type: ignore[arg-type]
+
+    metrics, failure = builder._evaluate(task, "ok")
+
+    assert calls == ["ok"]
+    assert metrics.exact_match is True
+    assert failure is None
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from adapter.core.datasets import GoldenTask
+from adapter.core.expectations import compile_expectation, json_subset
+
+
+@pytest.mark.parametrize(
+    ("expected", "output", "match", "failure"),
+    [
+        ({"type": "regex", "value": r"SUCC\w+"}, "login SUCCESS", True, None),
+        ({"value": "RESET_OK"}, "nope", False, None),
+        ({"type": "literal", "value": " hello world "}, "hello world", True, None),
+        ({"type": "json_equal", "value": {"b": 1, "a": [1, 2]}}, '{"a":[1,2],"b":1}', True, None),
+        ({"type": "json_equal", "value": {"a": 1}}, "{'a': 1}", False, "parsing"),
+        ({"type": "json_subset", "value": {"a": {"b": 1}}}, '{"a": {"b": 1, "c": 2}, "d": 3}', True, None),
+        ({"type": "json_subset", "value": {"a": [1]}}, '{"a": [2, 1]}', False, None),
+        ({"type": "contains_all", "value": ["alpha", "Beta"]}, "alpha and beta", False, None),
+        (
+            {"type": "contains_all", "value": ["alpha", "Beta"], "case_sensitive": False},
+            "alpha and beta",
+            True,
+            None,
+        ),
+        ({"type": "numeric_tolerance", "value": 3.14, "tolerance": 0.01}, "pi is 3.141", True, None),
+        ({"type": "numeric_tolerance", "value": 100, "relative": 0.05}, "about 106", False, None),
+        ({"type": "numeric_tolerance", "value": 1}, "no digits", False, "parsing"),
+        ({"type": "unknown", "value": "x"}, "x", None, None),
+    ],
+)
+def test_compiled_expectations_evaluate(
+    expected: dict[str, object], output: str, match: bool | None, failure: str | None
+) -> None:
+    metrics, failure_kind = compile_expectation(expected).evaluate(output)
+
+    assert metrics.exact_match is match
+    assert failure_kind == failure
+    if match is None:
+        assert metrics.diff_rate == 1.0
+
+
+def test_literal_diff_rate_and_partial_contains() -> None:
+    literal, _ = compile_expectation({"type": "literal", "value": "a b c d"}).evaluate("a b x d")
+    contains, _ = compile_expectation({"type": "contains_all", "value": ["a", "z"]}).evaluate("abc")
+
+    assert literal.diff_rate == pytest.approx(0.25)
+    assert contains.diff_rate == pytest.approx(0.5)
+
+
+def test_expectation_is_compiled_once_per_task_and_picklable() -> None:
+    task = GoldenTask(
+        task_id="t1",
+        name="task",
+        input={},
+        prompt_template="",
+        expected={"type": "regex", "value": "OK"},
+    )
+
+    first = task.expectation
+    assert task.expectation is first
+    assert first.digest == compile_expectation({"value": "OK", "type": "regex"}).digest
+    restored = pickle.loads(pickle.dumps(first))
+    assert restored.evaluate("OK")[0].exact_match is True
+
+
+def test_json_subset_rejects_type_mismatch() -> None:
+    assert json_subset({"a": 1}, {"a": 1, "b": 2})
+    assert not json_subset({"a": 1}, [1])
+    assert not json_subset([1, 2], [1])
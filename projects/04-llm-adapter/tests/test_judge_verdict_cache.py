@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from adapter.core.aggregation import AggregationCandidate
+from adapter.core.aggregation.judge import JudgeStrategy
+from adapter.core.aggregation.judge_cache import JudgeVerdictCache
+from adapter.core.provider_spi import ProviderResponse
+
+
+def _candidate(index: int, text: str) -> AggregationCandidate:
+    response = ProviderResponse(text=text, latency_ms=0)
+    return AggregationCandidate(index=index, provider=f"p{index}", response=response, text=text)
+
+
+class _Judge:
+    def __init__(self, answer: str) -> None:
+        self._answer = answer
+        self.calls = 0
+
+    def invoke(self, request: object) -> SimpleNamespace:
+        self.calls += 1
+        return SimpleNamespace(text=self._answer)
+
+
+class _Factory:
+    def __init__(self, judge: _Judge) -> None:
+        self._judge = judge
+        self.created = 0
+
+    def create(self, *, model: str) -> _Judge:
+        self.created += 1
+        return self._judge
+
+
+def test_cache_key_is_order_invariant_only_on_request() -> None:
+    forward = JudgeVerdictCache.key("m", "t", ["a", "b"])
+    backward = JudgeVerdictCache.key("m", "t", ["b", "a"])
+    assert forward != backward
+    assert JudgeVerdictCache.key("m", "t", ["a", "b"], ordered=False) == JudgeVerdictCache.key(
+        "m", "t", ["b", "a"], ordered=False
+    )
+    assert JudgeVerdictCache.key("m", "other", ["a", "b"]) != forward
+
+
+def test_cache_persists_verdicts_across_instances(tmp_path: Path) -> None:
+    path = tmp_path / "judge-cache.jsonl"
+    cache = JudgeVerdictCache(path)
+    cache.put("k", {"index": 1})
+    cache.put("k", {"index": 1})
+
+    reloaded = JudgeVerdictCache(path)
+
+    assert reloaded.get("k") == {"index": 1}
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_judge_strategy_reuses_provider_and_cached_verdict(tmp_path: Path) -> None:
+    judge = _Judge("2")
+    factory = _Factory(judge)
+    cache = JudgeVerdictCache(tmp_path / "cache.jsonl")
+    strategy = JudgeStrategy(model="judge", provider_factory=factory, verdict_cache=cache)
+    candidates = [_candidate(0, "alpha"), _candidate(1, "beta")]
+
+    first = strategy.aggregate(candidates)
+    second = strategy.aggregate(candidates)
+    rerun = JudgeStrategy(
+        model="judge",
+        provider_factory=factory,
+        verdict_cache=JudgeVerdictCache(tmp_path / "cache.jsonl"),
+    ).aggregate(candidates)
+
+    assert first.chosen.index == second.chosen.index == rerun.chosen.index == 1
+    assert judge.calls == 1
+    assert factory.created == 1
+    assert second.metadata == {"judge_raw": "2", "judge_cached": True}
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+import json
+from pathlib import Path
+
+from adapter.core.aggregation import AggregationCandidate
+from adapter.core.aggregation.builtin.tie_breakers import MaxScoreTieBreaker
+from adapter.core.aggregation.builtin.weighted_vote import WeightedVoteStrategy
+from adapter.core.aggregation.learned_weights import (
+    ProviderScoreTable,
+    update_learned_weights,
+)
+from adapter.core.aggregation_selector import AggregationSelector
+from adapter.core.metrics import RunMetrics
+from adapter.core.provider_spi import ProviderResponse
+from adapter.core.runner_api import RunnerConfig
+from adapter.core.runner_execution import SingleRunResult
+
+
+class _Mode(Enum):
+    CONSENSUS = "consensus"
+
+
+def _append(path: Path, rows: list[tuple[str, str, bool | None]]) -> None:
+    with path.open("a", encoding="utf-8") as fp:
+        for provider, prompt_id, matched in rows:
+            record: dict[str, object] = {"provider": provider, "prompt_id": prompt_id, "eval": {}}
+            if matched is not None:
+                record["eval"] = {"exact_match": matched}
+            fp.write(json.dumps(record) + "\n")
+
+
+def _candidate(index: int, provider: str, text: str) -> AggregationCandidate:
+    response = ProviderResponse(text=text, latency_ms=0)
+    return AggregationCandidate(index=index, provider=provider, response=response, text=text)
+
+
+def test_update_is_incremental_and_ignores_partial_lines(tmp_path: Path) -> None:
+    metrics = tmp_path / "runs-metrics.jsonl"
+    table_path = tmp_path / "weights.bin"
+    _append(metrics, [("p1", "t1", True), ("p1", "t1", False), ("p2", "t1", None)])
+
+    assert update_learned_weights(table_path, metrics) == 2
+    assert update_learned_weights(table_path, metrics) == 0
+
+    _append(metrics, [("p1", "t2", True)])
+    with metrics.open("a", encoding="utf-8") as fp:
+        fp.write('{"provider": "p1", "eval": {"exact_')
+    assert update_learned_weights(table_path, metrics) == 1
+
+    table = ProviderScoreTable(table_path)
+    try:
+        assert table.counts("p1") == (2, 3)
+        assert table.counts("p1", "t1") == (1, 2)
+        assert table.counts("p2") == (0, 0)
+        assert table.weight("p2") is None
+        # t1 はサンプル不足のため全体の正答率へ退避する
+        assert table.weight("p1", "t1") == table.weight("p1") == 3 / 5
+    finally:
+        table.close()
+
+
+def test_update_rebuilds_after_metrics_rotation(tmp_path: Path) -> None:
+    metrics = tmp_path / "runs-metrics.jsonl"
+    table_path = tmp_path / "weights.bin"
+    _append(metrics, [("p1", "t1", False)] * 3)
+    update_learned_weights(table_path, metrics)
+
+    metrics.write_text("", encoding="utf-8")
+    _append(metrics, [("p1", "t1", True)])
+    update_learned_weights(table_path, metrics)
+
+    table = ProviderScoreTable(table_path)
+    try:
+        assert table.counts("p1") == (1, 1)
+    finally:
+        table.close()
+
+
+def test_weighted_vote_and_tie_breaker_use_learned_scores() -> None:
+    learned = {"good": 0.9, "bad": 0.2}.get
+    strategy = WeightedVoteStrategy(weights={"bad": 2.0}, learned_weights=learned)
+    candidates = [
+        _candidate(0, "bad", "Alpha"),
+        _candidate(1, "good", "Beta"),
+        _candidate(2, "other", "Gamma"),
+    ]
+
+    result = strategy.aggregate(candidates)
+
+    # 静的な重みが学習重みより優先され、未知のプロバイダは 1.0
+    assert result.metadata is not None
+    assert result.metadata["weighted_votes"] == {"Alpha": 2.0, "Beta": 0.9, "Gamma": 1.0}
+    chosen = MaxScoreTieBreaker(provider_scores=learned).break_tie(candidates[:2])
+    assert chosen.provider == "good"
+
+
+def test_selector_reads_learned_weights_refreshed_at_run_start(tmp_path: Path) -> None:
+    metrics = tmp_path / "runs-metrics.jsonl"
+    _append(metrics, [("p1", "prompt", False), ("p2", "prompt", True)])
+    config = RunnerConfig(
+        mode="consensus",
+        aggregate="weighted_vote",
+        learned_weights=tmp_path / "weights.bin",
+        metrics_path=metrics,
+    )
+    base = dict(
+        ts="2024-01-01T00:00:00Z", run_id="run", mode="consensus",
+        prompt_id="prompt", prompt_name="Prompt", seed=0,
+        temperature=0.0, top_p=1.0, max_tokens=16,
+        input_tokens=1, output_tokens=1, latency_ms=1,
+        cost_usd=0.0, status="ok", failure_kind=None,
+        error_message=None, output_hash=None,
+    )
+    batch = [
+        (index, SingleRunResult(
+            metrics=RunMetrics(provider=provider, model="m", output_text=text, **base),
+            raw_output=text,
+        ))
+        for index, (provider, text) in enumerate([("p1", "Alpha"), ("p2", "Beta")])
+    ]
+    selector = AggregationSelector()
+    selector.refresh_learned_weights(config.learned_weights, metrics)
+
+    first = selector.select(_Mode.CONSENSUS, config, batch, default_judge_config=None)
+    assert first is not None
+    assert first.decision.chosen.provider == "p2"
+
+    # ラン中に追記されたメトリクスは次のラン開始まで反映しない
+    _append(metrics, [("p1", "prompt", True)] * 6 + [("p2", "prompt", False)] * 6)
+    during_run = selector.select(_Mode.CONSENSUS, config, batch, default_judge_config=None)
+    assert during_run is not None
+    assert during_run.decision.chosen.provider == "p2"
+
+    selector.refresh_learned_weights(config.learned_weights, metrics)
+    next_run = selector.select(_Mode.CONSENSUS, config, batch, default_judge_config=None)
+    assert next_run is not None
+    assert next_run.decision.chosen.provider == "p1"
+
+
+def test_update_rebuilds_when_metrics_file_is_replaced(tmp_path: Path) -> None:
+    metrics = tmp_path / "runs-metrics.jsonl"
+    table_path = tmp_path / "weights.bin"
+    _append(metrics, [("p1", "t1", False)])
+    update_learned_weights(table_path, metrics)
+
+    # 同じサイズ以上の新ファイルへ差し替えられても inode の変化で再構築する
+    replacement = tmp_path / "rotated.jsonl"
+    _append(replacement, [("p1", "t1", True)] * 2)
+    replacement.replace(metrics)
+    assert update_learned_weights(table_path, metrics) == 2
+
+    table = ProviderScoreTable(table_path)
+    try:
+        assert table.counts("p1") == (2, 2)
+    finally:
+        table.close()
+
+
+def test_update_advances_offset_without_evaluated_rows(tmp_path: Path) -> None:
+    metrics = tmp_path / "runs-metrics.jsonl"
+    table_path = tmp_path / "weights.bin"
+    _append(metrics, [("p1", "t1", None)] * 2)
+
+    assert update_learned_weights(table_path, metrics) == 0
+
+    table = ProviderScoreTable(table_path)
+    try:
+        assert table.metrics_offset == metrics.stat().st_size
+    finally:
+        table.close()
+
+
+def test_concurrent_updates_leave_a_readable_table(tmp_path: Path) -> None:
+    metrics = tmp_path / "runs-metrics.jsonl"
+    table_path = tmp_path / "weights.bin"
+    _append(metrics, [("p1", "t1", True)] * 50)
+
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        added = list(pool.map(update_learned_weights, [table_path] * 8, [metrics] * 8))
+
+    # ロックで直列化されるため、最初の 1 回だけが全行を反映する
+    assert sorted(added) == [0] * 7 + [50]
+    assert [path.name for path in tmp_path.iterdir() if path.suffix == ".tmp"] == []
+    table = ProviderScoreTable(table_path)
+    try:
+        assert table.counts("p1") == (50, 50)
+    finally:
+        table.close()
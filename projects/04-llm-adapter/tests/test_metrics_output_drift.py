@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from tools.report.metrics.output_drift import detect_output_drift, main, OutputDriftDetector
+
+from adapter.core.metrics.minhash import estimate_jaccard, minhash_signature
+
+_STABLE = "The quarterly revenue grew by twelve percent, driven by subscription sales."
+_STABLE_VARIANT = "The quarterly revenue grew by twelve percent, driven by subscription sales!"
+_DRIFTED = "I'm sorry, but I cannot help with that request at this time."
+
+
+def _metric(
+    prompt_id: str, text: str, *, provider: str = "openai", run_id: str | None = None
+) -> dict[str, object]:
+    return {
+        "run_id": run_id,
+        "provider": provider,
+        "model": "gpt",
+        "prompt_id": prompt_id,
+        "status": "ok",
+        "output_minhash": minhash_signature(text),
+    }
+
+
+def test_minhash_estimates_similarity() -> None:
+    same = estimate_jaccard(minhash_signature(_STABLE), minhash_signature(_STABLE_VARIANT))
+    different = estimate_jaccard(minhash_signature(_STABLE), minhash_signature(_DRIFTED))
+    assert same > 0.8
+    assert different < 0.2
+    assert minhash_signature(_STABLE) == minhash_signature(_STABLE)
+
+
+def test_detect_output_drift_flags_latest_output_outside_history() -> None:
+    metrics = [
+        _metric("p1", _STABLE),
+        _metric("p2", _STABLE),
+        _metric("p1", _STABLE_VARIANT),
+        _metric("p2", _STABLE_VARIANT),
+        _metric("p1", _STABLE),
+        _metric("p2", _DRIFTED),
+        _metric("p3", _DRIFTED),
+    ]
+
+    rows = detect_output_drift(metrics)
+
+    assert [(row["prompt_id"], row["history"]) for row in rows] == [("p2", 2)]
+    assert rows[0]["similarity"] < 0.5
+
+
+def test_output_drift_cli_falls_back_to_output_text(tmp_path: Path) -> None:
+    metrics_path = tmp_path / "runs-metrics.jsonl"
+    records = [
+        {"provider": "openai", "model": "gpt", "prompt_id": "p1", "status": "ok", "output_text": _STABLE},
+        {"provider": "openai", "model": "gpt", "prompt_id": "p1", "status": "ok", "output_text": _DRIFTED},
+    ]
+    metrics_path.write_text(
+        "".join(json.dumps(record) + "\n" for record in records), encoding="utf-8"
+    )
+
+    assert main(["--metrics", str(metrics_path), "--out", str(tmp_path / "out")]) == 0
+
+    payload = json.loads((tmp_path / "out" / "output_drift.json").read_text(encoding="utf-8"))
+    assert [row["prompt_id"] for row in payload["rows"]] == ["p1"]
+
+
+def test_output_drift_detector_updates_incrementally() -> None:
+    detector = OutputDriftDetector()
+    detector.update([_metric("p1", _STABLE), _metric("p1", _STABLE_VARIANT)])
+    assert detector.drifts() == []
+
+    detector.observe(_metric("p1", _DRIFTED))
+
+    assert [(row["prompt_id"], row["history"]) for row in detector.drifts()] == [("p1", 2)]
+
+
+def test_output_drift_ignores_sibling_attempts_of_the_latest_run() -> None:
+    metrics = [
+        *(_metric("p1", _STABLE, run_id="run-1") for _ in range(3)),
+        *(_metric("p1", _DRIFTED, run_id="run-2") for _ in range(3)),
+        *(_metric("p2", _STABLE, run_id="run-1") for _ in range(3)),
+        *(_metric("p2", _STABLE_VARIANT, run_id="run-2") for _ in range(3)),
+        *(_metric("p3", _STABLE, run_id="run-1") for _ in range(3)),
+    ]
+
+    rows = detect_output_drift(metrics)
+
+    assert [(row["prompt_id"], row["run_id"], row["history"]) for row in rows] == [
+        ("p1", "run-2", 3)
+    ]
+    assert rows[0]["similarity"] < 0.5
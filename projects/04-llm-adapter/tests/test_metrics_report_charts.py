@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+# ruff: noqa: I001
+
+import importlib
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+charts_mod = importlib.import_module("tools.report.metrics.charts")
+cli_mod = importlib.import_module("tools.report.metrics.cli")
+html_mod = importlib.import_module("tools.report.metrics.html_report")
+
+
+def test_bin_latency_counts_uses_shared_fixed_bins() -> None:
+    chart = charts_mod.bin_latency_counts(
+        {"a": {0.0: 2, 50.0: 1}, "b": {100.0: 3}}, bins=4
+    )
+    assert chart["start"] == 0.0
+    assert chart["width"] == 25.0
+    assert chart["providers"] == {"a": [2, 0, 1, 0], "b": [0, 0, 0, 3]}
+
+
+def test_lttb_keeps_endpoints_and_threshold() -> None:
+    points = [(float(x), float((x * 7) % 13), None) for x in range(500)]
+    reduced = charts_mod.lttb(points, 50)
+    assert len(reduced) == 50
+    assert reduced[0] == points[0]
+    assert reduced[-1] == points[-1]
+    assert [p[0] for p in reduced] == sorted(p[0] for p in reduced)
+
+
+def test_scatter_sample_merge_is_order_invariant() -> None:
+    points = [(float(i), i / 100, f"p{i % 7}") for i in range(300)]
+    whole = charts_mod.ScatterSample(capacity=40)
+    for point in points:
+        whole.add(*point)
+    left = charts_mod.ScatterSample(capacity=40)
+    right = charts_mod.ScatterSample(capacity=40)
+    for point in points[150:]:
+        left.add(*point)
+    for point in points[:150]:
+        right.add(*point)
+    left.merge(right)
+    assert sorted(left.points()) == sorted(whole.points())
+    assert left.seen == whole.seen == 300
+
+
+def test_render_html_does_not_inline_every_point() -> None:
+    hist = {"p": [float(i) for i in range(20_000)]}
+    scatter = {"p": [{"latency": float(i), "cost": 0.1, "prompt_id": i} for i in range(20_000)]}
+    html = html_mod.render_html(
+        {
+            "total": 0,
+            "success_rate": 0.0,
+            "avg_latency": 0.0,
+            "median_latency": 0.0,
+            "total_cost": 0.0,
+            "avg_cost": 0.0,
+        },
+        [],
+        hist,
+        scatter,
+        "",
+        0,
+        [],
+        [],
+    )
+    assert len(html) < 100_000
+
+
+def test_process_pool_report_matches_incremental(tmp_path: Path) -> None:
+    metrics_path = tmp_path / "runs-metrics.jsonl"
+    with metrics_path.open("w", encoding="utf-8") as fp:
+        for index in range(60):
+            fp.write(
+                json.dumps(
+                    {
+                        "ts": f"2024-01-0{index % 3 + 1}T00:00:00Z",
+                        "provider": "openai" if index % 2 else "gemini",
+                        "model": "m",
+                        "prompt_id": f"p{index % 4}",
+                        "latency_ms": 100 + index,
+                        "cost_usd": 0.01,
+                        "status": "ok",
+                    }
+                )
+                + "\n"
+            )
+    pooled = tmp_path / "pooled.html"
+    incremental = tmp_path / "incremental.html"
+    cli_mod.generate_report(metrics_path, None, pooled, workers=2, chunk_size=7)
+    cli_mod.generate_report(metrics_path, None, incremental, incremental=True)
+    assert pooled.read_text(encoding="utf-8") == incremental.read_text(encoding="utf-8")
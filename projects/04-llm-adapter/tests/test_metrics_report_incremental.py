@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+# ruff: noqa: I001
+
+import importlib
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+cli_mod = importlib.import_module("tools.report.metrics.cli")
+data_mod = importlib.import_module("tools.report.metrics.data")
+incremental_mod = importlib.import_module("tools.report.metrics.incremental")
+
+
+def _metric(day: str, provider: str, latency: int, **extra: object) -> dict[str, object]:
+    payload: dict[str, object] = {
+        "ts": f"{day}T00:00:00Z",
+        "provider": provider,
+        "model": "m",
+        "prompt_id": "p",
+        "latency_ms": latency,
+        "cost_usd": 0.25,
+        "status": "ok",
+        "eval": {"diff_rate": latency / 1000},
+    }
+    payload.update(extra)
+    return payload
+
+
+def _write(path: Path, metrics: list[dict[str, object]], mode: str = "w") -> None:
+    with path.open(mode, encoding="utf-8") as fp:
+        for metric in metrics:
+            fp.write(json.dumps(metric) + "\n")
+
+
+def test_aggregate_matches_full_recomputation() -> None:
+    metrics = [
+        _metric("2024-01-01", "openai", 100),
+        _metric("2024-01-01", "openai", 300, status="error", failure_kind="timeout"),
+        _metric("2024-01-02", "openrouter", 250, status="error", failure_kind="rate_limit"),
+        _metric("2024-01-02", "openai", 200, failure_kind="non_deterministic"),
+    ]
+    combined = incremental_mod.ReportAggregate()
+    for partial in incremental_mod.aggregate_metrics(metrics).values():
+        combined.merge(
+            incremental_mod.ReportAggregate.from_json(
+                json.loads(json.dumps(partial.to_json()))
+            )
+        )
+
+    assert combined.overview() == data_mod.compute_overview(metrics)
+    assert combined.comparison_table() == data_mod.build_comparison_table(metrics)
+    assert combined.failure_summary() == data_mod.build_failure_summary(metrics)
+    assert combined.openrouter_http_failures() == data_mod.build_openrouter_http_failures(
+        metrics
+    )
+    assert combined.determinism_alerts() == data_mod.build_determinism_alerts(metrics)
+
+
+def test_incremental_report_only_parses_appended_lines(tmp_path: Path) -> None:
+    metrics_path = tmp_path / "runs-metrics.jsonl"
+    out_path = tmp_path / "report" / "index.html"
+    cache_dir = tmp_path / "cache"
+    _write(metrics_path, [_metric("2024-01-01", "openai", 100)])
+
+    cli_mod.generate_report(
+        metrics_path, None, out_path, incremental=True, cache_dir=cache_dir
+    )
+    first_day = cache_dir / "days" / "2024-01-01.json"
+    first_snapshot = first_day.read_text(encoding="utf-8")
+
+    _write(metrics_path, [_metric("2024-01-02", "openai", 300)], mode="a")
+    cache = incremental_mod.ReportCache(cache_dir)
+    aggregate = cache.load_aggregate(metrics_path)
+
+    assert cache.touched_days == {"2024-01-02"}
+    assert first_day.read_text(encoding="utf-8") == first_snapshot
+    assert aggregate.total == 2
+
+    cli_mod.generate_report(
+        metrics_path, None, out_path, incremental=True, cache_dir=cache_dir
+    )
+    full_out = tmp_path / "full.html"
+    cli_mod.generate_report(metrics_path, None, full_out)
+    assert out_path.read_text(encoding="utf-8") == full_out.read_text(encoding="utf-8")
+
+
+def test_incremental_report_rebuilds_when_file_rewritten(tmp_path: Path) -> None:
+    metrics_path = tmp_path / "runs-metrics.jsonl"
+    cache_dir = tmp_path / "cache"
+    _write(metrics_path, [_metric("2024-01-01", "openai", 100)] * 3)
+    cache = incremental_mod.ReportCache(cache_dir)
+    cache.load_aggregate(metrics_path)
+    cache.save()
+    _write(metrics_path, [_metric("2024-02-01", "gemini", 50)])
+
+    aggregate = incremental_mod.ReportCache(cache_dir).load_aggregate(metrics_path)
+    assert aggregate.total == 1
+    assert list(aggregate.hist) == ["gemini"]
+
+
+def test_unchanged_sections_are_reused(tmp_path: Path) -> None:
+    metrics_path = tmp_path / "runs-metrics.jsonl"
+    out_path = tmp_path / "index.html"
+    cache_dir = tmp_path / "cache"
+    _write(metrics_path, [_metric("2024-01-01", "openai", 100)])
+    cli_mod.generate_report(
+        metrics_path, None, out_path, incremental=True, cache_dir=cache_dir
+    )
+
+    _write(metrics_path, [_metric("2024-01-02", "openai", 100)], mode="a")
+    cache = incremental_mod.ReportCache(cache_dir)
+    cache.load_aggregate(metrics_path)
+    cache.section("failures", [0, []], lambda: "fresh")
+    assert cache.reused_sections == {"failures"}
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+import io
+import json
+
+import pytest
+
+from adapter.core.metrics import (
+    BudgetSnapshot,
+    encode_run_metrics,
+    EvalMetrics,
+    run_metrics_to_dict,
+    RunMetrics,
+    serialization,
+    write_run_metrics,
+)
+from adapter.core.metrics.serialization import JSON_BACKENDS
+
+
+def _metrics(**overrides: object) -> RunMetrics:
+    payload: dict[str, object] = {
+        "ts": "2024-01-01T00:00:00Z",
+        "run_id": "run-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "mode": "parallel-any",
+        "prompt_id": "p1",
+        "prompt_name": "サンプル",
+        "seed": 0,
+        "temperature": 0.2,
+        "top_p": 1.0,
+        "max_tokens": 64,
+        "input_tokens": 10,
+        "output_tokens": 5,
+        "latency_ms": 120,
+        "cost_usd": 0.001,
+        "status": "ok",
+        "failure_kind": None,
+        "error_message": None,
+        "output_text": "こんにちは",
+        "output_hash": "abc",
+        "output_minhash": [1, 2, 3],
+        "providers": ["openai", "anthropic"],
+        "token_usage": {"prompt": 10, "completion": 5, "total": 15},
+        "eval": EvalMetrics(exact_match=True, diff_rate=0.0),
+        "budget": BudgetSnapshot(run_budget_usd=1.0, hit_stop=False),
+        "ci_meta": {"branch": "main"},
+    }
+    payload.update(overrides)
+    return RunMetrics(**payload)  # type: ignore[arg-type]
+
+
+def _legacy_dict(metrics: RunMetrics) -> dict[str, object]:
+    payload = asdict(metrics)
+    payload["cost_estimate"] = (
+        metrics.cost_estimate if metrics.cost_estimate is not None else metrics.cost_usd
+    )
+    payload["eval"] = {k: v for k, v in payload["eval"].items() if v is not None}
+    return payload
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [{}, {"output_minhash": None, "eval": EvalMetrics(), "cost_estimate": 0.5}],
+)
+def test_run_metrics_to_dict_matches_asdict(overrides: dict[str, object]) -> None:
+    metrics = _metrics(**overrides)
+
+    payload = run_metrics_to_dict(metrics)
+
+    assert payload == _legacy_dict(metrics)
+    assert list(payload) == list(_legacy_dict(metrics))
+    assert metrics.to_json_dict() == payload
+    payload["providers"].append("mutated")
+    assert metrics.providers == ["openai", "anthropic"]
+
+
+def test_write_run_metrics_round_trip() -> None:
+    records = [_metrics(run_id=f"run-{index}") for index in range(3)]
+    buffer = io.BytesIO()
+
+    written = write_run_metrics(buffer, records)
+
+    lines = buffer.getvalue().decode("utf-8").splitlines()
+    assert written == 3
+    assert [json.loads(line) for line in lines] == [_legacy_dict(item) for item in records]
+    assert json.loads(encode_run_metrics(records[0])) == _legacy_dict(records[0])
+
+
+def test_metrics_dataclasses_use_slots() -> None:
+    metrics = _metrics()
+
+    for instance in (metrics, metrics.eval, metrics.budget):
+        assert not hasattr(instance, "__dict__")
+
+
+@pytest.mark.parametrize("backend", JSON_BACKENDS)
+def test_encoders_produce_identical_output(
+    backend: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    metrics = _metrics(cost_usd=float("nan"), eval=EvalMetrics(diff_rate=float("inf")))
+    monkeypatch.setenv("LLM_ADAPTER_JSON_BACKEND", "json")
+    _, reference = serialization._json_encoder()
+    monkeypatch.setenv("LLM_ADAPTER_JSON_BACKEND", backend)
+    _, encode = serialization._json_encoder()
+
+    payload = serialization.run_metrics_to_dict(metrics)
+    encoded = encode(payload)
+
+    assert encoded == reference(payload)
+    assert b", " not in encoded and "サンプル".encode() in encoded
+    decoded = json.loads(encoded)
+    assert decoded["cost_usd"] is None
+    assert decoded["eval"]["diff_rate"] is None
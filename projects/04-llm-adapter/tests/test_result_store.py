@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from adapter.core.compare_runner_finalizer import TaskFinalizer
+from adapter.core.datasets import GoldenTask
+from adapter.core.metrics import BudgetSnapshot, EvalMetrics, ResultStore, RunMetrics
+
+
+def _metrics(index: int, output_text: str | None, **overrides: object) -> RunMetrics:
+    payload: dict[str, object] = {
+        "ts": f"2024-01-01T00:00:{index:02d}Z",
+        "run_id": f"run-{index}",
+        "provider": "openai" if index % 2 else "anthropic",
+        "model": "model-a",
+        "mode": "parallel-any",
+        "prompt_id": "task-1",
+        "prompt_name": "Task",
+        "seed": index,
+        "temperature": 0.3,
+        "top_p": 0.9,
+        "max_tokens": 64,
+        "input_tokens": 10 + index,
+        "output_tokens": 5,
+        "latency_ms": 100 + index,
+        "cost_usd": 0.25,
+        "status": "ok",
+        "failure_kind": None,
+        "error_message": None,
+        "output_text": output_text,
+        "output_hash": None,
+        "providers": ["openai"],
+        "token_usage": {"prompt": 10, "completion": 5, "total": 15},
+        "eval": EvalMetrics(exact_match=True, diff_rate=0.0),
+        "budget": BudgetSnapshot(run_budget_usd=1.0, hit_stop=False),
+        "ci_meta": {"branch": "main"},
+    }
+    payload.update(overrides)
+    return RunMetrics(**payload)  # type: ignore[arg-type]
+
+
+def test_result_store_round_trips_and_dedupes_outputs(tmp_path: Path) -> None:
+    records = [
+        _metrics(0, "同じ出力" * 100),
+        _metrics(1, "同じ出力" * 100),
+        _metrics(2, None, status="error", failure_kind="timeout", error_message="boom"),
+        _metrics(3, "別の出力", input_tokens=None, eval=EvalMetrics(diff_rate=0.5)),
+    ]
+
+    with ResultStore(tmp_path / "outputs.blob") as store:
+        store.extend(records)
+
+        assert len(store) == 4
+        assert list(store) == records
+        assert store[-1] == records[-1]
+        assert store[1:3] == records[1:3]
+        assert store.blob_count == 2
+        assert store.output_text(2) is None
+        assert list(store.column("latency_ms")) == [100, 101, 102, 103]
+        assert sum(store.column("cost_usd")) == 1.0
+
+
+def test_task_finalizer_appends_into_result_store(tmp_path: Path) -> None:
+    metrics_path = tmp_path / "metrics.jsonl"
+    finalizer = TaskFinalizer(metrics_path)
+    task = GoldenTask(task_id="task-1", name="Task", input={}, prompt_template="", expected={})
+    gates = SimpleNamespace(determinism_diff_rate_max=0.0, determinism_len_stdev_max=0.0)
+    provider_config = SimpleNamespace(quality_gates=gates)
+    histories = [[SimpleNamespace(metrics=_metrics(i, f"out-{i}"), raw_output=f"out-{i}") for i in range(3)]]
+    store = ResultStore()
+
+    finalizer.finalize_task(task, [(provider_config, object())], histories, store)
+
+    assert [item.run_id for item in store] == ["run-0", "run-1", "run-2"]
+    assert len(metrics_path.read_text(encoding="utf-8").splitlines()) == 3
+    store.close()
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
+from adapter.core import json_documents
+from adapter.core.aggregation import AggregationCandidate
+from adapter.core.aggregation.builtin.majority_vote import MajorityVoteStrategy
+from adapter.core.execution import guards
 from adapter.core.execution.guards import _SchemaValidator
+from adapter.core.provider_spi import ProviderResponse
 
 
 def _write_schema(tmp_path: Path, schema: dict[str, object]) -> Path:
@@ -61,3 +68,85 @@ def test_validate_detects_missing_nested_key(tmp_path: Path) -> None:
         validator.validate(json.dumps({"config": {}}))
 
     assert "required property" in str(excinfo.value)
+
+
+def test_compiled_schema_is_cached_until_file_changes(tmp_path: Path) -> None:
+    path = _write_schema(tmp_path, {"type": "object"})
+
+    first = _SchemaValidator(path)
+    second = _SchemaValidator(path)
+    assert first._validator is second._validator
+
+    path.write_text(json.dumps({"type": "object", "required": ["id"]}), encoding="utf-8")
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+    third = _SchemaValidator(path)
+
+    assert third._validator is not first._validator
+    assert third.schema == {"type": "object", "required": ["id"]}
+
+
+def test_fast_validator_short_circuits_and_keeps_messages(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[object] = []
+
+    def compile_schema(schema: dict[str, object], use_default: bool = True) -> object:
+        assert use_default is False
+
+        def validate(data: object) -> object:
+            calls.append(data)
+            if not isinstance(data, dict) or "id" not in data:
+                raise RuntimeError("fast path rejected")
+            return data
+
+        return validate
+
+    monkeypatch.setattr(guards, "_fastjsonschema", SimpleNamespace(compile=compile_schema))
+    validator = _SchemaValidator(
+        _write_schema(tmp_path, {"type": "object", "required": ["id"], "title": "fast"})
+    )
+
+    validator.validate('{"id": 1}')
+    with pytest.raises(ValueError, match="required property"):
+        validator.validate("{}")
+    assert calls == [{"id": 1}, {}]
+
+
+def test_validation_and_majority_vote_share_one_decode(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    decoded: list[str] = []
+    original = json_documents.json.loads
+
+    def counting_loads(text: str) -> object:
+        decoded.append(text)
+        return original(text)
+
+    schema = {"type": "object", "required": ["answer"]}
+    validator = _SchemaValidator(_write_schema(tmp_path, schema))
+    monkeypatch.setattr(json_documents.json, "loads", counting_loads)
+    output = '{"answer": "shared-decode"}'
+
+    validator.validate(output)
+    strategy = MajorityVoteStrategy(schema=schema)
+    candidate = AggregationCandidate(
+        index=0, provider="p", response=ProviderResponse(text=output, latency_ms=0), text=output
+    )
+    key, complete = strategy._candidate_key(candidate)
+
+    assert key.startswith("json:") and complete
+    assert decoded == [output]
+
+
+def test_cached_json_values_are_read_only() -> None:
+    document = json_documents.decode_json('{"items": [1, {"nested": true}]}')
+
+    with pytest.raises(TypeError):
+        document.value["items"] = []  # type: ignore[index]
+    with pytest.raises(TypeError):
+        document.value["items"].append(2)  # type: ignore[index]
+    copied = json_documents.thaw(document.value)
+    copied["items"].append(2)  # type: ignore[index]
+    assert json_documents.decode_json('{"items": [1, {"nested": true}]}').value == {
+        "items": [1, {"nested": True}]
+    }
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from adapter.core._shadow_helpers import start_shadow_session
+from adapter.core.shadow_sampling import (
+    AdaptiveShadowSampler,
+    request_fingerprint,
+    sampling_point,
+    ShadowSampler,
+)
+
+
+def test_deterministic_sampling_is_stable_and_nested() -> None:
+    keys = [f"prompt-{index}" for index in range(2000)]
+    low = ShadowSampler(0.1, deterministic=True)
+    high = ShadowSampler(0.3, deterministic=True)
+
+    low_selected = {key for key in keys if low.should_shadow(key)}
+    high_selected = {key for key in keys if high.should_shadow(key)}
+
+    assert low_selected == {key for key in keys if low.should_shadow(key)}
+    assert low_selected <= high_selected
+    assert len(low_selected) == pytest.approx(200, abs=60)
+    assert len(high_selected) == pytest.approx(600, abs=90)
+    assert 0.0 <= sampling_point("x") < 1.0
+
+
+def test_adaptive_sampler_enforces_rpm_and_backs_off() -> None:
+    now = [0.0]
+    sampler = AdaptiveShadowSampler(rpm=3, clock=lambda: now[0])
+
+    assert [sampler.should_shadow(str(index)) for index in range(5)] == [True, True, True, False, False]
+    now[0] = 61.0
+    assert sampler.should_shadow("later") is True
+
+    sampler.observe_primary(rate_limited=True)
+    sampler.observe_primary(rate_limited=True)
+    assert sampler.effective_rate() == pytest.approx(0.25)
+    for _ in range(5):
+        sampler.observe_primary(rate_limited=False)
+    assert sampler.effective_rate() == pytest.approx(0.5)
+
+
+def test_adaptive_sampler_stops_when_cost_budget_is_spent() -> None:
+    now = [0.0]
+    sampler = AdaptiveShadowSampler(cost_budget_usd_per_min=0.1, clock=lambda: now[0])
+
+    assert sampler.should_shadow("a") is True
+    sampler.observe_shadow(0.06)
+    assert sampler.should_shadow("b") is True
+    sampler.observe_shadow(0.06)
+    assert sampler.should_shadow("c") is False
+    now[0] = 120.0
+    assert sampler.should_shadow("d") is True
+
+
+def test_shadow_session_samples_on_request_fingerprint() -> None:
+    keys: list[str] = []
+
+    class _RecordingSampler(ShadowSampler):
+        def should_shadow(self, key: str) -> bool:
+            keys.append(key)
+            return False
+
+    session = start_shadow_session(
+        object(),  # type: ignore[arg-type]
+        SimpleNamespace(max_tokens=64),  # type: ignore[arg-type]
+        "  hello  ",
+        _RecordingSampler(),
+    )
+
+    assert session is None
+    assert keys == [request_fingerprint("hello", max_tokens=64)]
+    assert request_fingerprint("hello", max_tokens=64) != request_fingerprint(
+        "hello", max_tokens=128
+    )
@@ -0,0 +1,37 @@
+"""性能スイートのテスト."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from tools.bench.suite import compare_results, main
+
+
+def test_quick_suite_writes_json_and_flags_regressions(tmp_path: Path) -> None:
+    out_path = tmp_path / "bench.json"
+
+    exit_code = main(
+        ["--quick", "--cases", "compare_runner,diff_rate,votes,report", "--out", str(out_path)]
+    )
+
+    assert exit_code == 0
+    result = json.loads(out_path.read_text(encoding="utf-8"))
+    assert result["scale"]["name"] == "quick"
+    assert [row["id"] for row in result["cases"]["compare_runner"]] == [
+        "sequential",
+        "parallel_any",
+        "parallel_all",
+        "consensus",
+    ]
+    assert {row["id"] for row in result["cases"]["votes"]} == {
+        "majority_vote.200",
+        "weighted_vote.200",
+    }
+    assert result["cases"]["report"][0]["rows"] == 2_000
+
+    slower = json.loads(json.dumps(result))
+    for row in slower["cases"]["diff_rate"]:
+        row["seconds"] *= 2
+    comparisons = compare_results(result, slower, threshold=0.5)
+    regressed = {(row["case"], row["id"]) for row in comparisons if row["regressed"]}
+    assert regressed == {("diff_rate", row["id"]) for row in result["cases"]["diff_rate"]}
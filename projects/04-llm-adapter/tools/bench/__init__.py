@@ -0,0 +1 @@
+"""llm-adapter の性能計測ツール群。"""
@@ -0,0 +1,102 @@
+"""期待値評価ステージのワーカー数別スループット計測。"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+import json
+import os
+from pathlib import Path
+import random
+import time
+
+from adapter.core.compare_runner_support.evaluation_pool import (
+    DEFAULT_EVAL_CHUNK_SIZE,
+    evaluate_expectation,
+    EvaluationPool,
+)
+
+_WORDS = ("alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta")
+
+
+def _make_pairs(count: int, length: int, seed: int) -> list[tuple[dict[str, object], str]]:
+    rng = random.Random(seed)
+    pairs: list[tuple[dict[str, object], str]] = []
+    for index in range(count):
+        words = [rng.choice(_WORDS) for _ in range(max(length // 6, 1))]
+        output = " ".join(words)
+        expected_words = list(words)
+        for _ in range(max(len(words) // 20, 1)):
+            expected_words[rng.randrange(len(expected_words))] = rng.choice(_WORDS)
+        if index % 2:
+            expected: dict[str, object] = {"type": "literal", "value": " ".join(expected_words)}
+        else:
+            expected = {"type": "regex", "value": r"(alpha|beta)\s+gamma\s+\w+a\b"}
+        pairs.append((expected, output))
+    return pairs
+
+
+def run_benchmark(
+    *,
+    workers: Sequence[int],
+    pairs: int,
+    length: int,
+    chunk_size: int,
+    seed: int = 0,
+) -> list[dict[str, object]]:
+    data = _make_pairs(pairs, length, seed)
+    rows: list[dict[str, object]] = []
+    started = time.perf_counter()
+    for expected, output in data:
+        evaluate_expectation(expected, output)
+    baseline = time.perf_counter() - started
+    rows.append({"workers": 0, "seconds": baseline, "pairs_per_s": pairs / baseline})
+    for count in workers:
+        with EvaluationPool(count, chunk_size=chunk_size) as pool:
+            # ワーカー起動時間を計測から除く
+            pool.evaluate_many(data[: count * chunk_size])
+            started = time.perf_counter()
+            pool.evaluate_many(data)
+            elapsed = time.perf_counter() - started
+        rows.append(
+            {
+                "workers": count,
+                "seconds": elapsed,
+                "pairs_per_s": pairs / elapsed,
+                "speedup": baseline / elapsed,
+            }
+        )
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="評価ステージのスループットをワーカー数別に計測する")
+    parser.add_argument(
+        "--workers",
+        default=",".join(str(n) for n in sorted({1, 2, 4, cpu_count}) if n <= cpu_count),
+        help="計測するワーカー数 (カンマ区切り、0 は同期評価として常に計測)",
+    )
+    parser.add_argument("--pairs", type=int, default=200, help="評価する (期待値, 出力) 組の数")
+    parser.add_argument("--length", type=int, default=2000, help="出力 1 件あたりの文字数")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_EVAL_CHUNK_SIZE, help="1 回に送る評価件数")
+    parser.add_argument("--out", default=None, help="結果 JSON の出力先 (未指定なら標準出力)")
+    args = parser.parse_args(argv)
+
+    workers = [int(part) for part in args.workers.split(",") if part.strip() and int(part) > 0]
+    rows = run_benchmark(
+        workers=workers, pairs=args.pairs, length=args.length, chunk_size=args.chunk_size
+    )
+    payload = json.dumps(
+        {"benchmark": "evaluation_pool", "cpu_count": cpu_count, "rows": rows}, indent=2
+    )
+    if args.out:
+        out_path = Path(args.out).expanduser()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+"""RunMetrics の JSONL 書き出しスループット計測 (records/s)。"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+from dataclasses import asdict
+import io
+import json
+from pathlib import Path
+import time
+
+from adapter.core.metrics import serialization
+from adapter.core.metrics.models import BudgetSnapshot, EvalMetrics, RunMetrics
+
+
+def _make_records(count: int, output_length: int) -> list[RunMetrics]:
+    output = ("結果 result " * output_length)[:output_length]
+    return [
+        RunMetrics(
+            ts="2024-01-01T00:00:00Z",
+            run_id=f"run-{index}",
+            provider=f"provider-{index % 4}",
+            model="model-a",
+            mode="parallel-any",
+            prompt_id=f"task-{index % 50}",
+            prompt_name="bench",
+            seed=index,
+            temperature=0.2,
+            top_p=1.0,
+            max_tokens=256,
+            input_tokens=120,
+            output_tokens=80,
+            latency_ms=350 + index % 100,
+            cost_usd=0.0012,
+            status="ok",
+            failure_kind=None,
+            error_message=None,
+            output_text=output,
+            output_hash=f"{index:016x}",
+            providers=["provider-0", "provider-1"],
+            token_usage={"prompt": 120, "completion": 80, "total": 200},
+            eval=EvalMetrics(exact_match=index % 2 == 0, diff_rate=0.1),
+            budget=BudgetSnapshot(run_budget_usd=1.0, hit_stop=False),
+            ci_meta={"branch": "main"},
+        )
+        for index in range(count)
+    ]
+
+
+def _legacy_write(records: Sequence[RunMetrics]) -> None:
+    # 1 レコードずつ asdict で dict 化して json.dump していた従来経路
+    fp = io.StringIO()
+    for metrics in records:
+        payload = asdict(metrics)
+        payload["cost_estimate"] = (
+            metrics.cost_estimate if metrics.cost_estimate is not None else metrics.cost_usd
+        )
+        payload["eval"] = {k: v for k, v in payload["eval"].items() if v is not None}
+        json.dump(payload, fp, ensure_ascii=False)
+        fp.write("\n")
+
+
+def _batched_write(records: Sequence[RunMetrics]) -> None:
+    serialization.write_run_metrics(io.BytesIO(), records)
+
+
+def run_benchmark(*, records: int, output_length: int, repeat: int) -> list[dict[str, object]]:
+    data = _make_records(records, output_length)
+    rows: list[dict[str, object]] = []
+    for name, writer in (("json.dump", _legacy_write), ("write_run_metrics", _batched_write)):
+        best = float("inf")
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            writer(data)
+            best = min(best, time.perf_counter() - started)
+        rows.append({"writer": name, "seconds": best, "records_per_s": records / best})
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="RunMetrics の JSONL 書き出し速度を計測する")
+    parser.add_argument("--records", type=int, default=20000, help="書き出すレコード数")
+    parser.add_argument("--output-length", type=int, default=400, help="output_text の文字数")
+    parser.add_argument("--repeat", type=int, default=3, help="計測回数 (最良値を採用)")
+    parser.add_argument("--out", default=None, help="結果 JSON の出力先 (未指定なら標準出力)")
+    args = parser.parse_args(argv)
+
+    rows = run_benchmark(records=args.records, output_length=args.output_length, repeat=args.repeat)
+    payload = json.dumps(
+        {
+            "benchmark": "metrics_serialization",
+            "backend": serialization._BACKEND,  # noqa: SLF001
+            "rows": rows,
+        },
+        indent=2,
+    )
+    if args.out:
+        out_path = Path(args.out).expanduser()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI
+    raise SystemExit(main())
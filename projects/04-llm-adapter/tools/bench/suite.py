@@ -0,0 +1,538 @@
+"""主要経路の性能スイート。
+
+各ケースはシミュレーション用プロバイダだけで完結し、結果を 1 つの JSON に
+まとめて保存する。``--baseline`` に前回の JSON を渡すと、``seconds`` を持つ行を
+ケース名と ``id`` で突き合わせ、閾値を超えて遅くなった行を回帰として報告する。
+
+- ``compare_runner``: ``CompareRunner.run`` を ``RunnerMode`` ごとに実行
+- ``shadow_runner``: シャドウ付き ``Runner`` / ``AsyncRunner`` のスループット
+  (``llm_adapter`` が import できる場合のみ。例: ``PYTHONPATH=../04-llm-adapter-shadow/src``)
+- ``rate_limiters``: ``_TokenBucket`` / ``RateLimiter`` の競合下での達成レート
+- ``diff_rate``: 長い出力に対する ``compute_diff_rate``
+- ``votes``: 多数の候補に対する多数決 / 重み付き投票
+- ``report``: 大規模メトリクス (既定 100 万行) からのレポート生成
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, UTC
+import itertools
+import json
+import os
+from pathlib import Path
+import platform
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any
+
+Row = dict[str, Any]
+
+_WORDS = ("alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta")
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+
+
+@dataclass(frozen=True)
+class SuiteScale:
+    name: str
+    repeat: int
+    compare_tasks: int
+    shadow_requests: int
+    limiter_seconds: float
+    limiter_threads: int
+    diff_tokens: tuple[int, ...]
+    vote_candidates: tuple[int, ...]
+    report_rows: int
+
+
+FULL_SCALE = SuiteScale(
+    name="full",
+    repeat=3,
+    compare_tasks=50,
+    shadow_requests=2000,
+    limiter_seconds=2.0,
+    limiter_threads=16,
+    diff_tokens=(250, 1000, 3000),
+    vote_candidates=(1_000, 10_000, 100_000),
+    report_rows=1_000_000,
+)
+QUICK_SCALE = SuiteScale(
+    name="quick",
+    repeat=1,
+    compare_tasks=4,
+    shadow_requests=50,
+    limiter_seconds=0.3,
+    limiter_threads=4,
+    diff_tokens=(100,),
+    vote_candidates=(200,),
+    report_rows=2_000,
+)
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_compare_runner(scale: SuiteScale, workdir: Path) -> list[Row]:
+    from adapter.core.budgets import BudgetManager
+    from adapter.core.datasets import GoldenTask
+    from adapter.core.models import (
+        BudgetBook,
+        BudgetRule,
+        PricingConfig,
+        ProviderConfig,
+        QualityGatesConfig,
+        RateLimitConfig,
+        RetryConfig,
+    )
+    from adapter.core.runner_api import RunnerConfig
+    from adapter.core.runner_config_builder import RunnerMode
+    from adapter.core.runners import CompareRunner
+
+    providers = [
+        ProviderConfig(
+            path=workdir / f"sim-{index}.yaml",
+            schema_version=1,
+            provider="simulated",
+            endpoint=None,
+            model="sim",
+            auth_env=None,
+            seed=0,
+            temperature=0.0,
+            top_p=1.0,
+            max_tokens=16,
+            timeout_s=0,
+            retries=RetryConfig(),
+            persist_output=True,
+            pricing=PricingConfig(),
+            rate_limit=RateLimitConfig(),
+            quality_gates=QualityGatesConfig(),
+            raw={},
+        )
+        for index in range(3)
+    ]
+    tasks = [
+        GoldenTask(
+            task_id=f"t{index}",
+            name=f"task-{index}",
+            input={},
+            prompt_template=f"benchmark task {index}",
+            expected={"type": "literal", "value": "YES"},
+        )
+        for index in range(scale.compare_tasks)
+    ]
+    rows: list[Row] = []
+    for mode in RunnerMode:
+        attempts = itertools.count()
+
+        def _run(mode: RunnerMode = mode, attempts: Iterator[int] = attempts) -> None:
+            # 追記で肥大化したメトリクスを次の計測に持ち込まないよう毎回新しいファイルに書く
+            metrics_path = workdir / f"compare-{mode.value}-{next(attempts)}.jsonl"
+            budget = BudgetManager(
+                BudgetBook(
+                    default=BudgetRule(
+                        run_budget_usd=1e9, daily_budget_usd=1e9, stop_on_budget_exceed=False
+                    ),
+                    overrides={},
+                )
+            )
+            runner = CompareRunner(providers, tasks, budget, metrics_path)
+            runner.run(repeat=1, config=RunnerConfig(mode=mode, max_concurrency=len(providers)))
+
+        seconds = _best_of(scale.repeat, _run)
+        rows.append(
+            {
+                "id": mode.value,
+                "tasks": len(tasks),
+                "providers": len(providers),
+                "seconds": seconds,
+                "tasks_per_s": len(tasks) / seconds,
+            }
+        )
+    return rows
+
+
+def bench_shadow_runner(scale: SuiteScale, workdir: Path) -> list[Row]:
+    try:
+        from llm_adapter.provider_spi import ProviderRequest
+        from llm_adapter.providers.loadgen import LoadGenProvider, LoadProfile
+        from llm_adapter.runner import AsyncRunner, Runner
+        from llm_adapter.runner_config import RunnerConfig
+    except ImportError as exc:
+        return [{"id": "skipped", "reason": f"llm_adapter を import できません: {exc}"}]
+
+    # time_scale=0 でスリープを省き、ランナー自体のオーバーヘッドを測る
+    profile = LoadProfile(time_scale=0.0)
+    primary = LoadGenProvider("primary", profile, seed=0)
+    shadow = LoadGenProvider("shadow", profile, seed=1)
+    requests = [
+        ProviderRequest(model="sim", prompt=f"request {index}")
+        for index in range(scale.shadow_requests)
+    ]
+    rows: list[Row] = []
+
+    def _run_sync() -> None:
+        metrics_path = workdir / "shadow-sync.jsonl"
+        runner = Runner([primary], config=RunnerConfig(metrics_path=str(metrics_path)))
+        for request in requests:
+            runner.run(request, shadow=shadow)
+
+    async def _run_async_batch() -> None:
+        metrics_path = workdir / "shadow-async.jsonl"
+        runner = AsyncRunner([primary], config=RunnerConfig(metrics_path=str(metrics_path)))
+        limit = asyncio.Semaphore(32)
+
+        async def _one(request: ProviderRequest) -> None:
+            async with limit:
+                await runner.run_async(request, shadow=shadow)
+
+        await asyncio.gather(*(_one(request) for request in requests))
+
+    for name, func in (
+        ("runner", _run_sync),
+        ("async_runner", lambda: asyncio.run(_run_async_batch())),
+    ):
+        seconds = _best_of(scale.repeat, func)
+        rows.append(
+            {
+                "id": name,
+                "requests": len(requests),
+                "seconds": seconds,
+                "requests_per_s": len(requests) / seconds,
+            }
+        )
+    return rows
+
+
+def _measure_limiter(acquire: Callable[[], None], *, threads: int, seconds: float) -> Row:
+    grants = [0] * threads
+    waits: list[float] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def _worker(slot: int) -> None:
+        local_waits: list[float] = []
+        while True:
+            started = time.perf_counter()
+            if started >= deadline:
+                break
+            acquire()
+            finished = time.perf_counter()
+            if finished > deadline:
+                break
+            grants[slot] += 1
+            local_waits.append(finished - started)
+        with lock:
+            waits.extend(local_waits)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=_worker, args=(slot,)) for slot in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = min(time.perf_counter() - started, seconds)
+    waits.sort()
+    return {
+        "threads": threads,
+        "granted": sum(grants),
+        "achieved_rps": sum(grants) / elapsed,
+        "wait_p50_ms": waits[len(waits) // 2] * 1000.0 if waits else 0.0,
+        "wait_p99_ms": waits[int(len(waits) * 0.99)] * 1000.0 if waits else 0.0,
+    }
+
+
+def bench_rate_limiters(scale: SuiteScale, workdir: Path) -> list[Row]:
+    from adapter.core.execution.guards import _TokenBucket
+
+    rpm = 6000
+    target_rps = rpm / 60.0
+    limiters: list[tuple[str, Callable[[], None]]] = []
+    bucket = _TokenBucket(rpm)
+    # _TokenBucket は満杯で始まるため、初期バーストを消費して定常状態を測る
+    for _ in range(rpm):
+        bucket.acquire()
+    limiters.append(("token_bucket", bucket.acquire))
+    try:
+        from llm_adapter.rate_limiter import RateLimiter
+    except ImportError:
+        pass
+    else:
+        limiters.append(("rate_limiter", RateLimiter(rpm).acquire))
+    rows: list[Row] = []
+    for name, acquire in limiters:
+        measured = _measure_limiter(
+            acquire, threads=scale.limiter_threads, seconds=scale.limiter_seconds
+        )
+        error_pct = (measured["achieved_rps"] - target_rps) / target_rps * 100.0
+        rows.append({"id": name, "target_rps": target_rps, "error_pct": error_pct, **measured})
+    return rows
+
+
+def _perturbed_pair(tokens: int, rng: random.Random) -> tuple[str, str]:
+    words = [rng.choice(_WORDS) for _ in range(tokens)]
+    other = list(words)
+    for _ in range(max(tokens // 10, 1)):
+        other[rng.randrange(tokens)] = rng.choice(_WORDS)
+    return " ".join(words), " ".join(other)
+
+
+def bench_diff_rate(scale: SuiteScale, workdir: Path) -> list[Row]:
+    from adapter.core.metrics.diff import compute_diff_rate
+
+    rng = random.Random(0)
+    rows: list[Row] = []
+    for tokens in scale.diff_tokens:
+        left, right = _perturbed_pair(tokens, rng)
+
+        def _diff(left: str = left, right: str = right) -> None:
+            compute_diff_rate(left, right)
+
+        seconds = _best_of(scale.repeat, _diff)
+        rows.append({"id": str(tokens), "tokens": tokens, "seconds": seconds})
+    return rows
+
+
+def bench_votes(scale: SuiteScale, workdir: Path) -> list[Row]:
+    from adapter.core.aggregation import (
+        AggregationCandidate,
+        AggregationStrategy,
+        MajorityVoteStrategy,
+        WeightedVoteStrategy,
+    )
+    from adapter.core.providers import ProviderResponse
+
+    rng = random.Random(0)
+    answers = [f"Answer {word}" for word in _WORDS]
+    weights = {f"p{index}": 1.0 + index / 10.0 for index in range(50)}
+    rows: list[Row] = []
+    for count in scale.vote_candidates:
+        candidates: list[AggregationCandidate] = []
+        for index in range(count):
+            # 空白や大文字小文字の揺れを混ぜて正規化の負荷も含める
+            text = rng.choice(answers)
+            if index % 3 == 0:
+                text = f"  {text.upper()}\t"
+            candidates.append(
+                AggregationCandidate(
+                    index=index,
+                    provider=f"p{index % 50}",
+                    response=ProviderResponse(text=text, latency_ms=0),
+                    text=text,
+                )
+            )
+        strategies: tuple[tuple[str, AggregationStrategy], ...] = (
+            ("majority_vote", MajorityVoteStrategy()),
+            ("weighted_vote", WeightedVoteStrategy(weights=weights)),
+        )
+        for name, strategy in strategies:
+
+            def _aggregate(
+                strategy: AggregationStrategy = strategy,
+                candidates: list[AggregationCandidate] = candidates,
+            ) -> None:
+                strategy.aggregate(candidates)
+
+            seconds = _best_of(scale.repeat, _aggregate)
+            rows.append(
+                {
+                    "id": f"{name}.{count}",
+                    "candidates": count,
+                    "seconds": seconds,
+                    "candidates_per_s": count / seconds,
+                }
+            )
+    return rows
+
+
+def _write_report_metrics(path: Path, rows: int) -> None:
+    rng = random.Random(0)
+    statuses = ("ok", "ok", "ok", "ok", "error")
+    with path.open("w", encoding="utf-8") as fp:
+        batch: list[str] = []
+        for index in range(rows):
+            status = statuses[index % len(statuses)]
+            record = {
+                "ts": f"2024-01-{1 + index % 28:02d}T00:00:00Z",
+                "run_id": f"run-{index}",
+                "provider": f"provider-{index % 4}",
+                "model": f"model-{index % 2}",
+                "mode": "parallel-any",
+                "prompt_id": f"task-{index % 200}",
+                "latency_ms": int(rng.lognormvariate(5.5, 0.6)),
+                "cost_usd": round(rng.random() * 0.01, 6),
+                "status": status,
+                "failure_kind": None if status == "ok" else "timeout",
+                "output_hash": f"{index % 997:016x}",
+                "eval": {"diff_rate": round(rng.random() * 0.2, 4)},
+            }
+            batch.append(json.dumps(record))
+            if len(batch) >= 10_000:
+                fp.write("\n".join(batch) + "\n")
+                batch.clear()
+        if batch:
+            fp.write("\n".join(batch) + "\n")
+
+
+def bench_report(scale: SuiteScale, workdir: Path) -> list[Row]:
+    from tools.report.metrics.cli import generate_report
+
+    metrics_path = workdir / "report-metrics.jsonl"
+    _write_report_metrics(metrics_path, scale.report_rows)
+    cpu_count = os.cpu_count() or 1
+    rows: list[Row] = []
+    for workers in sorted({1, min(4, cpu_count)}):
+        out_path = workdir / f"report-{workers}.html"
+
+        def _run(workers: int = workers, out_path: Path = out_path) -> None:
+            out_path.unlink(missing_ok=True)
+            generate_report(metrics_path, None, out_path, workers=workers)
+
+        # 100 万行では 1 回でも十分長いため反復しない
+        seconds = _best_of(1, _run)
+        rows.append(
+            {
+                "id": f"workers{workers}",
+                "rows": scale.report_rows,
+                "workers": workers,
+                "seconds": seconds,
+                "rows_per_s": scale.report_rows / seconds,
+            }
+        )
+    return rows
+
+
+CASES: dict[str, Callable[[SuiteScale, Path], list[Row]]] = {
+    "compare_runner": bench_compare_runner,
+    "shadow_runner": bench_shadow_runner,
+    "rate_limiters": bench_rate_limiters,
+    "diff_rate": bench_diff_rate,
+    "votes": bench_votes,
+    "report": bench_report,
+}
+
+
+def run_suite(cases: Sequence[str], scale: SuiteScale) -> dict[str, list[Row]]:
+    results: dict[str, list[Row]] = {}
+    with tempfile.TemporaryDirectory(prefix="llm-adapter-bench-") as tmp:
+        for name in cases:
+            workdir = Path(tmp) / name
+            workdir.mkdir()
+            results[name] = CASES[name](scale, workdir)
+    return results
+
+
+def compare_results(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    *,
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> list[Row]:
+    """``seconds`` を持つ行を (ケース, id) で突き合わせ、比率と回帰判定を返す。"""
+
+    baseline_cases = baseline.get("cases", {})
+    comparisons: list[Row] = []
+    for case, rows in current.get("cases", {}).items():
+        previous = {
+            row.get("id"): row for row in baseline_cases.get(case, []) if "seconds" in row
+        }
+        for row in rows:
+            before = previous.get(row.get("id"))
+            if before is None or "seconds" not in row or before["seconds"] <= 0:
+                continue
+            ratio = row["seconds"] / before["seconds"]
+            comparisons.append(
+                {
+                    "case": case,
+                    "id": row["id"],
+                    "baseline_s": before["seconds"],
+                    "current_s": row["seconds"],
+                    "ratio": ratio,
+                    "regressed": ratio > 1.0 + threshold,
+                }
+            )
+    return comparisons
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=_PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="主要経路の性能スイートを実行して JSON に保存する")
+    parser.add_argument(
+        "--cases",
+        default=",".join(CASES),
+        help=f"実行するケース (カンマ区切り、既定は全件: {', '.join(CASES)})",
+    )
+    parser.add_argument("--quick", action="store_true", help="縮小した規模で実行する (動作確認用)")
+    parser.add_argument("--report-rows", type=int, default=None, help="report ケースの行数を上書きする")
+    parser.add_argument("--out", default=None, help="結果 JSON の出力先 (未指定なら標準出力)")
+    parser.add_argument("--baseline", default=None, help="比較対象とする過去の結果 JSON")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="回帰とみなす所要時間の増加率 (既定 0.2 = 20%%)",
+    )
+    args = parser.parse_args(argv)
+
+    cases = [part.strip() for part in args.cases.split(",") if part.strip()]
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+    scale = QUICK_SCALE if args.quick else FULL_SCALE
+    if args.report_rows is not None:
+        scale = SuiteScale(**{**scale.__dict__, "report_rows": args.report_rows})
+
+    result: dict[str, Any] = {
+        "benchmark": "suite",
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count() or 1,
+        "scale": scale.__dict__,
+        "cases": run_suite(cases, scale),
+    }
+    regressions: list[Row] = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).expanduser().read_text(encoding="utf-8"))
+        comparisons = compare_results(baseline, result, threshold=args.threshold)
+        result["baseline_commit"] = baseline.get("commit")
+        result["comparison"] = comparisons
+        regressions = [row for row in comparisons if row["regressed"]]
+
+    payload = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.out:
+        out_path = Path(args.out).expanduser()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI
+    raise SystemExit(main())
@@ -3,6 +3,7 @@
 from .cli import generate_report, main
 from .data import (
     build_comparison_table,
+    build_cost_projection,
     build_determinism_alerts,
     build_failure_summary,
     build_latency_histogram_data,
@@ -12,21 +13,27 @@ from .data import (
     load_metrics,
 )
 from .html_report import render_html
+from .incremental import ReportAggregate, ReportCache
+from .output_drift import detect_output_drift
 from .regression_summary import build_regression_summary
 from .weekly_summary import update_weekly_summary
 
 __all__ = [
     "build_comparison_table",
+    "build_cost_projection",
     "build_determinism_alerts",
     "build_failure_summary",
     "build_latency_histogram_data",
     "build_regression_summary",
     "build_scatter_data",
     "compute_overview",
+    "detect_output_drift",
     "generate_report",
     "load_baseline_expectations",
     "load_metrics",
     "main",
+    "ReportAggregate",
+    "ReportCache",
     "render_html",
     "update_weekly_summary",
 ]
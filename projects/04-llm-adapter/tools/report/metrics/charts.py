@@ -0,0 +1,194 @@
+"""Compact, precomputed chart payloads for the HTML report.
+
+Raw latency/cost points are never inlined into the page.  The histogram is
+binned server-side into fixed-width bins and the scatter plot is reduced to a
+deterministic bottom-k sample followed by LTTB downsampling, so the page size
+is bounded regardless of how many metrics were collected.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+import hashlib
+import heapq
+import json
+from typing import Any
+
+HISTOGRAM_BINS = 50
+SCATTER_SAMPLE_SIZE = 5000
+SCATTER_MAX_POINTS = 1000
+
+_ScatterPoint = tuple[int, float, float, object]
+
+
+def bin_latency_counts(
+    counts_by_provider: Mapping[str, Mapping[float, int]],
+    bins: int = HISTOGRAM_BINS,
+) -> dict[str, object]:
+    """Bin per-provider latency counts into shared fixed-width bins."""
+
+    values = [value for counts in counts_by_provider.values() for value in counts]
+    if not values:
+        return {"start": 0.0, "width": 0.0, "providers": {}}
+    low = min(values)
+    high = max(values)
+    width = (high - low) / bins if high > low else 1.0
+    providers: dict[str, list[int]] = {}
+    for provider, counts in counts_by_provider.items():
+        row = [0] * bins
+        for value, count in counts.items():
+            index = min(int((value - low) / width), bins - 1)
+            row[index] += count
+        providers[provider] = row
+    return {"start": low, "width": width, "providers": providers}
+
+
+def latency_counts(
+    hist_data: Mapping[str, Iterable[float]],
+) -> dict[str, Counter[float]]:
+    """Convert raw per-provider latency lists into value counts."""
+
+    return {provider: Counter(values) for provider, values in hist_data.items()}
+
+
+def _point_rank(latency: float, cost: float, prompt_id: object) -> int:
+    encoded = json.dumps([latency, cost, prompt_id], default=str).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), "big")
+
+
+@dataclass
+class ScatterSample:
+    """Deterministic bottom-k sample of scatter points.
+
+    Points are ranked by a content hash and only the ``capacity`` lowest
+    ranks are kept.  Because the rank does not depend on insertion order,
+    merging two samples yields exactly the sample of the combined input.
+    Identical points share a rank and are plotted once.
+    """
+
+    capacity: int = SCATTER_SAMPLE_SIZE
+    seen: int = 0
+    _heap: list[tuple[int, float, float, object]] = field(default_factory=list)
+    _ranks: set[int] = field(default_factory=set)
+
+    def add(self, latency: float, cost: float, prompt_id: object) -> None:
+        self.seen += 1
+        self._offer((-_point_rank(latency, cost, prompt_id), latency, cost, prompt_id))
+
+    def _offer(self, entry: tuple[int, float, float, object]) -> None:
+        if entry[0] in self._ranks:
+            return
+        if len(self._heap) < self.capacity:
+            heapq.heappush(self._heap, entry)
+        elif entry[0] > self._heap[0][0]:
+            evicted = heapq.heapreplace(self._heap, entry)
+            self._ranks.discard(evicted[0])
+        else:
+            return
+        self._ranks.add(entry[0])
+
+    def merge(self, other: ScatterSample) -> None:
+        self.seen += other.seen
+        for entry in other._heap:
+            self._offer(entry)
+
+    def points(self) -> list[_ScatterPoint]:
+        return [(-rank, latency, cost, prompt_id) for rank, latency, cost, prompt_id in self._heap]
+
+    def to_json(self) -> dict[str, object]:
+        return {"seen": self.seen, "points": [list(point) for point in self.points()]}
+
+    @classmethod
+    def from_json(cls, payload: Mapping[str, Any]) -> ScatterSample:
+        sample = cls(seen=int(payload["seen"]))
+        for rank, latency, cost, prompt_id in payload["points"]:
+            sample._offer((-int(rank), float(latency), float(cost), prompt_id))
+        return sample
+
+
+def lttb(
+    points: Sequence[tuple[float, float, object]], threshold: int
+) -> list[tuple[float, float, object]]:
+    """Largest-Triangle-Three-Buckets downsampling of x-sorted points."""
+
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(points)
+    sampled = [points[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        next_span = points[next_start:next_end] or points[-1:]
+        avg_x = sum(point[0] for point in next_span) / len(next_span)
+        avg_y = sum(point[1] for point in next_span) / len(next_span)
+        ax, ay = points[anchor][0], points[anchor][1]
+        best_index = start
+        best_area = -1.0
+        for index in range(start, end):
+            x, y = points[index][0], points[index][1]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best_index = index
+        sampled.append(points[best_index])
+        anchor = best_index
+    sampled.append(points[-1])
+    return sampled
+
+
+def scatter_chart(
+    samples: Mapping[str, ScatterSample],
+    max_points: int = SCATTER_MAX_POINTS,
+) -> dict[str, dict[str, object]]:
+    """Build columnar, downsampled scatter arrays keyed by provider."""
+
+    chart: dict[str, dict[str, object]] = {}
+    for provider, sample in samples.items():
+        ordered = sorted(
+            ((latency, cost, prompt_id) for _, latency, cost, prompt_id in sample.points()),
+            key=lambda point: (point[0], point[1], str(point[2])),
+        )
+        reduced = lttb(ordered, max_points)
+        chart[provider] = {
+            "x": [point[0] for point in reduced],
+            "y": [point[1] for point in reduced],
+            "text": [point[2] for point in reduced],
+            "total": sample.seen,
+        }
+    return chart
+
+
+def scatter_samples(
+    scatter_data: Mapping[str, Iterable[Mapping[str, object]]],
+) -> dict[str, ScatterSample]:
+    """Build bottom-k samples from raw per-provider scatter points."""
+
+    samples: dict[str, ScatterSample] = {}
+    for provider, points in scatter_data.items():
+        sample = samples.setdefault(provider, ScatterSample())
+        for point in points:
+            sample.add(
+                float(point.get("latency", 0.0)),  # type: ignore[arg-type]
+                float(point.get("cost", 0.0)),  # type: ignore[arg-type]
+                point.get("prompt_id"),
+            )
+    return samples
+
+
+__all__ = [
+    "HISTOGRAM_BINS",
+    "SCATTER_MAX_POINTS",
+    "SCATTER_SAMPLE_SIZE",
+    "ScatterSample",
+    "bin_latency_counts",
+    "latency_counts",
+    "lttb",
+    "scatter_chart",
+    "scatter_samples",
+]
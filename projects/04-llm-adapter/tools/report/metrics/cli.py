@@ -2,11 +2,16 @@
 from __future__ import annotations
 
 import argparse
-from collections.abc import Sequence
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import json
 from pathlib import Path
 
+from .charts import bin_latency_counts, scatter_chart
 from .data import (
     build_comparison_table,
+    build_cost_projection,
     build_determinism_alerts,
     build_failure_summary,
     build_latency_histogram_data,
@@ -15,17 +20,48 @@ from .data import (
     compute_overview,
     load_metrics,
 )
-from .html_report import render_html
+from .html_report import (
+    assemble_html,
+    render_comparison_rows,
+    render_cost_projection_section,
+    render_determinism_section,
+    render_failure_section,
+    render_html,
+    render_overview_section,
+)
+from .incremental import aggregate_lines, default_cache_dir, ReportAggregate, ReportCache
 from .regression_summary import build_regression_summary
 from .weekly_summary import update_weekly_summary
 
+DEFAULT_CHUNK_SIZE = 20_000
+
 
 def generate_report(
     metrics_path: Path,
     golden_dir: Path | None,
     out_path: Path,
     weekly_summary_path: Path | None = None,
+    *,
+    incremental: bool = False,
+    cache_dir: Path | None = None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
 ) -> None:
+    if incremental:
+        _generate_report_incremental(
+            metrics_path,
+            golden_dir,
+            out_path,
+            weekly_summary_path,
+            cache_dir or default_cache_dir(out_path),
+        )
+        return
+    if workers > 1:
+        aggregate = _aggregate_in_pool(metrics_path, workers, chunk_size)
+        _write_aggregate_report(
+            aggregate, golden_dir, out_path, weekly_summary_path, _render_now
+        )
+        return
     metrics = load_metrics(metrics_path)
     overview = compute_overview(metrics)
     comparison_table = build_comparison_table(metrics)
@@ -35,6 +71,7 @@ def generate_report(
     failure_total, failure_summary = build_failure_summary(metrics)
     _, openrouter_http_failures = build_openrouter_http_failures(metrics)
     determinism_alerts = build_determinism_alerts(metrics)
+    cost_projection = build_cost_projection(metrics)
     html = render_html(
         overview,
         comparison_table,
@@ -44,7 +81,141 @@ def generate_report(
         failure_total,
         failure_summary,
         determinism_alerts,
+        cost_projection,
+    )
+    _write_outputs(
+        out_path,
+        html,
+        weekly_summary_path,
+        failure_total,
+        failure_summary,
+        openrouter_http_failures,
+    )
+
+
+def _aggregate_in_pool(
+    metrics_path: Path, workers: int, chunk_size: int
+) -> ReportAggregate:
+    aggregate = ReportAggregate()
+    if not metrics_path.exists():
+        return aggregate
+    with metrics_path.open("r", encoding="utf-8") as fp, ProcessPoolExecutor(
+        max_workers=workers
+    ) as executor:
+        chunks = iter(lambda: list(islice(fp, chunk_size)), [])
+        for partial in executor.map(aggregate_lines, chunks):
+            aggregate.merge(partial)
+    return aggregate
+
+
+def _render_now(name: str, inputs: object, render: Callable[[], str]) -> str:
+    return render()
+
+
+def _write_aggregate_report(
+    aggregate: ReportAggregate,
+    golden_dir: Path | None,
+    out_path: Path,
+    weekly_summary_path: Path | None,
+    section: Callable[[str, object, Callable[[], str]], str],
+) -> None:
+    overview = aggregate.overview()
+    comparison_table = aggregate.comparison_table()
+    failure_total, failure_summary = aggregate.failure_summary()
+    _, openrouter_http_failures = aggregate.openrouter_http_failures()
+    determinism_alerts = aggregate.determinism_alerts()
+    cost_projection = aggregate.cost_projection()
+    latest_metrics = aggregate.latest_metrics()
+    hist_chart = bin_latency_counts(aggregate.hist)
+    scatter = scatter_chart(aggregate.scatter)
+    sections = {
+        "overview_html": section(
+            "overview", overview, lambda: render_overview_section(overview)
+        ),
+        "comparison_rows": section(
+            "comparison",
+            comparison_table,
+            lambda: render_comparison_rows(comparison_table),
+        ),
+        "regression_html": section(
+            "regression",
+            {"baseline": _baseline_signature(golden_dir), "latest": latest_metrics},
+            lambda: build_regression_summary(latest_metrics, golden_dir),
+        ),
+        "hist_json": section("histogram", hist_chart, lambda: json.dumps(hist_chart)),
+        "scatter_json": section("scatter", scatter, lambda: json.dumps(scatter)),
+        "failure_html": section(
+            "failures",
+            [failure_total, failure_summary],
+            lambda: render_failure_section(failure_total, failure_summary),
+        ),
+        "determinism_html": section(
+            "determinism",
+            determinism_alerts,
+            lambda: render_determinism_section(determinism_alerts),
+        ),
+        "projection_html": section(
+            "projection",
+            cost_projection,
+            lambda: render_cost_projection_section(cost_projection),
+        ),
+    }
+    html = assemble_html(sections)
+    if out_path.exists() and out_path.read_text(encoding="utf-8") == html:
+        if weekly_summary_path is not None:
+            update_weekly_summary(
+                weekly_summary_path,
+                failure_total,
+                failure_summary,
+                openrouter_http_failures=openrouter_http_failures,
+            )
+        return
+    _write_outputs(
+        out_path,
+        html,
+        weekly_summary_path,
+        failure_total,
+        failure_summary,
+        openrouter_http_failures,
     )
+
+
+def _generate_report_incremental(
+    metrics_path: Path,
+    golden_dir: Path | None,
+    out_path: Path,
+    weekly_summary_path: Path | None,
+    cache_dir: Path,
+) -> None:
+    cache = ReportCache(cache_dir)
+    aggregate = cache.load_aggregate(metrics_path)
+    _write_aggregate_report(
+        aggregate, golden_dir, out_path, weekly_summary_path, cache.section
+    )
+    cache.save()
+
+
+def _baseline_signature(golden_dir: Path | None) -> list[object]:
+    if golden_dir is None:
+        return []
+    baseline_dir = golden_dir / "baseline"
+    if not baseline_dir.exists():
+        return [str(baseline_dir)]
+    return [
+        [str(path), path.stat().st_mtime_ns, path.stat().st_size]
+        for path in sorted(baseline_dir.iterdir())
+        if path.is_file()
+    ]
+
+
+def _write_outputs(
+    out_path: Path,
+    html: str,
+    weekly_summary_path: Path | None,
+    failure_total: int,
+    failure_summary: Sequence[Mapping[str, object]],
+    openrouter_http_failures: Sequence[Mapping[str, object]],
+) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(html, encoding="utf-8")
     if weekly_summary_path is not None:
@@ -62,6 +233,28 @@ def main(argv: Sequence[str] | None = None) -> int:
     parser.add_argument("--golden", default=None, help="ゴールデンディレクトリ")
     parser.add_argument("--out", required=True, help="出力 HTML パス")
     parser.add_argument("--weekly-summary", default=None, help="週次サマリ Markdown の出力パス")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="日次の部分集計をキャッシュし、追記分のみ再集計する",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="集計に使うプロセス数 (2 以上でチャンク単位に並列集計)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="並列集計で 1 プロセスに渡す行数",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="インクリメンタル集計のキャッシュディレクトリ (既定: レポートと同じ階層)",
+    )
     args = parser.parse_args(argv)
 
     metrics_path = Path(args.metrics).expanduser().resolve()
@@ -73,7 +266,18 @@ def main(argv: Sequence[str] | None = None) -> int:
         else None
     )
 
-    generate_report(metrics_path, golden_dir, out_path, weekly_summary)
+    cache_dir = Path(args.cache_dir).expanduser().resolve() if args.cache_dir else None
+
+    generate_report(
+        metrics_path,
+        golden_dir,
+        out_path,
+        weekly_summary,
+        incremental=args.incremental,
+        cache_dir=cache_dir,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
     return 0
 
 
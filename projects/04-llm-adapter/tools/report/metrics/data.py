@@ -117,6 +117,47 @@ def build_comparison_table(
     return table
 
 
+def build_cost_projection(
+    metrics: Sequence[Mapping[str, object]]
+) -> list[dict[str, object]]:
+    """Compare projected and actual cost per (provider, model).
+
+    Only rows that carry ``projected_cost_usd`` take part, so the two sums
+    cover the same attempts.
+    """
+
+    groups: dict[tuple[object, object], list[float]] = {}
+    for metric in metrics:
+        projected = coerce_optional_float(metric.get("projected_cost_usd"))
+        if projected is None:
+            continue
+        key = (metric.get("provider"), metric.get("model"))
+        stats = groups.setdefault(key, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += projected
+        stats[2] += coerce_optional_float(metric.get("cost_usd")) or 0.0
+    return [
+        _cost_projection_row(provider, model, int(count), projected, actual)
+        for (provider, model), (count, projected, actual) in sorted(
+            groups.items(), key=lambda item: (str(item[0][0]), str(item[0][1]))
+        )
+    ]
+
+
+def _cost_projection_row(
+    provider: object, model: object, attempts: int, projected: float, actual: float
+) -> dict[str, object]:
+    error = (actual - projected) / projected * 100 if projected > 0 else None
+    return {
+        "provider": provider,
+        "model": model,
+        "attempts": attempts,
+        "projected_cost": round(projected, 4),
+        "actual_cost": round(actual, 4),
+        "error_pct": round(error, 2) if error is not None else None,
+    }
+
+
 def build_latency_histogram_data(
     metrics: Sequence[Mapping[str, object]]
 ) -> dict[str, list[float]]:
@@ -285,6 +326,7 @@ __all__ = [
     "load_metrics",
     "compute_overview",
     "build_comparison_table",
+    "build_cost_projection",
     "build_latency_histogram_data",
     "build_scatter_data",
     "build_failure_summary",
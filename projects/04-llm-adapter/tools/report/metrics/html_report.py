@@ -5,17 +5,27 @@ from collections.abc import Mapping, Sequence
 import json
 from string import Template
 
+from .charts import bin_latency_counts, latency_counts, scatter_chart, scatter_samples
+
+
+def render_overview_section(overview: Mapping[str, object]) -> str:
+    """Render the overview bullet list."""
+
+    return f"""
+    <ul>
+      <li>総試行数: {overview['total']}</li>
+      <li>成功率: {overview['success_rate']}%</li>
+      <li>平均レイテンシ: {overview['avg_latency']} ms</li>
+      <li>中央値レイテンシ: {overview['median_latency']} ms</li>
+      <li>総コスト: ${overview['total_cost']}</li>
+      <li>平均コスト: ${overview['avg_cost']}</li>
+    </ul>
+    """
+
+
+def render_comparison_rows(comparison_table: Sequence[Mapping[str, object]]) -> str:
+    """Render ``<tr>`` rows for the comparison table."""
 
-def render_html(
-    overview: Mapping[str, object],
-    comparison_table: Sequence[Mapping[str, object]],
-    hist_data: Mapping[str, Sequence[float]],
-    scatter_data: Mapping[str, Sequence[Mapping[str, object]]],
-    regression_html: str,
-    failure_total: int,
-    failure_summary: Sequence[Mapping[str, object]],
-    determinism_alerts: Sequence[Mapping[str, object]],
-) -> str:
     rows_html: list[str] = []
     for row in comparison_table:
         diff_value = row.get("avg_diff_rate")
@@ -36,23 +46,21 @@ def render_html(
                 )
             )
         )
-    comparison_rows = "".join(rows_html)
-    overview_html = f"""
-    <ul>
-      <li>総試行数: {overview['total']}</li>
-      <li>成功率: {overview['success_rate']}%</li>
-      <li>平均レイテンシ: {overview['avg_latency']} ms</li>
-      <li>中央値レイテンシ: {overview['median_latency']} ms</li>
-      <li>総コスト: ${overview['total_cost']}</li>
-      <li>平均コスト: ${overview['avg_cost']}</li>
-    </ul>
-    """
-    if failure_summary:
-        failure_rows = "".join(
-            f"<tr><td>{idx}</td><td>{row['failure_kind']}</td><td>{row['count']}</td></tr>"
-            for idx, row in enumerate(failure_summary, start=1)
-        )
-        failure_html = f"""
+    return "".join(rows_html)
+
+
+def render_failure_section(
+    failure_total: int, failure_summary: Sequence[Mapping[str, object]]
+) -> str:
+    """Render the failure summary table."""
+
+    if not failure_summary:
+        return "<p>失敗は記録されていません。</p>"
+    failure_rows = "".join(
+        f"<tr><td>{idx}</td><td>{row['failure_kind']}</td><td>{row['count']}</td></tr>"
+        for idx, row in enumerate(failure_summary, start=1)
+    )
+    return f"""
         <p>記録された失敗件数: {failure_total}</p>
         <table>
           <thead>
@@ -63,23 +71,89 @@ def render_html(
           </tbody>
         </table>
         """
-    else:
-        failure_html = "<p>失敗は記録されていません。</p>"
-    if determinism_alerts:
-        determinism_items = "".join(
-            "<li>{provider} / {model} / {prompt} (件数: {count})</li>".format(
-                provider=alert.get("provider", "?"),
-                model=alert.get("model", "?"),
-                prompt=alert.get("prompt_id", "?"),
-                count=alert.get("count", 0),
+
+
+def render_determinism_section(
+    determinism_alerts: Sequence[Mapping[str, object]],
+) -> str:
+    """Render the determinism alert list."""
+
+    if not determinism_alerts:
+        return "<p>決定性アラートはありません。</p>"
+    determinism_items = "".join(
+        "<li>{provider} / {model} / {prompt} (件数: {count})</li>".format(
+            provider=alert.get("provider", "?"),
+            model=alert.get("model", "?"),
+            prompt=alert.get("prompt_id", "?"),
+            count=alert.get("count", 0),
+        )
+        for alert in determinism_alerts
+    )
+    return f"<ul>{determinism_items}</ul>"
+
+
+def render_cost_projection_section(
+    projection_rows: Sequence[Mapping[str, object]],
+) -> str:
+    """Render the projected vs. actual cost table."""
+
+    if not projection_rows:
+        return "<p>予測コストの記録はありません。</p>"
+    rows_html = "".join(
+        "".join(
+            (
+                "<tr>",
+                f"<td>{row['provider']}</td>",
+                f"<td>{row['model']}</td>",
+                f"<td>{row['attempts']}</td>",
+                f"<td>${row['projected_cost']}</td>",
+                f"<td>${row['actual_cost']}</td>",
+                f"<td>{'-' if row['error_pct'] is None else str(row['error_pct']) + '%'}</td>",
+                "</tr>",
             )
-            for alert in determinism_alerts
         )
-        determinism_html = f"<ul>{determinism_items}</ul>"
-    else:
-        determinism_html = "<p>決定性アラートはありません。</p>"
-    hist_json = json.dumps(hist_data)
-    scatter_json = json.dumps(scatter_data)
+        for row in projection_rows
+    )
+    return f"""
+        <table>
+          <thead>
+            <tr><th>Provider</th><th>Model</th><th>Attempts</th><th>Projected</th><th>Actual</th><th>Error</th></tr>
+          </thead>
+          <tbody>
+            {rows_html}
+          </tbody>
+        </table>
+        """
+
+
+def render_html(
+    overview: Mapping[str, object],
+    comparison_table: Sequence[Mapping[str, object]],
+    hist_data: Mapping[str, Sequence[float]],
+    scatter_data: Mapping[str, Sequence[Mapping[str, object]]],
+    regression_html: str,
+    failure_total: int,
+    failure_summary: Sequence[Mapping[str, object]],
+    determinism_alerts: Sequence[Mapping[str, object]],
+    cost_projection: Sequence[Mapping[str, object]] = (),
+) -> str:
+    return assemble_html(
+        {
+            "overview_html": render_overview_section(overview),
+            "comparison_rows": render_comparison_rows(comparison_table),
+            "regression_html": regression_html,
+            "hist_json": json.dumps(bin_latency_counts(latency_counts(hist_data))),
+            "scatter_json": json.dumps(scatter_chart(scatter_samples(scatter_data))),
+            "failure_html": render_failure_section(failure_total, failure_summary),
+            "determinism_html": render_determinism_section(determinism_alerts),
+            "projection_html": render_cost_projection_section(cost_projection),
+        }
+    )
+
+
+def assemble_html(sections: Mapping[str, str]) -> str:
+    """Substitute pre-rendered section fragments into the page template."""
+
     template = Template(
         """<!DOCTYPE html>
 <html lang=\"ja\">
@@ -129,6 +203,10 @@ def render_html(
     <h2>Cost vs Latency</h2>
     <div id=\"cost_latency_scatter\" style=\"width:100%;height:400px;\"></div>
   </section>
+  <section>
+    <h2>Projected vs Actual Cost</h2>
+    ${projection_html}
+  </section>
   <section>
     <h2>Failure Summary</h2>
     ${failure_html}
@@ -143,22 +221,24 @@ def render_html(
   </section>
   <script>
     const histData = ${hist_json};
-    const histTraces = Object.keys(histData).map(provider => ({
-      type: 'histogram',
+    const histTraces = Object.keys(histData.providers).map(provider => ({
+      type: 'bar',
       name: provider,
-      x: histData[provider],
+      x: histData.providers[provider].map((_, i) => histData.start + (i + 0.5) * histData.width),
+      y: histData.providers[provider],
+      width: histData.width,
       opacity: 0.6,
     }));
     Plotly.newPlot('latency_hist', histTraces, {barmode: 'overlay', title: 'Latency Histogram'});
 
-    const scatterRaw = ${scatter_json};
-    const scatterTraces = Object.keys(scatterRaw).map(provider => ({
-      x: scatterRaw[provider].map(p => p.latency),
-      y: scatterRaw[provider].map(p => p.cost),
+    const scatterData = ${scatter_json};
+    const scatterTraces = Object.keys(scatterData).map(provider => ({
+      x: scatterData[provider].x,
+      y: scatterData[provider].y,
       mode: 'markers',
-      type: 'scatter',
+      type: 'scattergl',
       name: provider,
-      text: scatterRaw[provider].map(p => p.prompt_id),
+      text: scatterData[provider].text,
     }));
     Plotly.newPlot('cost_latency_scatter', scatterTraces, {
       title: 'Cost vs Latency',
@@ -171,14 +251,23 @@ def render_html(
 """
     )
     return template.substitute(
-        overview_html=overview_html,
-        comparison_rows=comparison_rows,
-        regression_html=regression_html,
-        hist_json=hist_json,
-        scatter_json=scatter_json,
-        failure_html=failure_html,
-        determinism_html=determinism_html,
+        overview_html=sections["overview_html"],
+        comparison_rows=sections["comparison_rows"],
+        regression_html=sections["regression_html"],
+        hist_json=sections["hist_json"],
+        scatter_json=sections["scatter_json"],
+        failure_html=sections["failure_html"],
+        determinism_html=sections["determinism_html"],
+        projection_html=sections.get("projection_html", render_cost_projection_section(())),
     )
 
 
-__all__ = ["render_html"]
+__all__ = [
+    "assemble_html",
+    "render_comparison_rows",
+    "render_cost_projection_section",
+    "render_determinism_section",
+    "render_failure_section",
+    "render_html",
+    "render_overview_section",
+]
@@ -0,0 +1,582 @@
+"""Incremental aggregation state for metrics reports.
+
+The report generator normally re-reads ``runs-metrics.jsonl`` and recomputes
+every section.  This module keeps mergeable per-day partial aggregates in a
+cache directory so that only lines appended since the previous run have to be
+parsed, and section fragments whose inputs did not change are reused.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from .charts import ScatterSample
+from .data import (
+    _classify_openrouter_http_failure,
+    _cost_projection_row,
+    _OPENROUTER_PROVIDER,
+    _RATE_LIMIT_LABEL,
+    _RETRIABLE_LABEL,
+    SUCCESS_STATUSES,
+)
+from .utils import coerce_optional_float, parse_iso_ts
+
+CACHE_VERSION = 4
+_MANIFEST_NAME = "manifest.json"
+_DAYS_DIR = "days"
+_SECTIONS_DIR = "sections"
+_TAIL_DIGEST_BYTES = 4096
+_UNKNOWN_DAY = "unknown"
+
+_GroupKey = tuple[object, object, object]
+
+
+def _day_of(metric: Mapping[str, object]) -> str:
+    ts = metric.get("ts")
+    parsed = parse_iso_ts(ts)
+    if parsed.year == 1:
+        return _UNKNOWN_DAY
+    return parsed.astimezone(UTC).date().isoformat()
+
+
+def _as_float(value: object) -> float:
+    if isinstance(value, int | float | str):
+        return float(value)
+    raise TypeError(f"expected a numeric value, got {type(value).__name__}")
+
+
+@dataclass
+class _GroupStats:
+    attempts: int = 0
+    ok_count: int = 0
+    latency_sum: float = 0.0
+    cost_sum: float = 0.0
+    diff_sum: float = 0.0
+    diff_count: int = 0
+
+    def merge(self, other: _GroupStats) -> None:
+        self.attempts += other.attempts
+        self.ok_count += other.ok_count
+        self.latency_sum += other.latency_sum
+        self.cost_sum += other.cost_sum
+        self.diff_sum += other.diff_sum
+        self.diff_count += other.diff_count
+
+    def to_list(self) -> list[float]:
+        return [
+            self.attempts,
+            self.ok_count,
+            self.latency_sum,
+            self.cost_sum,
+            self.diff_sum,
+            self.diff_count,
+        ]
+
+    @classmethod
+    def from_list(cls, values: list[float]) -> _GroupStats:
+        attempts, ok_count, latency_sum, cost_sum, diff_sum, diff_count = values
+        return cls(
+            int(attempts),
+            int(ok_count),
+            float(latency_sum),
+            float(cost_sum),
+            float(diff_sum),
+            int(diff_count),
+        )
+
+
+@dataclass
+class ReportAggregate:
+    """Mergeable partial aggregate covering an arbitrary subset of metrics.
+
+    Every report section can be derived from this state, and two aggregates
+    can be combined with :meth:`merge` without access to the raw metrics.
+    """
+
+    total: int = 0
+    successes: int = 0
+    latency_counts: Counter[float] = field(default_factory=Counter)
+    cost_sum: float = 0.0
+    groups: dict[_GroupKey, _GroupStats] = field(default_factory=dict)
+    hist: dict[str, Counter[float]] = field(default_factory=dict)
+    scatter: dict[str, ScatterSample] = field(default_factory=dict)
+    failures: Counter[str] = field(default_factory=Counter)
+    openrouter_errors: int = 0
+    openrouter_categories: Counter[str] = field(default_factory=Counter)
+    determinism: Counter[_GroupKey] = field(default_factory=Counter)
+    latest: dict[tuple[str, str, str], dict[str, object]] = field(default_factory=dict)
+    projections: dict[tuple[object, object], list[float]] = field(default_factory=dict)
+
+    def add(self, metric: Mapping[str, object]) -> None:
+        """Fold a single metric row into the aggregate."""
+
+        provider = metric.get("provider")
+        model = metric.get("model")
+        prompt_id = metric.get("prompt_id")
+        latency = _as_float(metric.get("latency_ms", 0))
+        cost = _as_float(metric.get("cost_usd", 0.0))
+        ok = str(metric.get("status", "")).lower() in SUCCESS_STATUSES
+
+        self.total += 1
+        self.successes += int(ok)
+        self.latency_counts[latency] += 1
+        self.cost_sum += cost
+
+        stats = self.groups.setdefault((provider, model, prompt_id), _GroupStats())
+        stats.attempts += 1
+        stats.ok_count += int(ok)
+        stats.latency_sum += latency
+        stats.cost_sum += cost
+        eval_payload = metric.get("eval", {})
+        if isinstance(eval_payload, Mapping):
+            diff = coerce_optional_float(eval_payload.get("diff_rate"))
+            if diff is not None:
+                stats.diff_sum += diff
+                stats.diff_count += 1
+
+        provider_label = str(provider)
+        self.hist.setdefault(provider_label, Counter())[latency] += 1
+        self.scatter.setdefault(provider_label, ScatterSample()).add(
+            latency, cost, prompt_id
+        )
+
+        projected = coerce_optional_float(metric.get("projected_cost_usd"))
+        if projected is not None:
+            projection = self.projections.setdefault((provider, model), [0, 0.0, 0.0])
+            projection[0] += 1
+            projection[1] += projected
+            projection[2] += cost
+
+        failure = metric.get("failure_kind")
+        if failure:
+            self.failures[str(failure)] += 1
+        if failure == "non_deterministic":
+            self.determinism[(provider, model, prompt_id)] += 1
+
+        if (
+            provider_label.lower() == _OPENROUTER_PROVIDER
+            and str(metric.get("status")).lower() == "error"
+        ):
+            self.openrouter_errors += 1
+            category = _classify_openrouter_http_failure(metric)
+            if category is not None:
+                self.openrouter_categories[category] += 1
+
+        if provider is not None and model is not None and prompt_id is not None:
+            key = (str(provider), str(model), str(prompt_id))
+            snapshot: dict[str, object] = {
+                "provider": key[0],
+                "model": key[1],
+                "prompt_id": key[2],
+                "ts": metric.get("ts"),
+                "status": metric.get("status", "-"),
+            }
+            if isinstance(eval_payload, Mapping) and "diff_rate" in eval_payload:
+                snapshot["eval"] = {"diff_rate": eval_payload.get("diff_rate")}
+            self._offer_latest(key, snapshot)
+
+    def _offer_latest(
+        self, key: tuple[str, str, str], snapshot: dict[str, object]
+    ) -> None:
+        existing = self.latest.get(key)
+        if existing is None or parse_iso_ts(snapshot.get("ts")) >= parse_iso_ts(
+            existing.get("ts")
+        ):
+            self.latest[key] = snapshot
+
+    def merge(self, other: ReportAggregate) -> None:
+        """Merge ``other`` into this aggregate; ``other`` is treated as newer."""
+
+        self.total += other.total
+        self.successes += other.successes
+        self.latency_counts.update(other.latency_counts)
+        self.cost_sum += other.cost_sum
+        for key, stats in other.groups.items():
+            self.groups.setdefault(key, _GroupStats()).merge(stats)
+        for provider, counts in other.hist.items():
+            self.hist.setdefault(provider, Counter()).update(counts)
+        for provider, sample in other.scatter.items():
+            self.scatter.setdefault(provider, ScatterSample()).merge(sample)
+        self.failures.update(other.failures)
+        self.openrouter_errors += other.openrouter_errors
+        self.openrouter_categories.update(other.openrouter_categories)
+        self.determinism.update(other.determinism)
+        for key, snapshot in other.latest.items():
+            self._offer_latest(key, snapshot)
+        for group, values in other.projections.items():
+            projection = self.projections.setdefault(group, [0, 0.0, 0.0])
+            for index, value in enumerate(values):
+                projection[index] += value
+
+    # -- section views -----------------------------------------------------
+
+    def overview(self) -> dict[str, object]:
+        """Equivalent of :func:`data.compute_overview`."""
+
+        if self.total == 0:
+            return {
+                "total": 0,
+                "success_rate": 0.0,
+                "avg_latency": 0.0,
+                "median_latency": 0.0,
+                "total_cost": 0.0,
+                "avg_cost": 0.0,
+            }
+        latency_sum = sum(value * count for value, count in self.latency_counts.items())
+        return {
+            "total": self.total,
+            "success_rate": round(self.successes / self.total * 100, 2),
+            "avg_latency": round(latency_sum / self.total, 2),
+            "median_latency": round(_median_from_counts(self.latency_counts), 2),
+            "total_cost": round(self.cost_sum, 4),
+            "avg_cost": round(self.cost_sum / self.total, 4),
+        }
+
+    def comparison_table(self) -> list[dict[str, object]]:
+        """Equivalent of :func:`data.build_comparison_table`."""
+
+        table: list[dict[str, object]] = []
+        for (provider, model, prompt_id), stats in sorted(self.groups.items()):
+            attempts = stats.attempts
+            avg_diff = stats.diff_sum / stats.diff_count if stats.diff_count else None
+            table.append(
+                {
+                    "provider": provider,
+                    "model": model,
+                    "prompt_id": prompt_id,
+                    "attempts": attempts,
+                    "ok_rate": round(stats.ok_count / attempts * 100, 2) if attempts else 0.0,
+                    "avg_latency": round(stats.latency_sum / attempts, 2) if attempts else 0.0,
+                    "avg_cost": round(stats.cost_sum / attempts, 4) if attempts else 0.0,
+                    "avg_diff_rate": round(avg_diff, 4) if avg_diff is not None else None,
+                }
+            )
+        return table
+
+    def failure_summary(self) -> tuple[int, list[dict[str, object]]]:
+        """Equivalent of :func:`data.build_failure_summary`."""
+
+        summary = [
+            {"failure_kind": name, "count": count}
+            for name, count in self.failures.most_common(3)
+        ]
+        return sum(self.failures.values()), summary
+
+    def openrouter_http_failures(self) -> tuple[int, list[dict[str, object]]]:
+        """Equivalent of :func:`data.build_openrouter_http_failures`."""
+
+        total = self.openrouter_errors
+        summary: list[dict[str, object]] = []
+        if total > 0:
+            for key, label in (
+                ("RateLimitError", _RATE_LIMIT_LABEL),
+                ("RetriableError", _RETRIABLE_LABEL),
+            ):
+                count = self.openrouter_categories.get(key, 0)
+                if count == 0:
+                    continue
+                summary.append(
+                    {
+                        "category": key,
+                        "label": label,
+                        "count": count,
+                        "rate": round(count / total * 100, 2),
+                    }
+                )
+        summary.sort(key=lambda row: _as_float(row["count"]), reverse=True)
+        return total, summary
+
+    def determinism_alerts(self) -> list[dict[str, object]]:
+        """Equivalent of :func:`data.build_determinism_alerts`."""
+
+        return [
+            {"provider": provider, "model": model, "prompt_id": prompt_id, "count": count}
+            for (provider, model, prompt_id), count in sorted(self.determinism.items())
+        ]
+
+    def cost_projection(self) -> list[dict[str, object]]:
+        """Equivalent of :func:`data.build_cost_projection`."""
+
+        return [
+            _cost_projection_row(provider, model, int(count), projected, actual)
+            for (provider, model), (count, projected, actual) in sorted(
+                self.projections.items(), key=lambda item: (str(item[0][0]), str(item[0][1]))
+            )
+        ]
+
+    def latest_metrics(self) -> list[Mapping[str, object]]:
+        """Return the latest snapshot per key, usable as regression input."""
+
+        return [self.latest[key] for key in sorted(self.latest)]
+
+    # -- persistence -------------------------------------------------------
+
+    def to_json(self) -> dict[str, object]:
+        return {
+            "total": self.total,
+            "successes": self.successes,
+            "latency_counts": [[value, count] for value, count in self.latency_counts.items()],
+            "cost_sum": self.cost_sum,
+            "groups": [[list(key), stats.to_list()] for key, stats in self.groups.items()],
+            "hist": {
+                provider: [[value, count] for value, count in counts.items()]
+                for provider, counts in self.hist.items()
+            },
+            "scatter": {
+                provider: sample.to_json() for provider, sample in self.scatter.items()
+            },
+            "failures": dict(self.failures),
+            "openrouter_errors": self.openrouter_errors,
+            "openrouter_categories": dict(self.openrouter_categories),
+            "determinism": [[list(key), count] for key, count in self.determinism.items()],
+            "latest": list(self.latest.values()),
+            "projections": [[list(key), values] for key, values in self.projections.items()],
+        }
+
+    @classmethod
+    def from_json(cls, payload: Mapping[str, Any]) -> ReportAggregate:
+        aggregate = cls(
+            total=int(payload["total"]),
+            successes=int(payload["successes"]),
+            cost_sum=float(payload["cost_sum"]),
+            openrouter_errors=int(payload["openrouter_errors"]),
+        )
+        for value, count in payload["latency_counts"]:
+            aggregate.latency_counts[float(value)] = int(count)
+        for key, values in payload["groups"]:
+            aggregate.groups[tuple(key)] = _GroupStats.from_list(values)
+        for provider, pairs in payload["hist"].items():
+            aggregate.hist[str(provider)] = Counter(
+                {float(value): int(count) for value, count in pairs}
+            )
+        for provider, sample in payload["scatter"].items():
+            aggregate.scatter[str(provider)] = ScatterSample.from_json(sample)
+        aggregate.failures = Counter(payload["failures"])
+        aggregate.openrouter_categories = Counter(payload["openrouter_categories"])
+        for key, count in payload["determinism"]:
+            aggregate.determinism[tuple(key)] = int(count)
+        for snapshot in payload["latest"]:
+            key = (str(snapshot["provider"]), str(snapshot["model"]), str(snapshot["prompt_id"]))
+            aggregate.latest[key] = dict(snapshot)
+        for key, values in payload.get("projections", []):
+            aggregate.projections[tuple(key)] = [float(value) for value in values]
+        return aggregate
+
+
+def _median_from_counts(counts: Mapping[float, int]) -> float:
+    total = sum(counts.values())
+    ordered = sorted(counts.items())
+    lower_index = (total - 1) // 2
+    upper_index = total // 2
+    lower: float | None = None
+    seen = 0
+    for value, count in ordered:
+        seen += count
+        if lower is None and seen > lower_index:
+            lower = value
+        if seen > upper_index:
+            assert lower is not None
+            return (lower + value) / 2
+    return 0.0
+
+
+def aggregate_metrics(metrics: Iterable[Mapping[str, object]]) -> dict[str, ReportAggregate]:
+    """Group metrics by UTC day and aggregate each day independently."""
+
+    days: dict[str, ReportAggregate] = {}
+    for metric in metrics:
+        days.setdefault(_day_of(metric), ReportAggregate()).add(metric)
+    return days
+
+
+def aggregate_lines(lines: Sequence[str]) -> ReportAggregate:
+    """Parse JSONL lines and fold them into a single aggregate.
+
+    Module level so that it can be shipped to a process pool.
+    """
+
+    aggregate = ReportAggregate()
+    for line in lines:
+        line = line.strip()
+        if line:
+            aggregate.add(json.loads(line))
+    return aggregate
+
+
+def fingerprint(payload: object) -> str:
+    """Stable digest of a JSON-serialisable section input."""
+
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """On-disk cache of per-day aggregates and rendered section fragments.
+
+    The metrics file is treated as append-only: the manifest remembers how many
+    bytes were consumed and a digest of the bytes right before that offset.
+    When both still match, only the appended tail is parsed; otherwise the
+    cache is discarded and rebuilt from scratch.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        self._manifest_path = cache_dir / _MANIFEST_NAME
+        self._days_dir = cache_dir / _DAYS_DIR
+        self._sections_dir = cache_dir / _SECTIONS_DIR
+        self._manifest = self._load_manifest()
+        self.reused_sections: set[str] = set()
+        self.touched_days: set[str] = set()
+
+    def _load_manifest(self) -> dict[str, object]:
+        if not self._manifest_path.exists():
+            return {}
+        try:
+            manifest = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get("version") != CACHE_VERSION:
+            return {}
+        return manifest
+
+    def _reset(self) -> None:
+        self._manifest = {}
+        for directory in (self._days_dir, self._sections_dir):
+            if directory.exists():
+                for path in directory.glob("*.json"):
+                    path.unlink()
+
+    def _resume_offset(self, metrics_path: Path) -> int:
+        if not self._manifest or self._manifest.get("source") != str(metrics_path):
+            return 0
+        offset = int(self._manifest.get("offset", 0))  # type: ignore[call-overload]
+        if offset == 0 or not metrics_path.exists():
+            return 0
+        if metrics_path.stat().st_size < offset:
+            return 0
+        if _tail_digest(metrics_path, offset) != self._manifest.get("tail_digest"):
+            return 0
+        return offset
+
+    def _load_days(self, offset: int) -> dict[str, ReportAggregate] | None:
+        days: dict[str, ReportAggregate] = {}
+        if not self._days_dir.exists():
+            return days
+        for path in self._days_dir.glob("*.json"):
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+                through = int(payload["through_offset"])
+                aggregate = ReportAggregate.from_json(payload["aggregate"])
+            except (OSError, ValueError, KeyError, TypeError):
+                return None
+            if through > offset:
+                # the day was written by a run whose manifest never got saved
+                return None
+            days[path.stem] = aggregate
+        return days
+
+    def load_aggregate(self, metrics_path: Path) -> ReportAggregate:
+        """Bring the cache up to date with ``metrics_path`` and merge all days."""
+
+        offset = self._resume_offset(metrics_path)
+        days = self._load_days(offset) if offset else None
+        if days is None:
+            self._reset()
+            offset = 0
+            days = {}
+        new_offset = offset
+        touched: set[str] = set()
+        if metrics_path.exists():
+            with metrics_path.open("rb") as fp:
+                fp.seek(offset)
+                for raw in fp:
+                    if not raw.endswith(b"\n"):
+                        # partially written line; pick it up on the next run
+                        break
+                    new_offset += len(raw)
+                    line = raw.decode("utf-8").strip()
+                    if not line:
+                        continue
+                    metric = json.loads(line)
+                    day = _day_of(metric)
+                    days.setdefault(day, ReportAggregate()).add(metric)
+                    touched.add(day)
+        if touched:
+            self._days_dir.mkdir(parents=True, exist_ok=True)
+        for day in touched:
+            _write_json(
+                self._days_dir / f"{day}.json",
+                {"through_offset": new_offset, "aggregate": days[day].to_json()},
+            )
+        self.touched_days = touched
+
+        combined = ReportAggregate()
+        for day in sorted(days):
+            combined.merge(days[day])
+        self._manifest = {
+            "version": CACHE_VERSION,
+            "source": str(metrics_path),
+            "offset": new_offset,
+            "tail_digest": _tail_digest(metrics_path, new_offset) if new_offset else None,
+        }
+        return combined
+
+    def section(self, name: str, inputs: object, render: Callable[[], str]) -> str:
+        """Return the cached fragment for ``name`` unless ``inputs`` changed."""
+
+        digest = fingerprint(inputs)
+        path = self._sections_dir / f"{name}.json"
+        if path.exists():
+            try:
+                cached = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                cached = None
+            if isinstance(cached, dict) and cached.get("fingerprint") == digest:
+                self.reused_sections.add(name)
+                return str(cached["html"])
+        fragment = render()
+        self._sections_dir.mkdir(parents=True, exist_ok=True)
+        _write_json(path, {"fingerprint": digest, "html": fragment})
+        return fragment
+
+    def save(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_json(self._manifest_path, self._manifest)
+
+
+def _tail_digest(path: Path, offset: int) -> str:
+    start = max(0, offset - _TAIL_DIGEST_BYTES)
+    with path.open("rb") as fp:
+        fp.seek(start)
+        chunk = fp.read(offset - start)
+    return hashlib.sha256(chunk).hexdigest()
+
+
+def _write_json(path: Path, payload: object) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def default_cache_dir(out_path: Path) -> Path:
+    """Cache directory placed next to the generated report."""
+
+    return out_path.parent / f".{out_path.stem}-cache"
+
+
+__all__ = [
+    "CACHE_VERSION",
+    "ReportAggregate",
+    "ReportCache",
+    "aggregate_lines",
+    "aggregate_metrics",
+    "default_cache_dir",
+    "fingerprint",
+]
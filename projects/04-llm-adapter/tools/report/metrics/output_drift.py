@@ -0,0 +1,219 @@
+"""Detect provider output drift across runs with MinHash + LSH.
+
+Every metric row carries a MinHash signature of its output
+(``output_minhash``).  Historical signatures are inserted into a banded LSH
+index keyed by ``(provider, model, prompt_id)``; the latest output of each
+group is then probed against the history of *earlier* runs (sibling attempts
+of the same ``run_id`` are skipped, so ``repeats > 1`` cannot mask a drifted
+run).  Only colliding signatures are
+compared, so detection stays sub-linear in the size of the history and no
+output pair is ever diffed exhaustively.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+
+from adapter.core.metrics.minhash import estimate_jaccard, minhash_signature
+
+DEFAULT_BANDS = 16
+DEFAULT_DRIFT_THRESHOLD = 0.5
+
+_OUTPUT_JSON = "output_drift.json"
+
+_GroupKey = tuple[str, str, str]
+
+
+@dataclass
+class MinHashLSH:
+    """Banded LSH index over MinHash signatures, partitioned by group."""
+
+    bands: int = DEFAULT_BANDS
+    _buckets: dict[tuple[_GroupKey, int, tuple[int, ...]], list[int]] = field(
+        default_factory=dict
+    )
+    _signatures: list[list[int]] = field(default_factory=list)
+    _runs: list[object] = field(default_factory=list)
+
+    def _band_keys(
+        self, group: _GroupKey, signature: Sequence[int]
+    ) -> Iterable[tuple[_GroupKey, int, tuple[int, ...]]]:
+        rows = max(len(signature) // self.bands, 1)
+        for band in range(self.bands):
+            chunk = tuple(signature[band * rows : (band + 1) * rows])
+            if chunk:
+                yield group, band, chunk
+
+    def insert(
+        self, group: _GroupKey, signature: Sequence[int], *, run_id: object = None
+    ) -> None:
+        position = len(self._signatures)
+        self._signatures.append(list(signature))
+        self._runs.append(run_id)
+        for key in self._band_keys(group, signature):
+            self._buckets.setdefault(key, []).append(position)
+
+    def best_match(
+        self, group: _GroupKey, signature: Sequence[int], *, exclude_run: object = None
+    ) -> float:
+        """Return the highest estimated Jaccard similarity among LSH candidates.
+
+        Entries inserted with ``run_id == exclude_run`` are ignored when
+        ``exclude_run`` is given.
+        """
+
+        candidates: set[int] = set()
+        for key in self._band_keys(group, signature):
+            candidates.update(self._buckets.get(key, ()))
+        best = 0.0
+        for position in candidates:
+            if exclude_run is not None and self._runs[position] == exclude_run:
+                continue
+            best = max(best, estimate_jaccard(signature, self._signatures[position]))
+        return best
+
+
+def _signature(metric: Mapping[str, object]) -> list[int] | None:
+    raw = metric.get("output_minhash")
+    if isinstance(raw, list) and raw and all(isinstance(value, int) for value in raw):
+        return list(raw)
+    text = metric.get("output_text")
+    if isinstance(text, str) and text:
+        return minhash_signature(text)
+    return None
+
+
+class OutputDriftDetector:
+    """Incrementally maintained drift detector.
+
+    ``observe`` inserts the previous latest signature of a group into the LSH
+    index as new rows arrive, so callers can keep feeding metrics without
+    rebuilding the index.  ``drifts`` only probes the latest row of each group,
+    against rows from other runs.
+    """
+
+    def __init__(self, *, bands: int = DEFAULT_BANDS) -> None:
+        self._index = MinHashLSH(bands=bands)
+        self._latest: dict[_GroupKey, tuple[list[int], Mapping[str, object]]] = {}
+        self._history: dict[_GroupKey, Counter[object]] = {}
+
+    def observe(self, metric: Mapping[str, object]) -> None:
+        if metric.get("status") not in (None, "ok"):
+            return
+        signature = _signature(metric)
+        if signature is None:
+            return
+        group = (
+            str(metric.get("provider", "")),
+            str(metric.get("model", "")),
+            str(metric.get("prompt_id", "")),
+        )
+        previous = self._latest.get(group)
+        if previous is not None:
+            run_id = previous[1].get("run_id")
+            self._index.insert(group, previous[0], run_id=run_id)
+            self._history.setdefault(group, Counter())[run_id] += 1
+        self._latest[group] = (signature, metric)
+
+    def update(self, metrics: Iterable[Mapping[str, object]]) -> None:
+        for metric in metrics:
+            self.observe(metric)
+
+    def drifts(self, *, threshold: float = DEFAULT_DRIFT_THRESHOLD) -> list[dict[str, object]]:
+        rows: list[dict[str, object]] = []
+        for group, (signature, metric) in sorted(self._latest.items()):
+            run_id = metric.get("run_id")
+            runs = self._history.get(group, Counter())
+            history = sum(runs.values()) - (runs[run_id] if run_id is not None else 0)
+            if not history:
+                continue
+            similarity = self._index.best_match(group, signature, exclude_run=run_id)
+            if similarity >= threshold:
+                continue
+            provider, model, prompt_id = group
+            rows.append(
+                {
+                    "provider": provider,
+                    "model": model,
+                    "prompt_id": prompt_id,
+                    "ts": metric.get("ts"),
+                    "run_id": run_id,
+                    "similarity": round(similarity, 4),
+                    "history": history,
+                }
+            )
+        return rows
+
+
+def detect_output_drift(
+    metrics: Iterable[Mapping[str, object]],
+    *,
+    threshold: float = DEFAULT_DRIFT_THRESHOLD,
+    bands: int = DEFAULT_BANDS,
+) -> list[dict[str, object]]:
+    """List groups whose latest output left its historical cluster.
+
+    ``metrics`` must be in chronological order, as appended to
+    ``runs-metrics.jsonl``.  Groups without rows from an earlier run are never
+    reported.
+    """
+
+    detector = OutputDriftDetector(bands=bands)
+    detector.update(metrics)
+    return detector.drifts(threshold=threshold)
+
+
+def _iter_metrics(path: Path) -> Iterable[Mapping[str, object]]:
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as fp:
+        for line in fp:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="プロバイダ出力のラン間ドリフト検出")
+    parser.add_argument("--metrics", required=True, help="runs-metrics.jsonl のパス")
+    parser.add_argument("--out", required=True, help="検出結果の出力ディレクトリ")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_DRIFT_THRESHOLD,
+        help="過去出力との推定 Jaccard 類似度がこれ未満ならドリフトとみなす",
+    )
+    parser.add_argument("--bands", type=int, default=DEFAULT_BANDS, help="LSH のバンド数")
+    args = parser.parse_args(argv)
+
+    rows = detect_output_drift(
+        _iter_metrics(Path(args.metrics).expanduser()),
+        threshold=args.threshold,
+        bands=args.bands,
+    )
+    out_dir = Path(args.out).expanduser()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / _OUTPUT_JSON).write_text(
+        json.dumps({"rows": rows}, ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    return 0
+
+
+__all__ = [
+    "DEFAULT_BANDS",
+    "DEFAULT_DRIFT_THRESHOLD",
+    "MinHashLSH",
+    "OutputDriftDetector",
+    "detect_output_drift",
+    "main",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI
+    raise SystemExit(main())